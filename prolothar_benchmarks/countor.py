@@ -0,0 +1,110 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+benchmarks CountOr on rostering datasets, e.g.
+
+python -m prolothar_benchmarks.countor --scheduling-period instance.xml --solutions solution1.xml solution2.xml
+
+the dataset is created by SchedulingPeriod.to_ca_dataset and contains one example
+per solution. the instance and solution files are expected in the xml format of
+the employee shift scheduling benchmark data sets.
+"""
+import argparse
+import json
+import sys
+from statistics import mean
+
+from prolothar_ca.ca.methods.countor.countor import CountOr
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.targets import RelationTarget
+from prolothar_ca.model.rostering import SchedulingPeriod, Solution, ca_names
+
+from prolothar_benchmarks.phases import measure
+from prolothar_benchmarks.run_benchmarks import _get_git_commit
+
+def create_rostering_dataset(
+        scheduling_period_xml: str, solution_xml_list: list[str],
+        with_helpful_relations: bool = False) -> CaDataset:
+    scheduling_period = SchedulingPeriod.from_xml(scheduling_period_xml)
+    dataset = scheduling_period.to_ca_dataset(with_helpful_relations=with_helpful_relations)
+    for solution_xml in solution_xml_list:
+        Solution.from_xml(solution_xml, scheduling_period).add_to_ca_dataset(
+            dataset, with_helpful_relations=with_helpful_relations)
+    return dataset
+
+def benchmark_countor(
+        dataset: CaDataset, nr_of_processes_list: list[int],
+        nr_of_repetitions: int = 1) -> dict:
+    """
+    runs CountOr on the given rostering dataset with every given number of
+    processes and returns the wall times in seconds and the number of
+    acquired constraints
+    """
+    target = RelationTarget(ca_names.works_at_shift)
+    results = []
+    for nr_of_processes in nr_of_processes_list:
+        print(f'benchmark CountOr with {nr_of_processes} processes', file=sys.stderr)
+        times = []
+        for _ in range(nr_of_repetitions):
+            elapsed_time, constraints = measure(
+                CountOr(nr_of_processes=nr_of_processes).acquire_constraints, dataset, target)
+            times.append(elapsed_time)
+        results.append({
+            'nr_of_processes': nr_of_processes,
+            'examples': len(dataset),
+            'constraints': len(constraints),
+            'times': times,
+            'min': min(times),
+            'mean': mean(times)
+        })
+    return {
+        'metadata': {
+            'commit': _get_git_commit(),
+            'repetitions': nr_of_repetitions
+        },
+        'results': results
+    }
+
+def main(args: list[str]|None = None):
+    parser = argparse.ArgumentParser(description='benchmark of CountOr on rostering datasets')
+    parser.add_argument('--scheduling-period', required=True, help='xml file of the rostering instance')
+    parser.add_argument('--solutions', nargs='+', required=True, help='xml files of the solutions')
+    parser.add_argument('--with-helpful-relations', action='store_true')
+    parser.add_argument('--processes', nargs='+', type=int, default=[1])
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--output', default=None, help='json file, default is stdout')
+    parsed_args = parser.parse_args(args)
+    with open(parsed_args.scheduling_period, 'r') as f:
+        scheduling_period_xml = f.read()
+    solution_xml_list = []
+    for solution_path in parsed_args.solutions:
+        with open(solution_path, 'r') as f:
+            solution_xml_list.append(f.read())
+    dataset = create_rostering_dataset(
+        scheduling_period_xml, solution_xml_list,
+        with_helpful_relations=parsed_args.with_helpful_relations)
+    benchmark_result = benchmark_countor(
+        dataset, parsed_args.processes, nr_of_repetitions=parsed_args.repetitions)
+    if parsed_args.output is None:
+        json.dump(benchmark_result, sys.stdout, indent=2)
+    else:
+        with open(parsed_args.output, 'w') as f:
+            json.dump(benchmark_result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+compares the throughput of the directory-based and the archive-based dataset
+loggers, e.g.
+
+python -m prolothar_benchmarks.dataset_logger --examples 1000 10000
+
+the datasets are generated by MultipleKnapsackCaDatasetGenerator and logged
+by MultipleKnapsackDatasetLogger with and without use_archive and by
+ArchiveDatasetLogger without rendered attachments.
+"""
+import argparse
+import json
+import sys
+from statistics import mean
+from tempfile import TemporaryDirectory
+
+from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
+from prolothar_ca.ca.dataset_logger.archive_dataset_logger import ArchiveDatasetLogger
+from prolothar_ca.ca.dataset_logger.multiple_knacksack_dataset_logger import MultipleKnapsackDatasetLogger
+from prolothar_ca.model.ca.dataset import CaDataset
+
+from prolothar_benchmarks.phases import measure
+from prolothar_benchmarks.run_benchmarks import _get_git_commit
+
+LOGGERS = {
+    'directory': lambda directory: MultipleKnapsackDatasetLogger(directory),
+    'archive_with_rendering': lambda directory: MultipleKnapsackDatasetLogger(directory, use_archive=True),
+    'archive': lambda directory: ArchiveDatasetLogger(directory),
+}
+
+def benchmark_dataset_loggers(
+        dataset: CaDataset, nr_of_repetitions: int = 1) -> list[dict]:
+    """
+    logs the dataset with every logger and returns the wall times in seconds
+    and the number of examples per second
+    """
+    results = []
+    for logger_name, create_logger in LOGGERS.items():
+        print(f'benchmark {logger_name} logger with {len(dataset)} examples', file=sys.stderr)
+        times = []
+        for repetition in range(nr_of_repetitions):
+            with TemporaryDirectory() as directory:
+                elapsed_time, _ = measure(
+                    create_logger(directory).log_dataset, dataset, f'dataset{repetition}')
+                times.append(elapsed_time)
+        results.append({
+            'logger': logger_name,
+            'examples': len(dataset),
+            'times': times,
+            'min': min(times),
+            'mean': mean(times),
+            'examples_per_second': len(dataset) / min(times) if min(times) > 0 else None
+        })
+    return results
+
+def main(args: list[str]|None = None):
+    parser = argparse.ArgumentParser(description='benchmark of the dataset loggers')
+    parser.add_argument('--examples', nargs='+', type=int, default=[1000])
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='json file, default is stdout')
+    parsed_args = parser.parse_args(args)
+    results = []
+    for nr_of_examples in parsed_args.examples:
+        dataset = MultipleKnapsackCaDatasetGenerator(random_seed=parsed_args.random_seed).generate(
+            nr_of_examples // 2, nr_of_examples - nr_of_examples // 2,
+            random_seed=parsed_args.random_seed)
+        results.extend(benchmark_dataset_loggers(dataset, nr_of_repetitions=parsed_args.repetitions))
+    benchmark_result = {
+        'metadata': {
+            'commit': _get_git_commit(),
+            'repetitions': parsed_args.repetitions
+        },
+        'results': results
+    }
+    if parsed_args.output is None:
+        json.dump(benchmark_result, sys.stdout, indent=2)
+    else:
+        with open(parsed_args.output, 'w') as f:
+            json.dump(benchmark_result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from dataclasses import dataclass
+from typing import Callable
+
+from prolothar_ca.ca.dataset_generator.dataset_generator import CaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.sudoku import SudokuCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.graph_color import GraphColorCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.double_round_robin import DoubleRoundRobinCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.random import RandomCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
+
+#small pddl domain that is bundled with the tests
+HANOI_DIRECTORY = 'prolothar_tests/resources/meta_planning/hanoi'
+
+@dataclass(frozen=True)
+class BenchmarkDataset:
+    """
+    a named dataset generator for benchmarks. create_generator receives a
+    random seed, such that every benchmark run creates the same datasets.
+    """
+    name: str
+    create_generator: Callable[[int], CaDatasetGenerator]
+    is_planning_dataset: bool = False
+
+BENCHMARK_DATASETS = {
+    benchmark_dataset.name: benchmark_dataset for benchmark_dataset in [
+        BenchmarkDataset(
+            'sudoku', lambda random_seed: SudokuCaDatasetGenerator(4)),
+        BenchmarkDataset(
+            'n_queens', lambda random_seed: NQueensCaDatasetGenerator(6, random_seed=random_seed)),
+        BenchmarkDataset(
+            'graph_color', lambda random_seed: GraphColorCaDatasetGenerator(random_seed=random_seed)),
+        BenchmarkDataset(
+            'multiple_knapsack', lambda random_seed: MultipleKnapsackCaDatasetGenerator(random_seed=random_seed)),
+        BenchmarkDataset(
+            'double_round_robin', lambda random_seed: DoubleRoundRobinCaDatasetGenerator(4)),
+        BenchmarkDataset(
+            'random', lambda random_seed: RandomCaDatasetGenerator(
+                nr_of_objects=4, boolean_features=1, numeric_features=1)),
+        BenchmarkDataset(
+            'hanoi', lambda random_seed: MetaplanningCaDatasetGenerator(
+                HANOI_DIRECTORY, filter_actions_with_duplicate_parameter=True),
+            is_planning_dataset=True),
+    ]
+}
@@ -0,0 +1,144 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from time import perf_counter
+from typing import Callable
+
+from prolothar_ca.ca.methods.custom.facade import URPiLs
+from prolothar_ca.ca.methods.custom.candidate_generator.for_all_one_parameter_cross_product import generate_for_all_one_parameter_cross_product_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.for_all_cross_product import generate_for_all_cross_product_candidates
+from prolothar_ca.ca.methods.custom.homogenous_candidate import Candidate
+from prolothar_ca.ca.methods.custom.itemset_miner import ItemsetMiner
+from prolothar_ca.ca.methods.custom.model.custom_constraint import DataGraph
+from prolothar_ca.ca.methods.custom.sat_encoding import create_homgenous_sat_encoded_dataset
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.sat.term_factory import TermFactory
+from prolothar_ca.solver.sat.modelcount.mc2 import MC2
+
+from prolothar_benchmarks.datasets import BenchmarkDataset
+
+#upper limit for the number of formulas in the model counting benchmark
+MAX_NR_OF_COUNTED_FORMULAS = 50
+
+def measure(function: Callable, *args, **kwargs) -> tuple[float, object]:
+    """
+    calls the given function and returns the elapsed wall time in seconds
+    together with the return value of the function
+    """
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return perf_counter() - start, result
+
+def benchmark_phases(
+        benchmark_dataset: BenchmarkDataset, nr_of_examples: int,
+        random_seed: int) -> dict:
+    """
+    runs all phases for a dataset of the given size.
+
+    Returns
+    -------
+    dict
+        the wall time in seconds per phase and the number of examples,
+        candidates and acquired constraints
+    """
+    phases = {}
+    phases['create_generator'], generator = measure(
+        benchmark_dataset.create_generator, random_seed)
+    phases['generate_dataset'], dataset = measure(
+        generator.generate, nr_of_examples, 0, random_seed=random_seed)
+    target = generator.get_target()
+    counts = {'examples': len(dataset)}
+    if not benchmark_dataset.is_planning_dataset:
+        target_relation = dataset.get_relation_type(target.relation_name)
+        phases['create_datagraph'], datagraph = measure(
+            DataGraph, next(iter(dataset)), dataset, target_relation)
+        phases['sat_encoding'], sat_encoded_dataset = measure(
+            create_homgenous_sat_encoded_dataset, dataset, target_relation, datagraph)
+        phases['candidate_generation'], constraint_list = measure(
+            _generate_candidates, dataset, datagraph)
+        phases['candidate_scoring'], candidate_list = measure(
+            _score_candidates, constraint_list, datagraph, sat_encoded_dataset)
+        phases['model_counting'], _ = measure(_count_models, candidate_list)
+        phases['itemset_mining'], _ = measure(
+            ItemsetMiner(verbose=False, random_seed=random_seed).find_patterns,
+            *_create_transactions(dataset, target_relation.name))
+        counts['generated_candidates'] = len(constraint_list)
+        counts['promising_candidates'] = len(candidate_list)
+    phases['acquire_constraints'], (constraints, report) = measure(
+        URPiLs(
+            planning_dataset=benchmark_dataset.is_planning_dataset,
+            random_seed=random_seed
+        ).acquire_constraints_with_report, dataset, target)
+    for phase, elapsed_time in report.phase_times.items():
+        phases[f'acquire_constraints.{phase}'] = elapsed_time
+    counts['constraints'] = len(constraints)
+    counts['model_counter_calls'] = report.model_counter_calls
+    counts['sql_queries'] = report.sql_queries
+    return {'phases': phases, 'counts': counts}
+
+def _generate_candidates(dataset: CaDataset, datagraph: DataGraph) -> list:
+    target_relation = datagraph.get_target_relation_type()
+    nr_of_target_relation_parameter_options = tuple(
+        len(next(iter(dataset)).all_objects_per_type[object_type])
+        for object_type in target_relation.parameter_types
+    )
+    constraint_list = list(generate_for_all_one_parameter_cross_product_candidates(
+        dataset, target_relation, nr_of_target_relation_parameter_options))
+    constraint_list.extend(generate_for_all_cross_product_candidates(
+        dataset, target_relation, nr_of_target_relation_parameter_options))
+    return constraint_list
+
+def _score_candidates(
+        constraint_list: list, datagraph: DataGraph,
+        sat_encoded_dataset: list) -> list[Candidate]:
+    term_factory = TermFactory()
+    candidate_list = []
+    for constraint in constraint_list:
+        candidate = Candidate(constraint, datagraph, sat_encoded_dataset, term_factory)
+        if candidate.gain < 0:
+            candidate_list.append(candidate)
+    return candidate_list
+
+def _count_models(candidate_list: list[Candidate]):
+    model_counter = MC2(use_graph_lower_bound=True, use_regular_graph_lower_bound=True)
+    for candidate in candidate_list[:MAX_NR_OF_COUNTED_FORMULAS]:
+        model_counter.countlog2(candidate.model_cnf)
+
+def _create_transactions(
+        dataset: CaDataset, target_relation_name: str) -> tuple[list[list[str]], list[list[str]]]:
+    """
+    creates one transaction per target relation instance, where the items are
+    the features of the parameters of the relation. transactions of relations
+    with value True are positive, all others are negative.
+    """
+    positive_list = []
+    negative_list = []
+    for example in dataset:
+        for relation in example.relations[target_relation_name]:
+            transaction = []
+            for i, obj in enumerate(relation.objects):
+                for feature_name, feature_value in obj.features.items():
+                    if isinstance(feature_value, bool):
+                        if feature_value:
+                            transaction.append(f'{i}.{feature_name}')
+                    else:
+                        transaction.append(f'{i}.{feature_name} = {feature_value}')
+            if relation.value:
+                positive_list.append(transaction)
+            else:
+                negative_list.append(transaction)
+    return positive_list, negative_list
@@ -0,0 +1,109 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+runs the benchmark suite and writes the results as json, e.g.
+
+python -m prolothar_benchmarks.run_benchmarks --output benchmark.json
+
+run from the repository root, such that the bundled pddl domain can be found.
+results of different commits can be compared by the keys dataset, size and phase.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from statistics import mean
+
+from prolothar_benchmarks.datasets import BENCHMARK_DATASETS
+from prolothar_benchmarks.phases import benchmark_phases
+
+DEFAULT_SIZES = [10, 25, 50]
+
+def run_benchmarks(
+        dataset_names: list[str], sizes: list[int],
+        nr_of_repetitions: int = 1, random_seed: int = 0) -> dict:
+    """
+    runs the benchmark for all given datasets and sizes. every phase is
+    repeated nr_of_repetitions times with the same random seed.
+    """
+    results = []
+    for dataset_name in dataset_names:
+        for size in sizes:
+            print(f'benchmark {dataset_name} with {size} examples', file=sys.stderr)
+            times_per_phase = {}
+            for _ in range(nr_of_repetitions):
+                run = benchmark_phases(BENCHMARK_DATASETS[dataset_name], size, random_seed)
+                for phase, elapsed_time in run['phases'].items():
+                    times_per_phase.setdefault(phase, []).append(elapsed_time)
+            results.append({
+                'dataset': dataset_name,
+                'size': size,
+                'counts': run['counts'],
+                'phases': {
+                    phase: {
+                        'times': times,
+                        'min': min(times),
+                        'mean': mean(times)
+                    }
+                    for phase, times in times_per_phase.items()
+                }
+            })
+    return {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'commit': _get_git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repetitions': nr_of_repetitions,
+            'random_seed': random_seed
+        },
+        'results': results
+    }
+
+def _get_git_commit() -> str|None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(args: list[str]|None = None):
+    parser = argparse.ArgumentParser(description='per-phase benchmarks of URPiLs')
+    parser.add_argument(
+        '--datasets', nargs='+', default=list(BENCHMARK_DATASETS),
+        choices=list(BENCHMARK_DATASETS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='json file, default is stdout')
+    parsed_args = parser.parse_args(args)
+    benchmark_result = run_benchmarks(
+        parsed_args.datasets, parsed_args.sizes,
+        nr_of_repetitions=parsed_args.repetitions,
+        random_seed=parsed_args.random_seed)
+    if parsed_args.output is None:
+        json.dump(benchmark_result, sys.stdout, indent=2)
+    else:
+        with open(parsed_args.output, 'w') as f:
+            json.dump(benchmark_result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -17,19 +17,30 @@
 
 from abc import ABC, abstractmethod
 from random import Random
-from tqdm import trange
+from tqdm import tqdm, trange
+
+from prolothar_common import validate as validate_utils
 
 from prolothar_ca.model.ca.dataset import CaDataset
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.constraints import CaConstraint
 from prolothar_ca.model.ca.targets import CaTarget
+from prolothar_ca.parallel import create_spawn_pool, get_chunksize, get_worker_state
 
 class CaDatasetGenerator(ABC):
 
+    #generators that walk through a sequence of examples (e.g. all solutions
+    #of a problem), that lazily create shared objects or that remember the
+    #generated examples keep this state in attributes. copies of the generator
+    #in worker processes would not share this state, therefore such generators
+    #set this flag to False and always generate their examples in the main process.
+    _supports_parallel_generation = True
+
     def generate(
         self, nr_of_positive_examples: int,
         nr_of_negative_examples: int,
-        random_seed: int|None = None) -> CaDataset:
+        random_seed: int|None = None,
+        nr_of_processes: int|None = None) -> CaDataset:
         """
         generates a new CaDataset based on Sudoku
 
@@ -41,6 +52,12 @@ class CaDatasetGenerator(ABC):
             nr of invalid solution that should be generated
         random_seed : int | None, optional
             for reproducibility, by default None
+        nr_of_processes : int | None, optional
+            if None (default), all examples are generated with a single random
+            generator in the main process. otherwise, every example gets its
+            own random generator, which is seeded from random_seed, and the
+            examples are generated by the given number of worker processes.
+            the generated dataset does not depend on the number of processes.
 
         Returns
         -------
@@ -48,14 +65,61 @@ class CaDatasetGenerator(ABC):
             constraint acqusition dataset with the specified number of
             positive and negative examples
         """
-        random_generator = Random(random_seed)
         dataset = self._create_empty_dataset()
-        for _ in trange(nr_of_positive_examples, desc='generate positive examples'):
-            dataset.add_example(self._generate_positive_example(random_generator))
-        for _ in trange(nr_of_negative_examples, desc='generate negative examples'):
-            dataset.add_example(self._generate_negative_example(random_generator))
+        self._add_generated_examples(
+            dataset, nr_of_positive_examples, nr_of_negative_examples,
+            random_seed, nr_of_processes)
         return dataset
 
+    def _add_generated_examples(
+            self, dataset: CaDataset, nr_of_positive_examples: int,
+            nr_of_negative_examples: int, random_seed: int|None,
+            nr_of_processes: int|None, validate: bool = True):
+        """
+        generates positive and negative examples and adds them to the dataset.
+        see "generate" for the meaning of the parameters.
+        """
+        if nr_of_processes is None:
+            random_generator = Random(random_seed)
+            dataset.add_examples((
+                self._generate_positive_example(random_generator)
+                for _ in trange(nr_of_positive_examples, desc='generate positive examples')
+            ), validate=validate)
+            dataset.add_examples((
+                self._generate_negative_example(random_generator)
+                for _ in trange(nr_of_negative_examples, desc='generate negative examples')
+            ), validate=validate)
+            return
+        validate_utils.greater_or_equal(nr_of_processes, 1)
+        seed_generator = Random(random_seed)
+        tasks = [(True, seed_generator.getrandbits(64), i) for i in range(nr_of_positive_examples)]
+        tasks.extend((False, seed_generator.getrandbits(64), i) for i in range(nr_of_negative_examples))
+        if nr_of_processes == 1 or len(tasks) <= 1 or not self._supports_parallel_generation:
+            dataset.add_examples((
+                self._generate_example_with_seed(task)
+                for task in tqdm(tasks, desc='generate examples')
+            ), validate=validate)
+            return
+        with create_spawn_pool(nr_of_processes, worker_state=self) as pool:
+            examples = pool.imap(
+                _generate_example_in_worker, tasks,
+                chunksize=get_chunksize(len(tasks), nr_of_processes))
+            dataset.add_examples(
+                tqdm(examples, total=len(tasks), desc='generate examples'),
+                validate=validate)
+
+    def _generate_example_with_seed(self, task: tuple[bool, int, int]) -> CaExample:
+        """
+        generates an example for a task (is_positive, seed, index), where index
+        is the position of the example among the positive (resp. negative) examples.
+        generators that walk through a sequence of examples can override this
+        method to use the index instead of their state.
+        """
+        is_positive, seed, _ = task
+        if is_positive:
+            return self._generate_positive_example(Random(seed))
+        return self._generate_negative_example(Random(seed))
+
     @abstractmethod
     def _create_empty_dataset(self) -> CaDataset:
         """
@@ -88,3 +152,6 @@ class CaDatasetGenerator(ABC):
         defines the target concept of this dataset, i.e. for which we want
         to acquire the constraints
         """
+
+def _generate_example_in_worker(task: tuple[bool, int, int]) -> CaExample:
+    return get_worker_state()._generate_example_with_seed(task)
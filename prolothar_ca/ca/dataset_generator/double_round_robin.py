@@ -119,13 +119,14 @@ class DoubleRoundRobinCaDatasetGenerator(CaDatasetGenerator):
     def generate(
             self, nr_of_positive_examples: int,
             nr_of_negative_examples: int,
-            random_seed: int|None = None) -> CaDataset:
+            random_seed: int|None = None,
+            nr_of_processes: int|None = None) -> CaDataset:
         validate.less_or_equal(nr_of_positive_examples, factorial(self.__nr_of_teams))
         self.__team_permutations_for_positive_examples = permutations(self.__team_objects, self.__nr_of_teams)
         self.__team_permutations_for_negative_examples = permutations(self.__team_objects, self.__nr_of_teams)
         return super().generate(
             nr_of_positive_examples, nr_of_negative_examples,
-            random_seed=random_seed)
+            random_seed=random_seed, nr_of_processes=nr_of_processes)
 
     def _create_empty_dataset(self) -> CaDataset:
         return CaDataset(
@@ -143,6 +144,16 @@ class DoubleRoundRobinCaDatasetGenerator(CaDatasetGenerator):
             }
         )
 
+    def _generate_example_with_seed(self, task: tuple[bool, int, int]) -> CaExample:
+        #the i-th example uses the i-th team permutation, which is computed from
+        #the index such that the examples do not depend on the permutation iterators
+        is_positive, seed, index = task
+        example = self.__generate_example_from_team_list(
+            _nth_permutation(self.__team_objects, index), is_positive)
+        if is_positive:
+            return example
+        return self.__mutate_until_invalid(example, Random(seed))
+
     def _generate_positive_example(self, random_generator: Random) -> CaExample:
         return self.__generate_example_from_team_list(
             next(self.__team_permutations_for_positive_examples), True)
@@ -192,8 +203,10 @@ class DoubleRoundRobinCaDatasetGenerator(CaDatasetGenerator):
         return example
 
     def _generate_negative_example(self, random_generator: Random) -> CaExample:
-        example = self.__generate_example_from_team_list(
-            next(self.__team_permutations_for_negative_examples), False)
+        return self.__mutate_until_invalid(self.__generate_example_from_team_list(
+            next(self.__team_permutations_for_negative_examples), False), random_generator)
+
+    def __mutate_until_invalid(self, example: CaExample, random_generator: Random) -> CaExample:
         while True:
             example = self.__mutate_example(example, random_generator)
             if any(not c.holds(example, {}) for c in self.__ground_truth_constraints):
@@ -218,3 +231,14 @@ class DoubleRoundRobinCaDatasetGenerator(CaDatasetGenerator):
 
     def get_target(self) -> CaTarget:
         return RelationTarget(MATCH_RELATION)
+
+def _nth_permutation(items: list, index: int) -> tuple:
+    """
+    returns the same permutation as the index-th element of itertools.permutations(items)
+    """
+    remaining_items = list(items)
+    permutation = []
+    for i in range(len(remaining_items), 0, -1):
+        position, index = divmod(index, factorial(i - 1))
+        permutation.append(remaining_items.pop(position))
+    return tuple(permutation)
@@ -35,12 +35,15 @@ class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
             cache_parsed_trajectories: bool = False,
             disable_gc_during_parsing: bool = False,
             ignore_parameters: list[str]|None = None,
-            remove_unused_objects: bool = False): ...
+            remove_unused_objects: bool = False,
+            nr_of_processes: int = 1,
+            use_bitset_states: bool = False): ...
 
     def generate(
             self, nr_of_positive_examples: int,
             nr_of_negative_examples: int,
-            random_seed: int|None = None) -> CaDataset: ...
+            random_seed: int|None = None,
+            nr_of_processes: int|None = None) -> CaDataset: ...
 
     def get_ground_truth_constraints(self) -> list[CaConstraint]: ...
 
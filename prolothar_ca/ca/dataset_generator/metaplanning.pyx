@@ -18,14 +18,14 @@
 from random import Random
 import os
 from prolothar_common import validate
-from pyparsing import nested_expr
 from tqdm import tqdm
 import bz2
 from multiprocessing.pool import ThreadPool
 from threading import Lock
-from typing import Set, List, Tuple
+from typing import Iterable, Set, List, Tuple
 import pickle
 import gc
+import tempfile
 
 from prolothar_ca.ca.dataset_generator.dataset_generator import CaDatasetGenerator
 from prolothar_ca.ca.dataset_generator.pddl import PddlCaDatasetGenerator
@@ -34,11 +34,13 @@ from prolothar_ca.model.ca.constraints.constraint import CaConstraint
 from prolothar_ca.model.ca.dataset import CaDataset
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.targets import RelationTarget
+from prolothar_ca.parallel import create_spawn_pool
 
 from prolothar_ca.model.pddl.domain import Domain
 from prolothar_ca.model.pddl.problem import Problem
 from prolothar_ca.model.pddl.plan import Plan
 from prolothar_ca.model.pddl.condition import PredicateIsTrueCondition
+from prolothar_ca.model.pddl.sexpression import iterate_sexpression_elements, read_in_chunks
 
 class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
 
@@ -54,7 +56,15 @@ class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
             cache_parsed_trajectories: bool = False,
             disable_gc_during_parsing: bool = False,
             ignore_parameters: list[str]|None = None,
-            remove_unused_objects: bool = False):
+            remove_unused_objects: bool = False,
+            nr_of_processes: int = 1,
+            use_bitset_states: bool = False):
+        """
+        loads the domain and the trajectory files of the given directory.
+        if nr_of_processes is greater than 1, the trajectory files are parsed in
+        parallel by worker processes, otherwise by nr_of_threads threads.
+        """
+        validate.greater_or_equal(nr_of_processes, 1)
         if disable_gc_during_parsing:
             gc.disable()
         try:
@@ -68,7 +78,8 @@ class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
                 with open(os.path.join(directory, 'domain.pddl')) as f:
                     domain = Domain.from_pddl(f.read())
             problem_list, plan_list = self.__parse_problem_and_plan_list(
-                directory, nr_of_threads, domain, max_trajectory_files, cache_parsed_trajectories)
+                directory, nr_of_threads, nr_of_processes, domain,
+                max_trajectory_files, cache_parsed_trajectories)
             if action_name_of_interest is None:
                 action_of_interest = plan_list[0].action_list[0][0]
             else:
@@ -81,24 +92,29 @@ class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
                 nr_of_target_relation_samples=nr_of_target_relation_samples,
                 nr_of_feature_relation_samples=nr_of_feature_relation_samples,
                 ignore_parameters=ignore_parameters,
-                remove_unused_objects=remove_unused_objects
+                remove_unused_objects=remove_unused_objects,
+                use_bitset_states=use_bitset_states
             )
         finally:
             gc.enable()
 
     def __parse_problem_and_plan_list(
-            self, directory: str, nr_of_threads: int, domain: Domain, max_trajectory_files: int,
+            self, directory: str, nr_of_threads: int, nr_of_processes: int,
+            domain: Domain, max_trajectory_files: int,
             cache_parsed_trajectories: bool):
         cdef list problem_list = []
         cdef list plan_list = []
         trajectory_file_list = [
             os.path.join(directory, trajectory_file)
             for trajectory_file in os.listdir(directory)
-            if trajectory_file.startswith('trajectory-') and not trajectory_file.endswith('.cache')
+            if trajectory_file.startswith('trajectory-') and not trajectory_file.endswith(('.cache', '.tmp'))
         ]
         if max_trajectory_files > 0:
             trajectory_file_list = trajectory_file_list[:max_trajectory_files]
-        if nr_of_threads == 1:
+        if nr_of_processes > 1:
+            return self.__parse_problem_and_plan_list_in_processes(
+                trajectory_file_list, nr_of_processes, domain, cache_parsed_trajectories)
+        elif nr_of_threads == 1:
             for trajectory_file in tqdm(trajectory_file_list, desc='parse trajectory files'):
                 problem, plan = parse_trajectory_file(trajectory_file, domain, cache_parsed_trajectories)
                 problem_list.append(problem)
@@ -117,16 +133,47 @@ class MetaplanningCaDatasetGenerator(CaDatasetGenerator):
                     plan_list.append(result[1])
         return problem_list,plan_list
 
+    def __parse_problem_and_plan_list_in_processes(
+            self, trajectory_file_list: List[str], nr_of_processes: int,
+            domain: Domain, cache_parsed_trajectories: bool):
+        cdef list problem_list = []
+        cdef list plan_list = []
+        cached_trajectories = {}
+        if cache_parsed_trajectories:
+            for trajectory_file in trajectory_file_list:
+                if os.path.exists(trajectory_file + '.cache'):
+                    cached_trajectories[trajectory_file] = load_pickled_trajectory_file(trajectory_file)
+        uncached_trajectory_file_list = [
+            trajectory_file for trajectory_file in trajectory_file_list
+            if trajectory_file not in cached_trajectories
+        ]
+        #the workers only tokenize the files. problem and plan are created
+        #in this process, such that they reference the objects of our domain
+        #and only lists of strings need to be transferred between the processes.
+        with create_spawn_pool(min(nr_of_processes, max(1, len(uncached_trajectory_file_list)))) as pool:
+            sections_iterator = pool.imap(read_trajectory_sections, uncached_trajectory_file_list)
+            for trajectory_file in tqdm(trajectory_file_list, desc='parse trajectory files'):
+                if trajectory_file in cached_trajectories:
+                    problem, plan = cached_trajectories[trajectory_file]
+                else:
+                    problem, plan = create_problem_and_plan_from_sections(
+                        trajectory_file, next(sections_iterator), domain,
+                        cache_parsed_trajectories)
+                problem_list.append(problem)
+                plan_list.append(plan)
+        return problem_list,plan_list
+
     def _create_empty_dataset(self) -> CaDataset:
         return self.pddl_ca_dataset_generator._create_empty_dataset()
 
     def generate(
             self, nr_of_positive_examples: int,
             nr_of_negative_examples: int,
-            random_seed: int|None = None) -> CaDataset:
+            random_seed: int|None = None,
+            nr_of_processes: int|None = None) -> CaDataset:
         return self.pddl_ca_dataset_generator.generate(
             nr_of_positive_examples, nr_of_negative_examples,
-            random_seed=random_seed)
+            random_seed=random_seed, nr_of_processes=nr_of_processes)
 
     def _generate_positive_example(self, random_generator: Random) -> CaExample:
         return self.pddl_ca_dataset_generator._generate_positive_example(random_generator)
@@ -154,12 +201,54 @@ def parse_trajectory_file(
             plan = parse_plan_with_custom_parsing(f.read(), domain, problem)
     else:
         with open(trajectory_file) as f:
-            plan = parse_plan_with_nested_expression(f.read(), domain, problem)
+            plan = parse_plan_with_nested_expression(read_in_chunks(f), domain, problem)
     if cache_parsed_trajectories:
-        with open(cache_file, mode='wb') as f:
-            pickle.dump((problem, plan), f, protocol=pickle.HIGHEST_PROTOCOL)
+        write_cache_file(cache_file, problem, plan)
+    return problem, plan
+
+def read_trajectory_sections(trajectory_file: str) -> List[Tuple[str, list]]:
+    """
+    reads the sections of a trajectory file as (section name, section content)
+    tuples, where the content consists of nested lists of strings. in contrast
+    to Problem and Plan, this representation does not reference the domain,
+    is cheap to pickle and can therefore be returned by worker processes.
+    """
+    if trajectory_file.endswith('bz2'):
+        with bz2.open(trajectory_file, 'rt') as f:
+            return list(iterate_custom_parsed_sections(f))
+    else:
+        with open(trajectory_file) as f:
+            return list(iterate_nested_expression_sections(read_in_chunks(f)))
+
+def create_problem_and_plan_from_sections(
+        trajectory_file: str, sections: List[Tuple[str, list]],
+        domain: Domain, cache_parsed_trajectories: bool) -> Tuple[Problem, Plan]:
+    """
+    creates problem and plan from the result of read_trajectory_sections
+    """
+    problem = Problem(trajectory_file, domain)
+    plan = create_plan_from_sections(sections, domain, problem)
+    if cache_parsed_trajectories:
+        write_cache_file(trajectory_file + '.cache', problem, plan)
     return problem, plan
 
+def write_cache_file(cache_file: str, problem: Problem, plan: Plan):
+    """
+    pickles problem and plan into a temporary file, which then replaces the
+    cache file. concurrent runs therefore never read a partially written cache file.
+    the temporary file is hidden and does not start with 'trajectory-', such that
+    it is not mistaken for a trajectory file.
+    """
+    cache_file_handle, temporary_file = tempfile.mkstemp(
+        dir=os.path.dirname(cache_file) or None, prefix='.' + os.path.basename(cache_file), suffix='.tmp')
+    try:
+        with os.fdopen(cache_file_handle, mode='wb') as f:
+            pickle.dump((problem, plan), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_file, cache_file)
+    except BaseException:
+        os.remove(temporary_file)
+        raise
+
 def load_pickled_trajectory_file(trajectory_file: str) -> Tuple[Problem, Plan]:
     cache_file = trajectory_file + '.cache'
     if os.path.exists(cache_file):
@@ -168,13 +257,54 @@ def load_pickled_trajectory_file(trajectory_file: str) -> Tuple[Problem, Plan]:
     else:
         raise NotImplementedError(f'multiprocessing requires pickled trajectory, but {cache_file} does not exist')
 
-def parse_plan_with_nested_expression(trajectory: str, domain: Domain, problem: Problem) -> Plan:
-    parsed_trajectory = nested_expr().parse_string(trajectory)[0]
-    validate.equals(parsed_trajectory[0], 'trajectory')
-    action_list = []
-    for pddl_section in tqdm(parsed_trajectory[1:], desc='sections'):
-        section_name = pddl_section[0]
-        section_content = pddl_section[1:]
+def parse_plan_with_nested_expression(trajectory: str|Iterable[str], domain: Domain, problem: Problem) -> Plan:
+    """
+    parses a trajectory given as string or as iterable of chunks of the string.
+    the sections are parsed and processed one after the other.
+    """
+    if isinstance(trajectory, str):
+        trajectory = (trajectory,)
+    return create_plan_from_sections(
+        tqdm(iterate_nested_expression_sections(trajectory), desc='sections'), domain, problem)
+
+def parse_plan_with_custom_parsing(trajectory: str, domain: Domain, problem: Problem) -> Plan:
+    return create_plan_from_sections(
+        iterate_custom_parsed_sections(trajectory.splitlines()), domain, problem)
+
+def iterate_nested_expression_sections(trajectory_chunks: Iterable[str]):
+    pddl_sections = iterate_sexpression_elements(trajectory_chunks)
+    validate.equals(next(pddl_sections, None), 'trajectory')
+    for pddl_section in pddl_sections:
+        yield pddl_section[0], pddl_section[1:]
+
+def iterate_custom_parsed_sections(trajectory_lines: Iterable[str]):
+    """
+    fast path for trajectories with one section per line. the sections are
+    parsed by splitting the lines. ":state" sections are skipped.
+    """
+    cdef str line
+    cdef list init_state_list
+    cdef str predicate
+    for line in trajectory_lines:
+        line = ' '.join(line.split())
+        if line.startswith('(:objects '):
+            yield ':objects', line[len('(:objects '):-1].split()
+        elif line.startswith('(:init ('):
+            init_state_list = []
+            for predicate in line[len('(:init ('):-2].split(') ('):
+                if predicate.startswith('= ('):
+                    init_state_list.append(['=', predicate[len('= ('):predicate.index(')')].split(), predicate.split()[-1]])
+                else:
+                    init_state_list.append(predicate.split())
+            yield ':init', init_state_list
+        elif line.startswith('(:action ('):
+            yield ':action', [line[len('(:action ('):-2].split()]
+        elif line and line != ')' and line != '(trajectory' and not line.startswith('(:state'):
+            raise NotImplementedError(line[:50])
+
+def create_plan_from_sections(sections: Iterable[Tuple[str, list]], domain: Domain, problem: Problem) -> Plan:
+    cdef list action_list = []
+    for section_name, section_content in sections:
         if section_name == ':objects':
             problem.add_objects_from_parsed_pddl(section_content)
         elif section_name == ':init':
@@ -197,31 +327,3 @@ def parse_plan_with_nested_expression(trajectory: str, domain: Domain, problem:
         else:
             raise NotImplementedError(f'unsupported section "{section_name}" with content "{section_content}"')
     return Plan(action_list, len(action_list))
-
-def parse_plan_with_custom_parsing(trajectory: str, domain: Domain, problem: Problem) -> Plan:
-    cdef list action_list = []
-    cdef str line
-    cdef list init_state_list
-    cdef str predicate
-    for line in trajectory.splitlines():
-        line = ' '.join(line.split())
-        if line.startswith('(:objects '):
-            problem.add_objects_from_parsed_pddl(line[len('(:objects '):-1].split())
-        elif line.startswith('(:init ('):
-            init_state_list = []
-            for predicate in line[len('(:init ('):-2].split(') ('):
-                if predicate.startswith('= ('):
-                    init_state_list.append(['=', predicate[len('= ('):predicate.index(')')].split(), predicate.split()[-1]])
-                else:
-                    init_state_list.append(predicate.split())
-            problem.set_initial_state_from_parsed_pddl(init_state_list)
-        elif line.startswith('(:action ('):
-            action_parts = line[len('(:action ('):-2].split()
-            action = domain.get_action_by_name(action_parts[0])
-            action_list.append((action, {
-                parameter_name: problem.get_object_by_name(object_name)
-                for parameter_name, object_name in zip(sorted(action.parameters.keys()), action_parts[1:])
-            }))
-        elif line and line != ')' and line != '(trajectory' and not line.startswith('(:state'):
-            raise NotImplementedError(line[:50])
-    return Plan(action_list, len(action_list))
\ No newline at end of file
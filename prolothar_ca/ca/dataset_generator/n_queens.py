@@ -45,6 +45,8 @@ class NQueensCaDatasetGenerator(CaDatasetGenerator):
     https://en.wikipedia.org/wiki/Eight_queens_puzzle#Counting_solutions_for_other_sizes_n
     """
 
+    _supports_parallel_generation = False
+
     def __init__(self, n: int = 8, include_queen_permutations: bool = True, random_seed: int|None = None):
         """
         creates a new dataset generator for the n queens problem
@@ -163,7 +165,8 @@ class NQueensCaDatasetGenerator(CaDatasetGenerator):
     def generate(
             self, nr_of_positive_examples: int,
             nr_of_negative_examples: int,
-            random_seed: int|None = None) -> CaDataset:
+            random_seed: int|None = None,
+            nr_of_processes: int|None = None) -> CaDataset:
         max_nr_of_solutions = len(self.__all_solutions)
         validate.less_or_equal(
             nr_of_positive_examples, max_nr_of_solutions,
@@ -176,7 +179,7 @@ class NQueensCaDatasetGenerator(CaDatasetGenerator):
         self.__current_solution_index = 0
         return super().generate(
             nr_of_positive_examples, nr_of_negative_examples,
-            random_seed=random_seed)
+            random_seed=random_seed, nr_of_processes=nr_of_processes)
 
     def _create_empty_dataset(self) -> CaDataset:
         return CaDataset(
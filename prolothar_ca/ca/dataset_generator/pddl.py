@@ -19,7 +19,7 @@ from random import Random
 from itertools import groupby, product
 from functools import reduce
 import gc
-from tqdm import trange, tqdm
+from tqdm import tqdm
 from prolothar_common import validate
 from prolothar_common.collections.list_utils import shuffle_together
 
@@ -47,11 +47,14 @@ from prolothar_ca.model.pddl.condition import PredicateIsTrueCondition
 from prolothar_ca.model.pddl.object_type import ObjectType
 from prolothar_ca.model.pddl.pddl_object import Object
 from prolothar_ca.model.pddl.state import State
+from prolothar_ca.model.pddl.bitset_state import GroundingTable
 
 IS_VALID_ACTION = 'is_valid_action'
 
 class PddlCaDatasetGenerator(CaDatasetGenerator):
 
+    _supports_parallel_generation = False
+
     def __init__(
             self, domain: Domain, problem_list: list[Problem], plan_list: list[Plan],
             action_of_interest: Action, search_new_valid_actions: bool = False,
@@ -60,7 +63,8 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
             nr_of_target_relation_samples: int|None = None,
             nr_of_feature_relation_samples: int|None = None,
             ignore_parameters: list[str]|None = None,
-            remove_unused_objects: bool = False):
+            remove_unused_objects: bool = False,
+            use_bitset_states: bool = False):
         if relations_to_ignore is not None:
             validate.is_in(type(relations_to_ignore), [set, list, tuple])
             self.__relations_to_ignore = relations_to_ignore
@@ -87,6 +91,9 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
         self.__nr_of_target_relation_samples = nr_of_target_relation_samples
         self.__nr_of_feature_relation_samples = nr_of_feature_relation_samples
         self.__remove_unused_objects = remove_unused_objects
+        self.__use_bitset_states = use_bitset_states
+        #GroundingTable per id of a problem, only used if use_bitset_states is True
+        self.__grounding_tables = {}
 
     def __pddl_to_ca_types_definition(self, domain: Domain) -> dict[str, CaObjectType]:
         return {
@@ -182,7 +189,8 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
     def generate(
             self, nr_of_positive_examples: int,
             nr_of_negative_examples: int,
-            random_seed: int|None = None) -> CaDataset:
+            random_seed: int|None = None,
+            nr_of_processes: int|None = None) -> CaDataset:
         nr_of_available_examples = 0
         for plan in self.plan_list:
             for action,_ in plan.action_list:
@@ -197,19 +205,14 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
         self.plan_list, self.problem_list = shuffle_together(
             self.plan_list, self.problem_list, random=Random(random_seed))
         self.__current_plan_index = 0
-        random_generator = Random(random_seed)
         dataset = self._create_empty_dataset()
         gc.disable()
-        for _ in trange(nr_of_positive_examples, desc='generate positive examples', leave=False):
-            dataset.add_example(
-                self._generate_positive_example(random_generator),
-                validate=self.__nr_of_target_relation_samples is None
-            )
-        for _ in trange(nr_of_negative_examples, desc='generate negative examples', leave=False):
-            dataset.add_example(
-                self._generate_negative_example(random_generator),
-                validate=self.__nr_of_target_relation_samples is None
-            )
+        #the examples are converted from the states with all groundings of the
+        #predicates (or a sample of the target groundings), i.e. they are
+        #correct by construction and do not need to be validated
+        self._add_generated_examples(
+            dataset, nr_of_positive_examples, nr_of_negative_examples,
+            random_seed, nr_of_processes, validate=False)
         gc.enable()
         if self.__remove_unused_objects:
             self.__remove_unused_objects_from_dataset(dataset)
@@ -220,38 +223,67 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
             try:
                 plan = self.plan_list[self.__current_plan_index]
                 problem = self.problem_list[self.__current_plan_index]
-                validate.is_true(plan.is_valid(problem))
+                validate.is_true(plan.is_valid(problem, grounding_table=self.__get_grounding_table(problem)))
                 self.__next_positive_examples = []
-                current_state = problem.get_intitial_state().to_state()
+                current_state = self.__create_initial_state(problem)
+                converter = None
                 for action, parameters in plan.action_list:
                     if action == self.action_of_interest and (\
                     not self.__filter_actions_with_duplicate_parameter \
                     or len(parameters.values()) == len(set(parameters.values()))):
                         validate.is_true(self.action_of_interest.is_applicable(parameters, current_state, problem))
+                        if converter is None:
+                            converter = self.__create_converter(problem, current_state)
                         self.__next_positive_examples.append(
-                            self.__plan_step_to_ca_example(parameters, current_state, problem, random_generator, True))
+                            self.__plan_step_to_ca_example(
+                                parameters, current_state, problem, random_generator, True,
+                                converter=converter))
                     current_state = action.apply(parameters, current_state)
+                    if converter is not None:
+                        converter.register_changes(current_state)
             except IndexError:
                 if not self.__search_new_valid_actions or self.__current_plan_index >= 2 * len(self.plan_list):
                     raise ValueError('No further positive example available')
                 plan = self.plan_list[self.__current_plan_index - len(self.plan_list)]
                 problem = self.problem_list[self.__current_plan_index - len(self.problem_list)]
-                current_state = problem.get_intitial_state().to_state()
+                current_state = self.__create_initial_state(problem)
+                converter = None
                 for action, parameters in plan.action_list:
                     if action == self.action_of_interest:
                         for parameter_combination in self.__yield_all_possible_action_of_interest_parameters(problem):
                             if (not self.__filter_actions_with_duplicate_parameter \
                             or len(parameter_combination.values()) == len(set(parameter_combination.values()))) \
                             and self.action_of_interest.is_applicable(parameter_combination, current_state, problem):
+                                if converter is None:
+                                    converter = self.__create_converter(problem, current_state)
                                 self.__next_positive_examples.append(
-                                    self.__plan_step_to_ca_example(parameter_combination, current_state, problem, random_generator, True))
+                                    self.__plan_step_to_ca_example(
+                                        parameter_combination, current_state, problem, random_generator, True,
+                                        converter=converter))
                     current_state = action.apply(parameters, current_state)
+                    if converter is not None:
+                        converter.register_changes(current_state)
             self.__current_plan_index += 1
         #might be that the current plan did not contain any positive examples => go to the next one and try again
         if not self.__next_positive_examples:
             return self._generate_positive_example(random_generator)
         return self.__next_positive_examples.pop()
 
+    def __get_grounding_table(self, problem: Problem) -> GroundingTable|None:
+        if not self.__use_bitset_states:
+            return None
+        try:
+            return self.__grounding_tables[id(problem)]
+        except KeyError:
+            grounding_table = GroundingTable(problem)
+            self.__grounding_tables[id(problem)] = grounding_table
+            return grounding_table
+
+    def __create_initial_state(self, problem: Problem) -> State:
+        if self.__use_bitset_states:
+            return problem.get_intitial_state().to_bitset_state(self.__get_grounding_table(problem))
+        return problem.get_intitial_state().to_state()
+
     def __yield_all_possible_action_of_interest_parameters(self, problem: Problem):
         parameter_name_list, parameter_type_list = zip(*self.action_of_interest.parameters.items())
         parameter_object_sets = [problem.get_objects_of_type(t) for t in parameter_type_list]
@@ -261,11 +293,47 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
                 for parameter_name, parameter_value in zip(parameter_name_list, parameter_value_tuple)
             }
 
+    def __create_converter(self, problem: Problem, current_state: State) -> 'IncrementalCaExampleConverter':
+        return IncrementalCaExampleConverter(
+            self.__empty_dataset, problem, current_state, self.__relation_name_to_pddl_name,
+            [
+                relation_type for relation_type in self.__empty_dataset.get_relation_types()
+                if relation_type.name != IS_VALID_ACTION
+                and relation_type.name not in self.__relations_to_ignore
+                and not self.__sample_feature_relations(relation_type, problem)
+            ],
+            self.__empty_dataset.get_relation_type(IS_VALID_ACTION)
+            if self.__nr_of_target_relation_samples is None else None
+        )
+
+    def __sample_feature_relations(self, relation_type: CaRelationType, problem: Problem) -> bool:
+        if self.__nr_of_feature_relation_samples is None:
+            return False
+        nr_of_objects_per_type = {}
+        for o in problem.get_objects():
+            nr_of_objects_per_type[o.object_type.name] = nr_of_objects_per_type.get(o.object_type.name, 0) + 1
+        nr_of_feature_relations = reduce(
+            lambda a,b: a*b, (nr_of_objects_per_type.get(p, 0) for p in relation_type.parameter_types), 1)
+        return nr_of_feature_relations >= self.__nr_of_feature_relation_samples
+
     def __plan_step_to_ca_example(
             self, action_parameters: dict[str, Object], current_state: State,
-            problem: Problem, random_generator: Random, is_valid_solution: bool):
+            problem: Problem, random_generator: Random, is_valid_solution: bool,
+            converter: 'IncrementalCaExampleConverter|None' = None):
         for parameter_name in self.__ignore_parameters:
             action_parameters.pop(parameter_name)
+        if converter is not None:
+            example = converter.create_example(
+                is_valid_solution, self.__get_action_parameters_object_ids(action_parameters))
+            #relations that are randomly sampled are created from scratch in the
+            #same order as below, such that the random generator yields the same examples
+            for relation_type in self.__empty_dataset.get_relation_types():
+                if relation_type.name != IS_VALID_ACTION and relation_type.name not in self.__relations_to_ignore \
+                and not converter.is_incremental_relation_type(relation_type.name):
+                    self.__add_ca_relations_from_pddl(example, relation_type, problem, current_state, random_generator)
+            if not converter.is_incremental_relation_type(IS_VALID_ACTION):
+                self.__add_is_valid_action_ca_relations_from_pddl(example, action_parameters, random_generator)
+            return example
         all_objects_per_type = {
             object_type: set(self.__pddl_object_to_ca_object(o, problem, current_state) for o in object_list)
             for object_type, object_list in
@@ -283,6 +351,14 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
         self.__add_is_valid_action_ca_relations_from_pddl(example, action_parameters, random_generator)
         return example
 
+    def __get_action_parameters_object_ids(self, action_parameters: dict[str, Object]) -> tuple[str]:
+        return tuple(
+            parameter_value.name
+            for _, parameter_value in sorted(
+                action_parameters.items(), key=lambda x: (x[1].object_type.name, x[0])
+            )
+        )
+
     def __add_is_valid_action_ca_relations_from_pddl(
             self, example: CaExample, action_parameters: dict[str, Object], random_generator: Random):
         relation_type = self.__empty_dataset.get_relation_type(IS_VALID_ACTION)
@@ -374,19 +450,16 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
                 i += 1
 
     def __pddl_object_to_ca_object(self, pddl_object: Object, problem: Problem, current_state: State) -> CaObject:
-        features = {}
-        ca_object_type = self.__empty_dataset.get_object_type(pddl_object.object_type.name)
-        for feature_name, feature_type in ca_object_type.feature_definition.items():
-            features[feature_name] = feature_type.get_feature_value_from_pddl_state(
-                problem, current_state, pddl_object, feature_name)
-        return CaObject(pddl_object.name, pddl_object.object_type.name, features)
+        return pddl_object_to_ca_object(
+            pddl_object, self.__empty_dataset.get_object_type(pddl_object.object_type.name),
+            problem, current_state)
 
     def _generate_negative_example(self, random_generator: Random) -> CaExample:
         problem_index = random_generator.randrange(len(self.problem_list))
         problem = self.problem_list[problem_index]
         plan = self.plan_list[problem_index]
         state_index = random_generator.randrange(len(plan.action_list))
-        current_state = problem.get_intitial_state().to_state()
+        current_state = self.__create_initial_state(problem)
         for i in range(state_index):
             action, parameters = plan.action_list[i]
             validate.is_true(action.is_applicable(parameters, current_state, problem))
@@ -454,7 +527,164 @@ class PddlCaDatasetGenerator(CaDatasetGenerator):
         print(f'keep objects of type {set(o.type_name for o in used_objects)}')
         for example in tqdm(dataset, total=len(dataset), desc='remove objects'):
             example.remove_all_objects_not_in_set(used_objects)
+        dataset.invalidate_statistics()
         print(
             f'removed all unused objects from dataset. {len(used_objects)} left. '
             f'{len(used_objects)}^2 = {len(used_objects)**2}'
-        )
\ No newline at end of file
+        )
+
+def pddl_object_to_ca_object(
+        pddl_object: Object, ca_object_type: CaObjectType,
+        problem: Problem, current_state: State) -> CaObject:
+    features = {}
+    for feature_name, feature_type in ca_object_type.feature_definition.items():
+        features[feature_name] = feature_type.get_feature_value_from_pddl_state(
+            problem, current_state, pddl_object, feature_name)
+    return CaObject(pddl_object.name, pddl_object.object_type.name, features)
+
+class IncrementalCaExampleConverter:
+    """
+    converts the consecutive states of a plan into CaExamples. the CaObjects and
+    CaRelations are created once for the first state. for every following state,
+    only the objects and relations affected by the predicates and numeric fluents
+    modified by the applied actions (see State.get_modified_keys) are replaced.
+    all other objects and relations are shared between the created examples.
+    shared objects and relations must therefore not be modified in place, see
+    CaExample.set_relation_value.
+    """
+
+    def __init__(
+            self, empty_dataset: CaDataset, problem: Problem, current_state: State,
+            relation_name_to_pddl_name: dict[str, str],
+            incremental_relation_types: list[CaRelationType],
+            is_valid_action_relation_type: CaRelationType|None):
+        """
+        Parameters
+        ----------
+        empty_dataset : CaDataset
+            defines the object types and relation types of the examples
+        problem : Problem
+            the problem of the plan
+        current_state : State
+            the first state that is converted
+        relation_name_to_pddl_name : dict[str, str]
+            maps the names of the relation types to the names of the predicates
+            and numeric fluents
+        incremental_relation_types : list[CaRelationType]
+            the relation types whose relations are created for all object
+            combinations and kept up to date by this converter
+        is_valid_action_relation_type : CaRelationType | None
+            if not None, all relations of this type are created with value False.
+            add_is_valid_action_relations adds them to an example.
+        """
+        self.__empty_dataset = empty_dataset
+        self.__problem = problem
+        self.__state = current_state
+        self.__relation_name_to_pddl_name = relation_name_to_pddl_name
+        self.__modified_keys = set()
+        self.__objects = {
+            pddl_object.name: pddl_object_to_ca_object(
+                pddl_object, empty_dataset.get_object_type(pddl_object.object_type.name),
+                problem, current_state)
+            for pddl_object in problem.get_objects()
+            if empty_dataset.has_object_type(pddl_object.object_type.name)
+        }
+        self.__object_ids_per_type = {}
+        for object_id, ca_object in self.__objects.items():
+            self.__object_ids_per_type.setdefault(ca_object.type_name, []).append(object_id)
+
+        self.__relation_types = {
+            relation_type.name: relation_type for relation_type in incremental_relation_types
+        }
+        self.__relation_type_per_pddl_name_and_parameter_types = {
+            (relation_name_to_pddl_name[relation_type.name], relation_type.parameter_types): relation_type
+            for relation_type in incremental_relation_types
+        }
+        if is_valid_action_relation_type is not None:
+            self.__relation_types[IS_VALID_ACTION] = is_valid_action_relation_type
+        #relation name => object ids => relation
+        self.__relations = {}
+        #object id => list of (relation name, object ids) of relations that contain the object
+        self.__relation_keys_per_object_id = {object_id: [] for object_id in self.__objects}
+        for relation_type in self.__relation_types.values():
+            relations = {}
+            for object_ids in product(*[
+                    self.__object_ids_per_type.get(p, ()) for p in relation_type.parameter_types]):
+                relations[object_ids] = self.__create_relation(relation_type, object_ids)
+                for object_id in set(object_ids):
+                    self.__relation_keys_per_object_id[object_id].append((relation_type.name, object_ids))
+            self.__relations[relation_type.name] = relations
+
+    def is_incremental_relation_type(self, relation_name: str) -> bool:
+        return relation_name in self.__relation_types
+
+    def register_changes(self, new_state: State):
+        """
+        registers the modifications of the state that resulted from applying
+        an action to the previously registered state
+        """
+        self.__modified_keys.update(new_state.get_modified_keys())
+        self.__state = new_state
+
+    def create_example(self, is_valid_solution: bool, action_parameter_ids: tuple[str]|None = None) -> CaExample:
+        """
+        creates an example for the last registered state with all objects and
+        all relations of the incremental relation types. if IS_VALID_ACTION is
+        one of them, only the relation of the given action parameters is true.
+        """
+        self.__apply_modifications()
+        all_objects_per_type = {
+            object_type: set(self.__objects[object_id] for object_id in object_ids)
+            for object_type, object_ids in self.__object_ids_per_type.items()
+        }
+        relations = {
+            relation_name: set(relations.values())
+            for relation_name, relations in self.__relations.items()
+            if relations
+        }
+        is_valid_action_relations = self.__relations.get(IS_VALID_ACTION)
+        if is_valid_action_relations is not None and action_parameter_ids in is_valid_action_relations:
+            false_relation = is_valid_action_relations[action_parameter_ids]
+            relations[IS_VALID_ACTION].discard(false_relation)
+            relations[IS_VALID_ACTION].add(CaRelation(IS_VALID_ACTION, false_relation.objects, True))
+        return CaExample(all_objects_per_type, relations, is_valid_solution, validate=False)
+
+    def __apply_modifications(self):
+        modified_relation_keys = set()
+        for predicate, pddl_objects in self.__modified_keys:
+            if len(pddl_objects) == 1:
+                object_id = pddl_objects[0].name
+                if object_id in self.__objects:
+                    self.__update_object(object_id, modified_relation_keys)
+            else:
+                relation_type = self.__relation_type_per_pddl_name_and_parameter_types.get(
+                    (predicate.name, tuple(o.object_type.name for o in pddl_objects)))
+                if relation_type is not None:
+                    modified_relation_keys.add((relation_type.name, tuple(o.name for o in pddl_objects)))
+        for relation_name, object_ids in modified_relation_keys:
+            self.__relations[relation_name][object_ids] = self.__create_relation(
+                self.__relation_types[relation_name], object_ids)
+        self.__modified_keys = set()
+
+    def __update_object(self, object_id: str, modified_relation_keys: set[tuple[str, tuple[str]]]):
+        old_object = self.__objects[object_id]
+        new_object = pddl_object_to_ca_object(
+            self.__problem.get_object_by_name(object_id),
+            self.__empty_dataset.get_object_type(old_object.type_name),
+            self.__problem, self.__state)
+        #copy on write: the object is only replaced if one of its features changed
+        if new_object.features != old_object.features:
+            self.__objects[object_id] = new_object
+            modified_relation_keys.update(self.__relation_keys_per_object_id[object_id])
+
+    def __create_relation(self, relation_type: CaRelationType, object_ids: tuple[str]) -> CaRelation:
+        if relation_type.name == IS_VALID_ACTION:
+            value = False
+        else:
+            value = relation_type.value_type.get_relation_value_from_pddl_state(
+                self.__problem, self.__state, self.__relation_name_to_pddl_name[relation_type.name],
+                tuple(self.__problem.get_object_by_name(object_id) for object_id in object_ids))
+        return CaRelation(
+            relation_type.name,
+            tuple(self.__objects[object_id] for object_id in object_ids),
+            value)
@@ -19,11 +19,14 @@ import os
 from random import Random
 import pickle
 
+import numpy as np
+
 from prolothar_common import validate
 from prolothar_ca.ca.dataset_generator.dataset_generator import \
     CaDatasetGenerator
 from prolothar_ca.model.ca.constraints.constraint import CaConstraint
 from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.columnar import read_columnar_dataset
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.obj import CaObject, CaObjectType
 from prolothar_ca.model.ca.relation import CaRelation, CaRelationType
@@ -42,29 +45,43 @@ HAS_COLOR_RELATION = 'has_color'
 
 class PickleCaDatasetGenerator(CaDatasetGenerator):
     """
-    loads a CaDataset from a pickle file
+    loads a CaDataset from a pickle file or from a directory written by
+    write_columnar_dataset. examples of a columnar dataset are only
+    materialized when they are generated.
     """
 
+    _supports_parallel_generation = False
+
     def __init__(self, pickle_file: str, target_relation: str):
         validate.is_true(os.path.exists(pickle_file))
-        with open(pickle_file, 'rb') as f:
-            self.__ca_dataset: CaDataset = pickle.load(f)
+        if os.path.isdir(pickle_file):
+            self.__ca_dataset: CaDataset = read_columnar_dataset(pickle_file)
+            self.__examples = self.__ca_dataset
+            is_valid_solution = self.__ca_dataset.get_is_valid_solution_column()
+            self.__positive_examples = np.flatnonzero(is_valid_solution).tolist()
+            self.__negative_examples = np.flatnonzero(~is_valid_solution).tolist()
+        else:
+            with open(pickle_file, 'rb') as f:
+                self.__ca_dataset: CaDataset = pickle.load(f)
+            self.__examples = list(self.__ca_dataset)
+            self.__positive_examples = [
+                i for i, example in enumerate(self.__examples)
+                if example.is_valid_solution
+            ]
+            self.__negative_examples = [
+                i for i, example in enumerate(self.__examples)
+                if not example.is_valid_solution
+            ]
         self.__target_relation = target_relation
-        self.__positive_examples = [
-            example for example in self.__ca_dataset
-            if example.is_valid_solution
-        ]
-        self.__negative_examples = [
-            example for example in self.__ca_dataset
-            if not example.is_valid_solution
-        ]
         self.__positive_index = 0
         self.__negative_index = 0
 
     def _create_empty_dataset(self) -> CaDataset:
         return self.__ca_dataset.empty_copy()
 
-    def generate(self, nr_of_positive_examples: int, nr_of_negative_examples: int, random_seed: int | None = None) -> CaDataset:
+    def generate(
+            self, nr_of_positive_examples: int, nr_of_negative_examples: int,
+            random_seed: int | None = None, nr_of_processes: int | None = None) -> CaDataset:
         validate.less_or_equal(nr_of_positive_examples, len(self.__positive_examples))
         validate.less_or_equal(nr_of_negative_examples, len(self.__negative_examples))
         random_generator = Random(random_seed)
@@ -72,15 +89,15 @@ class PickleCaDatasetGenerator(CaDatasetGenerator):
         random_generator.shuffle(self.__negative_examples)
         self.__positive_index = 0
         self.__negative_index = 0
-        return super().generate(nr_of_positive_examples, nr_of_negative_examples, random_seed)
+        return super().generate(nr_of_positive_examples, nr_of_negative_examples, random_seed, nr_of_processes)
 
     def _generate_positive_example(self, random_generator: Random) -> CaExample:
-        example = self.__positive_examples[self.__positive_index]
+        example = self.__examples[self.__positive_examples[self.__positive_index]]
         self.__positive_index += 1
         return example
 
     def _generate_negative_example(self, random_generator: Random) -> CaExample:
-        example = self.__negative_examples[self.__negative_index]
+        example = self.__examples[self.__negative_examples[self.__negative_index]]
         self.__negative_index += 1
         return example
 
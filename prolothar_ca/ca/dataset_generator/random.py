@@ -40,6 +40,8 @@ class RandomCaDatasetGenerator(CaDatasetGenerator):
     target variable, i.e. the list of ground-truth constraints is empty
     """
 
+    _supports_parallel_generation = False
+
     def __init__(
             self, dimensions: int = 2, nr_of_objects: int = 10,
             boolean_features: int = 2, numeric_features: int = 2, numeric_values: int = 5):
@@ -64,9 +64,11 @@ class SudokuCaDatasetGenerator(CaDatasetGenerator):
         size : int, optional
             size of the sudoku field (by default 9, i.e. 3x3 blocks)
         only_return_unique_examples : bool, optional
-            if False, examples with the same assignment can be generated, by default True
+            if False, examples with the same assignment can be generated, by default True.
+            examples are only generated in parallel if this is False.
         cache_dir : str, optional
-            can be used for caching => speed-up and better reproducibility, by default None
+            can be used for caching => speed-up and better reproducibility, by default None.
+            examples are only generated in parallel if no cache is used.
         include_block_feature : bool, optional
             if True, cells get an additional feature for their block numer.
             otherwise they only get row and column feature, by default False
@@ -79,6 +81,9 @@ class SudokuCaDatasetGenerator(CaDatasetGenerator):
             CaBoolean()
         )
         self.__only_return_unique_examples = only_return_unique_examples
+        #workers could neither check uniqueness against the examples of the
+        #other workers nor share the list of not yet used cached sudokus
+        self._supports_parallel_generation = not only_return_unique_examples and not cache_dir
         self.__include_block_feature = include_block_feature
         self.__generated_positive_sudokus: set[Sudoku] = set()
         self.__generated_negative_sudokus: set[Sudoku] = set()
@@ -0,0 +1,75 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+import os
+from typing import Callable
+
+from prolothar_ca.ca.dataset_logger.dataset_logger import DatasetLogger
+from prolothar_ca.ca.dataset_logger.example_archive import ExampleArchiveWriter, ExampleArchiveReader
+
+from prolothar_ca.model.ca.dataset import CaDataset, CaExample
+
+ARCHIVE_FILE_EXTENSION = '.caarchive'
+
+class ArchiveDatasetLogger(DatasetLogger):
+    """
+    logs every dataset into a single archive file instead of one file per
+    example. the examples can be read back with random access by
+    ExampleArchiveReader, e.g. as a CaDataset.
+    """
+
+    def __init__(
+            self, directory: str, examples_per_chunk: int = 64,
+            example_renderer: Callable[[CaExample], bytes]|None = None):
+        """
+        creates a new ArchiveDatasetLogger
+
+        Parameters
+        ----------
+        directory : str
+            directory in which this logger saves its archive files
+        examples_per_chunk : int, optional
+            number of examples that are compressed together, by default 64.
+            larger chunks compress better, smaller chunks are faster for
+            random access.
+        example_renderer : Callable[[CaExample], bytes] | None, optional
+            if not None, the rendered example (e.g. an image) is stored as
+            attachment together with the example, by default None
+        """
+        self.__directory = directory
+        self.__examples_per_chunk = examples_per_chunk
+        self.__example_renderer = example_renderer
+
+    def log_dataset(self, dataset: CaDataset, dataset_name: str):
+        with ExampleArchiveWriter(
+                self.get_archive_path(dataset_name), dataset,
+                examples_per_chunk=self.__examples_per_chunk) as writer:
+            for example in dataset:
+                if self.__example_renderer is None:
+                    writer.append(example)
+                else:
+                    writer.append(example, attachment=self.__example_renderer(example))
+
+    def get_archive_path(self, dataset_name: str) -> str:
+        return os.path.join(self.__directory, f'{dataset_name}{ARCHIVE_FILE_EXTENSION}')
+
+    def read_dataset(self, dataset_name: str) -> CaDataset:
+        """
+        reads a logged dataset back from its archive
+        """
+        with ExampleArchiveReader(self.get_archive_path(dataset_name)) as reader:
+            return reader.to_ca_dataset()
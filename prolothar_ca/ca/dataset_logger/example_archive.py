@@ -0,0 +1,156 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from bisect import bisect_right
+from itertools import accumulate
+import pickle
+import struct
+import zlib
+
+from prolothar_common import validate
+
+from prolothar_ca.model.ca.dataset import CaDataset, CaExample
+
+MAGIC_BYTES = b'CAARCHIVE1\n'
+#little-endian unsigned 64 bit integer, offset of the index at the end of the file
+INDEX_OFFSET_FORMAT = '<Q'
+
+class ExampleArchiveWriter:
+    """
+    appends CaExamples to a single archive file. examples are pickled and
+    compressed in chunks of examples_per_chunk examples. an offset table of the
+    chunks and the definition of the dataset are written at the end of the
+    file when the writer is closed. every example can have an optional
+    attachment, e.g. a rendered image of the example.
+
+    usage:
+    with ExampleArchiveWriter(path, dataset) as writer:
+        for example in dataset:
+            writer.append(example)
+    """
+
+    def __init__(
+            self, path: str, dataset: CaDataset, examples_per_chunk: int = 64,
+            compression_level: int = 6):
+        validate.greater_or_equal(examples_per_chunk, 1)
+        self.__file = open(path, 'wb')
+        self.__file.write(MAGIC_BYTES)
+        self.__empty_dataset = dataset.empty_copy()
+        self.__examples_per_chunk = examples_per_chunk
+        self.__compression_level = compression_level
+        self.__current_chunk = []
+        #list of (offset in file, length in bytes, number of examples)
+        self.__chunks = []
+
+    def append(self, example: CaExample, attachment: bytes|None = None):
+        self.__current_chunk.append((example, attachment))
+        if len(self.__current_chunk) == self.__examples_per_chunk:
+            self.__write_current_chunk()
+
+    def __write_current_chunk(self):
+        if self.__current_chunk:
+            compressed_chunk = zlib.compress(
+                pickle.dumps(self.__current_chunk, protocol=pickle.HIGHEST_PROTOCOL),
+                self.__compression_level)
+            self.__chunks.append((self.__file.tell(), len(compressed_chunk), len(self.__current_chunk)))
+            self.__file.write(compressed_chunk)
+            self.__current_chunk = []
+
+    def close(self):
+        if self.__file.closed:
+            return
+        self.__write_current_chunk()
+        index_offset = self.__file.tell()
+        self.__file.write(zlib.compress(pickle.dumps(
+            (self.__empty_dataset, self.__chunks), protocol=pickle.HIGHEST_PROTOCOL)))
+        self.__file.write(struct.pack(INDEX_OFFSET_FORMAT, index_offset))
+        self.__file.close()
+
+    def __enter__(self) -> 'ExampleArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class ExampleArchiveReader:
+    """
+    random access to the examples of an archive written by ExampleArchiveWriter.
+    only the chunk of the requested example is read and decompressed. the
+    last decompressed chunk is cached, such that iterating over the examples
+    decompresses every chunk once.
+    """
+
+    def __init__(self, path: str):
+        self.__file = open(path, 'rb')
+        if self.__file.read(len(MAGIC_BYTES)) != MAGIC_BYTES:
+            self.__file.close()
+            raise ValueError(f'{path} is not an example archive')
+        index_offset_size = struct.calcsize(INDEX_OFFSET_FORMAT)
+        self.__file.seek(-index_offset_size, 2)
+        index_end = self.__file.tell()
+        index_offset = struct.unpack(INDEX_OFFSET_FORMAT, self.__file.read(index_offset_size))[0]
+        self.__file.seek(index_offset)
+        self.__empty_dataset, self.__chunks = pickle.loads(zlib.decompress(
+            self.__file.read(index_end - index_offset)))
+        #index of the first example of every chunk
+        self.__chunk_starts = [0] + list(accumulate(size for _, _, size in self.__chunks))
+        self.__cached_chunk_index = None
+        self.__cached_chunk = None
+
+    def __len__(self) -> int:
+        return self.__chunk_starts[-1]
+
+    def __get_entry(self, index: int) -> tuple[CaExample, bytes|None]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chunk_index = bisect_right(self.__chunk_starts, index) - 1
+        if chunk_index != self.__cached_chunk_index:
+            offset, length, _ = self.__chunks[chunk_index]
+            self.__file.seek(offset)
+            self.__cached_chunk = pickle.loads(zlib.decompress(self.__file.read(length)))
+            self.__cached_chunk_index = chunk_index
+        return self.__cached_chunk[index - self.__chunk_starts[chunk_index]]
+
+    def __getitem__(self, index: int) -> CaExample:
+        return self.__get_entry(index)[0]
+
+    def get_attachment(self, index: int) -> bytes|None:
+        return self.__get_entry(index)[1]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_ca_dataset(self) -> CaDataset:
+        """
+        reads all examples into a new CaDataset
+        """
+        dataset = self.__empty_dataset.empty_copy()
+        for example in self:
+            dataset.add_example(example, validate=False)
+        return dataset
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self) -> 'ExampleArchiveReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
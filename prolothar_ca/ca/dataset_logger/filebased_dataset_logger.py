@@ -19,6 +19,7 @@ import os
 from abc import abstractmethod
 
 from prolothar_ca.ca.dataset_logger.dataset_logger import DatasetLogger
+from prolothar_ca.ca.dataset_logger.archive_dataset_logger import ArchiveDatasetLogger
 
 from prolothar_ca.model.ca.dataset import CaDataset, CaExample
 
@@ -27,7 +28,7 @@ class FilebasedDatasetLogger(DatasetLogger):
     template for dataset loggers that log to files
     """
 
-    def __init__(self, directory: str):
+    def __init__(self, directory: str, use_archive: bool = False):
         """
         creates a new FilebasedDatasetLogger with a given directory to save
         the log files
@@ -36,8 +37,17 @@ class FilebasedDatasetLogger(DatasetLogger):
         ----------
         directory : str
             directory in which this logger saves its log files
+        use_archive : bool, optional
+            if True, a dataset is logged into a single archive file (see
+            ArchiveDatasetLogger) with the rendered examples as attachments
+            instead of one file per example, by default False
         """
         self.__directory = directory
+        if use_archive:
+            self.__archive_dataset_logger = ArchiveDatasetLogger(
+                directory, example_renderer=self._render_example)
+        else:
+            self.__archive_dataset_logger = None
 
     def get_directory_for_positive_examples(self) -> str:
         return self.__directory_for_positive_examples
@@ -46,6 +56,9 @@ class FilebasedDatasetLogger(DatasetLogger):
         return self.__directory_for_negative_examples
 
     def log_dataset(self, dataset: CaDataset, dataset_name: str):
+        if self.__archive_dataset_logger is not None:
+            self.__archive_dataset_logger.log_dataset(dataset, dataset_name)
+            return
         dataset_directory = self.get_dataset_directory(dataset_name)
         os.mkdir(dataset_directory)
         positive_directory = self.get_positive_examples_directory(dataset_name)
@@ -67,13 +80,22 @@ class FilebasedDatasetLogger(DatasetLogger):
     def get_negative_examples_directory(self, dataset_name: str) -> str:
         return os.path.join(self.get_dataset_directory(dataset_name), 'negative_examples')
 
-    @abstractmethod
     def _log_example(self, example: CaExample, index: int, directory: str):
         """
         log the given example to the given directory into a file.
         index is a unique number for the given example in this directory.
         """
+        with open(os.path.join(directory, f'{index}.{self._get_file_extension()}'), 'wb') as f:
+            f.write(self._render_example(example))
 
+    @abstractmethod
+    def _render_example(self, example: CaExample) -> bytes:
+        """
+        renders the given example into the content of its log file
+        """
 
-
-
+    @abstractmethod
+    def _get_file_extension(self) -> str:
+        """
+        file extension (without dot) of the log file of an example
+        """
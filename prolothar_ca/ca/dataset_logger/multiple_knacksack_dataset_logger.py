@@ -15,8 +15,6 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-import os
-
 from prolothar_ca.ca.dataset_logger.filebased_dataset_logger import FilebasedDatasetLogger
 from prolothar_ca.ca.dataset_generator.multiple_knapsack import ITEM_TYPE, KNAPSACK_TYPE, SIZE_FEATURE, WEIGHT_FEATURE, ASSIGNED_RELATION
 
@@ -27,13 +25,16 @@ class MultipleKnapsackDatasetLogger(FilebasedDatasetLogger):
     a dataset logger that is specialized for multiple knapsaack
     """
 
-    def _log_example(self, example: CaExample, index: int, directory: str):
-        with open(os.path.join(directory, f'{index}.txt'), 'w') as f:
-            f.write(f'Nr of items: {len(example.all_objects_per_type[ITEM_TYPE])}\n')
-            for knapsack in sorted(example.all_objects_per_type[KNAPSACK_TYPE], key=lambda k: k.object_id):
-                items_str = ' | '.join(
-                    f'{item.object_id} ({item.features[WEIGHT_FEATURE]})'
-                    for item in example.all_objects_per_type[ITEM_TYPE]
-                    if example.get_relation_value(ASSIGNED_RELATION, (knapsack, item))
-                )
-                f.write(f'{knapsack.object_id} ({knapsack.features[SIZE_FEATURE]}): {items_str}\n')
+    def _render_example(self, example: CaExample) -> bytes:
+        lines = [f'Nr of items: {len(example.all_objects_per_type[ITEM_TYPE])}\n']
+        for knapsack in sorted(example.all_objects_per_type[KNAPSACK_TYPE], key=lambda k: k.object_id):
+            items_str = ' | '.join(
+                f'{item.object_id} ({item.features[WEIGHT_FEATURE]})'
+                for item in example.all_objects_per_type[ITEM_TYPE]
+                if example.get_relation_value(ASSIGNED_RELATION, (knapsack, item))
+            )
+            lines.append(f'{knapsack.object_id} ({knapsack.features[SIZE_FEATURE]}): {items_str}\n')
+        return ''.join(lines).encode()
+
+    def _get_file_extension(self) -> str:
+        return 'txt'
@@ -15,7 +15,7 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-import os
+from io import BytesIO
 
 import pandas as pd
 import dataframe_image as dfi
@@ -32,7 +32,7 @@ class SudokuDatasetLogger(FilebasedDatasetLogger):
     a dataset logger that is specialized for Sudoku
     """
 
-    def _log_example(self, example: CaExample, index: int, directory: str):
+    def _render_example(self, example: CaExample) -> bytes:
         sudoku_problem_size = len(example.all_objects_per_type[CELL_VALUE_TYPE_NAME])
         cell_text = [[None for _ in range(sudoku_problem_size)] for _ in range(sudoku_problem_size)]
         for relation in example.relations[CELL_VALUE_RELATION]:
@@ -41,11 +41,16 @@ class SudokuDatasetLogger(FilebasedDatasetLogger):
                 y = relation.objects[0].features[CELL_Y]
                 cell_value = relation.objects[1].object_id
                 cell_text[x][y] = self.__extend_cell_text(cell_text[x][y], cell_value)
+        image = BytesIO()
         dfi.export(
             pd.DataFrame(cell_text).fillna('').style.hide(),
-            os.path.join(directory, f'{index}.png'),
+            image,
             table_conversion='matplotlib'
         )
+        return image.getvalue()
+
+    def _get_file_extension(self) -> str:
+        return 'png'
 
     def __extend_cell_text(self, old_cell_text: str|None, cell_value: str) -> str:
         if old_cell_text is None:
@@ -15,11 +15,14 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from copy import deepcopy
+import numpy as np
 from prolothar_common import validate
 
 from prolothar_ca.ca.methods.method import CaMethod
+from prolothar_ca.model.ca.constraints.batch import evaluate_constraint_on_examples
 from prolothar_ca.model.ca.constraints.constraint import CaConstraint
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.relation import CaRelation
 from prolothar_ca.model.ca.targets import BooleanRelationListTarget, CaTarget
 from prolothar_common.random_utils import BufferingChoice
 
@@ -33,7 +36,10 @@ class NegativeExamplesAugmentationAdaptor(CaMethod):
     invalid solutions
     """
 
-    def __init__(self, supervised_ca_method: CaMethod, random_seed: int|None = None):
+    def __init__(
+            self, supervised_ca_method: CaMethod, random_seed: int|None = None,
+            rejection_model: list[CaConstraint]|None = None,
+            max_nr_of_rejection_rounds: int = 10):
         """
         configures the parameters of Hassle
 
@@ -44,25 +50,96 @@ class NegativeExamplesAugmentationAdaptor(CaMethod):
         random_seed : int | None, optional
             seed for the random generator that is used to create synthetic
             negative examples, by default None
+        rejection_model : list[CaConstraint] | None, optional
+            if given, random examples that satisfy all of these constraints
+            are rejected and sampled again, by default None
+        max_nr_of_rejection_rounds : int, optional
+            maximal number of times rejected random examples are sampled again.
+            random examples that are still rejected afterwards are not added
+            to the dataset. by default 10
         """
         validate.is_not_none(supervised_ca_method)
         self.__supervised_ca_method = supervised_ca_method
         self.__coin_flip = BufferingChoice([True, False], [0.5, 0.5], seed=random_seed)
+        self.__rejection_model = rejection_model
+        self.__max_nr_of_rejection_rounds = max_nr_of_rejection_rounds
 
     def acquire_constraints(self, dataset: CaDataset, target: CaTarget) -> list[CaConstraint]:
         extended_dataset, target_relations_names = target.transform_to_boolean_relations(dataset)
-        extended_dataset = deepcopy(extended_dataset)
+        #the existing examples are not modified, i.e. the copy can share them
+        extended_dataset = self.__shallow_copy(extended_dataset)
+        nr_of_positive_examples = sum(e.is_valid_solution for e in extended_dataset)
         positive_example = next(iter(extended_dataset))
-        for _ in (e for e in extended_dataset if e.is_valid_solution):
-            random_example = deepcopy(positive_example)
-            for target_relation_name in target_relations_names:
-                for target_relation in random_example.relations[target_relation_name]:
-                    target_relation.value = self.__coin_flip.next_sample()
-            #here we assume, that a random example has an almost 100% chance of being invalid
-            random_example.is_valid_solution = False
-            extended_dataset.add_example(random_example)
+        relation_pairs_per_name = {
+            target_relation_name: [
+                _create_false_and_true_relation(relation)
+                for relation in positive_example.relations[target_relation_name]
+            ]
+            for target_relation_name in target_relations_names
+        }
+        random_examples = [
+            self.__create_random_example(positive_example, relation_pairs_per_name)
+            for _ in range(nr_of_positive_examples)
+        ]
+        if self.__rejection_model:
+            random_examples = self.__reject_examples_satisfying_model(
+                random_examples, positive_example, relation_pairs_per_name)
+        #here we assume, that a random example has an almost 100% chance of being invalid
+        extended_dataset.add_examples(random_examples, validate=False)
         return self.__supervised_ca_method.acquire_constraints(
             extended_dataset, BooleanRelationListTarget(target_relations_names))
 
+    def __create_random_example(
+            self, positive_example: CaExample,
+            relation_pairs_per_name: dict[str, list[tuple[CaRelation, CaRelation]]]) -> CaExample:
+        """
+        the random example shares the objects and the non-target relations with
+        the positive example. the target relations are shared between all random
+        examples, i.e. a random example only stores which of both relations is used.
+        """
+        return positive_example.with_relations({
+            target_relation_name: set(
+                relation_pair[int(self.__coin_flip.next_sample())]
+                for relation_pair in relation_pairs
+            )
+            for target_relation_name, relation_pairs in relation_pairs_per_name.items()
+        }, False)
+
+    def __reject_examples_satisfying_model(
+            self, random_examples: list[CaExample], positive_example: CaExample,
+            relation_pairs_per_name: dict[str, list[tuple[CaRelation, CaRelation]]]) -> list[CaExample]:
+        is_rejected = self.__satisfies_rejection_model(random_examples)
+        for _ in range(self.__max_nr_of_rejection_rounds):
+            rejected_indices = np.flatnonzero(is_rejected)
+            if len(rejected_indices) == 0:
+                break
+            resampled_examples = [
+                self.__create_random_example(positive_example, relation_pairs_per_name)
+                for _ in rejected_indices
+            ]
+            for i, example in zip(rejected_indices, resampled_examples):
+                random_examples[i] = example
+            is_rejected[rejected_indices] = self.__satisfies_rejection_model(resampled_examples)
+        return [example for example, rejected in zip(random_examples, is_rejected) if not rejected]
+
+    def __satisfies_rejection_model(self, examples: list[CaExample]) -> np.ndarray:
+        satisfies_model = np.ones(len(examples), dtype=bool)
+        for constraint in self.__rejection_model:
+            satisfies_model &= evaluate_constraint_on_examples(constraint, examples)[0]
+        return satisfies_model
+
+    def __shallow_copy(self, dataset: CaDataset) -> CaDataset:
+        copy = dataset.empty_copy()
+        copy.add_examples(dataset, validate=False)
+        return copy
+
     def __repr__(self):
         return f'NegAugm({self.__supervised_ca_method})'
+
+def _create_false_and_true_relation(relation: CaRelation) -> tuple[CaRelation, CaRelation]:
+    """
+    returns a pair that can be indexed by the boolean value of the relation
+    """
+    if relation.value:
+        return CaRelation(relation.name, relation.objects, False), relation
+    return relation, CaRelation(relation.name, relation.objects, True)
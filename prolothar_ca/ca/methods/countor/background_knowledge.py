@@ -17,7 +17,7 @@
 
 from abc import ABC
 from dataclasses import dataclass
-import numpy as np
+from prolothar_ca.ca.methods.countor.sparse import SparseTensor
 from prolothar_ca.ca.methods.countor.utils import get_variable_name_for_dimension
 
 from prolothar_ca.model.ca.constraints.numeric import AggregateSum, Count, NumericExpression, NumericFeature
@@ -28,11 +28,11 @@ class BackgroundKnowledgeNotApplicableError(Exception):
 
 @dataclass
 class BackgroundKnowledge(ABC):
-    filter_tensor: np.ndarray
+    filter_tensor: SparseTensor
     dimension_index: int
     is_boolean: bool
 
-    def filter_target_tensor(self, target_tensor: np.ndarray) -> np.ndarray:
+    def filter_target_tensor(self, target_tensor: SparseTensor) -> SparseTensor:
         if self.dimension_index == 0:
             filtered_target_tensor = target_tensor
         else:
@@ -43,7 +43,7 @@ class BackgroundKnowledge(ABC):
             filtered_target_tensor = target_tensor.transpose(permutation)
 
         try:
-            filtered_target_tensor = np.matmul(self.filter_tensor, filtered_target_tensor)
+            filtered_target_tensor = self.filter_tensor.matmul(filtered_target_tensor)
         except ValueError:
             raise BackgroundKnowledgeNotApplicableError()
 
@@ -65,7 +65,7 @@ class BackgroundKnowledge(ABC):
 class NoBackgroundKnowledge(BackgroundKnowledge):
     def __init__(self):
         super().__init__(None, None, True)
-    def filter_target_tensor(self, target_tensor: np.ndarray) -> np.ndarray:
+    def filter_target_tensor(self, target_tensor: SparseTensor) -> SparseTensor:
         return target_tensor
     def extend_filter(self, filter: Filter):
         return filter
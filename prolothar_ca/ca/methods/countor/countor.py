@@ -23,6 +23,7 @@ import numpy as np
 from prolothar_common import validate
 from prolothar_ca.ca.methods.countor.background_knowledge import BackgroundKnowledge, BackgroundKnowledgeNotApplicableError, NoBackgroundKnowledge, ObjectFeatureBackgroundKnowledge
 from prolothar_ca.ca.methods.countor.order import ObjectOrder, OrderByFeature, OrderByObjectId
+from prolothar_ca.ca.methods.countor.sparse import SparseTensor
 from prolothar_ca.ca.methods.countor.utils import get_variable_name_for_dimension
 
 from prolothar_ca.ca.methods.method import CaMethod
@@ -37,6 +38,7 @@ from prolothar_ca.model.ca.targets import CaTarget, RelationTarget
 
 from prolothar_ca.model.ca import CaDataset
 from prolothar_ca.model.ca.variable_type import CaBoolean, CaNumber
+from prolothar_ca.parallel import create_spawn_pool, get_chunksize, get_worker_state
 
 ConstraintSet = dict[tuple[str, str, str], ForAll]
 
@@ -47,6 +49,20 @@ class CountOr(CaMethod):
     by Kumar et al. at ICTAI 2019
     """
 
+    def __init__(self, nr_of_processes: int = 1):
+        """
+        creates a new CountOr instance
+
+        Parameters
+        ----------
+        nr_of_processes : int, optional
+            number of processes that compute the constraints of the examples
+            in parallel. by default 1, i.e. all examples are processed in the
+            current process. the acquired constraints do not depend on this parameter.
+        """
+        validate.greater_or_equal(nr_of_processes, 1)
+        self.__nr_of_processes = nr_of_processes
+
     def acquire_constraints(self, dataset: CaDataset, target: CaTarget) -> list[CaConstraint]:
         validate.is_true(
             all(example.is_valid_solution for example in dataset),
@@ -54,14 +70,28 @@ class CountOr(CaMethod):
         )
         if not isinstance(target, RelationTarget):
             raise NotImplementedError()
-        constraint_set_list = []
-        for example in dataset:
-            constraint_set_list.append(self.__constraint_list_to_set(
-                self.__acquire_constraints_for_example(
-                    example, target.relation_name, dataset
-                )
-            ))
-        return list(reduce(self.__reduce_constraint_sets, constraint_set_list).values())
+        if self.__nr_of_processes == 1 or len(dataset) == 1:
+            constraint_sets = (
+                self._acquire_constraint_set_for_example(example, target.relation_name, dataset)
+                for example in dataset
+            )
+            return list(reduce(self.__reduce_constraint_sets, constraint_sets).values())
+        #the workers get the dataset once and then only the index of an example.
+        #the constraint sets are reduced in the order of the examples while
+        #the workers process the next examples.
+        #the example list shares the examples with the dataset in the pickle
+        with create_spawn_pool(
+                self.__nr_of_processes,
+                worker_state=(self, target.relation_name, dataset, list(dataset))) as pool:
+            constraint_sets = pool.imap(
+                _acquire_constraint_set_for_example_in_worker, range(len(dataset)),
+                chunksize=get_chunksize(len(dataset), self.__nr_of_processes))
+            return list(reduce(self.__reduce_constraint_sets, constraint_sets).values())
+
+    def _acquire_constraint_set_for_example(
+            self, example: CaExample, relation_name: str, dataset: CaDataset) -> ConstraintSet:
+        return self.__constraint_list_to_set(
+            self.__acquire_constraints_for_example(example, relation_name, dataset))
 
     def __constraint_list_to_set(
             self, constraint_list: list[ForAll]) -> ConstraintSet:
@@ -96,7 +126,8 @@ class CountOr(CaMethod):
 
     def __acquire_constraints_for_example(
             self, example: CaExample, relation_name: str, dataset: CaDataset):
-        target_tensor = map_to_target_tensor(example, dataset.get_relation_type(relation_name))
+        target_relation = dataset.get_relation_type(relation_name)
+        target_tensor = map_to_target_tensor(example, target_relation)
         background_knowledge_list = self.__map_to_background_knowledge_list(
             example, relation_name, dataset)
         constraint_list = self.__find_bounding_constraints(target_tensor, relation_name, dataset)
@@ -110,8 +141,8 @@ class CountOr(CaMethod):
                 pass
 
         for order in self.__map_to_order_list(example, relation_name, dataset):
-            ordered_target_tensor = map_to_target_tensor(
-                example, dataset.get_relation_type(relation_name), order=order)
+            ordered_target_tensor = reorder_target_tensor(
+                target_tensor, example, target_relation, order)
             constraint_list.extend(self.__find_consecutive_constraints(
                 ordered_target_tensor, order, relation_name, dataset, example))
             for background_knowledge in background_knowledge_list:
@@ -122,7 +153,7 @@ class CountOr(CaMethod):
         return constraint_list
 
     def __find_bounding_constraints(
-            self, target_tensor: np.ndarray, relation_name: str,
+            self, target_tensor: SparseTensor, relation_name: str,
             dataset: CaDataset,
             background_knowledge: BackgroundKnowledge = NoBackgroundKnowledge()) -> list[CaConstraint]:
         target_tensor = background_knowledge.filter_target_tensor(target_tensor)
@@ -131,11 +162,20 @@ class CountOr(CaMethod):
         target_relation_filter = RelationIsTrue(
             dataset.get_relation_type(relation_name), parameter_names)
         constraints = []
-        for m,s in self.__enumerate_splits(target_tensor):
-            count_x_m_s =  np.sum(target_tensor, axis=tuple(s))
-            trivial_upper_bound = np.max(target_tensor) * reduce(
-                lambda a,b: a*b, (target_tensor.shape[s_i] for s_i in s))
-            trivial_lower_bound = np.min(target_tensor)
+        max_value = target_tensor.max()
+        trivial_lower_bound = target_tensor.min()
+        #if the tensor contains only zeros, every count is zero and therefore
+        #equal to the trivial bounds
+        if max_value == 0 and trivial_lower_bound == 0:
+            return constraints
+        splits = list(self.__enumerate_splits(target_tensor))
+        upper_bound_per_s, lower_bound_per_s = self.__compute_non_trivial_bounds(
+            target_tensor, splits, max_value, trivial_lower_bound)
+        for m,s in splits:
+            upper_bound = upper_bound_per_s[tuple(s)]
+            lower_bound = lower_bound_per_s[tuple(s)]
+            if upper_bound is None and lower_bound is None:
+                continue
             quantifier_query = self.__create_quantifier_query(parameter_types, parameter_names, m)
 
             if len(s) == 1:
@@ -153,8 +193,7 @@ class CountOr(CaMethod):
                 )
 
             constraint_query = background_knowledge.create_constraint_query(source_filter)
-            upper_bound = count_x_m_s.max()
-            if upper_bound != trivial_upper_bound:
+            if upper_bound is not None:
                 constraints.append(ForAll(
                     quantifier_query,
                     LessOrEqual(
@@ -162,8 +201,7 @@ class CountOr(CaMethod):
                         Constant(upper_bound)
                     )
                 ))
-            lower_bound = count_x_m_s.min()
-            if lower_bound != trivial_lower_bound:
+            if lower_bound is not None:
                 constraints.append(ForAll(
                     quantifier_query,
                     GreaterOrEqual(
@@ -174,7 +212,7 @@ class CountOr(CaMethod):
         return constraints
 
     def __find_consecutive_constraints(
-            self, target_tensor: np.ndarray, order: ObjectOrder, relation_name: str,
+            self, target_tensor: SparseTensor, order: ObjectOrder, relation_name: str,
             dataset: CaDataset, example: CaExample,
             background_knowledge: BackgroundKnowledge = NoBackgroundKnowledge()) -> list[CaConstraint]:
         if not background_knowledge.is_boolean:
@@ -184,10 +222,12 @@ class CountOr(CaMethod):
         parameter_names = tuple(get_variable_name_for_dimension(i) for i in range(len(parameter_types)))
 
         constraints = []
+        if not isinstance(order, OrderByFeature):
+            return constraints
         # for all x1 in employee: count_consecutive(x2 in shift | works_at_shift(x1,x2) order by x2.start_time, shifts_are_within_one_day(a,b)) >= 2
-        for m,s in self.__enumerate_splits(target_tensor):
-            quantifier_query = self.__create_quantifier_query(parameter_types, parameter_names, m)
-            if len(s) == 1 and isinstance(order, OrderByFeature) and order.type_name == parameter_types[s[0]]:
+        for m,s in self.__enumerate_splits(target_tensor, max_nr_of_summed_dimensions=1):
+            if order.type_name == parameter_types[s[0]]:
+                quantifier_query = self.__create_quantifier_query(parameter_types, parameter_names, m)
                 for relation_type in dataset.get_relation_types():
                     if isinstance(relation_type.value_type, CaBoolean) \
                     and relation_type.parameter_types == [order.type_name, order.type_name]:
@@ -235,12 +275,82 @@ class CountOr(CaMethod):
                 for m_i in m
             ])
 
-    def __enumerate_splits(self, target_tensor: np.ndarray) -> Generator[tuple[list[int], list[int]],None,None]:
-        all_dimensions = set(range(len(target_tensor.shape)))
-        for m in powerset(all_dimensions):
-            s = all_dimensions.difference(m)
-            if m and s:
-                yield list(m), list(s)
+    def __enumerate_splits(
+            self, target_tensor: SparseTensor,
+            max_nr_of_summed_dimensions: int|None = None) -> Generator[tuple[list[int], list[int]],None,None]:
+        """
+        yields all splits (m,s) of the dimensions of the tensor into the nonempty
+        lists of quantified dimensions m and summed dimensions s. both lists are sorted.
+        splits with more than max_nr_of_summed_dimensions summed dimensions are skipped.
+        """
+        nr_of_dimensions = len(target_tensor.shape)
+        if max_nr_of_summed_dimensions is None:
+            min_nr_of_quantified_dimensions = 1
+        else:
+            min_nr_of_quantified_dimensions = max(1, nr_of_dimensions - max_nr_of_summed_dimensions)
+        for m in powerset(range(nr_of_dimensions)):
+            if min_nr_of_quantified_dimensions <= len(m) < nr_of_dimensions:
+                yield list(m), [d for d in range(nr_of_dimensions) if d not in m]
+
+    def __compute_non_trivial_bounds(
+            self, target_tensor: SparseTensor,
+            splits: list[tuple[list[int], list[int]]],
+            max_value, trivial_lower_bound) -> tuple[dict[tuple[int], object], dict[tuple[int], object]]:
+        """
+        computes the upper and lower bound of the sums of the target tensor over
+        the summed dimensions s of all given splits. a bound is None if it equals
+        the trivial bound.
+
+        the splits are processed from the coarsest to the finest aggregation.
+        if the upper bound of a split is trivial, there is a block over its
+        summed dimensions in which all values are maximal. then the upper bound
+        is also trivial for every split whose summed dimensions are a subset.
+        the same holds for a trivial lower bound if the tensor is not negative.
+        the bounds of such splits are not computed, and a split is not
+        aggregated at all if both of its bounds are implied.
+        """
+        aggregations = {(): target_tensor}
+        upper_bound_per_s = {}
+        lower_bound_per_s = {}
+        summed_dimensions_with_trivial_upper_bound = []
+        summed_dimensions_with_trivial_lower_bound = []
+        for s in sorted((tuple(s) for _,s in splits), key=len, reverse=True):
+            upper_bound_is_trivial = any(
+                set(s).issubset(t) for t in summed_dimensions_with_trivial_upper_bound)
+            lower_bound_is_trivial = trivial_lower_bound >= 0 and any(
+                set(s).issubset(t) for t in summed_dimensions_with_trivial_lower_bound)
+            upper_bound_per_s[s] = None
+            lower_bound_per_s[s] = None
+            if upper_bound_is_trivial and lower_bound_is_trivial:
+                continue
+            count_x_m_s = self.__aggregate(aggregations, s)
+            if not upper_bound_is_trivial:
+                upper_bound = count_x_m_s.max()
+                if upper_bound != max_value * reduce(lambda a,b: a*b, (target_tensor.shape[s_i] for s_i in s)):
+                    upper_bound_per_s[s] = upper_bound
+                else:
+                    summed_dimensions_with_trivial_upper_bound.append(s)
+            if not lower_bound_is_trivial:
+                lower_bound = count_x_m_s.min()
+                if lower_bound != trivial_lower_bound:
+                    lower_bound_per_s[s] = lower_bound
+                else:
+                    summed_dimensions_with_trivial_lower_bound.append(s)
+        return upper_bound_per_s, lower_bound_per_s
+
+    def __aggregate(self, aggregations: dict[tuple[int], SparseTensor], s: tuple[int]) -> SparseTensor:
+        """
+        returns the sum of the target tensor over the summed dimensions s. the
+        sum is computed from the aggregation of s without its last dimension,
+        which is computed the same way if it is not in aggregations yet, i.e.
+        partial aggregations are shared between the splits.
+        """
+        aggregation = aggregations.get(s)
+        if aggregation is None:
+            #the remaining axes of the finer aggregation are the dimensions not in s[:-1]
+            aggregation = self.__aggregate(aggregations, s[:-1]).sum(axis=(s[-1] - (len(s) - 1),))
+            aggregations[s] = aggregation
+        return aggregation
 
     def __map_to_background_knowledge_list(
             self, example: CaExample, relation_name: str,
@@ -253,17 +363,21 @@ class CountOr(CaMethod):
                 key=lambda o: o.object_id
             )
             for feature_name, feature_type in object_type.feature_definition.items():
-                tensor = np.array([
-                    [
-                        float(an_object.features[feature_name])
-                        if i == j else 0
-                        for j in range(len(all_objects_of_type))
-                    ]
-                    for i, an_object in enumerate(all_objects_of_type)
+                #diagonal matrix with the feature values. rows of objects
+                #with a false boolean feature are removed.
+                columns = [
+                    i for i, an_object in enumerate(all_objects_of_type)
                     if not isinstance(feature_type, CaBoolean) or an_object.features[feature_name]
+                ]
+                values = np.array([
+                    float(all_objects_of_type[i].features[feature_name]) for i in columns
                 ])
+                tensor = SparseTensor(
+                    (len(columns), len(all_objects_of_type)),
+                    np.array([(row, column) for row, column in enumerate(columns)], dtype=np.int64),
+                    values)
                 #filter out trivial filters that apply to no or all objects
-                if len(tensor.shape) == 2 and tensor.shape[0] == tensor.shape[1] and not np.all(np.equal(tensor, np.identity(tensor.shape[0]))):
+                if 0 < tensor.shape[0] == tensor.shape[1] and not np.all(values == 1):
                     for dimension_index in [i for i,t in enumerate(dimension_parameters) if t == object_type.name]:
                         background_knowledge_list.append(ObjectFeatureBackgroundKnowledge(
                             tensor, dimension_index,
@@ -292,18 +406,45 @@ class CountOr(CaMethod):
 def map_to_target_tensor(
         example: CaExample,
         target_relation: CaRelationType,
-        order: ObjectOrder = OrderByObjectId()):
-    tensor = np.zeros(tuple(
-        len(example.all_objects_per_type[t]) for t in target_relation.parameter_types))
+        order: ObjectOrder = OrderByObjectId()) -> SparseTensor:
+    """
+    creates a sparse tensor with one dimension per parameter of the target relation,
+    which is 1 for all relations with a true value and 0 otherwise
+    """
     object_type_and_id_to_index = create_object_type_and_id_to_index(example, target_relation, order=order)
-    for relation in example.relations[target_relation.name]:
-        if relation.value:
-            tensor_index = tuple([
-                object_type_and_id_to_index[o.type_name][o.object_id]
-                for o in relation.objects
-            ])
-            tensor[tensor_index] = 1
-    return tensor
+    object_id_to_index_per_dimension = [
+        object_type_and_id_to_index[t] for t in target_relation.parameter_types
+    ]
+    coordinates = np.array([
+        [
+            object_id_to_index[o.object_id]
+            for object_id_to_index, o in zip(object_id_to_index_per_dimension, relation.objects)
+        ]
+        for relation in example.relations[target_relation.name]
+        if relation.value
+    ], dtype=np.int64)
+    return SparseTensor(
+        tuple(len(example.all_objects_per_type[t]) for t in target_relation.parameter_types),
+        coordinates, np.ones(len(coordinates)))
+
+def reorder_target_tensor(
+        target_tensor: SparseTensor, example: CaExample,
+        target_relation: CaRelationType, order: ObjectOrder) -> SparseTensor:
+    """
+    converts a target tensor created by map_to_target_tensor with the default order
+    into the target tensor with the given order without iterating over the relations
+    of the example again
+    """
+    object_type_and_id_to_index = create_object_type_and_id_to_index(example, target_relation)
+    ordered_object_type_and_id_to_index = create_object_type_and_id_to_index(
+        example, target_relation, order=order)
+    coordinates = target_tensor.coordinates.copy()
+    for dimension, object_type in enumerate(target_relation.parameter_types):
+        index_mapping = np.empty(target_tensor.shape[dimension], dtype=np.int64)
+        for object_id, i in object_type_and_id_to_index[object_type].items():
+            index_mapping[i] = ordered_object_type_and_id_to_index[object_type][object_id]
+        coordinates[:,dimension] = index_mapping[coordinates[:,dimension]]
+    return SparseTensor(target_tensor.shape, coordinates, target_tensor.values)
 
 def create_object_type_and_id_to_index(
         example: CaExample, target_relation: CaRelationType,
@@ -314,4 +455,9 @@ def create_object_type_and_id_to_index(
         for an_object in order.sort_objects(example.all_objects_per_type[object_type]):
             object_id_to_index[an_object.object_id] = len(object_id_to_index)
         object_type_and_id_to_index[object_type] = object_id_to_index
-    return object_type_and_id_to_index
\ No newline at end of file
+    return object_type_and_id_to_index
+
+def _acquire_constraint_set_for_example_in_worker(example_index: int) -> ConstraintSet:
+    count_or, relation_name, dataset, example_list = get_worker_state()
+    return count_or._acquire_constraint_set_for_example(
+        example_list[example_index], relation_name, dataset)
@@ -0,0 +1,138 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+import numpy as np
+
+class SparseTensor:
+    """
+    tensor in coordinate format, i.e. only entries that are not zero are stored.
+    every coordinate is contained at most once. the methods mirror the subset
+    of the numpy api used by CountOr and return the same values as the numpy
+    functions on the corresponding dense tensor.
+
+    Attributes
+    ----------
+    shape : tuple[int]
+        shape of the corresponding dense tensor
+    coordinates : np.ndarray
+        integer array of shape (number of stored entries, number of dimensions)
+    values : np.ndarray
+        float array with the values of the stored entries
+    """
+    __slots__ = ('shape', 'coordinates', 'values')
+
+    def __init__(self, shape: tuple[int], coordinates: np.ndarray, values: np.ndarray):
+        self.shape = tuple(shape)
+        self.coordinates = np.asarray(coordinates, dtype=np.int64).reshape((-1, len(self.shape)))
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @staticmethod
+    def from_dense(tensor: np.ndarray) -> 'SparseTensor':
+        tensor = np.asarray(tensor, dtype=np.float64)
+        coordinates = np.argwhere(tensor)
+        return SparseTensor(tensor.shape, coordinates, tensor[tuple(coordinates.T)])
+
+    @staticmethod
+    def from_coordinates(shape: tuple[int], coordinates: np.ndarray, values: np.ndarray) -> 'SparseTensor':
+        """
+        creates a SparseTensor from coordinates that can occur multiple times.
+        the values of the same coordinate are added.
+        """
+        shape = tuple(shape)
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape((-1, len(shape)))
+        if len(coordinates) == 0:
+            return SparseTensor(shape, coordinates, np.zeros(0))
+        flat_indices = np.ravel_multi_index(tuple(coordinates.T), shape)
+        unique_flat_indices, inverse = np.unique(flat_indices, return_inverse=True)
+        return SparseTensor(
+            shape,
+            np.stack(np.unravel_index(unique_flat_indices, shape), axis=1),
+            np.bincount(inverse, weights=values, minlength=len(unique_flat_indices)))
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def to_dense(self) -> np.ndarray:
+        tensor = np.zeros(self.shape)
+        tensor[tuple(self.coordinates.T)] = self.values
+        return tensor
+
+    def max(self) -> np.float64:
+        if len(self.values) == 0:
+            return np.float64(0)
+        if self.__has_implicit_zeros():
+            return np.maximum(self.values.max(), 0.0)
+        return self.values.max()
+
+    def min(self) -> np.float64:
+        if len(self.values) == 0:
+            return np.float64(0)
+        if self.__has_implicit_zeros():
+            return np.minimum(self.values.min(), 0.0)
+        return self.values.min()
+
+    def sum(self, axis: tuple[int]) -> 'SparseTensor':
+        """
+        sums up the entries along the given axes
+        """
+        kept_axes = [i for i in range(self.ndim) if i not in axis]
+        return SparseTensor.from_coordinates(
+            tuple(self.shape[i] for i in kept_axes),
+            self.coordinates[:,kept_axes], self.values)
+
+    def transpose(self, permutation: tuple[int]) -> 'SparseTensor':
+        return SparseTensor(
+            tuple(self.shape[i] for i in permutation),
+            self.coordinates[:,permutation], self.values)
+
+    def matmul(self, other: 'SparseTensor') -> 'SparseTensor':
+        """
+        matrix product with the same semantics as np.matmul(self, other) for a
+        two dimensional tensor self, i.e. self is multiplied with the first axis
+        of a one dimensional tensor and with the second last axis of all other tensors.
+
+        Raises
+        ------
+        ValueError
+            if the size of the multiplied axis of other does not match the number
+            of columns of self
+        """
+        if self.ndim != 2:
+            raise NotImplementedError('only two dimensional tensors can be multiplied from left')
+        axis = max(other.ndim - 2, 0)
+        if other.shape[axis] != self.shape[1]:
+            raise ValueError(f'matmul: mismatch of shapes {self.shape} and {other.shape}')
+        column_order = np.argsort(self.coordinates[:,1], kind='stable')
+        sorted_columns = self.coordinates[column_order,1]
+        start = np.searchsorted(sorted_columns, other.coordinates[:,axis], side='left')
+        end = np.searchsorted(sorted_columns, other.coordinates[:,axis], side='right')
+        nr_of_matches = end - start
+        other_entries = np.repeat(np.arange(len(other.values)), nr_of_matches)
+        self_entries = column_order[
+            np.repeat(start - np.cumsum(nr_of_matches) + nr_of_matches, nr_of_matches)
+            + np.arange(len(other_entries))
+        ]
+        coordinates = other.coordinates[other_entries]
+        coordinates[:,axis] = self.coordinates[self_entries,0]
+        shape = list(other.shape)
+        shape[axis] = self.shape[0]
+        return SparseTensor.from_coordinates(
+            shape, coordinates, self.values[self_entries] * other.values[other_entries])
+
+    def __has_implicit_zeros(self) -> bool:
+        return len(self.values) < np.prod(self.shape)
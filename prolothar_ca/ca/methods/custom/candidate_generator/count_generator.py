@@ -16,9 +16,7 @@
 '''
 
 from typing import Generator
-from sortedcontainers import SortedSet
-
-from prolothar_common.experiments.statistics import Statistics
+import numpy as np
 
 from prolothar_ca.model.ca.dataset import CaDataset
 from prolothar_ca.model.ca.relation import CaRelationType
@@ -40,24 +38,25 @@ def generate_count_candidates(
     target_relation_cardinality = len(target_relation.parameter_types)
     clause_cache = {}
     nr_of_target_variables = datagraph.get_nr_of_target_variables()
+    example_matrix, column_index_of_variable = _create_example_matrix(sat_encoded_dataset, datagraph)
     for i, parameter_type in enumerate(target_relation.parameter_types):
         nr_of_boolean_features = dataset.get_nr_of_boolean_features(parameter_type)
         yield from _generate_count_candidates_from_partition(
             PartitionByTargetParameterFeaturesAreTrue(i, target_relation_cardinality, [], nr_of_boolean_features),
-            datagraph, sat_encoded_dataset, clause_cache, nr_of_target_variables)
+            datagraph, example_matrix, column_index_of_variable, clause_cache, nr_of_target_variables)
         for feature_name, feature_type in dataset.get_object_type(parameter_type).feature_definition.items():
             if isinstance(feature_type, CaBoolean):
                 yield from _generate_count_candidates_from_partition(
                     PartitionByTargetParameterFeaturesAreTrue(
                         i, target_relation_cardinality, [feature_name], nr_of_boolean_features
                     ),
-                    datagraph, sat_encoded_dataset, clause_cache, nr_of_target_variables
+                    datagraph, example_matrix, column_index_of_variable, clause_cache, nr_of_target_variables
                 )
                 yield from _generate_count_candidates_from_partition(
                     PartitionByTargetParameterFeaturesAreFalse(
                         i, target_relation_cardinality, [feature_name], nr_of_boolean_features
                     ),
-                    datagraph, sat_encoded_dataset, clause_cache, nr_of_target_variables
+                    datagraph, example_matrix, column_index_of_variable, clause_cache, nr_of_target_variables
                 )
                 for second_feature_name, second_feature_type in dataset.get_object_type(parameter_type).feature_definition.items():
                     if isinstance(second_feature_type, CaBoolean) and feature_name < second_feature_name:
@@ -67,26 +66,44 @@ def generate_count_candidates(
                                 [feature_name, second_feature_name],
                                 nr_of_boolean_features
                             ),
-                            datagraph, sat_encoded_dataset, clause_cache, nr_of_target_variables
+                            datagraph, example_matrix, column_index_of_variable, clause_cache, nr_of_target_variables
                         )
 
+def _create_example_matrix(
+        sat_encoded_dataset: list[SatEncodedExample],
+        datagraph: DataGraph) -> tuple[np.ndarray, dict]:
+    """
+    returns a matrix with one row per example and one column per target
+    variable, which is 1 if the variable is true in the example, and the
+    mapping from target variables to columns
+    """
+    variable_list = sorted(datagraph.get_target_variables().values(), key=lambda v: v.nr)
+    example_matrix = np.array([
+        [
+            example[variable].value == Value.TRUE
+            for variable in variable_list
+        ]
+        for example in sat_encoded_dataset
+    ], dtype=np.intc).reshape(len(sat_encoded_dataset), len(variable_list))
+    return example_matrix, {variable: i for i, variable in enumerate(variable_list)}
+
 def _generate_count_candidates_from_partition(
         partition: Partition,
         datagraph: DataGraph,
-        sat_encoded_dataset: list[SatEncodedExample],
+        example_matrix: np.ndarray,
+        column_index_of_variable: dict,
         clause_cache: dict, nr_of_target_variables: int):
     variable_group_tuples = partition.compute_variable_groups(datagraph)
-    if variable_group_tuples:
-        statistics_of_counts = Statistics()
-        sorted_set_of_counts = SortedSet()
-        for example in sat_encoded_dataset:
-            for variable_group in variable_group_tuples:
-                count = _count_true_variables_in_group(variable_group, example)
-                sorted_set_of_counts.add(count)
-                statistics_of_counts.push(count)
+    if variable_group_tuples and example_matrix.shape[0] > 0:
+        counts = _count_true_variables_in_groups(variable_group_tuples, example_matrix, column_index_of_variable)
+        #floor of the mean count over all examples and groups
+        mean_count = int(counts.sum()) // counts.size
+        distinct_counts = np.unique(counts)
+        lowerbound_list = distinct_counts[distinct_counts <= mean_count].tolist()
+        upperbound_list = distinct_counts[distinct_counts >= mean_count].tolist()
         maximum_possible_upperbound = len(variable_group_tuples[0])
-        for lowerbound in sorted_set_of_counts.irange(statistics_of_counts.minimum(), int(statistics_of_counts.mean())):
-            for upperbound in sorted_set_of_counts.irange(max(lowerbound, int(statistics_of_counts.mean())), statistics_of_counts.maximum()):
+        for lowerbound in lowerbound_list:
+            for upperbound in upperbound_list:
                 yield Count(
                     partition, lowerbound, upperbound, nr_of_target_variables, clause_cache,
                     is_trivial = (
@@ -95,9 +112,23 @@ def _generate_count_candidates_from_partition(
                     )
                 )
 
-def _count_true_variables_in_group(variable_group: tuple, example: SatEncodedExample):
-    count = 0
-    for variable in variable_group:
-        if example[variable].value == Value.TRUE:
-            count += 1
-    return count
\ No newline at end of file
+def _count_true_variables_in_groups(
+        variable_group_tuples: tuple, example_matrix: np.ndarray,
+        column_index_of_variable: dict) -> np.ndarray:
+    """
+    returns a matrix with one row per example and one column per group, which
+    contains the number of true variables of the group in the example
+    """
+    group_sizes = np.fromiter(
+        (len(variable_group) for variable_group in variable_group_tuples),
+        dtype=np.intp, count=len(variable_group_tuples))
+    column_indices = np.fromiter(
+        (
+            column_index_of_variable[variable]
+            for variable_group in variable_group_tuples
+            for variable in variable_group
+        ),
+        dtype=np.intp, count=int(group_sizes.sum()))
+    group_offsets = np.zeros(len(variable_group_tuples), dtype=np.intp)
+    np.cumsum(group_sizes[:-1], out=group_offsets[1:])
+    return np.add.reduceat(example_matrix[:, column_indices], group_offsets, axis=1)
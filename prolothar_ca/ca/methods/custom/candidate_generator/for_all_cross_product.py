@@ -159,26 +159,8 @@ def _generate_cross_product_filter_from_feature_pairs(
 def _compute_max_absolute_difference(
         dataset: CaDataset, target_relation: CaRelationType,
         feature_name: str, i: int, j: int) -> int:
-    max_difference = 0
-    for example in dataset:
-        for relation in example.relations[target_relation.name]:
-            if relation.value:
-                try:
-                    difference = abs(
-                        relation.objects[i].features[feature_name] -
-                        relation.objects[j].features[feature_name]
-                    )
-                except KeyError:
-                    raise NotImplementedError((
-                        target_relation, i, j, feature_name,
-                        target_relation.parameter_types[i],
-                        target_relation.parameter_types[j],
-                        relation.objects[i].features.keys(),
-                        relation.objects[j].features.keys())
-                    )
-                if difference > max_difference:
-                    max_difference = difference
-    return int(ceil(max_difference))
+    return int(ceil(dataset.get_statistics().get_max_absolute_difference(
+        target_relation.name, feature_name, i, j)))
 
 def _check_there_are_no_relations_without_parameters(dataset):
     for relation_type in dataset.get_relation_types():
@@ -0,0 +1,229 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from heapq import heappush, heapreplace
+from math import ceil
+from typing import Iterable
+from prolothar_common.mdl_utils import L_N
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import AndCrossProductFilter
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import BooleanFeature
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import BooleanRelation
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import CrossProductFilter
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import NotCrossProductFilter
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import OrCrossProductFilter
+from prolothar_ca.ca.methods.custom.model.custom_constraint import CustomConstraint, DataGraph
+from prolothar_ca.ca.methods.custom.model.for_all_join_all import ForAllJoinAll
+from prolothar_ca.ca.methods.custom.model.for_all_no_join import ForAll
+from prolothar_ca.ca.methods.custom.mdl_score import compute_error_score
+from prolothar_ca.model.sat.cnf import CnfFormula
+
+class GainBound:
+    """
+    computes a cheap lowerbound of the initial gain of a candidate constraint
+    without querying the datagraph. the initial gain of a candidate is
+
+    L(constraint) - |D| * |variables in clauses| + |D| + sum of error scores
+
+    where every error score is at least L_N(1). the number of variables in the
+    clauses of a ForAll constraint is at most the number of target variables
+    that pass its cross product filter. for ForAllJoinAll constraints, a
+    variable can be part of the first or of the joined tuple of the cross
+    product. filters on boolean features and on boolean relations are counted
+    directly on the objects of the target variables and the true relations of
+    the datagraph. for all other filters and constraints, the number of target
+    variables is used.
+    """
+
+    def __init__(self, datagraph: DataGraph, nr_of_examples: int):
+        self.__datagraph = datagraph
+        self.__nr_of_examples = nr_of_examples
+        self.__nr_of_target_variables = datagraph.get_nr_of_target_variables()
+        self.__target_relation_cardinality = len(datagraph.get_target_relation_type().parameter_types)
+        self.__feature_count_cache = {}
+        self.__relation_count_cache = {}
+
+    def compute(self, constraint: CustomConstraint) -> float:
+        """
+        returns a lowerbound of the initial gain of the candidate constraint.
+        inf is returned if the constraint cannot lead to any clause.
+        """
+        max_nr_of_variables = self.__nr_of_target_variables
+        if isinstance(constraint, ForAll):
+            max_nr_of_variables = self.__compute_max_nr_of_variables(constraint.cross_product_filter, 0)
+        elif isinstance(constraint, ForAllJoinAll):
+            max_nr_of_variables = min(
+                self.__nr_of_target_variables,
+                self.__compute_max_nr_of_variables(constraint.cross_product_filter, 0) +
+                self.__compute_max_nr_of_variables(
+                    constraint.cross_product_filter, constraint.target_relation_cardinality)
+            )
+        if max_nr_of_variables == 0:
+            return float('inf')
+        return (
+            constraint.encoded_model_length
+            - self.__nr_of_examples * (max_nr_of_variables - 1)
+            + self.__nr_of_examples * L_N(1)
+        )
+
+    def compute_against_model(
+            self, constraint: CustomConstraint, gain_bound: float,
+            model: list[CustomConstraint], data_cost: float) -> float:
+        """
+        tightens a lowerbound of the initial gain of the candidate constraint
+        for a model that already contains the given constraints. the candidate
+        cannot reduce the data cost by more than the current data cost. if it
+        cannot be merged with a constraint of the model, the model cost grows
+        by at least the encoded model length of the candidate.
+        """
+        if any(model_constraint.merge(constraint) is not None for model_constraint in model):
+            return max(gain_bound, -data_cost)
+        return max(gain_bound, constraint.encoded_model_length - data_cost)
+    def estimate_from_sampled_clauses(
+            self, constraint: ForAllJoinAll, sat_encoded_dataset: list,
+            max_nr_of_clauses: int) -> float:
+        """
+        estimates the initial gain of the candidate constraint on a block of
+        its cross product with about max_nr_of_clauses rows. the block consists
+        of the rows whose first target variable number is divisible by a block
+        modulus. the number of variables in the clauses and the error scores
+        are scaled by the number of target variables over the number of target
+        variables in the block. in contrast to "compute", the result is not a
+        lowerbound, but the full cross product is never computed.
+        """
+        nr_of_target_variables = self.__nr_of_target_variables
+        block_modulus = max(1, min(
+            nr_of_target_variables,
+            ceil(nr_of_target_variables * nr_of_target_variables / max_nr_of_clauses)))
+        nr_of_block_variables = sum(
+            1 for variable_nr in self.__datagraph.get_target_variables()
+            if variable_nr % block_modulus == 0)
+        if nr_of_block_variables == 0:
+            return float('inf')
+        sampled_cnf = CnfFormula(constraint.compute_sampled_cnf_clauses(self.__datagraph, block_modulus))
+        if sampled_cnf.get_nr_of_clauses() == 0:
+            return float('inf')
+        scaling_factor = nr_of_target_variables / nr_of_block_variables
+        gain_estimate = constraint.encoded_model_length - self.__nr_of_examples * (min(
+            nr_of_target_variables,
+            len(sampled_cnf.get_variable_nr_set()) * scaling_factor) - 1)
+        for i, example in enumerate(sat_encoded_dataset):
+            gain_estimate += scaling_factor * compute_error_score(sampled_cnf, example, i)
+            if gain_estimate >= 0:
+                break
+        return gain_estimate
+
+    def __compute_max_nr_of_variables(self, cross_product_filter: CrossProductFilter, offset: int) -> int:
+        """
+        returns the maximal number of target variables whose objects can be at
+        the positions offset, ..., offset + cardinality - 1 of a row of the
+        cross product that passes the filter
+        """
+        if isinstance(cross_product_filter, BooleanFeature):
+            return self.__count_target_variables_with_feature_value(
+                cross_product_filter.variable_index - offset, cross_product_filter.feature_name)[0]
+        if isinstance(cross_product_filter, NotCrossProductFilter) \
+        and isinstance(cross_product_filter.term, BooleanFeature):
+            return self.__count_target_variables_with_feature_value(
+                cross_product_filter.term.variable_index - offset, cross_product_filter.term.feature_name)[1]
+        if isinstance(cross_product_filter, BooleanRelation):
+            return self.__count_target_variables_in_true_relation(
+                cross_product_filter.relation_type.name,
+                tuple(i - offset for i in cross_product_filter.variable_indices))
+        if isinstance(cross_product_filter, AndCrossProductFilter) and cross_product_filter.terms:
+            return min(self.__compute_max_nr_of_variables(term, offset) for term in cross_product_filter.terms)
+        if isinstance(cross_product_filter, OrCrossProductFilter) and cross_product_filter.terms:
+            return min(self.__nr_of_target_variables, sum(
+                self.__compute_max_nr_of_variables(term, offset) for term in cross_product_filter.terms))
+        return self.__nr_of_target_variables
+
+    def __count_target_variables_with_feature_value(
+            self, variable_index: int, feature_name: str) -> tuple[int, int]:
+        """
+        returns the number of target variables whose object at the given index
+        has a true value for the feature and the number of target variables
+        whose object does not have a true value for the feature
+        """
+        if not 0 <= variable_index < self.__target_relation_cardinality:
+            #filter on another tuple of the cross product => no information about the bound
+            return self.__nr_of_target_variables, self.__nr_of_target_variables
+        key = (variable_index, feature_name)
+        counts = self.__feature_count_cache.get(key)
+        if counts is None:
+            nr_of_true = 0
+            nr_of_not_true = 0
+            for variable_nr in self.__datagraph.get_target_variables():
+                if self.__datagraph.get_target_relation(variable_nr).objects[variable_index].features.get(feature_name):
+                    nr_of_true += 1
+                else:
+                    nr_of_not_true += 1
+            counts = (nr_of_true, nr_of_not_true)
+            self.__feature_count_cache[key] = counts
+        return counts
+
+    def __count_target_variables_in_true_relation(
+            self, relation_name: str, variable_indices: tuple[int]) -> int:
+        """
+        returns the number of target variables whose objects at the given
+        indices can be part of a true relation, i.e. the true relations are
+        projected on the parameters that refer to the target variable.
+        """
+        #pairs of the parameter index in the relation and the object index in the target relation
+        projection = tuple(
+            (parameter_index, variable_index)
+            for parameter_index, variable_index in enumerate(variable_indices)
+            if 0 <= variable_index < self.__target_relation_cardinality
+        )
+        if not projection:
+            #filter on another tuple of the cross product => no information about the bound
+            return self.__nr_of_target_variables
+        key = (relation_name, projection)
+        count = self.__relation_count_cache.get(key)
+        if count is None:
+            projected_true_relations = set(
+                tuple(parameters[parameter_index] for parameter_index, _ in projection)
+                for parameters in self.__datagraph.get_statistics().get_true_relation_parameters(relation_name)
+            )
+            count = 0
+            for variable_nr in self.__datagraph.get_target_variables():
+                objects = self.__datagraph.get_target_relation(variable_nr).objects
+                if tuple(objects[variable_index] for _, variable_index in projection) in projected_true_relations:
+                    count += 1
+            self.__relation_count_cache[key] = count
+        return count
+
+def select_candidates_for_expansion(
+        estimated_constraints: Iterable[tuple[float, CustomConstraint]],
+        max_nr_of_candidates: int) -> list[tuple[float, CustomConstraint]]:
+    """
+    returns the pairs of gain estimate and constraint of the at most
+    max_nr_of_candidates constraints with the lowest negative gain estimates,
+    sorted by their estimate. only these constraints are expanded to their
+    full cross product, all others are skipped.
+    """
+    #max heap of the selected constraints by their estimate, the index breaks ties
+    selected_constraints = []
+    for i, (gain_estimate, constraint) in enumerate(estimated_constraints):
+        if gain_estimate >= 0 or max_nr_of_candidates <= 0:
+            continue
+        if len(selected_constraints) < max_nr_of_candidates:
+            heappush(selected_constraints, (-gain_estimate, -i, constraint))
+        elif -gain_estimate > selected_constraints[0][0]:
+            heapreplace(selected_constraints, (-gain_estimate, -i, constraint))
+    return [
+        (-negative_gain_estimate, constraint) for negative_gain_estimate, _, constraint
+        in sorted(selected_constraints, reverse=True)
+    ]
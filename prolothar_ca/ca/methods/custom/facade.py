@@ -23,6 +23,7 @@ from prolothar_ca.model.ca.targets import CaTarget
 from prolothar_ca.ca.methods.custom.itemset_miner import ItemsetMiner
 from prolothar_ca.ca.methods.custom.homogenous_ca import HomogenousCustomCa
 from prolothar_ca.ca.methods.custom.planning_ca import PlanningCustomCa
+from prolothar_ca.ca.methods.custom.report import AcquisitionReport
 
 class URPiLs(CaMethod):
     """
@@ -44,10 +45,16 @@ class URPiLs(CaMethod):
             max_filter_conjunction_length: int = 3,
             max_nr_of_target_zeros: int = -1,
             singleton_positive_support_threshold: float = 0,
-            nr_of_sampled_clauses_for_error: int = 0):
+            nr_of_sampled_clauses_for_error: int = 0,
+            nr_of_screening_examples: int = 0,
+            screening_confidence: float = 0.95,
+            max_nr_of_sampled_cross_product_clauses: int = 1000,
+            max_nr_of_expanded_cross_product_candidates: int = 100):
         if planning_dataset:
             if nr_of_sampled_clauses_for_error != 0:
                 raise NotImplementedError('nr_of_sampled_clauses_for_error != 0 not supported for planning dataset')
+            if nr_of_screening_examples != 0:
+                raise NotImplementedError('nr_of_screening_examples != 0 not supported for planning dataset')
             if implication_pairs_limit is None:
                 implication_pairs_limit =  0
             self.__custom_ca = PlanningCustomCa(
@@ -73,11 +80,23 @@ class URPiLs(CaMethod):
                 implication_pairs_limit=implication_pairs_limit,
                 max_nr_of_target_zeros=max_nr_of_target_zeros,
                 nr_of_sampled_clauses_for_error=nr_of_sampled_clauses_for_error,
+                nr_of_screening_examples=nr_of_screening_examples,
+                screening_confidence=screening_confidence,
+                max_nr_of_sampled_cross_product_clauses=max_nr_of_sampled_cross_product_clauses,
+                max_nr_of_expanded_cross_product_candidates=max_nr_of_expanded_cross_product_candidates,
                 random_seed=random_seed
             )
 
     def acquire_constraints(self, dataset: CaDataset, target: CaTarget) -> list[CaConstraint]:
         return self.__custom_ca.acquire_constraints(dataset, target)
 
+    def acquire_constraints_with_report(
+            self, dataset: CaDataset, target: CaTarget) -> tuple[list[CaConstraint], AcquisitionReport]:
+        """
+        same as acquire_constraints, but additionally returns runtime
+        statistics of the acquisition run
+        """
+        return self.__custom_ca.acquire_constraints_with_report(dataset, target)
+
     def __repr__(self):
         return 'URPiLs'
\ No newline at end of file
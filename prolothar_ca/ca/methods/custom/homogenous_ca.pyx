@@ -19,8 +19,8 @@ from typing import Tuple, List
 from math import ceil
 from libc.math cimport ceil as cceil
 from heapq import heapify, heappop, heappush
-from itertools import chain
-from more_itertools import ilen
+from itertools import chain, repeat
+from more_itertools import ilen, countable
 from tqdm import tqdm
 import numpy as np
 from statistics import mean
@@ -28,6 +28,8 @@ from random import Random
 cimport cython
 from cpython.list cimport PyList_GET_SIZE
 
+from prolothar_common import validate
+
 from prolothar_common.mdl_utils cimport L_N
 from prolothar_common.mdl_utils cimport log2binom
 
@@ -36,6 +38,8 @@ from prolothar_ca.ca.methods.custom.candidate_generator.for_all_all_parameters_c
 from prolothar_ca.ca.methods.custom.candidate_generator.for_all_one_parameter_cross_product import generate_for_all_one_parameter_cross_product_candidates
 from prolothar_ca.ca.methods.custom.candidate_generator.for_all_cross_product import generate_for_all_cross_product_candidates
 from prolothar_ca.ca.methods.custom.candidate_generator.count_generator import generate_count_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.gain_bound import GainBound
+from prolothar_ca.ca.methods.custom.candidate_generator.gain_bound import select_candidates_for_expansion
 from prolothar_ca.ca.methods.custom.mdl_score import compute_encoded_data_length_from_known_solution_with_upperbound
 from prolothar_ca.ca.methods.custom.model.custom_constraint cimport JoinTargetConstraint
 from prolothar_ca.ca.methods.custom.model.custom_constraint cimport SingleTargetConstraint
@@ -47,6 +51,7 @@ from prolothar_ca.ca.methods.custom.model.for_all_join_n import ForAllJoinN
 from prolothar_ca.ca.methods.custom.itemset_miner.itemset_miner cimport ItemsetMiner
 from prolothar_ca.ca.methods.custom.sat_encoding import create_homgenous_sat_encoded_dataset, SatEncodedExample
 from prolothar_ca.ca.methods.custom.ca_items import pattern_to_cross_product_filter
+from prolothar_ca.ca.methods.custom.report import AcquisitionReport
 
 from prolothar_ca.model.ca import CaDataset
 from prolothar_ca.model.ca.obj cimport CaObject
@@ -59,6 +64,7 @@ from prolothar_ca.model.sat.cnf cimport CnfFormula
 from prolothar_ca.model.sat.variable cimport Variable, Value
 from prolothar_ca.solver.sat.modelcount.approxmc import ApproxMC
 from prolothar_ca.solver.sat.modelcount.model_counter import ModelCounter
+from prolothar_ca.solver.sat.modelcount.instrumented_model_counter import InstrumentedModelCounter
 from prolothar_ca.solver.sat.solver.twosat_solver import TwoSatSolver
 from prolothar_ca.solver.sat.modelcount.mc2 cimport compute_graph_lower_bound
 
@@ -76,6 +82,7 @@ cdef class HomogenousCustomCa:
     examples have the same boolean variables => enables runtime improvements
     """
     cdef __sat_model_counter
+    cdef object __instrumented_model_counter
     cdef ItemsetMiner __itemset_miner
     cdef __implication_pairs_limit
     cdef bint __assume_equal_modelcount_for_all_single_target_constraint_candidates
@@ -85,6 +92,12 @@ cdef class HomogenousCustomCa:
     cdef int __max_nr_of_target_zeros
     cdef dict __item_cache
     cdef int __nr_of_sampled_clauses_for_error
+    cdef int __nr_of_screening_examples
+    cdef double __screening_confidence
+    cdef list __screening_example_ids
+    cdef int __max_nr_of_sampled_cross_product_clauses
+    cdef int __max_nr_of_expanded_cross_product_candidates
+    cdef object __report
 
     def __init__(
             self,
@@ -95,11 +108,32 @@ cdef class HomogenousCustomCa:
             verbose: bool = False,
             random_seed: int|None = None,
             max_nr_of_target_zeros: int = -1,
-            nr_of_sampled_clauses_for_error: int = 0):
-        if sat_model_counter is not None:
-            self.__sat_model_counter = sat_model_counter
-        else:
-            self.__sat_model_counter = ApproxMC()
+            nr_of_sampled_clauses_for_error: int = 0,
+            nr_of_screening_examples: int = 0,
+            screening_confidence: float = 0.95,
+            max_nr_of_sampled_cross_product_clauses: int = 1000,
+            max_nr_of_expanded_cross_product_candidates: int = 100):
+        """
+        nr_of_screening_examples and screening_confidence configure a two-stage
+        scoring of candidates. if nr_of_screening_examples > 0, a random
+        subsample of this size is used to compute a lowerbound of the data cost
+        of a candidate, which holds with probability screening_confidence.
+        candidates are scored on the full dataset only if this lowerbound
+        does not rule them out. if nr_of_screening_examples <= 0 (default),
+        all candidates are scored exactly.
+
+        max_nr_of_sampled_cross_product_clauses is the approximate number of
+        clauses of the block that is used to estimate the gain of candidates
+        over the cross product of all target relation parameters if this cross
+        product is too large to be computed for every candidate. only the
+        max_nr_of_expanded_cross_product_candidates candidates with the best
+        estimates are computed on the full cross product, all others are skipped.
+        """
+        validate.in_open_interval(screening_confidence, 0, 1)
+        if sat_model_counter is None:
+            sat_model_counter = ApproxMC()
+        self.__sat_model_counter = sat_model_counter
+        self.__instrumented_model_counter = InstrumentedModelCounter(sat_model_counter)
         if itemset_miner is not None:
             self.__itemset_miner = itemset_miner
         else:
@@ -112,9 +146,41 @@ cdef class HomogenousCustomCa:
         self.__max_nr_of_target_zeros = max_nr_of_target_zeros
         self.__item_cache = {}
         self.__nr_of_sampled_clauses_for_error = nr_of_sampled_clauses_for_error
+        self.__nr_of_screening_examples = nr_of_screening_examples
+        self.__screening_confidence = screening_confidence
+        self.__screening_example_ids = None
+        self.__max_nr_of_sampled_cross_product_clauses = max_nr_of_sampled_cross_product_clauses
+        self.__max_nr_of_expanded_cross_product_candidates = max_nr_of_expanded_cross_product_candidates
 
     def acquire_constraints(self, dataset: CaDataset, target: CaTarget) -> List[CaConstraint]:
+        return self.__acquire_constraints(dataset, target, False)[0]
+
+    def acquire_constraints_with_report(
+            self, dataset: CaDataset, target: CaTarget) -> Tuple[List[CaConstraint], AcquisitionReport]:
+        """
+        same as acquire_constraints, but additionally returns runtime
+        statistics of this run (wall time per phase, candidate counts,
+        model counter calls, sql queries, itemset miner calls and peak rss)
+        """
+        return self.__acquire_constraints(dataset, target, True)
+
+    def __acquire_constraints(
+            self, dataset: CaDataset, target: CaTarget,
+            bint instrument_model_counter) -> Tuple[List[CaConstraint], AcquisitionReport]:
+        """
+        the model counter is only instrumented for acquire_constraints_with_report,
+        because measuring the time of each call is an overhead per call.
+        the model counter statistics of the report are 0 otherwise.
+        """
         self.__item_cache.clear()
+        self.__report = AcquisitionReport()
+        if instrument_model_counter:
+            self.__instrumented_model_counter.reset()
+            self.__sat_model_counter = self.__instrumented_model_counter
+        else:
+            self.__sat_model_counter = self.__instrumented_model_counter.model_counter
+        cdef size_t itemset_miner_calls_before = self.__itemset_miner.nr_of_calls
+        cdef double itemset_miner_time_before = self.__itemset_miner.cumulative_time
         cdef TermFactory term_factory = TermFactory()
         discovered_constraints = []
         TargetIsBooleanRelation().validate(dataset, target)
@@ -123,10 +189,12 @@ cdef class HomogenousCustomCa:
         if self.__verbose:
             print(f'target relation is {target_relation}')
             print('create data graph')
-        cdef DataGraph datagraph = DataGraph(
-            first_example, dataset, target_relation,
-            max_nr_of_target_zeros=self.__max_nr_of_target_zeros
-        )
+        cdef DataGraph datagraph
+        with self.__report.measure_phase('create_datagraph'):
+            datagraph = DataGraph(
+                first_example, dataset, target_relation,
+                max_nr_of_target_zeros=self.__max_nr_of_target_zeros
+            )
         nr_of_variables_per_type = {
             object_type: len(object_set)
             for object_type, object_set in first_example.all_objects_per_type.items()
@@ -137,30 +205,49 @@ cdef class HomogenousCustomCa:
         )
         if self.__verbose:
             print('create sat encoded dataset')
-        sat_encoded_dataset = create_homgenous_sat_encoded_dataset(
-            dataset, target_relation, datagraph)
+        with self.__report.measure_phase('sat_encoding'):
+            sat_encoded_dataset = create_homgenous_sat_encoded_dataset(
+                dataset, target_relation, datagraph)
+        if 0 < self.__nr_of_screening_examples < len(sat_encoded_dataset):
+            self.__screening_example_ids = sorted(Random(self.__random_seed).sample(
+                range(len(sat_encoded_dataset)), self.__nr_of_screening_examples))
+        else:
+            self.__screening_example_ids = None
 
-        model_cost, data_cost, total_cost, discovered_constraints, model_cnf = self.__find_model_with_simple_quantified_expressions(
-            dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph, term_factory)
+        with self.__report.measure_phase('simple_quantified_expressions'):
+            model_cost, data_cost, total_cost, discovered_constraints, model_cnf = self.__find_model_with_simple_quantified_expressions(
+                dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph, term_factory)
 
         if self.__implication_pairs_limit is None or self.__implication_pairs_limit > 0:
-            model_cost, data_cost, total_cost, discovered_constraints, model_cnf = self.__find_model_with_complex_quantified_expressions(
-                dataset, sat_encoded_dataset, discovered_constraints, model_cnf, datagraph,
-                term_factory, model_cost, data_cost, total_cost
-            )
+            with self.__report.measure_phase('complex_quantified_expressions'):
+                model_cost, data_cost, total_cost, discovered_constraints, model_cnf = self.__find_model_with_complex_quantified_expressions(
+                    dataset, sat_encoded_dataset, discovered_constraints, model_cnf, datagraph,
+                    term_factory, model_cost, data_cost, total_cost
+                )
 
-        model_cost, data_cost, total_cost, discovered_constraints = self.__find_model_with_count_expressions(
-            dataset, target_relation, sat_encoded_dataset, datagraph, term_factory,
-            discovered_constraints, model_cnf, model_cost, data_cost, total_cost
-        )
+        with self.__report.measure_phase('count_expressions'):
+            model_cost, data_cost, total_cost, discovered_constraints = self.__find_model_with_count_expressions(
+                dataset, target_relation, sat_encoded_dataset, datagraph, term_factory,
+                discovered_constraints, model_cnf, model_cost, data_cost, total_cost
+            )
 
         if self.__verbose:
             print(f'return model with {len(discovered_constraints)} constraints')
 
-        return [
-            constraint.to_ca_model(datagraph)
-            for constraint in discovered_constraints
-        ]
+        with self.__report.measure_phase('to_ca_model'):
+            ca_constraints = [
+                constraint.to_ca_model(datagraph)
+                for constraint in discovered_constraints
+            ]
+        if instrument_model_counter:
+            self.__report.model_counter_calls = self.__instrumented_model_counter.nr_of_calls
+            self.__report.model_counter_time = self.__instrumented_model_counter.cumulative_time
+        self.__report.sql_queries = datagraph.nr_of_sql_queries
+        self.__report.sql_query_time = datagraph.sql_query_time
+        self.__report.itemset_miner_calls = self.__itemset_miner.nr_of_calls - itemset_miner_calls_before
+        self.__report.itemset_miner_time = self.__itemset_miner.cumulative_time - itemset_miner_time_before
+        self.__report.measure_peak_rss()
+        return ca_constraints, self.__report
 
     def __find_model_with_complex_quantified_expressions(
             self, dataset: CaDataset, sat_encoded_dataset: List[SatEncodedExample],
@@ -174,6 +261,8 @@ cdef class HomogenousCustomCa:
 
         constraint_candidates = self.__generate_quantifier_constraint_candidates_from_pairwise_implications(
             single_target_constraint_candidates, rejected_candidates, datagraph, dataset)
+        self.__report.count_candidates('complex_quantified_expressions', 'generated', len(constraint_candidates))
+        self.__report.count_candidates('complex_quantified_expressions', 'scored', len(constraint_candidates))
 
         return self.__process_candidate_list(
             [
@@ -182,7 +271,9 @@ cdef class HomogenousCustomCa:
                         constraint, datagraph,
                         sat_encoded_dataset,
                         term_factory,
-                        nr_of_sampled_clauses_for_error=self.__nr_of_sampled_clauses_for_error
+                        nr_of_sampled_clauses_for_error=self.__nr_of_sampled_clauses_for_error,
+                        screening_example_ids=self.__screening_example_ids,
+                        screening_confidence=self.__screening_confidence
                     ) for constraint in constraint_candidates
                 ) if candidate.gain < 0
             ],
@@ -192,7 +283,8 @@ cdef class HomogenousCustomCa:
             data_cost,
             total_cost,
             sat_encoded_dataset,
-            datagraph.get_target_variables()
+            datagraph.get_target_variables(),
+            'complex_quantified_expressions'
         )
 
     def __find_model_with_simple_quantified_expressions(
@@ -205,34 +297,79 @@ cdef class HomogenousCustomCa:
         model_cost = L_N(1)
         data_cost = len(dataset) * datagraph.get_nr_of_target_variables()
         total_cost = model_cost + data_cost
-        constraint_list = list(generate_for_all_one_parameter_cross_product_candidates(
-                dataset, datagraph.get_target_relation_type(),
-                nr_of_target_relation_parameter_options))
-        constraint_list.extend(generate_for_all_cross_product_candidates(
+        #the generators are consumed lazily, i.e. only candidates with a
+        #negative lowerbound of their gain are kept in memory.
+        #candidates are scored lazily in the order of this lowerbound.
+        gain_bound = GainBound(datagraph, len(sat_encoded_dataset))
+        cdef list candidate_queue = []
+        cdef double candidate_gain_bound
+        cdef int nr_of_generated_constraints = 0
+        for constraint in tqdm(
+                chain(
+                    generate_for_all_one_parameter_cross_product_candidates(
+                        dataset, datagraph.get_target_relation_type(),
+                        nr_of_target_relation_parameter_options),
+                    generate_for_all_cross_product_candidates(
+                        dataset, datagraph.get_target_relation_type(),
+                        nr_of_target_relation_parameter_options)
+                ),
+                desc='create candidates', disable=not self.__verbose):
+            nr_of_generated_constraints += 1
+            candidate_gain_bound = gain_bound.compute(constraint)
+            if candidate_gain_bound < 0:
+                candidate_queue.append(self.__create_lazy_candidate(
+                    constraint, candidate_gain_bound, datagraph, sat_encoded_dataset, term_factory))
+        all_parameters_constraints = countable(generate_for_all_all_parameters_cross_product_candidates(
             dataset, datagraph.get_target_relation_type(),
             nr_of_target_relation_parameter_options))
-        #full cross product of more than two object sets is computationally too expensive
-        #and probably does not lead to meaningful constraints in practice.
-        #it is also way too expensive for object sets with more than 100 objects
         if len(nr_of_target_relation_parameter_options) <= 2 and dataset.get_max_size_of_object_set() <= 100:
-            constraint_list.extend(generate_for_all_all_parameters_cross_product_candidates(
-                dataset, datagraph.get_target_relation_type(),
-                nr_of_target_relation_parameter_options))
-        cdef list candidate_queue = []
-        cdef Candidate candidate
-        for constraint in tqdm(constraint_list, desc='create candidates', disable=not self.__verbose):
-            candidate = Candidate(
-                constraint, datagraph,
-                sat_encoded_dataset,
-                term_factory,
-                nr_of_sampled_clauses_for_error=self.__nr_of_sampled_clauses_for_error)
-            if candidate.gain < 0:
-                candidate_queue.append(candidate)
+            for constraint in all_parameters_constraints:
+                candidate_gain_bound = gain_bound.compute(constraint)
+                if candidate_gain_bound < 0:
+                    candidate_queue.append(self.__create_lazy_candidate(
+                        constraint, candidate_gain_bound, datagraph, sat_encoded_dataset, term_factory))
+        else:
+            #the full cross product of more than two object sets or of object sets
+            #with more than 100 objects is too expensive to be computed for every candidate.
+            #in this case, the gain of the candidates is estimated on a block of
+            #their cross product and only the most promising candidates are
+            #computed on the full cross product.
+            max_nr_of_sampled_clauses = self.__max_nr_of_sampled_cross_product_clauses
+            for candidate_gain_bound, constraint in select_candidates_for_expansion(
+                    (
+                        (gain_bound.estimate_from_sampled_clauses(
+                            sampled_constraint, sat_encoded_dataset, max_nr_of_sampled_clauses),
+                         sampled_constraint)
+                        for sampled_constraint in tqdm(
+                            all_parameters_constraints, desc='estimate candidates on blocks',
+                            disable=not self.__verbose)
+                    ),
+                    self.__max_nr_of_expanded_cross_product_candidates):
+                candidate_queue.append(self.__create_lazy_candidate(
+                    constraint, candidate_gain_bound, datagraph, sat_encoded_dataset, term_factory))
+        nr_of_generated_constraints += all_parameters_constraints.items_seen
+        self.__report.count_candidates(
+            'simple_quantified_expressions', 'generated', nr_of_generated_constraints)
+        self.__report.count_candidates(
+            'simple_quantified_expressions', 'pruned', nr_of_generated_constraints - len(candidate_queue))
         model_cost, data_cost, total_cost, discovered_constraints, model_cnf = self.__process_candidate_list(
             candidate_queue, [], CnfFormula(), model_cost, data_cost, total_cost,
-            sat_encoded_dataset, datagraph.get_target_variables())
+            sat_encoded_dataset, datagraph.get_target_variables(),
+            'simple_quantified_expressions', gain_bound=gain_bound)
         return model_cost, data_cost, total_cost, discovered_constraints, model_cnf.resolve_new_clauses()
 
+    def __create_lazy_candidate(
+            self, constraint: CustomConstraint, double gain_bound, DataGraph datagraph,
+            list sat_encoded_dataset, TermFactory term_factory) -> Candidate:
+        return Candidate(
+            constraint, datagraph,
+            sat_encoded_dataset,
+            term_factory,
+            nr_of_sampled_clauses_for_error=self.__nr_of_sampled_clauses_for_error,
+            screening_example_ids=self.__screening_example_ids,
+            screening_confidence=self.__screening_confidence,
+            gain_bound=gain_bound)
+
     def __find_single_target_constraint_candidates(
             self, list sat_encoded_dataset,
             DataGraph datagraph,
@@ -792,16 +929,45 @@ cdef class HomogenousCustomCa:
             self, list candidate_queue, list model,
             CnfFormula model_cnf, double model_cost, double data_cost, double total_cost,
             list sat_encoded_dataset,
-            dict variables) -> Tuple[float, float, float, List[CustomConstraint], CnfFormula]:
+            dict variables, str phase,
+            gain_bound: GainBound = None) -> Tuple[float, float, float, List[CustomConstraint], CnfFormula]:
+        """
+        greedily adds the candidates of the queue to the model. candidates that
+        are not materialized yet must have been created with a lowerbound of
+        their gain, which is tightened against the current model by gain_bound.
+        """
         heapify(candidate_queue)
         # we have defined in the Candidate class the model is empty in iteration 1
         cdef int iteration = 1 if not model else 2
         if self.__verbose:
             print(f'start with {len(candidate_queue)} candidates, L(D,M) = {total_cost:.2f}')
         cdef Candidate candidate
+        cdef double candidate_gain_bound
         while candidate_queue:
+            if gain_bound is not None and data_cost <= 0:
+                #no candidate can reduce the data cost and no candidate decreases the model cost
+                self.__report.count_candidates(phase, 'pruned', sum(
+                    1 for queued_candidate in candidate_queue if not queued_candidate.is_materialized))
+                break
             candidate = <Candidate>heappop(candidate_queue)
-            if candidate.iteration == iteration:
+            if not candidate.is_materialized and gain_bound is not None and model:
+                candidate_gain_bound = gain_bound.compute_against_model(
+                    candidate.constraint, candidate.gain, model, data_cost)
+                if candidate_gain_bound >= 0:
+                    #the candidate cannot improve the current model
+                    self.__report.count_candidates(phase, 'pruned')
+                    continue
+                if candidate_queue and candidate_gain_bound > (<Candidate>candidate_queue[0]).gain:
+                    #another candidate could be better than this one
+                    candidate.gain = candidate_gain_bound
+                    heappush(candidate_queue, candidate)
+                    continue
+            if not candidate.is_materialized:
+                candidate.materialize()
+                self.__report.count_candidates(phase, 'scored')
+                if candidate.gain < 0:
+                    heappush(candidate_queue, candidate)
+            elif candidate.iteration == iteration:
                 if candidate.replaced_constraint is not None:
                     model[candidate.replaced_constraint_index] = candidate.constraint
                 else:
@@ -810,6 +976,7 @@ cdef class HomogenousCustomCa:
                 model_cost = candidate.model_cost
                 data_cost = candidate.data_cost
                 total_cost = candidate.total_cost
+                self.__report.count_candidates(phase, 'accepted')
                 if self.__verbose:
                     print((
                         f'gained {abs(candidate.gain):.2f} bits with candidate "{candidate.constraint}", '
@@ -820,6 +987,7 @@ cdef class HomogenousCustomCa:
                 candidate.update_gain(
                     iteration, model, model_cost, model_cnf,
                     sat_encoded_dataset, total_cost, variables, self.__sat_model_counter)
+                self.__report.count_candidates(phase, 'scored')
                 if candidate.gain < 0:
                     heappush(candidate_queue, candidate)
                 elif self.__verbose:
@@ -849,16 +1017,16 @@ cdef class HomogenousCustomCa:
             model_cnf, sat_encoded_dataset, datagraph.get_target_variables(),
             self.__sat_model_counter, sat_encoded_dataset[0], total_cost)
         total_cost = model_cost + data_cost
-        for constraint in tqdm(list(generate_count_candidates(
-                dataset,
-                sat_encoded_dataset,
-                datagraph, target_relation)),
-                disable=not self.__verbose, desc='create candidate list'):
+        count_candidate_constraints = list(generate_count_candidates(
+            dataset, sat_encoded_dataset, datagraph, target_relation))
+        self.__report.count_candidates('count_expressions', 'generated', len(count_candidate_constraints))
+        self.__report.count_candidates('count_expressions', 'scored', len(count_candidate_constraints))
+        for constraint in tqdm(count_candidate_constraints, disable=not self.__verbose, desc='create candidate list'):
             candidate = CountCandidate(constraint, model_cnf, sat_encoded_dataset, datagraph)
             if candidate.gain < 0:
                 candidate_list.append(candidate)
         model_cost, data_cost, total_cost, discovered_constraints = self.__process_count_candidate_list(
-            candidate_list, discovered_constraints, model_cnf.to_constraint_graph(),
+            candidate_list, discovered_constraints, model_cnf,
             model_cost, data_cost, total_cost,
             sat_encoded_dataset, datagraph)
         pruned_constraint_list = []
@@ -873,7 +1041,7 @@ cdef class HomogenousCustomCa:
         return model_cost, data_cost, total_cost, pruned_constraint_list
 
     def __process_count_candidate_list(
-            self, list candidate_queue, list model_without_count_constraints, ConstraintGraph constraint_graph,
+            self, list candidate_queue, list model_without_count_constraints, CnfFormula model_cnf,
             double model_cost, double data_cost, double total_cost, list sat_encoded_dataset,
             DataGraph datagraph) -> Tuple[float, float, float, List[CustomConstraint]]:
         heapify(candidate_queue)
@@ -884,7 +1052,14 @@ cdef class HomogenousCustomCa:
         cdef CountCandidate candidate
         cdef int total_nr_of_constraints_in_model = <int>len(model_without_count_constraints)
         cdef list count_constraint_list = []
-        cdef list model_count_list = [compute_graph_lower_bound(constraint_graph)]
+        cdef list model_count_list = [compute_graph_lower_bound(model_cnf.to_constraint_graph())]
+        #running totals of the untrue clauses of the current model, updated for every accepted candidate
+        cdef list nr_of_untrue_model_clauses_per_example = []
+        cdef int j
+        for j,example in enumerate(sat_encoded_dataset):
+            for variable, variable_value in (<dict>example).items():
+                (<Variable>variable).value = <Value>variable_value
+            nr_of_untrue_model_clauses_per_example.append(model_cnf.get_nr_of_untrue_clauses_for_example(j))
         while candidate_queue:
             candidate = <CountCandidate>heappop(candidate_queue)
             if candidate.iteration == iteration:
@@ -894,10 +1069,13 @@ cdef class HomogenousCustomCa:
                 else:
                     count_constraint_list.append(candidate.count_constraint)
                     model_count_list.append(candidate.model_count)
+                for j,delta in enumerate(candidate.nr_of_untrue_clauses_delta_per_example):
+                    nr_of_untrue_model_clauses_per_example[j] += delta
                 total_nr_of_constraints_in_model += 1
                 model_cost = candidate.model_cost
                 data_cost = candidate.data_cost
                 total_cost = candidate.total_cost
+                self.__report.count_candidates('count_expressions', 'accepted')
                 if self.__verbose:
                     print((
                         f'gained {abs(candidate.gain):.2f} bits with candidate "{candidate.count_constraint}", '
@@ -908,7 +1086,8 @@ cdef class HomogenousCustomCa:
                 candidate.update_gain(
                     iteration, total_nr_of_constraints_in_model, count_constraint_list,
                     model_cost, sat_encoded_dataset, datagraph,
-                    total_cost, model_count_list)
+                    total_cost, model_count_list, nr_of_untrue_model_clauses_per_example)
+                self.__report.count_candidates('count_expressions', 'scored')
                 if candidate.gain < 0:
                     heappush(candidate_queue, candidate)
                 elif self.__verbose:
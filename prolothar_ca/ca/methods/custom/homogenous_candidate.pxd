@@ -20,6 +20,7 @@ from prolothar_ca.ca.methods.custom.model.custom_constraint cimport Count
 from prolothar_ca.ca.methods.custom.model.custom_constraint cimport DataGraph
 from prolothar_ca.model.sat.cnf cimport CnfFormula
 from prolothar_ca.model.sat.constraint_graph cimport ConstraintGraph
+from prolothar_ca.model.sat.term_factory cimport TermFactory
 
 cdef class Candidate:
 
@@ -32,7 +33,16 @@ cdef class Candidate:
     cdef public double total_cost
     cdef public double gain
     cdef public int iteration
+    cdef public bint is_materialized
     cdef __sat_solver
+    cdef list __screening_example_ids
+    cdef double __screening_confidence
+    cdef DataGraph __datagraph
+    cdef list __dataset
+    cdef TermFactory __term_factory
+    cdef int __nr_of_sampled_clauses_for_error
+
+    cpdef materialize(self)
 
     cpdef update_gain(
             self, int iteration, list model, double model_cost,
@@ -55,9 +65,11 @@ cdef class CountCandidate:
     cdef public double total_cost
     cdef public double gain
     cdef public double model_count
+    #change of the number of untrue clauses per example if this candidate is accepted
+    cdef public list nr_of_untrue_clauses_delta_per_example
 
     cpdef update_gain(
             self, int iteration, int total_nr_of_constraints_in_model,
             list other_count_constraints, double model_cost,
             list sat_encoded_dataset, DataGraph datagraph, double total_cost,
-            list model_count_list)
\ No newline at end of file
+            list model_count_list, list nr_of_untrue_model_clauses_per_example)
\ No newline at end of file
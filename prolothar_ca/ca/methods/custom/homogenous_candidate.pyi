@@ -21,6 +21,7 @@ from prolothar_ca.ca.methods.custom.model.custom_constraint import CustomConstra
 from prolothar_ca.ca.methods.custom.model.custom_constraint import DataGraph as DataGraph
 from prolothar_ca.ca.methods.custom.sat_encoding import SatEncodedExample as SatEncodedExample
 from prolothar_ca.model.sat.cnf import CnfFormula as CnfFormula
+from prolothar_ca.model.sat.term_factory import TermFactory as TermFactory
 from prolothar_ca.model.sat.variable import Value as Value, Variable as Variable
 from prolothar_ca.solver.sat.modelcount.model_counter import ModelCounter as ModelCounter
 from prolothar_ca.solver.sat.solver.solver import SatSolver as SatSolver
@@ -36,7 +37,9 @@ class Candidate:
     total_cost: int
     gain: Incomplete
     iteration: int
-    def __init__(self, constraint: CustomConstraint, datagraph: DataGraph, dataset: list[SatEncodedExample], sat_solver: SatSolver = ..., nr_of_sampled_clauses_for_error: int = 0) -> None: ...
+    is_materialized: bool
+    def __init__(self, constraint: CustomConstraint, datagraph: DataGraph, dataset: list[SatEncodedExample], term_factory: TermFactory, sat_solver: SatSolver = ..., nr_of_sampled_clauses_for_error: int = 0, screening_example_ids: list[int]|None = None, screening_confidence: float = 0.95, gain_bound: float|None = None) -> None: ...
+    def materialize(self): ...
     def update_gain(
             self, iteration: int, model: list[CustomConstraint], model_cost: float,
             model_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample],
@@ -19,6 +19,8 @@ from prolothar_common.mdl_utils cimport L_N, log2binom
 from prolothar_common.experiments.statistics cimport Statistics
 
 from prolothar_ca.ca.methods.custom.mdl_score cimport compute_encoded_data_length_from_known_solution_with_upperbound
+from prolothar_ca.ca.methods.custom.mdl_score cimport compute_encoded_data_length_from_known_solution_with_screening
+from prolothar_ca.ca.methods.custom.mdl_score cimport compute_lowerbound_of_summed_error_score
 from prolothar_ca.ca.methods.custom.mdl_score cimport compute_error_score
 from prolothar_ca.ca.methods.custom.mdl_score cimport estimate_error_score
 from prolothar_ca.ca.methods.custom.model.custom_constraint cimport Count
@@ -39,38 +41,82 @@ cdef class Candidate:
             list dataset,
             TermFactory term_factory,
             sat_solver: SatSolver = TwoSatSolver(),
-            int nr_of_sampled_clauses_for_error = 0):
+            int nr_of_sampled_clauses_for_error = 0,
+            list screening_example_ids = None,
+            double screening_confidence = 0.95,
+            gain_bound = None):
+        """
+        if gain_bound is None, the clauses and the initial gain of the
+        constraint are computed immediately. otherwise, the gain of the
+        candidate is set to the given lower bound of its initial gain and the
+        computation is deferred until "materialize" is called, e.g. when the
+        candidate reaches the top of the candidate queue.
+        """
         self.constraint = constraint
         self.replaced_constraint = None
         self.replaced_constraint_index = None
-        self.model_cnf = CnfFormula(self.constraint.compute_cnf_clauses(datagraph, term_factory))
         self.model_cost = 0
         self.data_cost = 0
         self.total_cost = 0
+        self.iteration = 0
+        self.__sat_solver = sat_solver
+        self.__screening_example_ids = screening_example_ids
+        self.__screening_confidence = screening_confidence
+        self.__datagraph = datagraph
+        self.__dataset = dataset
+        self.__term_factory = term_factory
+        self.__nr_of_sampled_clauses_for_error = nr_of_sampled_clauses_for_error
+        self.is_materialized = False
+        if gain_bound is None:
+            self.materialize()
+        else:
+            self.gain = gain_bound
+
+    cpdef materialize(self):
+        """
+        computes the clauses and the initial gain of the constraint
+        """
+        if self.is_materialized:
+            return
+        cdef list dataset = self.__dataset
+        cdef int nr_of_sampled_clauses_for_error = self.__nr_of_sampled_clauses_for_error
+        self.model_cnf = CnfFormula(self.constraint.compute_cnf_clauses(self.__datagraph, self.__term_factory))
         self.gain = (
             self.constraint.encoded_model_length -
             len(dataset) * len(self.model_cnf.get_variable_nr_set())
         )
         cdef bint at_least_one_example_satisfied = False
+        cdef double gain_lowerbound
         cdef int i
         if self.model_cnf.get_nr_of_clauses() == 0:
             self.gain = float('inf')
         else:
             self.gain += len(dataset)
-            for i,example in enumerate(dataset):
-                if nr_of_sampled_clauses_for_error <= 0:
-                    self.gain += compute_error_score(self.model_cnf, <dict>example, i)
-                else:
-                    self.gain += estimate_error_score(
-                        self.model_cnf, <dict>example, i, nr_of_sampled_clauses_for_error)
-                if self.model_cnf.get_nr_of_untrue_clauses_for_example(i) == 0:
-                    at_least_one_example_satisfied = True
-                if self.gain > 0:
-                    break
-            if not at_least_one_example_satisfied:
-                self.gain = float('inf')
-        self.iteration = 0
-        self.__sat_solver = sat_solver
+            if self.__screening_example_ids is not None:
+                gain_lowerbound = self.gain + compute_lowerbound_of_summed_error_score(
+                    self.model_cnf, dataset, self.__screening_example_ids,
+                    self.__screening_confidence, nr_of_sampled_clauses_for_error)
+            if self.__screening_example_ids is not None and gain_lowerbound > 0:
+                #with high confidence, the candidate does not lead to any compression
+                self.gain = gain_lowerbound
+            else:
+                for i,example in enumerate(dataset):
+                    if nr_of_sampled_clauses_for_error <= 0:
+                        self.gain += compute_error_score(self.model_cnf, <dict>example, i)
+                    else:
+                        self.gain += estimate_error_score(
+                            self.model_cnf, <dict>example, i, nr_of_sampled_clauses_for_error)
+                    if self.model_cnf.get_nr_of_untrue_clauses_for_example(i) == 0:
+                        at_least_one_example_satisfied = True
+                    if self.gain > 0:
+                        break
+                if not at_least_one_example_satisfied:
+                    self.gain = float('inf')
+        self.is_materialized = True
+        #only needed for the materialization
+        self.__datagraph = None
+        self.__dataset = None
+        self.__term_factory = None
 
     cpdef update_gain(
             self, int iteration, list model, double model_cost,
@@ -113,9 +159,15 @@ cdef class Candidate:
                     self.constraint.encoded_model_length
                 )
         try:
-            self.data_cost = compute_encoded_data_length_from_known_solution_with_upperbound(
-                self.model_cnf, sat_encoded_dataset, variables, sat_model_counter,
-                solution, total_cost)
+            if self.__screening_example_ids is None:
+                self.data_cost = compute_encoded_data_length_from_known_solution_with_upperbound(
+                    self.model_cnf, sat_encoded_dataset, variables, sat_model_counter,
+                    solution, total_cost)
+            else:
+                self.data_cost = compute_encoded_data_length_from_known_solution_with_screening(
+                    self.model_cnf, sat_encoded_dataset, variables, sat_model_counter,
+                    solution, total_cost, self.__screening_example_ids,
+                    self.__screening_confidence)
         except OverflowError:
             #we have a very high number of possible solutions for the boolean formula model
             self.data_cost = float('inf')
@@ -162,12 +214,21 @@ cdef class CountCandidate:
             self.gain += log2binom(
                 nr_of_variables, min(nr_of_variables // 2, nr_of_untrue_clauses))
         self.iteration = 0
+        self.nr_of_untrue_clauses_delta_per_example = []
 
     cpdef update_gain(
             self, int iteration, int total_nr_of_constraints_in_model,
             list other_count_constraints, double model_cost,
             list sat_encoded_dataset, DataGraph datagraph, double total_cost,
-            list model_count_list):
+            list model_count_list, list nr_of_untrue_model_clauses_per_example):
+        """
+        nr_of_untrue_model_clauses_per_example contains the number of untrue
+        clauses of the current model (including all count constraints) for
+        each example. the number of untrue clauses of the model with this
+        candidate is derived from these totals and the clauses of this
+        candidate and of the replaced constraint, i.e. the runtime does not
+        depend on the number of constraints in the model.
+        """
         cdef Count constraint, merged_constraint
         if self.replaced_constraint_index is not None:
             constraint = other_count_constraints[self.replaced_constraint_index]
@@ -200,15 +261,16 @@ cdef class CountCandidate:
         cdef int nr_of_errors
         cdef int j
         cdef int nr_of_variables = self.count_constraint.get_nr_of_target_variables()
-        cdef Count other_count_constraint
+        cdef int delta
+        self.nr_of_untrue_clauses_delta_per_example = []
         for j,example in enumerate(sat_encoded_dataset):
             for variable, variable_value in (<dict>example).items():
                 (<Variable>variable).value = <Value>variable_value
-            nr_of_errors = self.model_cnf.get_nr_of_untrue_clauses_for_example(j)
-            nr_of_errors += self.count_constraint.get_nr_of_untrue_clauses_for_example(datagraph, j)
-            for other_count_constraint in other_count_constraints:
-                if other_count_constraint is not self.replaced_constraint:
-                    nr_of_errors += (<Count>other_count_constraint).get_nr_of_untrue_clauses_for_example(datagraph, j)
+            delta = self.count_constraint.get_nr_of_untrue_clauses_for_example(datagraph, j)
+            if self.replaced_constraint is not None:
+                delta -= self.replaced_constraint.get_nr_of_untrue_clauses_for_example(datagraph, j)
+            self.nr_of_untrue_clauses_delta_per_example.append(delta)
+            nr_of_errors = <int>nr_of_untrue_model_clauses_per_example[j] + delta
             nr_of_errors = min(
                 nr_of_variables // 2,
                 <int>(ceil(nr_of_variables - nr_of_variables * (1 - 1 / nr_of_variables)**(nr_of_errors)))
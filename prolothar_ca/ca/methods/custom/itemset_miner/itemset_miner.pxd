@@ -25,6 +25,8 @@ cdef class ItemsetMiner:
     cdef __pattern_score
     cdef __random_seed
     cdef float __singleton_positive_support_threshold
+    cdef public size_t nr_of_calls
+    cdef public double cumulative_time
 
     cdef PatternScore __find_next_pattern(self, list singleton_patterns, y)
     cdef tuple __downsample_majority_class_if_necessary(self, list positive_list, list negative_list)
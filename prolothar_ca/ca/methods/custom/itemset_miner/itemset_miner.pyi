@@ -18,6 +18,8 @@
 from prolothar_ca.ca.methods.custom.itemset_miner.score import Mdl
 
 class ItemsetMiner:
+    nr_of_calls: int
+    cumulative_time: float
     def __init__(
             self, max_pattern_length: int = 3, downsample_itemset_majority_class: bool = False,
             crossover_found_itemsets: bool = False, random_seed: int|None = None,
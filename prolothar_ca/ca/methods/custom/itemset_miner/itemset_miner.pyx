@@ -26,6 +26,7 @@ from itertools import chain
 from random import Random
 import numpy as np
 from heapq import heappush, heappop
+from time import perf_counter
 from tqdm import tqdm
 
 from prolothar_common import validate
@@ -51,8 +52,18 @@ cdef class ItemsetMiner:
         self.__random_seed = random_seed
         self.__crossover_found_itemsets = crossover_found_itemsets
         self.__singleton_positive_support_threshold = singleton_positive_support_threshold
+        self.nr_of_calls = 0
+        self.cumulative_time = 0
 
     def find_patterns(self, positive_list: List[List[str]], negative_list: List[List[str]]) -> List[List[str]]:
+        cdef double start = perf_counter()
+        try:
+            return self.__find_patterns(positive_list, negative_list)
+        finally:
+            self.cumulative_time += perf_counter() - start
+            self.nr_of_calls += 1
+
+    def __find_patterns(self, positive_list: List[List[str]], negative_list: List[List[str]]) -> List[List[str]]:
         positive_list, negative_list = self.__downsample_majority_class_if_necessary(positive_list, negative_list)
         y = np.concatenate((
             np.ones((len(positive_list), ), dtype=bool),
@@ -27,6 +27,17 @@ cpdef double compute_encoded_data_length_from_known_solution_with_upperbound(
         dict variables, sat_model_counter: ModelCounter,
         dict solution, double upperbound)
 
+cpdef double compute_encoded_data_length_from_known_solution_with_screening(
+        CnfFormula candidate_cnf, list sat_encoded_dataset,
+        dict variables, sat_model_counter: ModelCounter,
+        dict solution, double upperbound,
+        list sampled_example_ids, double confidence)
+
+cpdef double compute_lowerbound_of_summed_error_score(
+        CnfFormula candidate_cnf, list sat_encoded_dataset,
+        list sampled_example_ids, double confidence,
+        int nr_of_sampled_clauses = *)
+
 cpdef double compute_encoded_planning_data_length_with_upperbound(
         list candidate_cnf_list, list sat_encoded_dataset, double upperbound)
 
@@ -22,5 +22,7 @@ from prolothar_ca.solver.sat.modelcount.model_counter import ModelCounter as Mod
 
 def compute_encoded_data_length_from_known_solution(candidate_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample], variables: dict[int, Variable], sat_model_counter: ModelCounter, solution: dict[Variable, Value]) -> float: ...
 def compute_encoded_data_length_from_known_solution_with_upperbound(candidate_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample], variables: dict[int, Variable], sat_model_counter: ModelCounter, solution: dict[Variable, Value], upperbound: float) -> float: ...
+def compute_encoded_data_length_from_known_solution_with_screening(candidate_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample], variables: dict[int, Variable], sat_model_counter: ModelCounter, solution: dict[Variable, Value], upperbound: float, sampled_example_ids: list[int], confidence: float) -> float: ...
+def compute_lowerbound_of_summed_error_score(candidate_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample], sampled_example_ids: list[int], confidence: float, nr_of_sampled_clauses: int = 0) -> float: ...
 def compute_encoded_data_length(candidate_cnf: CnfFormula, sat_encoded_dataset: list[SatEncodedExample], variables: dict[int, Variable], sat_model_counter: ModelCounter) -> float: ...
 def computed_encoded_length_of_example(candidate_cnf: CnfFormula, example: SatEncodedExample, variables: dict[int, Variable], sat_model_counter: ModelCounter) -> float: ...
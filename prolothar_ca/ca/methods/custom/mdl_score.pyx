@@ -15,7 +15,7 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from libc.math cimport ceil, log2
+from libc.math cimport ceil, log2, log, sqrt
 cimport cython
 from prolothar_common.mdl_utils cimport log2binom, L_N, prequential_coding_length
 from prolothar_ca.ca.methods.custom.sat_encoding import SatEncodedExample
@@ -73,6 +73,69 @@ cpdef double compute_encoded_data_length_from_known_solution_with_upperbound(
             return encoded_length
     return encoded_length
 
+@cython.cdivision(True)
+cpdef double compute_lowerbound_of_summed_error_score(
+        CnfFormula candidate_cnf, list sat_encoded_dataset,
+        list sampled_example_ids, double confidence,
+        int nr_of_sampled_clauses = 0):
+    """
+    estimates the sum of the error scores of all examples in the dataset from
+    the error scores of the sampled examples. returns a lowerbound of this sum
+    that holds with the given confidence (one-sided hoeffding bound for sampling
+    without replacement). the error score of a single example is bounded by
+    the scores for zero errors and for the maximum number of errors.
+    """
+    cdef int nr_of_samples = <int>len(sampled_example_ids)
+    cdef int nr_of_variables = <int>len(<dict>sat_encoded_dataset[0])
+    cdef double minimum_score = L_N(1)
+    cdef double score_range = (
+        L_N(nr_of_variables // 2 + 1) +
+        log2binom(nr_of_variables, nr_of_variables // 2) -
+        minimum_score
+    )
+    cdef double sampled_score = 0
+    cdef int example_id
+    for example_id in sampled_example_ids:
+        if nr_of_sampled_clauses <= 0:
+            sampled_score += compute_error_score(
+                candidate_cnf, <dict>sat_encoded_dataset[example_id], example_id)
+        else:
+            sampled_score += estimate_error_score(
+                candidate_cnf, <dict>sat_encoded_dataset[example_id], example_id,
+                nr_of_sampled_clauses)
+    cdef double mean_score_lowerbound = (
+        sampled_score / nr_of_samples -
+        score_range * sqrt(-log(1 - confidence) / (2 * nr_of_samples))
+    )
+    return len(sat_encoded_dataset) * max(minimum_score, mean_score_lowerbound)
+
+cpdef double compute_encoded_data_length_from_known_solution_with_screening(
+        CnfFormula candidate_cnf, list sat_encoded_dataset,
+        dict variables, sat_model_counter: ModelCounter,
+        dict solution, double upperbound,
+        list sampled_example_ids, double confidence):
+    """
+    two-stage version of compute_encoded_data_length_from_known_solution_with_upperbound.
+    the first stage uses the sampled examples to compute a lowerbound of the
+    encoded data length. if this lowerbound already exceeds the upperbound,
+    the lowerbound is returned. otherwise, the second stage computes the exact
+    encoded data length on the full dataset.
+    """
+    for variable, variable_value in (<dict>solution).items():
+        (<Variable>variable).value = <Value>variable_value
+    cdef double encoded_length = len(sat_encoded_dataset) * sat_model_counter.countlog2(candidate_cnf)
+    #one bit to encode true or false for each variable not in the model
+    encoded_length += len(sat_encoded_dataset) * (len(variables) - len(candidate_cnf.get_variable_nr_set()))
+    cdef double encoded_length_lowerbound = encoded_length + compute_lowerbound_of_summed_error_score(
+        candidate_cnf, sat_encoded_dataset, sampled_example_ids, confidence)
+    if encoded_length_lowerbound > upperbound:
+        return encoded_length_lowerbound
+    for i,example in enumerate(sat_encoded_dataset):
+        encoded_length += compute_error_score(candidate_cnf, <dict>example, <int>i)
+        if encoded_length > upperbound:
+            return encoded_length
+    return encoded_length
+
 cpdef double compute_encoded_planning_data_length_with_upperbound(
         list candidate_cnf_list, list sat_encoded_dataset, double upperbound):
     cdef double encoded_length = 0
@@ -109,18 +109,22 @@ cdef class DataGraph:
     cdef dict __target_relations
 
     cdef dict __create_cnf_clause_cache
-    cdef dict __get_feature_value_bounds_cache
+    cdef object __statistics
+    cdef list __target_variable_list_sorted_by_nr
+    cdef str __fingerprint
 
     cdef __target_relation
     cdef __db
     cdef str __create_table_suffix
     cdef bint __create_foreign_keys
+    cdef public size_t nr_of_sql_queries
+    cdef public double sql_query_time
 
     cpdef set compute_cnf_clauses(
         self, JoinTargetConstraint target_constraint, tuple additional_joins,
-        object cross_product_filter)
+        object cross_product_filter, Py_ssize_t limit=?, Py_ssize_t block_modulus=?)
     cdef CnfDisjunction __create_cnf_clause(self, tuple variables, JoinTargetConstraint target_constraint)
-    cpdef list query_variables(self, JoinTargetConstraint target_constraint, tuple additional_joins, object cross_product_filter)
+    cpdef list query_variables(self, JoinTargetConstraint target_constraint, tuple additional_joins, object cross_product_filter, Py_ssize_t limit=?, Py_ssize_t block_modulus=?)
     cdef tuple __create_variable_tuple_from_row(self, tuple row)
     cdef str __create_select_query_part(self, list target_variables)
     cdef str __create_join_query_part(self, tuple additional_joins, list target_variables)
@@ -131,7 +135,12 @@ cdef class DataGraph:
     cpdef Variable get_target_variable_by_number(self, object variable_nr)
     cpdef tuple get_target_variables_grouped_by_parameter_with_true_features(self, int parameter_index, list feature_name_list)
     cpdef tuple get_target_variables_grouped_by_parameter_with_false_features(self, int parameter_index, list feature_name_list)
-    cdef tuple __get_target_variables_by_group_query(self, str sql_query)
+    cdef tuple __get_target_variables_grouped_by_parameter(
+        self, int parameter_index, list feature_name_list, bint expected_feature_value)
+    cpdef object get_target_variable_group_ids(
+        self, int parameter_index, list feature_name_list, bint expected_feature_value)
+    cdef list __get_target_variable_list_sorted_by_nr(self)
+    cdef list __fetch_all(self, str sql_query)
     cpdef clear_caches(self)
     cpdef add_object_node(self, CaObject an_object, CaObjectType object_type, bint commit=?)
     cdef add_object_nodes_from_set(self, set object_set, CaObjectType object_type)
\ No newline at end of file
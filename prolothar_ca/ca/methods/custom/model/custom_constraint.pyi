@@ -27,6 +27,7 @@ from prolothar_ca.model.ca.dataset import CaDataset as CaDataset
 from prolothar_ca.model.ca.example import CaExample as CaExample
 from prolothar_ca.model.ca.obj import CaObject as CaObject, CaObjectType as CaObjectType
 from prolothar_ca.model.ca.relation import CaRelation as CaRelation, CaRelationType as CaRelationType
+from prolothar_ca.model.ca.statistics import DatasetStatistics as DatasetStatistics
 from prolothar_ca.model.sat.cnf import CnfDisjunction as CnfDisjunction
 from prolothar_ca.model.sat.variable import Variable
 from typing import Optional
@@ -90,6 +91,8 @@ class Count(CustomConstraint):
     def get_nr_of_untrue_clauses_for_example(self, datagraph: DataGraph, example_id: int) -> int: ...
 
 class DataGraph:
+    nr_of_sql_queries: int
+    sql_query_time: float
     def __init__(self, example: CaExample, dataset: CaDataset, target_relation: CaRelationType, max_nr_of_zeros: int = -1) -> None: ...
     def __del__(self) -> None: ...
     def add_object_type(self, object_type: CaObjectType): ...
@@ -103,8 +106,12 @@ class DataGraph:
     def get_target_variables(self) -> dict[int, Variable]: ...
     def get_target_relation_type(self) -> CaRelationType: ...
     def get_target_relation(self, variable_nr: int) -> CaRelation: ...
-    def compute_cnf_clauses(self, target_constraint: JoinTargetConstraint, additional_joins: tuple[int], cross_product_filter: CrossProductFilter) -> set[CnfDisjunction]: ...
-    def query_variables(self, target_constraint: JoinTargetConstraint, additional_joins: tuple[int], cross_product_filter: CrossProductFilter) -> list[tuple[Variable]]: ...
+    def compute_cnf_clauses(self, target_constraint: JoinTargetConstraint, additional_joins: tuple[int], cross_product_filter: CrossProductFilter, limit: int = -1, block_modulus: int = 1) -> set[CnfDisjunction]: ...
+    def query_variables(self, target_constraint: JoinTargetConstraint, additional_joins: tuple[int], cross_product_filter: CrossProductFilter, limit: int = -1, block_modulus: int = 1) -> list[tuple[Variable]]: ...
+    def get_statistics(self) -> DatasetStatistics: ...
     def get_feature_value_bounds(self, object_type: str, feature_name: str) -> tuple[Union[int, float], Union[int, float]]: ...
     def get_target_variables_grouped_by_parameter_with_true_features(self, parameter_index: int, feature_name_list: list[str]) -> tuple[tuple[Variable]]: ...
+    def get_target_variables_grouped_by_parameter_with_false_features(self, parameter_index: int, feature_name_list: list[str]) -> tuple[tuple[Variable]]: ...
+    def get_target_variable_group_ids(self, parameter_index: int, feature_name_list: list[str], expected_feature_value: bool) -> np.ndarray: ...
+    def get_fingerprint(self) -> str: ...
     def clear_caches(self): ...
\ No newline at end of file
@@ -17,11 +17,14 @@
 
 from math import floor
 from itertools import chain
+from collections import OrderedDict
+import hashlib
 import sqlite3
 from libc.math cimport log2
 import numpy as np
 from scipy.special.cython_special cimport binom
 from random import Random
+from time import perf_counter
 
 from cpython.tuple cimport PyTuple_GET_ITEM, PyTuple_New, PyTuple_GET_SIZE, PyTuple_SET_ITEM
 from cpython.dict cimport PyDict_GetItem
@@ -35,6 +38,7 @@ from prolothar_common.collections.tuple_utils cimport all_splits_of_size_k
 from prolothar_common.mdl_utils cimport log2binom, L_N
 
 from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.statistics import DatasetStatistics
 from prolothar_ca.model.ca.example cimport CaExample
 from prolothar_ca.model.ca.relation import CaRelation, CaRelationType
 from prolothar_ca.model.ca.variable_type cimport CaVariableType
@@ -57,6 +61,10 @@ from prolothar_ca.ca.methods.custom.model.datagraph_sql_constants import COLUMN_
 
 cdef double CONSTRAINT_TYPE_COST = log2(3)
 
+#dict[fingerprint of a DataGraph, dict[partition key, group ids]], least recently used first
+_VARIABLE_GROUP_IDS_CACHE = OrderedDict()
+cdef int _VARIABLE_GROUP_IDS_CACHE_SIZE = 8
+
 cdef class Partition:
 
     def __init__(self, double encoded_model_length):
@@ -581,7 +589,12 @@ cdef class DataGraph:
             self.__create_table_suffix = ''
             self.__create_foreign_keys = False
         self.__create_cnf_clause_cache = {}
-        self.__get_feature_value_bounds_cache = {}
+        self.__target_variable_list_sorted_by_nr = None
+        self.__fingerprint = None
+        #statistics of the objects in the datagraph, i.e. of the given example
+        self.__statistics = DatasetStatistics([example])
+        self.nr_of_sql_queries = 0
+        self.sql_query_time = 0
 
         cdef set object_set
         for object_type_name, object_set in example.all_objects_per_type.items():
@@ -617,7 +630,6 @@ cdef class DataGraph:
 
     cpdef clear_caches(self):
         self.__create_cnf_clause_cache.clear()
-        self.__get_feature_value_bounds_cache().clear()
 
     def __del__(self):
         self.__db.close()
@@ -834,9 +846,18 @@ cdef class DataGraph:
 
     cpdef set compute_cnf_clauses(
             self, JoinTargetConstraint target_constraint, tuple additional_joins,
-            cross_product_filter: CrossProductFilter):
+            cross_product_filter: CrossProductFilter, Py_ssize_t limit = -1,
+            Py_ssize_t block_modulus = 1):
+        """
+        if limit >= 0, at most limit clauses are created from the first rows
+        of the cross product, which bounds the runtime on large object sets.
+        if block_modulus > 1, only the rows whose first target variable number
+        is divisible by block_modulus are used, i.e. a block of the cross product.
+        """
         cdef set clauses = set()
-        for variables in self.query_variables(target_constraint, additional_joins, cross_product_filter):
+        for variables in self.query_variables(
+                target_constraint, additional_joins, cross_product_filter,
+                limit=limit, block_modulus=block_modulus):
             clauses.add(self.__create_cnf_clause(<tuple>variables, target_constraint))
         return clauses
 
@@ -861,19 +882,21 @@ cdef class DataGraph:
             self.__create_cnf_clause_cache[hash_key] = cnf_disjunction
             return cnf_disjunction
 
-    cpdef list query_variables(self, JoinTargetConstraint target_constraint, tuple additional_joins, cross_product_filter: CrossProductFilter):
+    cpdef list query_variables(
+            self, JoinTargetConstraint target_constraint, tuple additional_joins,
+            cross_product_filter: CrossProductFilter, Py_ssize_t limit = -1,
+            Py_ssize_t block_modulus = 1):
         cdef list target_variables = [*target_constraint.antecedent_terms]
         target_variables.append(target_constraint.consequent_term)
         sql_query = ' '.join((
             self.__create_select_query_part(target_variables),
             self.__create_join_query_part(additional_joins, target_variables),
             self.__create_relation_join_query_part(cross_product_filter),
-            self.__create_where_query_part(additional_joins, cross_product_filter),
+            self.__create_where_query_part(additional_joins, cross_product_filter, block_modulus),
+            f'LIMIT {limit}' if limit >= 0 else '',
             ';'
         ))
-        cursor = self.__db.execute(sql_query)
-        # cursor.arraysize = min(self.__nr_of_target_variables ** 2, LONG_MAX)
-        cdef list variable_result_list = <list>cursor.fetchall()
+        cdef list variable_result_list = self.__fetch_all(sql_query)
         cdef size_t i
         for i,row in enumerate(variable_result_list):
             variable_result_list[i] = self.__create_variable_tuple_from_row(<tuple>row)
@@ -933,7 +956,9 @@ cdef class DataGraph:
                 pass
         return ' AND '.join(join_criterion_list)
 
-    def __create_where_query_part(self, additional_joins: tuple[int], cross_product_filter: CrossProductFilter) -> str:
+    def __create_where_query_part(
+            self, additional_joins: tuple[int], cross_product_filter: CrossProductFilter,
+            block_modulus: int = 1) -> str:
         nr_of_target_parameters = len(self.__target_relation.parameter_types)
         return ''.join((
             'WHERE ',
@@ -941,77 +966,144 @@ cdef class DataGraph:
                 chain((
                     f'{self.__join_table_variable_name(i)}.{COLUMN_OBJECT_ID} != {self.__join_table_variable_name(nr_of_target_parameters + j)}.{COLUMN_OBJECT_ID}'
                     for j,i in enumerate(additional_joins)
-                ), cross_product_filter.yield_sql_where_clauses(self.__join_table_variable_name))
+                ), [
+                    f'{self.__target_table_variable_name(0)}.{COLUMN_VARIABLEN_NR} % {block_modulus} = 0'
+                ] if block_modulus > 1 else [], cross_product_filter.yield_sql_where_clauses(self.__join_table_variable_name))
             )
         ))
 
     def __target_table_variable_name(self, i: int) -> str:
         return f't{i}'
 
+    cdef list __fetch_all(self, str sql_query):
+        """
+        executes the given sql query and records the number of queries and their cumulative wall time
+        """
+        cdef double start = perf_counter()
+        cdef list result_list = <list>(self.__db.execute(sql_query).fetchall())
+        self.sql_query_time += perf_counter() - start
+        self.nr_of_sql_queries += 1
+        return result_list
+
     def __join_table_variable_name(self, i: int) -> str:
         return f'x{i}'
 
     def __relation_table_parameter_name(self, i: int) -> str:
         return f'p{i}'
 
+    def get_statistics(self) -> DatasetStatistics:
+        """
+        returns the statistics of the example of this datagraph
+        """
+        return self.__statistics
+
     def get_feature_value_bounds(self, object_type: str, feature_name: str) -> tuple:
-        hash_key = (object_type, feature_name)
         try:
-            return self.__get_feature_value_bounds_cache[hash_key]
+            feature_statistics = self.__statistics.get_feature_statistics(object_type, feature_name)
         except KeyError:
-            feature_bounds = self.__db.execute(f'SELECT MIN({feature_name}), MAX({feature_name}) FROM {object_type}').fetchone()
-            self.__get_feature_value_bounds_cache[hash_key] = feature_bounds
-            return feature_bounds
+            #there is no object of this type
+            return None, None
+        return feature_statistics.minimum, feature_statistics.maximum
 
     cpdef tuple get_target_variables_grouped_by_parameter_with_true_features(self, int parameter_index, list feature_name_list):
-        cdef str feature_name_list_query_part = ''
-        if feature_name_list:
-            where_query_list = []
-            for feature_name in feature_name_list:
-                where_query_list.append(f'{feature_name} = 1')
-            where_query_part = " AND ".join(where_query_list)
-            feature_name_list_query_part = (
-                f'INNER JOIN {self.__target_relation.parameter_types[parameter_index]} '
-                f'ON {self.__relation_table_parameter_name(parameter_index)} = {COLUMN_OBJECT_ID} '
-                f'WHERE {where_query_part} '
-            )
-        return self.__get_target_variables_by_group_query((
-            f'SELECT GROUP_CONCAT({COLUMN_VARIABLEN_NR}) FROM {self.__target_relation.name} '
-            f'{feature_name_list_query_part}'
-            f'GROUP BY {self.__relation_table_parameter_name(parameter_index)}'
-        ))
+        return self.__get_target_variables_grouped_by_parameter(parameter_index, feature_name_list, True)
 
     cpdef tuple get_target_variables_grouped_by_parameter_with_false_features(self, int parameter_index, list feature_name_list):
-        cdef str feature_name_list_query_part = ''
-        if feature_name_list:
-            where_query_list = []
-            for feature_name in feature_name_list:
-                where_query_list.append(f'{feature_name} = 0')
-            where_query_part = " AND ".join(where_query_list)
-            feature_name_list_query_part = (
-                f'INNER JOIN {self.__target_relation.parameter_types[parameter_index]} '
-                f'ON {self.__relation_table_parameter_name(parameter_index)} = {COLUMN_OBJECT_ID} '
-                f'WHERE {where_query_part} '
-            )
-        return self.__get_target_variables_by_group_query((
-            f'SELECT GROUP_CONCAT({COLUMN_VARIABLEN_NR}) FROM {self.__target_relation.name} '
-            f'{feature_name_list_query_part}'
-            f'GROUP BY {self.__relation_table_parameter_name(parameter_index)}'
-        ))
+        return self.__get_target_variables_grouped_by_parameter(parameter_index, feature_name_list, False)
+
+    cdef tuple __get_target_variables_grouped_by_parameter(
+            self, int parameter_index, list feature_name_list, bint expected_feature_value):
+        group_ids = self.get_target_variable_group_ids(parameter_index, feature_name_list, expected_feature_value)
+        cdef list variable_list = self.__get_target_variable_list_sorted_by_nr()
+        variable_indices = np.flatnonzero(group_ids >= 0)
+        #stable sort => variables in a group are ordered by their number
+        variable_indices = variable_indices[np.argsort(group_ids[variable_indices], kind='stable')]
+        group_sizes = np.bincount(group_ids[variable_indices])
+        cdef list variable_group_list = []
+        cdef int start = 0
+        for group_size in group_sizes.tolist():
+            variable_group_list.append(tuple([
+                variable_list[i] for i in variable_indices[start:start+group_size].tolist()
+            ]))
+            start += group_size
+        return tuple(variable_group_list)
 
-    cdef tuple __get_target_variables_by_group_query(self, str sql_query):
-        cdef list raw_result_list = (<list>self.__db.execute(sql_query).fetchall())
-        cdef tuple variable_group_tuple = PyTuple_New(PyList_GET_SIZE(raw_result_list))
-        cdef tuple variable_tuple
-        cdef list variable_nr_str_list
-        cdef int i,j
-        for j,raw_result in enumerate(raw_result_list):
-            variable_nr_str_list = <list>((<str>(PyTuple_GET_ITEM(raw_result, 0))).split(','))
-            variable_tuple = PyTuple_New(PyList_GET_SIZE(variable_nr_str_list))
-            for i,variable_nr_str in enumerate(variable_nr_str_list):
-                variable_i = <object>PyDict_GetItem(self.__variables, int(variable_nr_str))
-                Py_INCREF(variable_i)
-                PyTuple_SET_ITEM(variable_tuple, i, variable_i)
-            Py_INCREF(variable_tuple)
-            PyTuple_SET_ITEM(variable_group_tuple, j, variable_tuple)
-        return variable_group_tuple
+    cpdef object get_target_variable_group_ids(
+            self, int parameter_index, list feature_name_list, bint expected_feature_value):
+        """
+        groups the target variables by the object at the given parameter index.
+        only variables whose object has the expected value for all features
+        in feature_name_list are part of a group.
+
+        returns an integer array with one entry per target variable, ordered by
+        variable number, which is the id of the group of the variable or -1
+        if the variable is not part of any group. groups are numbered by the
+        order of the object ids. the result is cached by the fingerprint of the
+        datagraph, i.e. it is shared between datagraphs of the same data.
+        """
+        cache = _VARIABLE_GROUP_IDS_CACHE.get(self.get_fingerprint())
+        if cache is None:
+            cache = {}
+            _VARIABLE_GROUP_IDS_CACHE[self.get_fingerprint()] = cache
+            while len(_VARIABLE_GROUP_IDS_CACHE) > _VARIABLE_GROUP_IDS_CACHE_SIZE:
+                _VARIABLE_GROUP_IDS_CACHE.popitem(last=False)
+        else:
+            _VARIABLE_GROUP_IDS_CACHE.move_to_end(self.get_fingerprint())
+        cache_key = (parameter_index, tuple(feature_name_list), expected_feature_value)
+        group_ids = cache.get(cache_key)
+        if group_ids is None:
+            group_ids = self.__compute_target_variable_group_ids(
+                parameter_index, feature_name_list, expected_feature_value)
+            group_ids.flags.writeable = False
+            cache[cache_key] = group_ids
+        return group_ids
+
+    def __compute_target_variable_group_ids(
+            self, int parameter_index, list feature_name_list, bint expected_feature_value):
+        cdef list object_list = [
+            (<CaRelation>self.__target_relations[variable.nr]).objects[parameter_index]
+            for variable in self.__get_target_variable_list_sorted_by_nr()
+        ]
+        if not object_list:
+            return np.zeros(0, dtype=np.int64)
+        #sort-based grouping, the group ids are the ranks of the object ids
+        _, group_ids = np.unique(
+            np.array([(<CaObject>o).object_id for o in object_list]), return_inverse=True)
+        group_ids = group_ids.astype(np.int64).reshape(-1)
+        is_in_group = np.fromiter(
+            (
+                all((<CaObject>o).features[feature_name] == expected_feature_value for feature_name in feature_name_list)
+                for o in object_list
+            ),
+            dtype=bool, count=len(object_list))
+        #groups without any variable are removed
+        remaining_group_ids = np.unique(group_ids[is_in_group])
+        return np.where(is_in_group, np.searchsorted(remaining_group_ids, group_ids), -1)
+
+    cdef list __get_target_variable_list_sorted_by_nr(self):
+        if self.__target_variable_list_sorted_by_nr is None:
+            self.__target_variable_list_sorted_by_nr = [
+                self.__variables[variable_nr] for variable_nr in sorted(self.__variables)
+            ]
+        return self.__target_variable_list_sorted_by_nr
+
+    def get_fingerprint(self) -> str:
+        """
+        returns a hash of the target variables and the objects of the target
+        relations including their features. datagraphs created from the same
+        data have the same fingerprint.
+        """
+        if self.__fingerprint is None:
+            fingerprint = hashlib.sha256(self.__target_relation.name.encode())
+            object_dict = {}
+            for variable in self.__get_target_variable_list_sorted_by_nr():
+                relation = <CaRelation>self.__target_relations[variable.nr]
+                fingerprint.update(repr((variable.nr, tuple(
+                    ((<CaObject>o).type_name, (<CaObject>o).object_id) for o in relation.objects
+                ))).encode())
+                for o in relation.objects:
+                    object_dict[((<CaObject>o).type_name, (<CaObject>o).object_id)] = o
+            for key in sorted(object_dict):
+                fingerprint.update(repr((key, sorted((<CaObject>object_dict[key]).features.items()))).encode())
+            self.__fingerprint = fingerprint.hexdigest()
+        return self.__fingerprint
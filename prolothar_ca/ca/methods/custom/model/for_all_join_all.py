@@ -44,6 +44,18 @@ class ForAllJoinAll(CustomConstraint):
             tuple(range(self.target_relation_cardinality)),
             self.cross_product_filter)
 
+    def compute_sampled_cnf_clauses(self, datagraph: DataGraph, block_modulus: int) -> set[CnfDisjunction]:
+        """
+        returns the clauses of the block of the cross product in which the
+        number of the first target variable is divisible by block_modulus,
+        i.e. the full cross product is never materialized.
+        """
+        return datagraph.compute_cnf_clauses(
+            self.target_constraint,
+            tuple(range(self.target_relation_cardinality)),
+            self.cross_product_filter,
+            block_modulus=block_modulus)
+
     def merge(self, other: CustomConstraint) -> None|CustomConstraint:
         if isinstance(other, ForAllJoinAll) \
         and self.target_constraint == other.target_constraint:
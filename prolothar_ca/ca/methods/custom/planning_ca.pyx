@@ -31,6 +31,7 @@ from prolothar_ca.ca.methods.custom.model.custom_constraint cimport JoinTargetCo
 from prolothar_ca.ca.methods.custom.sat_encoding import create_heterogenous_sat_encoded_dataset
 from prolothar_ca.ca.methods.custom.itemset_miner.itemset_miner cimport ItemsetMiner
 from prolothar_ca.ca.methods.custom.ca_items import pattern_to_cross_product_filter
+from prolothar_ca.ca.methods.custom.report import AcquisitionReport
 
 from prolothar_ca.model.ca import CaDataset
 from prolothar_ca.model.ca.example cimport CaExample
@@ -42,6 +43,7 @@ from prolothar_ca.model.ca.format import TargetIsBooleanRelation
 from prolothar_ca.model.ca.targets import CaTarget
 from prolothar_ca.model.sat.cnf cimport CnfFormula
 from prolothar_ca.solver.sat.modelcount.one_sat import OneSatModelCounter
+from prolothar_ca.solver.sat.modelcount.instrumented_model_counter import InstrumentedModelCounter
 
 from prolothar_ca.model.ca.relation import CaRelationType
 from prolothar_ca.model.sat.term_factory cimport TermFactory
@@ -56,6 +58,9 @@ cdef class PlanningCustomCa:
     cdef ItemsetMiner __itemset_miner
     cdef int __max_nr_of_unobserved_transactions_per_example
     cdef __random_seed
+    cdef object __model_counter
+    cdef object __instrumented_model_counter
+    cdef object __report
 
     def __init__(
             self, verbose: bool = False, ItemsetMiner itemset_miner = None,
@@ -71,8 +76,37 @@ cdef class PlanningCustomCa:
             )
         self.__max_nr_of_unobserved_transactions_per_example = max_nr_of_unobserved_transactions_per_example
         self.__random_seed = random_seed
+        self.__model_counter = OneSatModelCounter()
+        self.__instrumented_model_counter = InstrumentedModelCounter(self.__model_counter)
 
     def acquire_constraints(self, dataset: CaDataset, target: CaTarget) -> List[CaConstraint]:
+        return self.__acquire_constraints(dataset, target, False)[0]
+
+    def acquire_constraints_with_report(
+            self, dataset: CaDataset, target: CaTarget) -> Tuple[List[CaConstraint], AcquisitionReport]:
+        """
+        same as acquire_constraints, but additionally returns runtime
+        statistics of this run (wall time per phase, candidate counts,
+        model counter calls, sql queries, itemset miner calls and peak rss)
+        """
+        return self.__acquire_constraints(dataset, target, True)
+
+    def __acquire_constraints(
+            self, dataset: CaDataset, target: CaTarget,
+            bint instrument_model_counter) -> Tuple[List[CaConstraint], AcquisitionReport]:
+        """
+        the model counter is only instrumented for acquire_constraints_with_report,
+        because measuring the time of each call is an overhead per call.
+        the model counter statistics of the report are 0 otherwise.
+        """
+        self.__report = AcquisitionReport()
+        if instrument_model_counter:
+            self.__instrumented_model_counter.reset()
+            self.__model_counter = self.__instrumented_model_counter
+        else:
+            self.__model_counter = self.__instrumented_model_counter.model_counter
+        cdef size_t itemset_miner_calls_before = self.__itemset_miner.nr_of_calls
+        cdef double itemset_miner_time_before = self.__itemset_miner.cumulative_time
         cdef TermFactory term_factory = TermFactory()
         discovered_constraints = []
         TargetIsBooleanRelation().validate(dataset, target)
@@ -80,7 +114,8 @@ cdef class PlanningCustomCa:
         first_example = next(iter(dataset))
         if self.__verbose:
             print('create data graphs')
-        datagraph_list = [DataGraph(example, dataset, target_relation) for example in dataset]
+        with self.__report.measure_phase('create_datagraph'):
+            datagraph_list = [DataGraph(example, dataset, target_relation) for example in dataset]
         nr_of_variables_per_type = {
             object_type: len(object_set)
             for object_type, object_set in first_example.all_objects_per_type.items()
@@ -91,23 +126,37 @@ cdef class PlanningCustomCa:
         )
         if self.__verbose:
             print('create sat encoded dataset')
-        sat_encoded_dataset = create_heterogenous_sat_encoded_dataset(
-            dataset, target_relation, datagraph_list)
+        with self.__report.measure_phase('sat_encoding'):
+            sat_encoded_dataset = create_heterogenous_sat_encoded_dataset(
+                dataset, target_relation, datagraph_list)
 
-        model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list = self.__find_model_with_simple_quantified_expressions(
-            dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph_list, target_relation, term_factory)
+        with self.__report.measure_phase('simple_quantified_expressions'):
+            model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list = self.__find_model_with_simple_quantified_expressions(
+                dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph_list, target_relation, term_factory)
 
-        model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list = self.__find_model_with_complex_quantified_expressions(
-            dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph_list, target_relation, term_factory,
-            model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list)
+        with self.__report.measure_phase('complex_quantified_expressions'):
+            model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list = self.__find_model_with_complex_quantified_expressions(
+                dataset, nr_of_target_relation_parameter_options, sat_encoded_dataset, datagraph_list, target_relation, term_factory,
+                model_cost, data_cost, total_cost, discovered_constraints, model_cnf_list)
 
         if self.__verbose:
             print(f'return model with {len(discovered_constraints)} constraints')
 
-        return [
-            constraint.to_ca_model(datagraph_list[0])
-            for constraint in discovered_constraints
-        ]
+        with self.__report.measure_phase('to_ca_model'):
+            ca_constraints = [
+                constraint.to_ca_model(datagraph_list[0])
+                for constraint in discovered_constraints
+            ]
+        if instrument_model_counter:
+            self.__report.model_counter_calls = self.__instrumented_model_counter.nr_of_calls
+            self.__report.model_counter_time = self.__instrumented_model_counter.cumulative_time
+        for datagraph in datagraph_list:
+            self.__report.sql_queries += (<DataGraph>datagraph).nr_of_sql_queries
+            self.__report.sql_query_time += (<DataGraph>datagraph).sql_query_time
+        self.__report.itemset_miner_calls = self.__itemset_miner.nr_of_calls - itemset_miner_calls_before
+        self.__report.itemset_miner_time = self.__itemset_miner.cumulative_time - itemset_miner_time_before
+        self.__report.measure_peak_rss()
+        return ca_constraints, self.__report
 
     def __find_model_with_simple_quantified_expressions(
             self, dataset: CaDataset, nr_of_target_relation_parameter_options: Tuple[int],
@@ -124,6 +173,8 @@ cdef class PlanningCustomCa:
         constraint_list = list(generate_for_all_cross_product_candidates(
             dataset, target_relation, nr_of_target_relation_parameter_options,
             create_feature_distance_candidates=True, is_for_planning_dataset=True))
+        self.__report.count_candidates('simple_quantified_expressions', 'generated', len(constraint_list))
+        self.__report.count_candidates('simple_quantified_expressions', 'scored', len(constraint_list))
         cdef list candidate_queue = []
         cdef Candidate candidate
         for constraint in tqdm(constraint_list, desc='create candidates', disable=not self.__verbose):
@@ -139,7 +190,8 @@ cdef class PlanningCustomCa:
             model_cost, data_cost, total_cost,
             sat_encoded_dataset,
             datagraph_list,
-            term_factory
+            term_factory,
+            'simple_quantified_expressions'
         )
         return (
             model_cost, data_cost, total_cost, discovered_constraints,
@@ -187,7 +239,8 @@ cdef class PlanningCustomCa:
             model_cost, data_cost, total_cost,
             sat_encoded_dataset,
             datagraph_list,
-            term_factory
+            term_factory,
+            'complex_quantified_expressions'
         )
         return (
             model_cost, data_cost, total_cost, discovered_constraints,
@@ -223,6 +276,8 @@ cdef class PlanningCustomCa:
                     if item not in item_set:
                         item_set.add(item)
                         pattern_list.append([item])
+        self.__report.count_candidates('complex_quantified_expressions', 'generated', len(pattern_list))
+        self.__report.count_candidates('complex_quantified_expressions', 'scored', len(pattern_list))
         for pattern in pattern_list:
             candidate = Candidate(
                 ForAll(
@@ -269,14 +324,13 @@ cdef class PlanningCustomCa:
             list model_cnf_list, double model_cost, double data_cost, double total_cost,
             list sat_encoded_dataset,
             list datagraph_list,
-            TermFactory term_factory) -> Tuple[float, float, float, List[CustomConstraint], CnfFormula]:
+            TermFactory term_factory, str phase) -> Tuple[float, float, float, List[CustomConstraint], CnfFormula]:
         heapify(candidate_queue)
         # we have defined in the Candidate class the model is empty in iteration 1
         cdef int iteration = 1 if not model else 2
         if self.__verbose:
             print(f'start with {len(candidate_queue)} candidates, L(D,M) = {total_cost:.2f}')
         cdef Candidate candidate
-        cdef object model_counter = OneSatModelCounter()
         while candidate_queue:
             candidate = <Candidate>heappop(candidate_queue)
             if candidate.iteration == iteration:
@@ -288,6 +342,7 @@ cdef class PlanningCustomCa:
                 model_cost = candidate.model_cost
                 data_cost = candidate.data_cost
                 total_cost = candidate.total_cost
+                self.__report.count_candidates(phase, 'accepted')
                 if self.__verbose:
                     print((
                         f'gained {abs(candidate.gain):.2f} bits with candidate "{candidate.constraint}", '
@@ -297,7 +352,8 @@ cdef class PlanningCustomCa:
             else:
                 candidate.update_gain(
                     iteration, model, model_cost, model_cnf_list,
-                    sat_encoded_dataset, total_cost, model_counter)
+                    sat_encoded_dataset, total_cost, self.__model_counter)
+                self.__report.count_candidates(phase, 'scored')
                 if candidate.gain < 0:
                     heappush(candidate_queue, candidate)
                 else:
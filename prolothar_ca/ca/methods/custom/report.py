@@ -0,0 +1,93 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from time import perf_counter
+import sys
+
+try:
+    import resource
+except ImportError:
+    #not available on Windows
+    resource = None
+
+@dataclass
+class AcquisitionReport:
+    """
+    runtime statistics of a single constraint acquisition run
+
+    Attributes
+    ----------
+    phase_times : dict[str, float]
+        wall time in seconds per phase of the acquisition run
+    candidate_counts : dict[str, dict[str, int]]
+        per phase, the number of "generated" constraint candidates,
+        the number of gain computations ("scored"), the number of candidates
+        that are discarded by a lowerbound of their gain without being scored
+        ("pruned") and the number of "accepted" candidates
+    model_counter_calls : int
+        number of calls to the model counter
+    model_counter_time : float
+        cumulative wall time in seconds spent in the model counter
+    sql_queries : int
+        number of sql queries (SELECT statements) executed by the DataGraph(s).
+        statements that create or fill the tables are not counted.
+    sql_query_time : float
+        cumulative wall time in seconds of the sql queries
+    itemset_miner_calls : int
+        number of calls to the itemset miner
+    itemset_miner_time : float
+        cumulative wall time in seconds spent in the itemset miner
+    peak_rss : int|None
+        peak resident set size of the process in bytes at the end of the run.
+        None if not supported by the operating system
+    """
+    phase_times: dict[str, float] = field(default_factory=dict)
+    candidate_counts: dict[str, dict[str, int]] = field(default_factory=dict)
+    model_counter_calls: int = 0
+    model_counter_time: float = 0
+    sql_queries: int = 0
+    sql_query_time: float = 0
+    itemset_miner_calls: int = 0
+    itemset_miner_time: float = 0
+    peak_rss: int|None = None
+
+    @contextmanager
+    def measure_phase(self, phase: str):
+        """
+        context manager that adds the wall time of its body to the given phase
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0) + perf_counter() - start
+
+    def count_candidates(self, phase: str, counter: str, increment: int = 1):
+        phase_counts = self.candidate_counts.setdefault(
+            phase, {'generated': 0, 'scored': 0, 'pruned': 0, 'accepted': 0})
+        phase_counts[counter] += increment
+
+    def measure_peak_rss(self):
+        if resource is not None:
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            #Linux reports kilobytes, macOS reports bytes
+            self.peak_rss = peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+    def to_dict(self) -> dict:
+        return asdict(self)
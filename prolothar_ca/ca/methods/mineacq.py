@@ -15,68 +15,23 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from dataclasses import dataclass
 from random import Random
 from typing import Iterable
 import numpy as np
-from tqdm import tqdm, trange
+from tqdm import tqdm
 
 from prolothar_ca.ca.methods.method import CaMethod
 from prolothar_ca.model.ca.constraints.boolean import Not, RelationIsTrue
 from prolothar_ca.model.ca.constraints.conjunction import Implies
 from prolothar_ca.model.ca.constraints.constraint import CaConstraint
-from prolothar_ca.model.ca.example import CaExample
-from prolothar_ca.model.ca.relation import CaRelation
 from prolothar_ca.model.ca.targets import CaTarget, RelationTarget
 
 from prolothar_ca.model.ca import CaDataset
 from prolothar_ca.model.ca.variable_type import CaBoolean
 
-@dataclass
-class ImpliesWrapper:
-
-    constraint: Implies
-    antecedent_not_holds_vector: np.ndarray
-    antecedent_not_holds_expected_vector: np.ndarray
-    probability_antecendent_not_holds: float
-    expected_probability_antecendent_not_holds: float
-    consequent_holds_vector: np.ndarray
-    expected_consequent_holds_vector: np.ndarray
-    probability_consequent_holds: float
-    expected_probability_consequent_holds: float
-
-    def compute_probability_that_constraint_holds(self) -> float:
-        return (
-            self.antecedent_not_holds_vector |
-            self.consequent_holds_vector
-        ).sum() / len(self.antecedent_not_holds_vector)
-
-    def compute_upper_bound_probability_that_constraint_holds(self) -> float:
-        return self.probability_antecendent_not_holds + self.probability_consequent_holds
-
-    def compute_lower_bound_probability_that_constraint_holds(self) -> float:
-        return max(
-            self.probability_antecendent_not_holds,
-            self.probability_consequent_holds
-        )
-
-    def compute_expected_probability_that_constraint_holds(self) -> float:
-        return (
-            self.antecedent_not_holds_expected_vector |
-            self.expected_consequent_holds_vector
-        ).sum() / len(self.antecedent_not_holds_expected_vector)
-
-    def compute_upper_bound_expected_probability_that_constraint_holds(self) -> float:
-        return (
-            self.expected_probability_antecendent_not_holds +
-            self.expected_probability_consequent_holds
-        )
-
-    def compute_lower_bound_expected_probability_that_constraint_holds(self) -> float:
-        return max(
-            self.expected_probability_antecendent_not_holds,
-            self.expected_probability_consequent_holds
-        )
+#number of antecedent relations for which the implication candidates are
+#evaluated with one matrix product
+BLOCK_SIZE = 256
 
 class MineAcq(CaMethod):
     """
@@ -113,117 +68,113 @@ class MineAcq(CaMethod):
         for relation_type in dataset.get_relation_types():
             if not isinstance(relation_type.value_type, CaBoolean):
                 raise NotImplementedError(relation_type)
-        pseudo_dataset = self.__generate_pseudo_dataset(dataset)
-        constraint_list = []
-        for candidate in self.__generate_candidate_constraints(
-            dataset, pseudo_dataset, target.relation_name):
-            p_c_upper_bound = candidate.compute_upper_bound_probability_that_constraint_holds()
-            expected_p_c_lower_bound = candidate.compute_lower_bound_expected_probability_that_constraint_holds()
-            if (1 - p_c_upper_bound) <= self.__rho or 1 - expected_p_c_lower_bound >= self.__tau * (1 - p_c_upper_bound):
-                p_c = candidate.compute_probability_that_constraint_holds()
-                expected_p_c = candidate.compute_expected_probability_that_constraint_holds()
-                if (1 - p_c) <= self.__rho or 1 - expected_p_c >= self.__tau * (1 - p_c):
-                    constraint_list.append(candidate.constraint)
-        return constraint_list
-
-    def __generate_candidate_constraints(
-            self, dataset: CaDataset, pseudo_dataset: CaDataset,
-            target_relation_name: str) -> Iterable[ImpliesWrapper]:
-        example = next(iter(dataset))
+        return list(self.__generate_constraints(dataset, target.relation_name))
+
+    def __generate_constraints(
+            self, dataset: CaDataset, target_relation_name: str) -> Iterable[CaConstraint]:
+        """
+        tests the candidates "r" and "r => t" and "r => not t" for all relations r and
+        all target relations t. the number of examples in which an implication does
+        not hold is computed for a block of antecedents at once by a matrix product of the
+        holds matrices. python objects are only created for accepted candidates.
+        """
         relation_is_true_constraint_list = []
-        relation_is_true_holds_vector_list = []
-        relation_is_false_holds_vector_list = []
-        probability_relation_is_true_list = []
-        expected_relation_is_true_holds_vector_list = []
-        expected_relation_is_false_holds_vector_list = []
-        expected_probability_relation_is_true_list = []
-        if self.__verbose:
-            print('precompute candidates marginal probabilities')
-        for relation_type in tqdm(dataset.get_relation_types(), disable=not self.__verbose):
-            for relation in tqdm(example.relations[relation_type.name], leave=False, disable=not self.__verbose):
-                constraint = RelationIsTrue(relation_type, tuple(o.object_id for o in relation.objects))
-                relation_is_true_constraint_list.append(constraint)
-                holds_vector = np.array([constraint.holds(example, {}) for example in dataset])
-                relation_is_true_holds_vector_list.append(holds_vector)
-                relation_is_false_holds_vector_list.append(~holds_vector)
-                probability_relation_is_true_list.append(holds_vector.sum() / len(holds_vector))
-                expected_holds_vector = np.array([constraint.holds(
-                    example, {}) for example in pseudo_dataset])
-                expected_relation_is_true_holds_vector_list.append(expected_holds_vector)
-                expected_relation_is_false_holds_vector_list.append(~expected_holds_vector)
-                expected_probability_relation_is_true_list.append(
-                    expected_holds_vector.sum() / len(expected_holds_vector))
-        if relation_is_false_holds_vector_list:
-            all_zero_vector = np.zeros_like(relation_is_false_holds_vector_list[0])
+        row_per_relation_and_objects = {}
+        example = next(iter(dataset))
+        for relation_type in dataset.get_relation_types():
+            row_per_objects = row_per_relation_and_objects.setdefault(relation_type.name, {})
+            for relation in example.relations[relation_type.name]:
+                object_ids = tuple(o.object_id for o in relation.objects)
+                row_per_objects[object_ids] = len(relation_is_true_constraint_list)
+                relation_is_true_constraint_list.append(RelationIsTrue(relation_type, object_ids))
+        if not relation_is_true_constraint_list:
+            return
+        holds_matrix, expected_holds_matrix = self.__create_holds_matrices(
+            dataset, row_per_relation_and_objects, len(relation_is_true_constraint_list))
+
+        target_rows = np.array([
+            i for i, constraint in enumerate(relation_is_true_constraint_list)
+            if constraint.get_relation_name() == target_relation_name
+        ], dtype=int)
+        nr_of_examples = holds_matrix.shape[1]
+        #counts are integers <= nr_of_examples and therefore exact in float32
+        dtype = np.float32 if nr_of_examples < 2**24 else np.float64
+        holds_count = holds_matrix.sum(axis=1)
+        expected_holds_count = expected_holds_matrix.sum(axis=1)
+        target_holds_matrix = holds_matrix[target_rows].T.astype(dtype)
+        expected_target_holds_matrix = expected_holds_matrix[target_rows].T.astype(dtype)
+
         if self.__verbose:
             print('generate and filter candidates')
-        for i in trange(len(relation_is_true_constraint_list), disable=not self.__verbose):
-            yield ImpliesWrapper(
-                relation_is_true_constraint_list[i],
-                all_zero_vector,
-                all_zero_vector,
-                0,
-                0,
-                relation_is_true_holds_vector_list[i],
-                expected_relation_is_true_holds_vector_list[i],
-                probability_relation_is_true_list[i],
-                expected_probability_relation_is_true_list[i]
-            )
-            for j in trange(len(relation_is_true_constraint_list), leave=False, disable=not self.__verbose):
-                if i != j and relation_is_true_constraint_list[j].get_relation_name() == target_relation_name:
-                    yield ImpliesWrapper(
-                        Implies(
-                            relation_is_true_constraint_list[i],
-                            relation_is_true_constraint_list[j]
-                        ),
-                        relation_is_false_holds_vector_list[i],
-                        expected_relation_is_false_holds_vector_list[i],
-                        1 - probability_relation_is_true_list[i],
-                        1 - expected_probability_relation_is_true_list[i],
-                        relation_is_true_holds_vector_list[j],
-                        expected_relation_is_true_holds_vector_list[j],
-                        probability_relation_is_true_list[j],
-                        expected_probability_relation_is_true_list[j]
-                    )
-                    yield ImpliesWrapper(
-                        Implies(
-                            relation_is_true_constraint_list[i],
-                            Not(relation_is_true_constraint_list[j])
-                        ),
-                        relation_is_false_holds_vector_list[i],
-                        expected_relation_is_false_holds_vector_list[i],
-                        1 - probability_relation_is_true_list[i],
-                        expected_probability_relation_is_true_list[i],
-                        relation_is_false_holds_vector_list[j],
-                        expected_relation_is_false_holds_vector_list[j],
-                        1 - probability_relation_is_true_list[j],
-                        1 - expected_probability_relation_is_true_list[j]
-                    )
-
-    def __generate_pseudo_dataset(self, dataset: CaDataset) -> CaDataset:
+        for block_start in tqdm(range(0, len(relation_is_true_constraint_list), BLOCK_SIZE),
+                                disable=not self.__verbose):
+            block = slice(block_start, block_start + BLOCK_SIZE)
+            both_true_count = holds_matrix[block].astype(dtype) @ target_holds_matrix
+            expected_both_true_count = (
+                expected_holds_matrix[block].astype(dtype) @ expected_target_holds_matrix)
+            #column 0: "r", column 1+2k: "r => t_k", column 2+2k: "r => not t_k"
+            nr_of_block_rows = both_true_count.shape[0]
+            nr_of_holds = np.empty((nr_of_block_rows, 1 + 2 * len(target_rows)), dtype=int)
+            expected_nr_of_holds = np.empty_like(nr_of_holds)
+            nr_of_holds[:,0] = holds_count[block]
+            nr_of_holds[:,1::2] = nr_of_examples - (holds_count[block,None] - both_true_count)
+            nr_of_holds[:,2::2] = nr_of_examples - both_true_count
+            expected_nr_of_holds[:,0] = expected_holds_count[block]
+            expected_nr_of_holds[:,1::2] = nr_of_examples - (
+                expected_holds_count[block,None] - expected_both_true_count)
+            expected_nr_of_holds[:,2::2] = nr_of_examples - expected_both_true_count
+
+            is_accepted = self.__is_accepted(
+                nr_of_holds / nr_of_examples, expected_nr_of_holds / nr_of_examples)
+            block_rows = np.arange(block_start, block_start + nr_of_block_rows)
+            is_same_relation = block_rows[:,None] == target_rows[None,:]
+            is_accepted[:,1::2] &= ~is_same_relation
+            is_accepted[:,2::2] &= ~is_same_relation
+
+            for i, column in zip(*np.nonzero(is_accepted)):
+                antecedent = relation_is_true_constraint_list[block_start + i]
+                if column == 0:
+                    yield antecedent
+                else:
+                    consequent = relation_is_true_constraint_list[target_rows[(column - 1) // 2]]
+                    if column % 2 == 1:
+                        yield Implies(antecedent, consequent)
+                    else:
+                        yield Implies(antecedent, Not(consequent))
+
+    def __is_accepted(self, p_c: np.ndarray, expected_p_c: np.ndarray) -> np.ndarray:
+        return ((1 - p_c) <= self.__rho) | (1 - expected_p_c >= self.__tau * (1 - p_c))
+
+    def __create_holds_matrices(
+            self, dataset: CaDataset, row_per_relation_and_objects: dict[str, dict[tuple, int]],
+            nr_of_rows: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        creates the boolean holds matrices with one row per relation of the first
+        example and one column per example. the second matrix is the
+        holds matrix of a pseudo dataset, in which the relation values of every
+        relation type are randomly permuted. the pseudo dataset is needed to compute
+        the expected probabilities.
+        """
         if self.__verbose:
-            print('generate pseudo dataset needed to compute expected probabilities')
-        pseudo_dataset = dataset.empty_copy()
-        for example in tqdm(dataset, disable=not self.__verbose):
-            shuffled_values = {
-                relation_type_name: [relation.value for relation in relation_set]
-                for relation_type_name, relation_set in example.relations.items()
-            }
-            for value_list in shuffled_values.values():
-                self.__random.shuffle(value_list)
-            pseudo_dataset.add_example(CaExample(
-                example.all_objects_per_type,
-                {
-                    relation_type_name: set(
-                        CaRelation(relation_type_name, relation.objects, shuffled_value)
-                        for relation, shuffled_value in zip(relation_set, shuffled_values[relation_type_name])
-                    )
-                    for relation_type_name, relation_set in example.relations.items()
-                },
-                example.is_valid_solution,
-                validate=False
-            ), validate=False)
-        return pseudo_dataset
+            print('create holds matrices')
+        holds_matrix = np.zeros((nr_of_rows, len(dataset)), dtype=bool)
+        expected_holds_matrix = np.zeros_like(holds_matrix)
+        for column, example in enumerate(tqdm(dataset, disable=not self.__verbose)):
+            for relation_type_name, relation_set in example.relations.items():
+                row_per_objects = row_per_relation_and_objects.get(relation_type_name, {})
+                rows = []
+                values = []
+                for relation in relation_set:
+                    rows.append(row_per_objects.get(tuple(o.object_id for o in relation.objects), -1))
+                    values.append(bool(relation.value))
+                shuffled_values = list(values)
+                self.__random.shuffle(shuffled_values)
+                rows = np.array(rows, dtype=int)
+                is_known_row = rows >= 0
+                rows = rows[is_known_row]
+                holds_matrix[rows, column] = np.array(values, dtype=bool)[is_known_row]
+                expected_holds_matrix[rows, column] = np.array(shuffled_values, dtype=bool)[is_known_row]
+        return holds_matrix, expected_holds_matrix
 
     def __repr__(self):
         return f'MineAcq(tau={self.__tau}, rho={self.__rho})'
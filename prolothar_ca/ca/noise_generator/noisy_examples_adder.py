@@ -39,6 +39,7 @@ class NoisyExamplesAdder(NoiseGenerator):
         self.__random.shuffle(example_list)
         for example in example_list[:int(self.__noise_proportion * len(dataset))]:
             self.__noise_generator.apply_on_example(example)
+        dataset.invalidate_statistics()
 
     def __repr__(self):
         return f'NoisyExamplesAdder({self.__noise_proportion}, {self.__random_seed}, {self.__noise_generator})'
\ No newline at end of file
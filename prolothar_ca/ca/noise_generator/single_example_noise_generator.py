@@ -27,6 +27,7 @@ class SingleExampleNoiseGenerator(NoiseGenerator):
         self.validate_usage_on_dataset(dataset)
         for example in dataset:
             self.apply_on_example(example)
+        dataset.invalidate_statistics()
 
     @abstractmethod
     def validate_usage_on_dataset(self, dataset: CaDataset):
@@ -37,5 +38,6 @@ class SingleExampleNoiseGenerator(NoiseGenerator):
     @abstractmethod
     def apply_on_example(self, example: CaExample):
         """
-        applies noise to the given example
+        applies noise to the given example. if the example is part of a dataset,
+        the statistics of the dataset must be invalidated afterwards.
         """
\ No newline at end of file
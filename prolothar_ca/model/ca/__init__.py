@@ -23,4 +23,5 @@ from prolothar_ca.model.ca.variable_type import CaNumber
 from prolothar_ca.model.ca.variable_type import CaBoolean
 from prolothar_ca.model.ca.relation import CaRelationType
 from prolothar_ca.model.ca.relation import CaRelation
-from prolothar_ca.model.ca.targets import FeatureValueTarget, RelationTarget
\ No newline at end of file
+from prolothar_ca.model.ca.targets import FeatureValueTarget, RelationTarget
+from prolothar_ca.model.ca.columnar import ColumnarCaDataset, write_columnar_dataset, read_columnar_dataset
@@ -0,0 +1,343 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+import os
+import json
+from typing import Iterator
+
+import numpy as np
+from prolothar_common import validate as validate_utils
+
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObjectType, CaObject
+from prolothar_ca.model.ca.relation import CaRelationType, CaRelation
+from prolothar_ca.model.ca.statistics import DatasetStatistics
+from prolothar_ca.model.ca.variable_type import CaVariableType, CaNumber, CaBoolean
+
+METADATA_FILE = 'metadata.json'
+FORMAT_VERSION = 1
+
+def write_columnar_dataset(dataset: CaDataset, directory: str):
+    """
+    writes the dataset in a columnar format into the given directory, which is
+    created if it does not exist. the dataset can be opened again with
+    read_columnar_dataset.
+
+    per object type, the features are stored in one column per feature
+    and the objects of example i are the rows offsets[i], ..., offsets[i+1]-1.
+    per relation type, the values are stored in one column and the objects
+    of the relations are stored as indices into the objects of the example,
+    where the objects of an example are ordered by object type and object id.
+    """
+    os.makedirs(directory, exist_ok=True)
+    object_types = dataset.get_object_types()
+    relation_types = dataset.get_relation_types()
+    nr_of_examples = len(dataset)
+
+    is_valid_solution = np.zeros(nr_of_examples, dtype=bool)
+    has_object_type = np.zeros((nr_of_examples, len(object_types)), dtype=bool)
+    has_relation_type = np.zeros((nr_of_examples, len(relation_types)), dtype=bool)
+    object_offsets = [[0] for _ in object_types]
+    object_ids = [[] for _ in object_types]
+    feature_values = [
+        [[] for _ in object_type.feature_definition] for object_type in object_types
+    ]
+    relation_offsets = [[0] for _ in relation_types]
+    relation_objects = [[] for _ in relation_types]
+    relation_values = [[] for _ in relation_types]
+
+    for example_index, example in enumerate(dataset):
+        is_valid_solution[example_index] = example.is_valid_solution
+        object_index = {}
+        for type_index, object_type in enumerate(object_types):
+            object_set = example.all_objects_per_type.get(object_type.name)
+            if object_set is not None:
+                has_object_type[example_index, type_index] = True
+                for o in sorted(object_set, key=lambda o: o.object_id):
+                    object_index[o] = len(object_index)
+                    object_ids[type_index].append(o.object_id)
+                    for feature_index, feature_name in enumerate(object_type.feature_definition):
+                        feature_values[type_index][feature_index].append(o.features[feature_name])
+            object_offsets[type_index].append(len(object_ids[type_index]))
+        for relation_index, relation_type in enumerate(relation_types):
+            relation_set = example.relations.get(relation_type.name)
+            if relation_set is not None:
+                has_relation_type[example_index, relation_index] = True
+                for relation in relation_set:
+                    relation_objects[relation_index].append([object_index[o] for o in relation.objects])
+                    relation_values[relation_index].append(relation.value)
+            relation_offsets[relation_index].append(len(relation_values[relation_index]))
+
+    metadata = {
+        'version': FORMAT_VERSION,
+        'nr_of_examples': nr_of_examples,
+        'object_types': [],
+        'relation_types': []
+    }
+    _save_column(directory, 'is_valid_solution', is_valid_solution)
+    _save_column(directory, 'has_object_type', has_object_type)
+    _save_column(directory, 'has_relation_type', has_relation_type)
+    for type_index, object_type in enumerate(object_types):
+        metadata['object_types'].append({
+            'name': object_type.name,
+            'features': [
+                {'name': feature_name, 'type': _variable_type_to_str(feature_type)}
+                for feature_name, feature_type in object_type.feature_definition.items()
+            ]
+        })
+        _save_column(directory, f'type_{type_index}_offsets', np.array(object_offsets[type_index], dtype=np.int64))
+        _save_column(directory, f'type_{type_index}_ids', np.array(object_ids[type_index], dtype=str))
+        for feature_index, feature_type in enumerate(object_type.feature_definition.values()):
+            _save_column(
+                directory, f'type_{type_index}_feature_{feature_index}',
+                _values_to_column(feature_values[type_index][feature_index], feature_type))
+    for relation_index, relation_type in enumerate(relation_types):
+        metadata['relation_types'].append({
+            'name': relation_type.name,
+            'parameter_types': list(relation_type.parameter_types),
+            'value_type': _variable_type_to_str(relation_type.value_type)
+        })
+        _save_column(directory, f'relation_{relation_index}_offsets', np.array(relation_offsets[relation_index], dtype=np.int64))
+        _save_column(
+            directory, f'relation_{relation_index}_objects',
+            np.array(relation_objects[relation_index], dtype=np.int64).reshape(
+                len(relation_values[relation_index]), len(relation_type.parameter_types)))
+        _save_column(
+            directory, f'relation_{relation_index}_values',
+            _values_to_column(relation_values[relation_index], relation_type.value_type))
+    with open(os.path.join(directory, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f)
+
+def read_columnar_dataset(directory: str) -> 'ColumnarCaDataset':
+    """
+    opens a dataset written by write_columnar_dataset. the columns are memory
+    mapped, i.e. only the parts that are accessed are read from disk.
+    """
+    return ColumnarCaDataset(directory)
+
+def _save_column(directory: str, column_name: str, column: np.ndarray):
+    np.save(os.path.join(directory, f'{column_name}.npy'), column, allow_pickle=False)
+
+def _values_to_column(values: list, variable_type: CaVariableType) -> np.ndarray:
+    if isinstance(variable_type, CaBoolean):
+        return np.array(values, dtype=bool)
+    if all(isinstance(value, (int, np.integer)) for value in values):
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=np.float64)
+
+def _variable_type_to_str(variable_type: CaVariableType) -> str:
+    validate_utils.is_in(type(variable_type), [CaBoolean, CaNumber])
+    return repr(variable_type)
+
+def _variable_type_from_str(variable_type: str) -> CaVariableType:
+    if variable_type == 'Boolean':
+        return CaBoolean()
+    if variable_type == 'Number':
+        return CaNumber()
+    raise ValueError(f'unknown variable type {variable_type}')
+
+class ColumnarCaDataset(CaDataset):
+    """
+    read-only CaDataset backed by memory mapped columns of a directory written
+    by write_columnar_dataset. CaExamples are materialized from the columns when
+    they are accessed. scoring code can work directly on the columns, e.g.
+    get_feature_column or get_relation_value_column.
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        validate_utils.equals(FORMAT_VERSION, metadata['version'])
+        self.__directory = directory
+        self.__nr_of_examples = metadata['nr_of_examples']
+        self.__object_type_names = [type_metadata['name'] for type_metadata in metadata['object_types']]
+        self.__feature_names = [
+            [feature['name'] for feature in type_metadata['features']]
+            for type_metadata in metadata['object_types']
+        ]
+        self.__relation_type_names = [relation_metadata['name'] for relation_metadata in metadata['relation_types']]
+        self.__type_index = {type_name: i for i, type_name in enumerate(self.__object_type_names)}
+        self.__relation_index = {relation_name: i for i, relation_name in enumerate(self.__relation_type_names)}
+        super().__init__(
+            {
+                type_metadata['name']: CaObjectType(type_metadata['name'], {
+                    feature['name']: _variable_type_from_str(feature['type'])
+                    for feature in type_metadata['features']
+                })
+                for type_metadata in metadata['object_types']
+            },
+            {
+                relation_metadata['name']: CaRelationType(
+                    relation_metadata['name'], tuple(relation_metadata['parameter_types']),
+                    _variable_type_from_str(relation_metadata['value_type']))
+                for relation_metadata in metadata['relation_types']
+            }
+        )
+        self.__statistics = None
+        self.__is_valid_solution = self.__load_column('is_valid_solution')
+        self.__has_object_type = self.__load_column('has_object_type')
+        self.__has_relation_type = self.__load_column('has_relation_type')
+        self.__object_offsets = [
+            self.__load_column(f'type_{i}_offsets') for i in range(len(self.__object_type_names))
+        ]
+        self.__object_ids = [
+            self.__load_column(f'type_{i}_ids') for i in range(len(self.__object_type_names))
+        ]
+        self.__feature_columns = [
+            [
+                self.__load_column(f'type_{i}_feature_{j}')
+                for j in range(len(self.__feature_names[i]))
+            ]
+            for i in range(len(self.__object_type_names))
+        ]
+        self.__relation_offsets = [
+            self.__load_column(f'relation_{i}_offsets') for i in range(len(self.__relation_type_names))
+        ]
+        self.__relation_objects = [
+            self.__load_column(f'relation_{i}_objects') for i in range(len(self.__relation_type_names))
+        ]
+        self.__relation_values = [
+            self.__load_column(f'relation_{i}_values') for i in range(len(self.__relation_type_names))
+        ]
+
+    def __load_column(self, column_name: str) -> np.ndarray:
+        return np.load(
+            os.path.join(self.__directory, f'{column_name}.npy'),
+            mmap_mode='r', allow_pickle=False)
+
+    def add_example(self, example: CaExample, validate: bool = True):
+        raise NotImplementedError('a ColumnarCaDataset is read-only. use to_ca_dataset() to get a modifiable copy')
+
+    def get_is_valid_solution_column(self) -> np.ndarray:
+        return self.__is_valid_solution
+
+    def get_object_offsets(self, type_name: str) -> np.ndarray:
+        """
+        the objects of the given type of example i are the rows
+        offsets[i], ..., offsets[i+1]-1 of the feature columns
+        """
+        return self.__object_offsets[self.__type_index[type_name]]
+
+    def get_object_id_column(self, type_name: str) -> np.ndarray:
+        return self.__object_ids[self.__type_index[type_name]]
+
+    def get_feature_column(self, type_name: str, feature_name: str) -> np.ndarray:
+        type_index = self.__type_index[type_name]
+        return self.__feature_columns[type_index][self.__feature_names[type_index].index(feature_name)]
+
+    def get_relation_offsets(self, relation_name: str) -> np.ndarray:
+        """
+        the relations of the given type of example i are the rows
+        offsets[i], ..., offsets[i+1]-1 of the relation columns
+        """
+        return self.__relation_offsets[self.__relation_index[relation_name]]
+
+    def get_relation_object_column(self, relation_name: str) -> np.ndarray:
+        """
+        returns an array with one row per relation and one column per parameter.
+        the values are the indices of the objects in an example, where the
+        objects of an example are ordered by object type and object id.
+        """
+        return self.__relation_objects[self.__relation_index[relation_name]]
+
+    def get_relation_value_column(self, relation_name: str) -> np.ndarray:
+        return self.__relation_values[self.__relation_index[relation_name]]
+
+    def get_example(self, example_index: int) -> CaExample:
+        """
+        materializes the example with the given index from the columns
+        """
+        if example_index < 0:
+            example_index += self.__nr_of_examples
+        if not 0 <= example_index < self.__nr_of_examples:
+            raise IndexError(example_index)
+        all_objects_per_type = {}
+        object_list = []
+        for type_index, type_name in enumerate(self.__object_type_names):
+            start = self.__object_offsets[type_index][example_index]
+            end = self.__object_offsets[type_index][example_index + 1]
+            feature_values = [
+                feature_column[start:end].tolist()
+                for feature_column in self.__feature_columns[type_index]
+            ]
+            object_set = set()
+            for i, object_id in enumerate(self.__object_ids[type_index][start:end].tolist()):
+                o = CaObject(object_id, type_name, {
+                    feature_name: feature_values[feature_index][i]
+                    for feature_index, feature_name in enumerate(self.__feature_names[type_index])
+                })
+                object_set.add(o)
+                object_list.append(o)
+            if self.__has_object_type[example_index, type_index]:
+                all_objects_per_type[type_name] = object_set
+        relations = {}
+        for relation_index, relation_name in enumerate(self.__relation_type_names):
+            if not self.__has_relation_type[example_index, relation_index]:
+                continue
+            start = self.__relation_offsets[relation_index][example_index]
+            end = self.__relation_offsets[relation_index][example_index + 1]
+            relations[relation_name] = {
+                CaRelation(relation_name, tuple(object_list[i] for i in object_indices), value)
+                for object_indices, value in zip(
+                    self.__relation_objects[relation_index][start:end].tolist(),
+                    self.__relation_values[relation_index][start:end].tolist())
+            }
+        return CaExample(
+            all_objects_per_type, relations,
+            bool(self.__is_valid_solution[example_index]), validate=False)
+
+    def __getitem__(self, example_index: int) -> CaExample:
+        return self.get_example(example_index)
+
+    def __len__(self):
+        return self.__nr_of_examples
+
+    def __iter__(self) -> Iterator[CaExample]:
+        for example_index in range(self.__nr_of_examples):
+            yield self.get_example(example_index)
+
+    def get_max_size_of_object_set(self) -> int:
+        return max(
+            (int(np.diff(offsets).max()) for offsets in self.__object_offsets if len(offsets) > 1),
+            default=0)
+
+    def get_statistics(self) -> DatasetStatistics:
+        """
+        the statistics are computed on the first call, which materializes all examples once
+        """
+        if self.__statistics is None:
+            self.__statistics = DatasetStatistics(list(self))
+        return self.__statistics
+
+    def compute_minimum_feature_value(self, object_type: CaObjectType, feature_name: str) -> float:
+        return self.get_feature_column(object_type.name, feature_name).min().item()
+
+    def compute_maximum_feature_value(self, object_type: CaObjectType, feature_name: str) -> float:
+        return self.get_feature_column(object_type.name, feature_name).max().item()
+
+    def to_ca_dataset(self) -> CaDataset:
+        """
+        materializes all examples into a modifiable CaDataset
+        """
+        dataset = self.empty_copy()
+        for example in self:
+            dataset.add_example(example, validate=False)
+        return dataset
+
+    def fast_deepcopy(self) -> CaDataset:
+        return self.to_ca_dataset()
@@ -0,0 +1,240 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from typing import Iterable
+
+import numpy as np
+
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.relation import CaRelationType
+
+class ObjectVariable:
+    """
+    binding of a variable to the objects of a type. indices is an integer
+    array with the object indices (see ExampleBatch.object_ids_per_type)
+    """
+    __slots__ = ('type_name', 'indices')
+
+    def __init__(self, type_name: str, indices: np.ndarray):
+        self.type_name = type_name
+        self.indices = indices
+
+class ExampleBatch:
+    """
+    numpy representation of examples with the same objects, which is used
+    to evaluate constraints on all examples of the batch at once
+    (see CaConstraint.holds_vectorized).
+
+    axis 0 of every array is the example axis. every variable that is bound by
+    a query gets its own new axis, i.e. a constraint with n quantified
+    variables is evaluated on an array with n+1 dimensions. arrays that do
+    not depend on a variable have size 1 at the corresponding axis.
+    feature and relation tensors are created lazily at first use.
+    """
+
+    def __init__(self, examples: list[CaExample]):
+        self.examples = examples
+        self.size = len(examples)
+        self.object_ids_per_type = {
+            type_name: sorted(o.object_id for o in object_set)
+            for type_name, object_set in examples[0].all_objects_per_type.items()
+        }
+        self.object_index_per_type = {
+            type_name: {object_id: i for i, object_id in enumerate(object_ids)}
+            for type_name, object_ids in self.object_ids_per_type.items()
+        }
+        self.nr_of_axes = 1
+        self.__object_id_codes = {}
+        self.__object_id_code_arrays = {}
+        self.__feature_arrays = {}
+        self.__boolean_relation_arrays = {}
+        self.__numeric_relation_arrays = {}
+
+    @staticmethod
+    def get_signature(example: CaExample) -> tuple:
+        """
+        examples with equal signature can be put into the same batch
+        """
+        return tuple(sorted(
+            (type_name, frozenset(o.object_id for o in object_set))
+            for type_name, object_set in example.all_objects_per_type.items()
+        ))
+
+    def new_axis(self) -> int:
+        """
+        reserves a new axis for a variable and returns its index
+        """
+        axis = self.nr_of_axes
+        self.nr_of_axes += 1
+        return axis
+
+    def along_axis(self, values: np.ndarray, axis: int) -> np.ndarray:
+        """
+        reshapes a one dimensional array such that its values are along the given axis
+        """
+        shape = [1] * (axis + 1)
+        shape[axis] = len(values)
+        return values.reshape(shape)
+
+    def get_object_index(self, type_name: str, object_id: str) -> int:
+        return self.object_index_per_type[type_name][object_id]
+
+    def has_object(self, type_name: str, object_id: str) -> bool:
+        try:
+            return object_id in self.object_index_per_type[type_name]
+        except KeyError:
+            return False
+
+    def get_feature(self, type_name: str, feature_name: str, indices) -> np.ndarray:
+        """
+        returns the values of a feature for the given object indices in all examples
+        """
+        try:
+            feature_array = self.__feature_arrays[(type_name, feature_name)]
+        except KeyError:
+            feature_array = np.array([
+                [
+                    example.get_object_by_type_and_id(type_name, object_id).features[feature_name]
+                    for object_id in self.object_ids_per_type[type_name]
+                ]
+                for example in self.examples
+            ])
+            self.__feature_arrays[(type_name, feature_name)] = feature_array
+        indices = np.asarray(indices)
+        return feature_array[self.__batch_indices(indices.ndim), indices]
+
+    def get_boolean_relation(self, relation_type: CaRelationType, parameters: list) -> np.ndarray:
+        """
+        returns the values of a boolean relation for the given parameters, which are
+        object indices. relations that are not part of an example are False.
+        """
+        try:
+            relation_array = self.__boolean_relation_arrays[relation_type.name]
+        except KeyError:
+            relation_array = self.__create_relation_array(relation_type, False, bool)
+            self.__boolean_relation_arrays[relation_type.name] = relation_array
+        return self.__lookup_relation(relation_array, parameters)
+
+    def get_numeric_relation(self, relation_type: CaRelationType, parameters: list) -> np.ndarray:
+        """
+        returns the values of a numeric relation for the given parameters, which are
+        object indices. relations that are not part of an example are nan.
+        """
+        try:
+            relation_array = self.__numeric_relation_arrays[relation_type.name]
+        except KeyError:
+            relation_array = self.__create_relation_array(relation_type, np.nan, float)
+            self.__numeric_relation_arrays[relation_type.name] = relation_array
+        return self.__lookup_relation(relation_array, parameters)
+
+    def get_object_id_codes(self, type_name: str|None, indices) -> np.ndarray:
+        """
+        returns integer codes of object ids, such that objects (also of different types)
+        have the same code if and only if they have the same object id.
+        if type_name is None, indices is an object id.
+        """
+        if type_name is None:
+            try:
+                return np.asarray(self.__object_id_codes[indices])
+            except KeyError:
+                self.__object_id_codes[indices] = len(self.__object_id_codes)
+                return np.asarray(self.__object_id_codes[indices])
+        try:
+            code_array = self.__object_id_code_arrays[type_name]
+        except KeyError:
+            code_array = np.array([
+                self.__object_id_codes.setdefault(object_id, len(self.__object_id_codes))
+                for object_id in self.object_ids_per_type[type_name]
+            ], dtype=int)
+            self.__object_id_code_arrays[type_name] = code_array
+        return code_array[indices]
+
+    def __create_relation_array(self, relation_type: CaRelationType, default_value, dtype) -> np.ndarray:
+        object_index_per_type = [
+            self.object_index_per_type[type_name]
+            for type_name in relation_type.parameter_types
+        ]
+        relation_array = np.full(
+            (self.size,) + tuple(map(len, object_index_per_type)), default_value, dtype=dtype)
+        for i, example in enumerate(self.examples):
+            for relation in example.relations.get(relation_type.name, ()):
+                relation_array[(i,) + tuple(
+                    object_index[o.object_id]
+                    for object_index, o in zip(object_index_per_type, relation.objects)
+                )] = relation.value
+        return relation_array
+
+    def __lookup_relation(self, relation_array: np.ndarray, parameters: list) -> np.ndarray:
+        parameters = align(*parameters)
+        ndim = max((p.ndim for p in parameters), default=1)
+        return relation_array[(self.__batch_indices(ndim),) + tuple(parameters)]
+
+    def __batch_indices(self, ndim: int) -> np.ndarray:
+        return np.arange(self.size).reshape((self.size,) + (1,) * max(ndim - 1, 0))
+
+def align(*arrays) -> list[np.ndarray]:
+    """
+    appends axes of size 1 to all given arrays, such that all arrays have the
+    same number of dimensions. this is necessary because numpy broadcasting
+    aligns the last axes, but axes of an ExampleBatch are numbered from the front.
+    """
+    arrays = [np.asarray(a) for a in arrays]
+    ndim = max(a.ndim for a in arrays)
+    return [
+        a if a.ndim in (0, ndim) else a.reshape(a.shape + (1,) * (ndim - a.ndim))
+        for a in arrays
+    ]
+
+def evaluate_constraint_on_examples(
+        constraint, examples: Iterable[CaExample]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    evaluates a constraint on all given examples. examples with the same objects
+    are evaluated together in one batch by CaConstraint.holds_vectorized.
+    if a part of the constraint does not support vectorized evaluation,
+    the examples are evaluated one by one with CaConstraint.holds.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        a boolean array that is True for all examples in which the constraint holds
+        and an integer array with the number of violations per example. the
+        number of violations of a ForAll constraint is the number of elements of
+        its query for which the inner constraint does not hold. for all
+        other constraints, it is 1 if the constraint does not hold.
+    """
+    examples = list(examples)
+    holds = np.ones(len(examples), dtype=bool)
+    nr_of_violations = np.zeros(len(examples), dtype=int)
+    example_ids_per_signature = {}
+    for i, example in enumerate(examples):
+        example_ids_per_signature.setdefault(ExampleBatch.get_signature(example), []).append(i)
+    for example_ids in example_ids_per_signature.values():
+        batch = ExampleBatch([examples[i] for i in example_ids])
+        try:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                batch_violations = _flatten(constraint.count_violations_vectorized(batch, {}), batch.size)
+        except NotImplementedError:
+            batch_violations = np.array([
+                0 if constraint.holds(example, {}) else 1 for example in batch.examples
+            ], dtype=int)
+        nr_of_violations[example_ids] = batch_violations
+        holds[example_ids] = batch_violations == 0
+    return holds, nr_of_violations
+
+def _flatten(array: np.ndarray, size: int) -> np.ndarray:
+    array = np.asarray(array)
+    return np.broadcast_to(array.reshape(array.shape[0] if array.ndim > 0 else 1), (size,))
@@ -18,11 +18,15 @@
 from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM, PyTuple_GET_ITEM, PyTuple_GET_SIZE
 from cpython.ref cimport Py_INCREF
 
+import numpy as np
+
 from prolothar_ca.model.ca.constraints.conjunction import Or
 from prolothar_ca.model.ca.constraints.constraint cimport CaConstraint
+from prolothar_ca.model.ca.constraints.constraint import union_of_referenced_names
 from prolothar_ca.model.ca.obj cimport CaObject
 from prolothar_ca.model.ca.relation cimport CaRelationType
 from prolothar_ca.model.ca.example cimport CaExample
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch
 
 cpdef tuple _create_relation_parameters(
         tuple object_id_list, tuple parameter_types,
@@ -41,6 +45,24 @@ cpdef tuple _create_relation_parameters(
         PyTuple_SET_ITEM(relation_parameters, i, an_object)
     return relation_parameters
 
+def _create_relation_parameters_vectorized(
+        tuple object_id_list, tuple parameter_types,
+        batch: ExampleBatch, dict variables) -> list:
+    cdef list relation_parameters = []
+    for type_name, object_id in zip(parameter_types, object_id_list):
+        try:
+            relation_parameters.append(variables[object_id].indices)
+        except KeyError:
+            relation_parameters.append(batch.get_object_index(type_name, object_id))
+    return relation_parameters
+
+def _get_feature_vectorized(
+        batch: ExampleBatch, dict variables, str object_type, str object_id, str feature_name):
+    if batch.has_object(object_type, object_id):
+        return batch.get_feature(object_type, feature_name, batch.get_object_index(object_type, object_id))
+    variable = variables[object_id]
+    return batch.get_feature(variable.type_name, feature_name, variable.indices)
+
 cdef class RelationIsTrue(CaConstraint):
 
     def __init__(self, CaRelationType relation_type, tuple object_id_list):
@@ -56,9 +78,21 @@ cdef class RelationIsTrue(CaConstraint):
                 self.__object_id_list, self.__relation_type.parameter_types,
                 example, variables))
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return batch.get_boolean_relation(
+            self.__relation_type, _create_relation_parameters_vectorized(
+                self.__object_id_list, self.__relation_type.parameter_types,
+                batch, variables))
+
     cpdef str get_relation_name(self):
         return self.__relation_type.name
 
+    def get_object_id_list(self) -> tuple[str]:
+        return self.__object_id_list
+
+    def get_referenced_names(self) -> set[str]:
+        return set(self.__object_id_list)
+
     def count_nr_of_terms(self) -> int:
         return 1
 
@@ -93,12 +127,21 @@ cdef class RelationIsFalse(CaConstraint):
                 self.__object_id_list, self.__relation_type.parameter_types,
                 example, variables))
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.logical_not(batch.get_boolean_relation(
+            self.__relation_type, _create_relation_parameters_vectorized(
+                self.__object_id_list, self.__relation_type.parameter_types,
+                batch, variables)))
+
     def count_nr_of_terms(self) -> int:
         return 1
 
     def count_nr_of_preconditions(self) -> int:
         return 1
 
+    def get_referenced_names(self) -> set[str]:
+        return set(self.__object_id_list)
+
     def __str__(self) -> str:
         return f'!{self.__relation_type.name}({",".join(self.__object_id_list)})'
 
@@ -123,6 +166,9 @@ cdef class Not(CaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return not self.__constraint.holds(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.logical_not(self.__constraint.holds_vectorized(batch, variables))
+
     def count_nr_of_terms(self) -> int:
         nr_of_terms_in_constraint = self.__constraint.count_nr_of_terms()
         if nr_of_terms_in_constraint == 1:
@@ -137,6 +183,9 @@ cdef class Not(CaConstraint):
         else:
             return 1 + nr_of_terms_in_constraint
 
+    def get_referenced_names(self) -> set[str]|None:
+        return self.__constraint.get_referenced_names()
+
     def __str__(self) -> str:
         return f'!{self.__constraint}'
 
@@ -153,9 +202,17 @@ cdef class BooleanFeatureIsTrue(CaConstraint):
             the_object = variables[self.__object_id]
         return <bint>((<CaObject>the_object).features[self.__feature_name])
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return _get_feature_vectorized(
+            batch, variables, self.__object_type, self.__object_id,
+            self.__feature_name).astype(bool)
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return isinstance(other, Or) and self in other.term_list
 
+    def get_referenced_names(self) -> set[str]:
+        return {self.__object_id}
+
     def __str__(self) -> str:
         return f'{self.__object_id}.{self.__feature_name}'
 
@@ -178,9 +235,17 @@ cdef class BooleanFeatureIsFalse(CaConstraint):
             the_object = variables[self.__object_id]
         return not (<bint>(<CaObject>the_object).features[self.__feature_name])
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.logical_not(_get_feature_vectorized(
+            batch, variables, self.__object_type, self.__object_id,
+            self.__feature_name).astype(bool))
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return isinstance(other, Or) and self in other.term_list
 
+    def get_referenced_names(self) -> set[str]:
+        return {self.__object_id}
+
     def __str__(self) -> str:
         return f'!{self.__object_id}.{self.__feature_name}'
 
@@ -18,7 +18,11 @@
 from dataclasses import dataclass
 from typing import Generator
 
-from prolothar_ca.model.ca.constraints.constraint import CaConstraint
+import numpy as np
+
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, align
+
+from prolothar_ca.model.ca.constraints.constraint import CaConstraint, union_of_referenced_names
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.obj import CaObject
 
@@ -32,6 +36,12 @@ cdef class And(CaConstraint):
                 return False
         return True
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        result = np.asarray(True)
+        for term in self.term_list:
+            result = np.logical_and(*align(result, (<CaConstraint>term).holds_vectorized(batch, variables)))
+        return result
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return other in self.term_list or (
             isinstance(other, And) and set(other.term_list).issubset(self.term_list)
@@ -40,6 +50,9 @@ cdef class And(CaConstraint):
     def __hash__(self) -> int:
         return hash(str(self))
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names(self.term_list)
+
     def __str__(self) -> str:
         return f'({" and ".join(str(t) for t in self.term_list)})'
 
@@ -59,6 +72,12 @@ cdef class Or(CaConstraint):
                 return True
         return False
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        result = np.asarray(False)
+        for term in self.term_list:
+            result = np.logical_or(*align(result, (<CaConstraint>term).holds_vectorized(batch, variables)))
+        return result
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return isinstance(other, Or) and set(self.term_list).issubset(other.term_list)
 
@@ -71,6 +90,9 @@ cdef class Or(CaConstraint):
     def __hash__(self) -> int:
         return hash(str(self))
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names(self.term_list)
+
     def __str__(self) -> str:
         return f'({" or ".join(str(t) for t in self.term_list)})'
 
@@ -83,6 +105,12 @@ cdef class Implies(CaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return not self.__antecedent.holds(example, variables) or self.__consequent.holds(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        antecedent_holds, consequent_holds = align(
+            self.__antecedent.holds_vectorized(batch, variables),
+            self.__consequent.holds_vectorized(batch, variables))
+        return np.logical_or(np.logical_not(antecedent_holds), consequent_holds)
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return isinstance(other, Or) and self in other.term_list
 
@@ -95,6 +123,9 @@ cdef class Implies(CaConstraint):
     def __hash__(self) -> int:
         return hash(str(self))
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.__antecedent, self.__consequent))
+
     def __str__(self) -> str:
         return f'{self.__antecedent} -> {self.__consequent}'
 
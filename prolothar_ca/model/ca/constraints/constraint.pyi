@@ -17,6 +17,8 @@
 
 from prolothar_ca.model.ca.dataset import CaDataset, CaExample
 from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, ObjectVariable
+import numpy as np
 
 class CaConstraint:
 
@@ -39,6 +41,38 @@ class CaConstraint:
         """
         ...
 
+    def holds_vectorized(self, batch: ExampleBatch, variables: dict[str, ObjectVariable|np.ndarray]) -> np.ndarray:
+        """
+        decides for all examples of a batch at once whether this constraint holds
+
+        Parameters
+        ----------
+        batch : ExampleBatch
+            examples with the same objects
+        variables : dict[str, ObjectVariable|np.ndarray]
+            named variables that can be used in constraints. variables bound
+            to objects are ObjectVariable, numeric variables are numpy arrays
+
+        Returns
+        -------
+        np.ndarray
+            boolean array. axis 0 is the example axis, see ExampleBatch for
+            the other axes
+
+        Raises
+        ------
+        NotImplementedError
+            if this constraint does not support vectorized evaluation
+        """
+        ...
+
+    def count_violations_vectorized(self, batch: ExampleBatch, variables: dict[str, ObjectVariable|np.ndarray]) -> np.ndarray:
+        """
+        counts for all examples of a batch at once how often this constraint is violated.
+        the default is 1 if the constraint does not hold, 0 otherwise.
+        """
+        ...
+
     def is_more_restrictive(self, other: 'CaConstraint') -> bool:
         """
         returns True if the object space for which this constraint holds is a subspace
@@ -46,6 +80,13 @@ class CaConstraint:
         """
         ...
 
+    def get_referenced_names(self) -> set[str]|None:
+        """
+        returns the names of all variables and objects this constraint refers to.
+        None if the names are unknown, e.g. for constraints with nested queries.
+        """
+        ...
+
     def compute_probability_that_constraint_holds(self, dataset: CaDataset) -> float:
         """
         returns number of examples in the dataset for which the constraint holds
@@ -15,7 +15,23 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
+import numpy as np
+
 from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, evaluate_constraint_on_examples
+
+def union_of_referenced_names(parts) -> set|None:
+    """
+    returns the union of the referenced names of the given constraints or
+    numeric expressions. None if the referenced names of a part are unknown.
+    """
+    cdef set referenced_names = set()
+    for part in parts:
+        part_referenced_names = part.get_referenced_names()
+        if part_referenced_names is None:
+            return None
+        referenced_names.update(part_referenced_names)
+    return referenced_names
 
 cdef class CaConstraint:
 
@@ -38,6 +54,38 @@ cdef class CaConstraint:
         """
         raise NotImplementedError()
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        """
+        decides for all examples of a batch at once whether this constraint holds
+
+        Parameters
+        ----------
+        batch : ExampleBatch
+            examples with the same objects
+        variables : dict[str, ObjectVariable|np.ndarray]
+            named variables that can be used in constraints. variables bound
+            to objects are ObjectVariable, numeric variables are numpy arrays
+
+        Returns
+        -------
+        np.ndarray
+            boolean array. axis 0 is the example axis, see ExampleBatch for
+            the other axes
+
+        Raises
+        ------
+        NotImplementedError
+            if this constraint does not support vectorized evaluation
+        """
+        raise NotImplementedError(type(self))
+
+    def count_violations_vectorized(self, batch: ExampleBatch, dict variables):
+        """
+        counts for all examples of a batch at once how often this constraint is violated.
+        the default is 1 if the constraint does not hold, 0 otherwise.
+        """
+        return np.logical_not(self.holds_vectorized(batch, variables)).astype(int)
+
     def is_more_restrictive(self, other: 'CaConstraint') -> bool:
         """
         returns True if the object space for which this constraint holds is a subspace
@@ -45,16 +93,19 @@ cdef class CaConstraint:
         """
         raise NotImplementedError()
 
+    def get_referenced_names(self) -> set[str]|None:
+        """
+        returns the names of all variables and objects this constraint refers to.
+        None if the names are unknown, e.g. for constraints with nested queries.
+        """
+        return None
+
     def compute_probability_that_constraint_holds(self, dataset: CaDataset) -> float:
         """
         returns number of examples in the dataset for which the constraint holds
         divided by the total number of examples in the dataset.
         """
-        count = 0
-        for example in dataset:
-            if self.holds(example, {}):
-                count += 1
-        return count / len(dataset)
+        return float(np.mean(evaluate_constraint_on_examples(self, dataset)[0]))
 
     def count_nr_of_terms(self) -> int:
         """
@@ -0,0 +1,222 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.constraints.constraint import CaConstraint
+from prolothar_ca.model.ca.constraints.boolean import RelationIsTrue
+from prolothar_ca.model.ca.constraints.conjunction import And
+from prolothar_ca.model.ca.constraints.numeric import Equal, NumericFeature
+from prolothar_ca.model.ca.constraints.objects import ObjectsEqual
+
+class ObjectIdJoin:
+    """
+    hash join for "a = b" where a and b are object variables
+    """
+    def __init__(self, new_variable: str, bound_variable: str):
+        self.new_variable = new_variable
+        self.bound_variable = bound_variable
+
+    def create_index(self, example: CaExample, result_list: list[dict]) -> dict:
+        index = {}
+        for result in result_list:
+            index.setdefault(result[self.new_variable].object_id, []).append(result)
+        return index
+
+    def lookup(self, index: dict, bound_result: dict) -> list[dict]:
+        return index.get(bound_result[self.bound_variable].object_id, [])
+
+class FeatureJoin:
+    """
+    hash join for "a.f = b.g" where a and b are object variables
+    """
+    def __init__(self, new_variable: str, new_feature: str, bound_variable: str, bound_feature: str):
+        self.new_variable = new_variable
+        self.new_feature = new_feature
+        self.bound_variable = bound_variable
+        self.bound_feature = bound_feature
+
+    def create_index(self, example: CaExample, result_list: list[dict]) -> dict:
+        index = {}
+        for result in result_list:
+            index.setdefault(float(result[self.new_variable].features[self.new_feature]), []).append(result)
+        return index
+
+    def lookup(self, index: dict, bound_result: dict) -> list[dict]:
+        return index.get(float(bound_result[self.bound_variable].features[self.bound_feature]), [])
+
+class RelationJoin:
+    """
+    index join for "r(a,b)" where a and b are object variables and r is a
+    binary boolean relation. the index maps an object to all objects with which
+    it has a true relation.
+    """
+    def __init__(
+            self, relation_name: str, new_variable: str, new_position: int,
+            bound_variable: str, bound_position: int):
+        self.relation_name = relation_name
+        self.new_variable = new_variable
+        self.new_position = new_position
+        self.bound_variable = bound_variable
+        self.bound_position = bound_position
+
+    def create_index(self, example: CaExample, result_list: list[dict]) -> dict:
+        result_positions_per_object = {}
+        for i, result in enumerate(result_list):
+            result_positions_per_object.setdefault(result[self.new_variable], []).append(i)
+        result_positions_per_bound_object = {}
+        for relation in example.relations.get(self.relation_name, ()):
+            if relation.value:
+                try:
+                    result_positions_per_bound_object.setdefault(
+                        relation.objects[self.bound_position], []).extend(
+                        result_positions_per_object[relation.objects[self.new_position]])
+                except KeyError:
+                    pass
+        return {
+            bound_object: [result_list[i] for i in sorted(result_positions)]
+            for bound_object, result_positions in result_positions_per_bound_object.items()
+        }
+
+    def lookup(self, index: dict, bound_result: dict) -> list[dict]:
+        return index.get(bound_result[self.bound_variable], [])
+
+class JoinPlan:
+    """
+    evaluates a Filter of a Product. terms of the filter constraint that only
+    depend on the variables of one subquery are evaluated before the cross
+    product is created. every subquery can be joined with the previous subqueries by an
+    equality or relation term using an index (index nested loop join). all other terms
+    are evaluated on the joined elements. the order of the returned elements is
+    the same as for the cross product.
+    """
+    def __init__(
+            self, subquery_list: list, variable_names: set[str],
+            local_terms_per_subquery: list[list[CaConstraint]],
+            join_per_subquery: list, residual_terms: list[CaConstraint]):
+        self.subquery_list = subquery_list
+        self.variable_names = variable_names
+        self.local_terms_per_subquery = local_terms_per_subquery
+        self.join_per_subquery = join_per_subquery
+        self.residual_terms = residual_terms
+
+    def evaluate(self, example: CaExample, variables: dict) -> list[dict]:
+        joined_result_list = [{}]
+        for subquery, local_terms, join in zip(
+                self.subquery_list, self.local_terms_per_subquery, self.join_per_subquery):
+            result_list = subquery.evaluate(example, variables)
+            if local_terms:
+                result_list = [
+                    result for result in result_list
+                    if _all_terms_hold(local_terms, example, result, variables)
+                ]
+            if join is None:
+                joined_result_list = [
+                    joined_result | result
+                    for joined_result in joined_result_list
+                    for result in result_list
+                ]
+            else:
+                index = join.create_index(example, result_list)
+                joined_result_list = [
+                    joined_result | result
+                    for joined_result in joined_result_list
+                    for result in join.lookup(index, joined_result)
+                ]
+        if self.residual_terms:
+            return [
+                result for result in joined_result_list
+                if _all_terms_hold(self.residual_terms, example, result, variables)
+            ]
+        return joined_result_list
+
+def _all_terms_hold(terms: list[CaConstraint], example: CaExample, result: dict, variables: dict) -> bool:
+    result_with_variables = dict(result)
+    result_with_variables.update(variables)
+    for term in terms:
+        if not term.holds(example, result_with_variables):
+            return False
+    return True
+
+def create_join_plan(subquery_list: list, constraint: CaConstraint) -> JoinPlan|None:
+    """
+    creates a JoinPlan for a Filter of a Product with the given subqueries.
+    returns None if the variables of the subqueries are unknown or if no term
+    of the filter constraint can be pushed into the product.
+    """
+    subquery_index_per_variable = {}
+    object_variables = set()
+    for i, subquery in enumerate(subquery_list):
+        variable_types = subquery.get_variable_types()
+        if variable_types is None:
+            return None
+        for variable_name, type_name in variable_types.items():
+            if variable_name in subquery_index_per_variable:
+                return None
+            subquery_index_per_variable[variable_name] = i
+            if type_name is not None:
+                object_variables.add(variable_name)
+
+    local_terms_per_subquery = [[] for _ in subquery_list]
+    join_per_subquery = [None] * len(subquery_list)
+    residual_terms = []
+    for term in (constraint.term_list if isinstance(constraint, And) else [constraint]):
+        referenced_names = term.get_referenced_names()
+        if referenced_names is None:
+            residual_terms.append(term)
+            continue
+        referenced_subqueries = set(
+            subquery_index_per_variable[name] for name in referenced_names
+            if name in subquery_index_per_variable
+        )
+        if len(referenced_subqueries) == 1:
+            local_terms_per_subquery[referenced_subqueries.pop()].append(term)
+            continue
+        join = _create_join(term, subquery_index_per_variable, object_variables)
+        if join is not None and join_per_subquery[subquery_index_per_variable[join.new_variable]] is None:
+            join_per_subquery[subquery_index_per_variable[join.new_variable]] = join
+        else:
+            residual_terms.append(term)
+
+    if not any(local_terms_per_subquery) and all(join is None for join in join_per_subquery):
+        return None
+    return JoinPlan(
+        subquery_list, set(subquery_index_per_variable), local_terms_per_subquery,
+        join_per_subquery, residual_terms)
+
+def _create_join(term: CaConstraint, subquery_index_per_variable: dict, object_variables: set):
+    if isinstance(term, ObjectsEqual):
+        variable_pair = (term.left_object_id, term.right_object_id)
+        create_join = lambda new, bound: ObjectIdJoin(variable_pair[new], variable_pair[bound])
+    elif isinstance(term, Equal) and isinstance(term.a, NumericFeature) and isinstance(term.b, NumericFeature):
+        variable_pair = (term.a.object_id, term.b.object_id)
+        feature_pair = (term.a.feature_name, term.b.feature_name)
+        create_join = lambda new, bound: FeatureJoin(
+            variable_pair[new], feature_pair[new], variable_pair[bound], feature_pair[bound])
+    elif isinstance(term, RelationIsTrue) and len(term.get_object_id_list()) == 2:
+        variable_pair = term.get_object_id_list()
+        create_join = lambda new, bound: RelationJoin(
+            term.get_relation_name(), variable_pair[new], new, variable_pair[bound], bound)
+    else:
+        return None
+    if not all(variable in object_variables for variable in variable_pair):
+        return None
+    subquery_pair = tuple(subquery_index_per_variable[variable] for variable in variable_pair)
+    if subquery_pair[0] == subquery_pair[1]:
+        return None
+    if subquery_pair[0] > subquery_pair[1]:
+        return create_join(0, 1)
+    return create_join(1, 0)
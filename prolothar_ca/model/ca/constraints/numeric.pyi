@@ -20,6 +20,8 @@ from prolothar_ca.model.ca.constraints.constraint import CaConstraint
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.obj import CaObject
 from prolothar_ca.model.ca.relation import CaRelationType
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch
+import numpy as np
 
 
 class NumericExpression:
@@ -29,6 +31,21 @@ class NumericExpression:
         """
         ...
 
+    def evaluate_vectorized(self, batch: ExampleBatch, variables: dict) -> np.ndarray:
+        """
+        evaluates this numeric expression for all examples of a batch at once.
+        returns a numpy array of floats, see ExampleBatch for the meaning of its axes.
+        raises NotImplementedError if this expression does not support vectorized evaluation
+        """
+        ...
+
+    def get_referenced_names(self) -> set[str]|None:
+        """
+        returns the names of all variables and objects this expression refers to.
+        None if the names are unknown, e.g. for expressions with nested queries.
+        """
+        ...
+
     def __lt__(self, other: 'NumericExpression'):
         """
         returns True if this numeric expression is always smaller than another numeric expression
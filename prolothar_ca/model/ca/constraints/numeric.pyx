@@ -17,12 +17,16 @@
 
 from itertools import pairwise
 
+import numpy as np
+
 from prolothar_ca.model.ca.constraints.conjunction import Or
 from prolothar_ca.model.ca.constraints.query cimport AllOfTypeOrderBy, Query
 from prolothar_ca.model.ca.constraints.constraint cimport CaConstraint
+from prolothar_ca.model.ca.constraints.constraint import union_of_referenced_names
 from prolothar_ca.model.ca.example cimport CaExample
 from prolothar_ca.model.ca.obj cimport CaObject
 from prolothar_ca.model.ca.relation cimport CaRelationType
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, align
 
 
 cdef class NumericExpression:
@@ -32,6 +36,21 @@ cdef class NumericExpression:
         """
         raise NotImplementedError()
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        """
+        evaluates this numeric expression for all examples of a batch at once.
+        returns a numpy array of floats, see ExampleBatch for the meaning of its axes.
+        raises NotImplementedError if this expression does not support vectorized evaluation
+        """
+        raise NotImplementedError(type(self))
+
+    def get_referenced_names(self) -> set[str]|None:
+        """
+        returns the names of all variables and objects this expression refers to.
+        None if the names are unknown, e.g. for expressions with nested queries.
+        """
+        return None
+
     def __lt__(self, other: 'NumericExpression'):
         """
         returns True if this numeric expression is always smaller than another numeric expression
@@ -59,12 +78,18 @@ cdef class Constant(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return self.value
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.asarray(float(self.value))
+
     def __lt__(self, other: NumericExpression):
         return isinstance(other, Constant) and self.value < other.value
 
     def __gt__(self, other: NumericExpression):
         return isinstance(other, Constant) and self.value > other.value
 
+    def get_referenced_names(self) -> set[str]|None:
+        return set()
+
     def __str__(self) -> str:
         return str(self.value)
 
@@ -80,12 +105,18 @@ cdef class NumericVariable(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return variables[self.variable_name]
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.asarray(variables[self.variable_name], dtype=float)
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return {self.variable_name}
+
     def __str__(self) -> str:
         return str(self.variable_name)
 
@@ -103,12 +134,20 @@ cdef class Modulo(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) % self.b.evaluate(example, variables)
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.mod(*align(
+            self.a.evaluate_vectorized(batch, variables),
+            self.b.evaluate_vectorized(batch, variables)))
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.a, self.b))
+
     def __str__(self) -> str:
         return f'{self.a} % {self.b}'
 
@@ -126,12 +165,20 @@ cdef class IntegerDivision(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) // self.b.evaluate(example, variables)
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.floor_divide(*align(
+            self.a.evaluate_vectorized(batch, variables),
+            self.b.evaluate_vectorized(batch, variables)))
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.a, self.b))
+
     def __str__(self) -> str:
         return f'{self.a} // {self.b}'
 
@@ -149,12 +196,20 @@ cdef class Division(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) / self.b.evaluate(example, variables)
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.true_divide(*align(
+            self.a.evaluate_vectorized(batch, variables),
+            self.b.evaluate_vectorized(batch, variables)))
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.a, self.b))
+
     def __str__(self) -> str:
         return f'{self.a} / {self.b}'
 
@@ -178,12 +233,24 @@ cdef class NumericFeature(NumericExpression):
             the_object = example.get_object_by_type_and_id(self.object_type, self.object_id)
         return (<CaObject>the_object).features[self.feature_name]
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        try:
+            variable = variables[self.object_id]
+        except KeyError:
+            return batch.get_feature(
+                self.object_type, self.feature_name,
+                batch.get_object_index(self.object_type, self.object_id)).astype(float)
+        return batch.get_feature(variable.type_name, self.feature_name, variable.indices).astype(float)
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return {self.object_id}
+
     def __str__(self) -> str:
         return f'{self.object_id}.{self.feature_name}'
 
@@ -205,7 +272,16 @@ cdef class NumericRelation(NumericExpression):
                 parameters.append(example.get_object_by_type_and_id(type_name, object_id))
             except KeyError:
                 parameters.append(variables[object_id])
-        example.get_relation_value(self.relation_type.name, tuple(parameters))
+        return example.get_relation_value(self.relation_type.name, tuple(parameters))
+
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        cdef list parameters = []
+        for type_name, object_id in zip(self.relation_type.parameter_types, self.object_id_list):
+            if batch.has_object(type_name, object_id):
+                parameters.append(batch.get_object_index(type_name, object_id))
+            else:
+                parameters.append(variables[object_id].indices)
+        return batch.get_numeric_relation(self.relation_type, parameters)
 
     def __lt__(self, other: NumericExpression):
         return False
@@ -213,6 +289,9 @@ cdef class NumericRelation(NumericExpression):
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return set(self.object_id_list)
+
     def __str__(self) -> str:
         return f'{self.relation_type.name}({",".join(self.object_id_list)})'
 
@@ -228,6 +307,10 @@ cdef class Count(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return len(self.query.evaluate(example, variables))
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        bindings, mask, axes = self.query.evaluate_vectorized(batch, variables)
+        return np.sum(mask, axis=axes, keepdims=True, dtype=float)
+
     def __lt__(self, other: NumericExpression):
         return isinstance(other, Count) and self.query.is_more_restrictive(other.query)
 
@@ -257,6 +340,13 @@ cdef class AggregateSum(NumericExpression):
             s += self.expression.evaluate(example, extended_variables)
         return s
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        bindings, mask, axes = self.query.evaluate_vectorized(batch, variables)
+        cdef dict extended_variables = dict(variables)
+        extended_variables.update(bindings)
+        mask, values = align(mask, self.expression.evaluate_vectorized(batch, extended_variables))
+        return np.sum(np.where(mask, values, 0.0), axis=axes, keepdims=True)
+
     def __lt__(self, other: NumericExpression):
         return (
             isinstance(other, AggregateSum) and
@@ -304,6 +394,9 @@ cdef class Absolute(NumericExpression):
     cpdef double evaluate(self, CaExample example, dict variables):
         return abs(self.expression.evaluate(example, variables))
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.abs(self.expression.evaluate_vectorized(batch, variables))
+
     def __lt__(self, other: NumericExpression):
         return (
             isinstance(self, Constant) and
@@ -318,6 +411,9 @@ cdef class Absolute(NumericExpression):
             abs(self.value) > other.value
         )
 
+    def get_referenced_names(self) -> set[str]|None:
+        return self.expression.get_referenced_names()
+
     def __str__(self) -> str:
         return f'|{self.expression}|'
 
@@ -338,12 +434,20 @@ cdef class Difference(NumericExpression):
             self.right_expression.evaluate(example, variables)
         )
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.subtract(*align(
+            self.left_expression.evaluate_vectorized(batch, variables),
+            self.right_expression.evaluate_vectorized(batch, variables)))
+
     def __lt__(self, other: NumericExpression):
         return self.left_expression < other and self.right_expression > Constant(0)
 
     def __gt__(self, other: NumericExpression):
         return False
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.left_expression, self.right_expression))
+
     def __str__(self) -> str:
         return f'{self.left_expression} - {self.right_expression}'
 
@@ -364,12 +468,20 @@ cdef class Sum(NumericExpression):
             self.right_expression.evaluate(example, variables)
         )
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        return np.add(*align(
+            self.left_expression.evaluate_vectorized(batch, variables),
+            self.right_expression.evaluate_vectorized(batch, variables)))
+
     def __lt__(self, other: NumericExpression):
         return False
 
     def __gt__(self, other: NumericExpression):
         return self.left_expression > other or self.right_expression > other
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.left_expression, self.right_expression))
+
     def __str__(self) -> str:
         return f'{self.left_expression} + {self.right_expression}'
 
@@ -389,6 +501,9 @@ cdef class NumericQuery():
         """
         raise NotImplementedError()
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables):
+        raise NotImplementedError(type(self))
+
     cpdef int count_nr_of_terms(self):
         """
         counts the number of terms in this numeric query. the more terms the more
@@ -500,6 +615,13 @@ cdef class Between(CaConstraint):
             <= self.upper.evaluate(example, variables)
         )
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        lower, x, upper = align(
+            self.lower.evaluate_vectorized(batch, variables),
+            self.x.evaluate_vectorized(batch, variables),
+            self.upper.evaluate_vectorized(batch, variables))
+        return np.logical_and(lower <= x, x <= upper)
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             (isinstance(other, Between) and self.x == other.x and (
@@ -509,6 +631,9 @@ cdef class Between(CaConstraint):
             (isinstance(other, Or) and self in other.term_list)
         )
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.lower, self.x, self.upper))
+
     def __str__(self) -> str:
         return f'{self.lower} <= {self.x} <= {self.upper}'
 
@@ -523,11 +648,23 @@ cdef class BinaryNumericCaConstraint(CaConstraint):
     cpdef int count_nr_of_terms(self):
         return self.a.count_nr_of_terms() + self.b.count_nr_of_terms()
 
+    def get_referenced_names(self) -> set[str]|None:
+        return union_of_referenced_names((self.a, self.b))
+
+    def _evaluate_operands_vectorized(self, batch: ExampleBatch, dict variables) -> list:
+        return align(
+            self.a.evaluate_vectorized(batch, variables),
+            self.b.evaluate_vectorized(batch, variables))
+
 cdef class Equal(BinaryNumericCaConstraint):
 
     cpdef bint holds(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) == self.b.evaluate(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a == b
+
     def negated(self) -> 'NotEqual':
         return NotEqual(self.a, self.b)
 
@@ -543,7 +680,11 @@ cdef class Equal(BinaryNumericCaConstraint):
 cdef class NotEqual(BinaryNumericCaConstraint):
 
     cpdef bint holds(self, CaExample example, dict variables):
-        return self.a.evaluate(example, variables) == self.b.evaluate(example, variables)
+        return self.a.evaluate(example, variables) != self.b.evaluate(example, variables)
+
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a != b
 
     def negated(self) -> Equal:
         return Equal(self.a, self.b)
@@ -559,6 +700,10 @@ cdef class Greater(BinaryNumericCaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) > self.b.evaluate(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a > b
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             isinstance(other, Greater) and
@@ -574,6 +719,10 @@ cdef class GreaterOrEqual(BinaryNumericCaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) >= self.b.evaluate(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a >= b
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             isinstance(other, GreaterOrEqual) and
@@ -589,6 +738,10 @@ cdef class LessOrEqual(BinaryNumericCaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) <= self.b.evaluate(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a <= b
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             isinstance(other, LessOrEqual)
@@ -604,6 +757,10 @@ cdef class Less(BinaryNumericCaConstraint):
     cpdef bint holds(self, CaExample example, dict variables):
         return self.a.evaluate(example, variables) < self.b.evaluate(example, variables)
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        a, b = self._evaluate_operands_vectorized(batch, variables)
+        return a < b
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             isinstance(other, Less)
@@ -20,6 +20,14 @@ from prolothar_ca.model.ca.example cimport CaExample
 from prolothar_ca.model.ca.obj cimport CaObject
 
 from prolothar_ca.model.ca.constraints.constraint import CaConstraint
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, align
+
+def _get_object_id_codes(batch: ExampleBatch, dict variables, str object_id):
+    try:
+        variable = variables[object_id]
+    except KeyError:
+        return batch.get_object_id_codes(None, object_id)
+    return batch.get_object_id_codes(variable.type_name, variable.indices)
 
 cdef class ObjectsEqual(CaConstraint):
     def __init__(self, str left_object_id, str right_object_id):
@@ -42,9 +50,18 @@ cdef class ObjectsEqual(CaConstraint):
             right_object_id = self.right_object_id
         return left_object_id == right_object_id
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        left_codes, right_codes = align(
+            _get_object_id_codes(batch, variables, self.left_object_id),
+            _get_object_id_codes(batch, variables, self.right_object_id))
+        return left_codes == right_codes
+
     def count_nr_of_terms(self) -> int:
         return 2
 
+    def get_referenced_names(self) -> set[str]:
+        return {self.left_object_id, self.right_object_id}
+
     def __str__(self) -> str:
         return f'{self.left_object_id} = {self.right_object_id}'
 
@@ -69,8 +86,17 @@ cdef class ObjectsNotEqual(CaConstraint):
             right_object_id = self.right_object_id
         return left_object_id != right_object_id
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        left_codes, right_codes = align(
+            _get_object_id_codes(batch, variables, self.left_object_id),
+            _get_object_id_codes(batch, variables, self.right_object_id))
+        return left_codes != right_codes
+
     def count_nr_of_terms(self) -> int:
         return 2
 
+    def get_referenced_names(self) -> set[str]:
+        return {self.left_object_id, self.right_object_id}
+
     def __str__(self) -> str:
         return f'{self.left_object_id} != {self.right_object_id}'
@@ -15,6 +15,10 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
+import numpy as np
+
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, align
+
 cdef class ForAll(CaConstraint):
     query: Query
     constraint: CaConstraint
@@ -31,6 +35,19 @@ cdef class ForAll(CaConstraint):
                 return False
         return True
 
+    def holds_vectorized(self, batch: ExampleBatch, dict variables):
+        return self.count_violations_vectorized(batch, variables) == 0
+
+    def count_violations_vectorized(self, batch: ExampleBatch, dict variables):
+        """
+        counts the number of elements of the query for which the inner constraint does not hold
+        """
+        bindings, mask, axes = self.query.evaluate_vectorized(batch, variables)
+        cdef dict extended_variables = dict(variables)
+        extended_variables.update(bindings)
+        mask, inner_holds = align(mask, self.constraint.holds_vectorized(batch, extended_variables))
+        return np.sum(np.logical_and(mask, np.logical_not(inner_holds)), axis=axes, keepdims=True)
+
     def is_more_restrictive(self, other: CaConstraint) -> bool:
         return (
             isinstance(other, ForAll) and
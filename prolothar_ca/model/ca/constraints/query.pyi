@@ -18,10 +18,14 @@
 from prolothar_ca.model.ca.constraints.constraint import CaConstraint
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch
+import numpy as np
 
 class Query:
 
     def evaluate(self, example: CaExample, variables: dict[str, CaObject]) -> list: ...
+    def evaluate_vectorized(self, batch: ExampleBatch, variables: dict) -> tuple[dict, np.ndarray, tuple[int]]: ...
+    def get_variable_types(self) -> dict[str, str|None]|None: ...
     def count_nr_of_terms(self) -> int: ...
 
 class AllOfType(Query):
@@ -20,6 +20,19 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from itertools import product
 
+import numpy as np
+
+from prolothar_ca.model.ca.constraints.batch import ExampleBatch, ObjectVariable, align
+
+def _all_of_type_vectorized(batch: ExampleBatch, str type_name, str variable_name) -> tuple:
+    cdef int axis = batch.new_axis()
+    indices = batch.along_axis(np.arange(len(batch.object_ids_per_type[type_name])), axis)
+    return (
+        {variable_name: ObjectVariable(type_name, indices)},
+        np.ones(indices.shape, dtype=bool),
+        (axis,)
+    )
+
 cdef class Query:
     cpdef list evaluate(self, CaExample example, dict variables):
         """
@@ -28,6 +41,25 @@ cdef class Query:
         """
         raise NotImplementedError()
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        """
+        evaluates the query for all examples of a batch at once.
+        returns a tuple (bindings, mask, axes). bindings maps the variable
+        names of this query to ObjectVariable (or numpy arrays for numeric
+        variables) along new axes of the batch. mask is a boolean array that
+        is True for all elements in the query result. axes are the new axes.
+        raises NotImplementedError if this query does not support vectorized evaluation
+        """
+        raise NotImplementedError(type(self))
+
+    def get_variable_types(self) -> dict[str, str|None]|None:
+        """
+        returns the names of the variables bound by this query together with
+        their object type name. the type is None for variables that are not bound
+        to objects. returns None if the variables are unknown.
+        """
+        return None
+
     cpdef int count_nr_of_terms(self):
         """
         counts the number of terms in the query. the more terms the more complex
@@ -63,6 +95,12 @@ cdef class EvaluateOnceQueryWrapper(Query):
         else:
             return self.result_list
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        return self.query.evaluate_vectorized(batch, variables)
+
+    def get_variable_types(self) -> dict[str, str|None]|None:
+        return self.query.get_variable_types()
+
     def __str__(self):
         return self.__str
 
@@ -85,6 +123,12 @@ cdef class AllOfType(Query):
     cpdef list evaluate(self, CaExample example, dict variables: Dict[str, CaObject]):
         return [{self.variable_name: o} for o in example.all_objects_per_type[self.type_name]]
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        return _all_of_type_vectorized(batch, self.type_name, self.variable_name)
+
+    def get_variable_types(self) -> dict[str, str|None]:
+        return {self.variable_name: self.type_name}
+
     def __str__(self):
         return f'{self.variable_name} in {self.type_name}'
 
@@ -109,6 +153,24 @@ cdef class DistinctValuesOfFeatureQuery(Query):
             {self.variable_name: feature_value} for feature_value in distinct_feature_values
         ]
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        feature_values = batch.get_feature(
+            self.object_type, self.feature_name,
+            np.arange(len(batch.object_ids_per_type[self.object_type])).reshape(1, -1))
+        distinct_feature_values = np.unique(feature_values)
+        cdef int axis = batch.new_axis()
+        is_value_of_example = np.any(
+            feature_values[:, :, np.newaxis] == distinct_feature_values[np.newaxis, np.newaxis, :],
+            axis=1)
+        return (
+            {self.variable_name: batch.along_axis(distinct_feature_values.astype(float), axis)},
+            is_value_of_example.reshape((batch.size,) + (1,) * (axis - 1) + (len(distinct_feature_values),)),
+            (axis,)
+        )
+
+    def get_variable_types(self) -> dict[str, str|None]:
+        return {self.variable_name: None}
+
     def __str__(self) -> str:
         return f'{self.variable_name} in distinct({self.object_type}.{self.feature_name})'
 
@@ -137,6 +199,13 @@ cdef class AllOfTypeOrderBy(Query):
         result_list.sort(key=self.__sort_function)
         return result_list
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        #the order is irrelevant for quantifiers and aggregations
+        return _all_of_type_vectorized(batch, self.type_name, self.variable_name)
+
+    def get_variable_types(self) -> dict[str, str|None]:
+        return {self.variable_name: self.type_name}
+
     def __hash__(self):
         return hash(str(self))
 
@@ -170,6 +239,26 @@ cdef class Product(Query):
             result_list.append(result)
         return result_list
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        cdef dict bindings = {}
+        mask = np.ones(1, dtype=bool)
+        cdef tuple axes = ()
+        for subquery in self.subquery_list:
+            subquery_bindings, subquery_mask, subquery_axes = (<Query>subquery).evaluate_vectorized(batch, variables)
+            bindings.update(subquery_bindings)
+            mask = np.logical_and(*align(mask, subquery_mask))
+            axes += subquery_axes
+        return bindings, mask, axes
+
+    def get_variable_types(self) -> dict[str, str|None]|None:
+        cdef dict variable_types = {}
+        for subquery in self.subquery_list:
+            subquery_variable_types = (<Query>subquery).get_variable_types()
+            if subquery_variable_types is None:
+                return None
+            variable_types.update(subquery_variable_types)
+        return variable_types
+
     def __hash__(self):
         return hash(str(self))
 
@@ -188,10 +277,14 @@ cdef class Product(Query):
 
 cdef class Filter(Query):
     """
-    This query consists of a subquery that is filtered by a CaConstraint
+    This query consists of a subquery that is filtered by a CaConstraint.
+    if the subquery is a Product, terms of the constraint are pushed into the
+    product with index joins (see prolothar_ca.model.ca.constraints.join)
     """
     cdef public Query query
     cdef public CaConstraint constraint
+    cdef object __join_plan
+    cdef bint __join_plan_is_created
 
     def __init__(self, Query query, CaConstraint constraint):
         self.query = query
@@ -199,6 +292,11 @@ cdef class Filter(Query):
 
     cpdef list evaluate(self, example: CaExample, dict variables):
         #variables is of type Dict[str, CaObject]
+        if not self.__join_plan_is_created:
+            self.__join_plan = self.__create_join_plan()
+            self.__join_plan_is_created = True
+        if self.__join_plan is not None and variables.keys().isdisjoint(self.__join_plan.variable_names):
+            return self.__join_plan.evaluate(example, variables)
         cdef list result_list = []
         cdef dict result_with_variables
         for result in self.query.evaluate(example, variables):
@@ -208,6 +306,23 @@ cdef class Filter(Query):
                 result_list.append(result)
         return result_list
 
+    def evaluate_vectorized(self, batch: ExampleBatch, dict variables) -> tuple:
+        bindings, mask, axes = self.query.evaluate_vectorized(batch, variables)
+        cdef dict bindings_with_variables = dict(bindings)
+        bindings_with_variables.update(variables)
+        mask, constraint_holds = align(mask, self.constraint.holds_vectorized(batch, bindings_with_variables))
+        return bindings, np.logical_and(mask, constraint_holds), axes
+
+    def __create_join_plan(self):
+        if not isinstance(self.query, Product) or len(self.query.subquery_list) < 2:
+            return None
+        #import here to avoid cyclic imports
+        from prolothar_ca.model.ca.constraints.join import create_join_plan
+        return create_join_plan(self.query.subquery_list, self.constraint)
+
+    def get_variable_types(self) -> dict[str, str|None]|None:
+        return self.query.get_variable_types()
+
     def __str__(self) -> str:
         return f'{self.query} | {self.constraint}'
 
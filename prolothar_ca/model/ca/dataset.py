@@ -15,22 +15,29 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from itertools import product
-from more_itertools import ilen
-from typing import Iterator
+from math import prod
+from typing import Iterable, Iterator
 import pickle
 from prolothar_common import validate as validate_utils
 
 from prolothar_ca.model.ca.example import CaExample
 from prolothar_ca.model.ca.obj import CaObjectType, CaObject
+from prolothar_ca.model.ca.object_table import ObjectTable
 from prolothar_ca.model.ca.relation import CaRelationType
+from prolothar_ca.model.ca.statistics import DatasetStatistics
 from prolothar_ca.model.ca.variable_type import CaNumber, CaBoolean
 
 class CaDataset:
 
     def __init__(
             self, types_definition: dict[str, CaObjectType],
-            relations_definition: dict[str, CaRelationType]):
+            relations_definition: dict[str, CaRelationType],
+            share_objects: bool = False):
+        """
+        share_objects: if True, examples added to this dataset use shared
+        object and relation instances (see ObjectTable). this reduces memory
+        and pickle size of datasets with many examples over the same objects.
+        """
         for type_name, object_type in types_definition.items():
             validate_utils.equals(type_name, object_type.name)
         for type_name, relation_type in types_definition.items():
@@ -38,37 +45,84 @@ class CaDataset:
         self.__types_definition = types_definition
         self.__relations_definition = relations_definition
         self.__examples = []
+        self.__statistics = DatasetStatistics(self.__examples)
+        self.__object_table = ObjectTable() if share_objects else None
 
     def empty_copy(self) -> 'CaDataset':
         """
         creates a new empty dataset (i.e. without examples) with the same definition as this dataset
         """
-        return CaDataset(self.__types_definition, self.__relations_definition)
+        copy = CaDataset(self.__types_definition, self.__relations_definition)
+        copy.__object_table = self.__object_table
+        return copy
 
     def add_example(self, example: CaExample, validate: bool = True):
+        """
+        adds an example to this dataset. if this dataset shares objects, the
+        added example is a copy of the given example that uses the shared instances.
+        """
         if validate:
-            validate_utils.collection.is_subset(example.all_objects_per_type.keys(), self.__types_definition.keys())
-            validate_utils.collection.is_subset(example.relations.keys(), self.__relations_definition.keys())
-            # check that relations is defined for all possible parameter assignments
-            for relation_name, relation_set in example.relations.items():
-                validate_utils.equals(
-                    ilen(product(*[
-                        example.all_objects_per_type[type_name]
-                        for type_name in self.__relations_definition[relation_name].parameter_types])),
-                    len(relation_set)
-                )
-            for object_set in example.all_objects_per_type.values():
-                for an_object in object_set:
-                    self.__types_definition[an_object.type_name].validate_object(an_object)
+            self.__validate_example(example)
+        if self.__object_table is not None:
+            example = self.__object_table.intern_example(example)
         self.__examples.append(example)
+        if self.__statistics is not None:
+            self.__statistics.add_example(example)
+
+    def add_examples(self, examples: Iterable[CaExample], validate: bool = True):
+        """
+        adds all given examples. validate=False is meant for generators whose
+        examples are correct by construction.
+        """
+        for example in examples:
+            self.add_example(example, validate=validate)
+
+    def __validate_example(self, example: CaExample):
+        validate_utils.collection.is_subset(example.all_objects_per_type.keys(), self.__types_definition.keys())
+        validate_utils.collection.is_subset(example.relations.keys(), self.__relations_definition.keys())
+        # check that relations is defined for all possible parameter assignments,
+        # i.e. the number of distinct parameter assignments equals the size of the cross product
+        for relation_name, relation_set in example.relations.items():
+            parameter_types = self.__relations_definition[relation_name].parameter_types
+            object_sets = [example.all_objects_per_type[type_name] for type_name in parameter_types]
+            validate_utils.equals(prod(len(object_set) for object_set in object_sets), len(relation_set))
+            parameter_assignments = set()
+            for relation in relation_set:
+                validate_utils.equals(len(parameter_types), len(relation.objects))
+                for an_object, object_set in zip(relation.objects, object_sets):
+                    if an_object not in object_set:
+                        raise ValueError(f'{relation} contains an object that is not part of the example')
+                parameter_assignments.add(relation.objects)
+            validate_utils.equals(len(relation_set), len(parameter_assignments))
+        for object_set in example.all_objects_per_type.values():
+            for an_object in object_set:
+                self.__types_definition[an_object.type_name].validate_object(an_object)
+
+    def get_statistics(self) -> DatasetStatistics:
+        """
+        returns the statistics of the examples, which are kept up to date by add_example.
+        the statistics are recomputed on the first call after invalidate_statistics.
+        """
+        if self.__statistics is None:
+            self.__statistics = DatasetStatistics(self.__examples)
+        return self.__statistics
+
+    def invalidate_statistics(self):
+        """
+        must be called after examples of this dataset have been modified in place
+        (e.g. by CaExample.set_relation_value), because add_example cannot
+        see these changes. previously returned statistics must not be used afterwards.
+        """
+        self.__statistics = None
+
+    def get_object_table(self) -> ObjectTable|None:
+        """
+        returns the table of shared objects or None if this dataset does not share objects
+        """
+        return self.__object_table
 
     def get_max_size_of_object_set(self) -> int:
-        max_size = 0
-        for example in self.__examples:
-            for object_set in example.all_objects_per_type.values():
-                if len(object_set) > max_size:
-                    max_size = len(object_set)
-        return max_size
+        return self.get_statistics().get_max_size_of_object_set()
 
     def get_object_type(self, type_name: str) -> CaObjectType:
         return self.__types_definition[type_name]
@@ -100,18 +154,10 @@ class CaDataset:
         return nr_of_numeric_features
 
     def compute_minimum_feature_value(self, object_type: CaObjectType, feature_name: str) -> float:
-        return min(
-            o.features[feature_name]
-            for example in self
-            for o in example.all_objects_per_type[object_type.name]
-        )
+        return self.get_statistics().get_minimum_feature_value(object_type.name, feature_name)
 
     def compute_maximum_feature_value(self, object_type: CaObjectType, feature_name: str) -> float:
-        return max(
-            o.features[feature_name]
-            for example in self
-            for o in example.all_objects_per_type[object_type.name]
-        )
+        return self.get_statistics().get_maximum_feature_value(object_type.name, feature_name)
 
     def get_total_nr_of_boolean_functions(self) -> int:
         """
@@ -138,10 +184,7 @@ class CaDataset:
         return result
 
     def is_relation_true_for_any_example(self, relation_type_name: str, parameters: tuple[CaObject]) -> bool:
-        for example in self:
-            if example.get_relation_value(relation_type_name, parameters):
-                return True
-        return False
+        return self.get_statistics().is_relation_true_for_any_example(relation_type_name, parameters)
 
     def __len__(self):
         """
@@ -154,3 +197,11 @@ class CaDataset:
 
     def fast_deepcopy(self) -> 'CaDataset':
         return pickle.loads(pickle.dumps(self))
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        #datasets pickled before the statistics were introduced
+        if '_CaDataset__statistics' not in state:
+            self.__statistics = DatasetStatistics(self.__examples)
+        if '_CaDataset__object_table' not in state:
+            self.__object_table = None
@@ -31,4 +31,5 @@ cdef class CaExample:
     cpdef CaObject get_object_by_type_and_id(self, type_name, object_id)
     cdef bint get_boolean_relation_value(self, relation_type_name, parameters)
     cpdef add_relation(self, CaRelation relation, bint validate = ?)
+    cpdef CaExample with_relations(self, dict relations, bint is_valid_solution)
     cpdef remove_all_objects_not_in_set(self, set objects_to_keep)
\ No newline at end of file
@@ -34,6 +34,10 @@ class CaExample:
         ...
     def add_relation(self, relation: CaRelation, validate: bool = True):
         ...
+    def set_relation_value(self, relation: CaRelation, new_value: bool|float|int) -> CaRelation:
+        ...
+    def with_relations(self, relations: dict[str, set[CaRelation]], is_valid_solution: bool) -> 'CaExample':
+        ...
     def remove_all_objects_not_in_set(self, objects_to_keep: set[CaObject]):
         ...
 
@@ -89,9 +89,41 @@ cdef class CaExample:
                 relation.objects: relation.value
             }
 
-    def set_relation_value(self, CaRelation relation, new_value):
-        relation.value = new_value
-        self.__relation_value_per_type_and_objects[relation.name][relation.objects] = new_value
+    def set_relation_value(self, CaRelation relation, new_value) -> CaRelation:
+        """
+        replaces the relation by a relation with the same objects and the new value.
+        relations can be shared between examples and are therefore never modified
+        in place. returns the new relation.
+        """
+        cdef dict value_per_objects = self.__relation_value_per_type_and_objects[relation.name]
+        cdef set relation_set = self.relations[relation.name]
+        relation_set.discard(CaRelation(relation.name, relation.objects, value_per_objects[relation.objects]))
+        cdef CaRelation new_relation = CaRelation(relation.name, relation.objects, new_value)
+        relation_set.add(new_relation)
+        value_per_objects[relation.objects] = new_value
+        return new_relation
+
+    cpdef CaExample with_relations(self, dict relations, bint is_valid_solution):
+        """
+        creates an example with the objects of this example, in which the given
+        relation sets replace the relation sets of this example with the same name.
+        the objects, the other relation sets and their lookup tables are shared
+        with this example, i.e. the new example only costs memory for the given
+        relations. neither of both examples must be modified in place afterwards.
+        """
+        cdef CaExample example = CaExample.__new__(CaExample)
+        example.all_objects_per_type = self.all_objects_per_type
+        example.relations = self.relations | relations
+        example.is_valid_solution = is_valid_solution
+        example.__objects_per_type_and_id = self.__objects_per_type_and_id
+        example.__relation_value_per_type_and_objects = self.__relation_value_per_type_and_objects | {
+            relation_type_name: {
+                relation.objects: relation.value
+                for relation in relation_set
+            }
+            for relation_type_name, relation_set in relations.items()
+        }
+        return example
 
     cpdef remove_all_objects_not_in_set(self, set objects_to_keep):
         for object_set in self.all_objects_per_type.values():
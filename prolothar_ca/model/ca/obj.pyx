@@ -27,6 +27,10 @@ cdef class CaObject:
     def __hash__(self):
         return self.__hash
 
+    def __reduce__(self):
+        #the cached hash of a string is only valid in the process that created it
+        return CaObject, (self.object_id, self.type_name, self.features)
+
     def __eq__(self, other: 'CaObject'):
         return self.object_id == other.object_id and self.type_name == other.type_name
 
@@ -0,0 +1,98 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.relation import CaRelation
+
+class ObjectTable:
+    """
+    interns the objects and relations of examples, such that examples over
+    the same objects share the same CaObject and CaRelation instances. objects
+    are only shared if their features are equal, i.e. objects whose features
+    differ between examples are kept per example.
+
+    sharing reduces the memory of datasets with many examples over a fixed set
+    of objects, makes comparisons of relation objects identity checks and
+    shrinks pickles, because pickle stores shared instances only once.
+    """
+
+    def __init__(self):
+        #dict[tuple[str, str, tuple], CaObject]
+        self.__objects = {}
+        #dict[tuple[str, tuple[int], object], CaRelation], the ints are ids of interned objects
+        self.__relations = {}
+
+    def intern_object(self, an_object: CaObject) -> CaObject:
+        """
+        returns the shared instance of an object with the same type, id and features
+        """
+        key = (an_object.type_name, an_object.object_id, tuple(sorted(an_object.features.items())))
+        try:
+            return self.__objects[key]
+        except KeyError:
+            self.__objects[key] = an_object
+            return an_object
+
+    def intern_relation(self, relation: CaRelation, object_mapping: dict) -> CaRelation:
+        """
+        returns the shared instance of a relation with the same name, value and objects.
+        object_mapping maps (type name, object id) to the interned objects of the example.
+        """
+        objects = []
+        for o in relation.objects:
+            interned_object = object_mapping.get((o.type_name, o.object_id))
+            if interned_object is None:
+                interned_object = self.intern_object(o)
+            objects.append(interned_object)
+        objects = tuple(objects)
+        #objects with equal ids can differ in their features, i.e. we need identity here
+        key = (relation.name, tuple(id(o) for o in objects), relation.value)
+        try:
+            return self.__relations[key]
+        except KeyError:
+            if any(a is not b for a, b in zip(objects, relation.objects)):
+                relation = CaRelation(relation.name, objects, relation.value)
+            self.__relations[key] = relation
+            return relation
+
+    def intern_example(self, example: CaExample) -> CaExample:
+        """
+        returns an example with the same objects and relations as the given
+        example, which uses the shared instances of this table. the object
+        and relation sets are not shared, because examples modify them in place.
+        """
+        object_mapping = {}
+        all_objects_per_type = {}
+        for type_name, object_set in example.all_objects_per_type.items():
+            interned_object_set = set()
+            for an_object in object_set:
+                interned_object = self.intern_object(an_object)
+                object_mapping[(interned_object.type_name, interned_object.object_id)] = interned_object
+                interned_object_set.add(interned_object)
+            all_objects_per_type[type_name] = interned_object_set
+        relations = {
+            relation_name: {self.intern_relation(relation, object_mapping) for relation in relation_set}
+            for relation_name, relation_set in example.relations.items()
+        }
+        return CaExample(all_objects_per_type, relations, example.is_valid_solution, validate=False)
+
+    def get_nr_of_objects(self) -> int:
+        return len(self.__objects)
+
+    def get_nr_of_relations(self) -> int:
+        return len(self.__relations)
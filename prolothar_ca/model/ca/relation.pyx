@@ -28,6 +28,10 @@ cdef class CaRelation:
     def __hash__(self):
         return self.__hash
 
+    def __reduce__(self):
+        #the cached hash of a string is only valid in the process that created it
+        return CaRelation, (self.name, self.objects, self.value)
+
     def __eq__(self, other: 'CaRelation'):
         return other.name == self.name and self.objects == other.objects and self.value == other.value
 
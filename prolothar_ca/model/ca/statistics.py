@@ -0,0 +1,152 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject
+
+class FeatureStatistics:
+    """
+    minimum, maximum and distinct values of a feature of an object type
+    """
+
+    def __init__(self):
+        self.minimum = None
+        self.maximum = None
+        self.distinct_values = set()
+
+    def add_value(self, value):
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.distinct_values.add(value)
+
+    def get_nr_of_distinct_values(self) -> int:
+        return len(self.distinct_values)
+
+class DatasetStatistics:
+    """
+    statistics of the examples of a CaDataset, which are computed in one pass
+    over the examples and updated incrementally with add_example. this avoids
+    repeated scans of all examples by the candidate generators.
+
+    feature statistics, the maximal size of the object sets and the true
+    relations are computed eagerly. ranges of feature differences of the
+    objects of relations are computed when they are requested for the first
+    time and kept up to date afterwards.
+    """
+
+    def __init__(self, examples: list[CaExample]):
+        """
+        computes the statistics of the given examples. the list is not copied,
+        i.e. examples that are appended to the list later must be registered
+        with add_example.
+        """
+        self.__examples = examples
+        #dict[str, int]
+        self.__max_size_of_object_set_per_type = {}
+        #dict[tuple[str,str], FeatureStatistics]
+        self.__feature_statistics = {}
+        #dict[str, set[tuple[CaObject]]]
+        self.__true_relations = {}
+        #dict[tuple[str,str,int,int], float]
+        self.__max_absolute_difference_cache = {}
+        for example in examples:
+            self.__update(example)
+
+    def add_example(self, example: CaExample):
+        """
+        updates the statistics with an example that has been appended to the list of examples
+        """
+        self.__update(example)
+        for key in self.__max_absolute_difference_cache:
+            self.__max_absolute_difference_cache[key] = max(
+                self.__max_absolute_difference_cache[key],
+                _compute_max_absolute_difference(example, *key))
+
+    def __update(self, example: CaExample):
+        for type_name, object_set in example.all_objects_per_type.items():
+            if len(object_set) > self.__max_size_of_object_set_per_type.get(type_name, 0):
+                self.__max_size_of_object_set_per_type[type_name] = len(object_set)
+            for an_object in object_set:
+                for feature_name, feature_value in an_object.features.items():
+                    key = (type_name, feature_name)
+                    feature_statistics = self.__feature_statistics.get(key)
+                    if feature_statistics is None:
+                        feature_statistics = FeatureStatistics()
+                        self.__feature_statistics[key] = feature_statistics
+                    feature_statistics.add_value(feature_value)
+        for relation_name, relation_set in example.relations.items():
+            true_relations = self.__true_relations.setdefault(relation_name, set())
+            for relation in relation_set:
+                if relation.value:
+                    true_relations.add(relation.objects)
+
+    def get_max_size_of_object_set(self) -> int:
+        return max(self.__max_size_of_object_set_per_type.values(), default=0)
+
+    def get_feature_statistics(self, type_name: str, feature_name: str) -> FeatureStatistics:
+        """
+        raises a KeyError if no example contains an object of the type with this feature
+        """
+        return self.__feature_statistics[(type_name, feature_name)]
+
+    def get_minimum_feature_value(self, type_name: str, feature_name: str):
+        return self.get_feature_statistics(type_name, feature_name).minimum
+
+    def get_maximum_feature_value(self, type_name: str, feature_name: str):
+        return self.get_feature_statistics(type_name, feature_name).maximum
+
+    def get_nr_of_distinct_feature_values(self, type_name: str, feature_name: str) -> int:
+        return self.get_feature_statistics(type_name, feature_name).get_nr_of_distinct_values()
+
+    def is_relation_true_for_any_example(self, relation_name: str, parameters: tuple[CaObject]) -> bool:
+        return parameters in self.__true_relations.get(relation_name, ())
+
+    def get_true_relation_parameters(self, relation_name: str) -> set[tuple[CaObject]]:
+        """
+        returns the parameters of all relations with the given name that are true in any example
+        """
+        return self.__true_relations.get(relation_name, set())
+
+    def get_max_absolute_difference(self, relation_name: str, feature_name: str, i: int, j: int) -> float:
+        """
+        returns the maximal absolute difference of the feature of the i-th and
+        the j-th object of all true relations (0 if there is no true relation)
+        """
+        key = (relation_name, feature_name, i, j)
+        try:
+            return self.__max_absolute_difference_cache[key]
+        except KeyError:
+            max_difference = max(
+                (_compute_max_absolute_difference(example, *key) for example in self.__examples),
+                default=0)
+            self.__max_absolute_difference_cache[key] = max_difference
+            return max_difference
+
+def _compute_max_absolute_difference(
+        example: CaExample, relation_name: str, feature_name: str, i: int, j: int) -> float:
+    max_difference = 0
+    for relation in example.relations[relation_name]:
+        if relation.value:
+            difference = abs(
+                relation.objects[i].features[feature_name] -
+                relation.objects[j].features[feature_name]
+            )
+            if difference > max_difference:
+                max_difference = difference
+    return max_difference
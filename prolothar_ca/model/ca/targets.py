@@ -65,23 +65,28 @@ class RelationTarget(CaTarget):
                     for new_relation_name in value_to_relation_name.values()
                 }
             )
+            #the one-hot relations only depend on the objects and the value of the
+            #original relation, i.e. they are created once and shared between examples
+            one_hot_relations_cache = {}
             for example in dataset:
+                one_hot_relations = {
+                    new_relation_name: set() for new_relation_name in value_to_relation_name.values()
+                }
+                for relation in example.relations[self.relation_name]:
+                    for new_relation in _get_one_hot_relations(
+                            relation, value_to_relation_name, one_hot_relations_cache):
+                        one_hot_relations[new_relation.name].add(new_relation)
+                #the transformation preserves the validity of the examples in the given dataset
                 transformed_dataset.add_example(CaExample(
                     example.all_objects_per_type,
                     {
                         relation_name: relation_set
                         for relation_name, relation_set in example.relations.items()
                         if relation_name != self.relation_name
-                    } | {
-                        new_relation_name: set(CaRelation(
-                            new_relation_name,
-                            relation.objects,
-                            relation.value == value
-                        ) for relation in example.relations[self.relation_name])
-                        for value, new_relation_name in value_to_relation_name.items()
-                    },
-                    example.is_valid_solution
-                ))
+                    } | one_hot_relations,
+                    example.is_valid_solution,
+                    validate=False
+                ), validate=False)
             return transformed_dataset, list(value_to_relation_name.values())
         else:
             raise NotImplementedError()
@@ -124,52 +129,93 @@ class FeatureValueTarget(CaTarget):
             } | {
                 new_relation_name: CaRelationType(
                     new_relation_name,
-                    [self.type_name],
+                    (self.type_name,),
                     dataset.get_object_type(self.type_name).feature_definition[self.feature_name]
                 )
             }
         )
+        #objects, relations and feature relations are shared between examples
+        #if their objects and values are equal
+        new_object_cache = {}
+        new_relation_cache = {}
         for example in dataset:
-            object_id_to_new_object = {
-                an_object.object_id: CaObject(
-                    an_object.object_id,
-                    an_object.type_name,
-                    {
-                        feature_name: feature_value
-                        for feature_name, feature_value in an_object.features.items()
-                        if feature_name != self.feature_name
-                    }
-                )
-                for an_object in example.all_objects_per_type[self.type_name]
-            }
+            object_id_to_new_object = {}
+            for an_object in example.all_objects_per_type[self.type_name]:
+                new_features = {
+                    feature_name: feature_value
+                    for feature_name, feature_value in an_object.features.items()
+                    if feature_name != self.feature_name
+                }
+                key = (an_object.object_id, tuple(sorted(new_features.items())))
+                new_object = new_object_cache.get(key)
+                if new_object is None:
+                    new_object = CaObject(an_object.object_id, self.type_name, new_features)
+                    new_object_cache[key] = new_object
+                object_id_to_new_object[an_object.object_id] = new_object
             transformed_dataset.add_example(CaExample(
                 {
                     object_type: object_set
                     for object_type, object_set in example.all_objects_per_type.items()
                     if object_type != self.type_name
                 } | {
-                    self.type_name: set(
-                        object_id_to_new_object[an_object.object_id]
-                        for an_object in example.all_objects_per_type[self.type_name]
-                    )
+                    self.type_name: set(object_id_to_new_object.values())
                 },
                 {
-                    relation_name: set(CaRelation(
-                        relation_name,
-                        tuple(object_id_to_new_object.get(o.object_id, o) for o in relation.objects),
-                        relation.value
-                    ) for relation in relation_set)
-                    for relation_name, relation_set in example.relations
+                    relation_name: self.__replace_objects_in_relations(
+                        relation_set, object_id_to_new_object, new_relation_cache)
+                    if self.type_name in dataset.get_relation_type(relation_name).parameter_types
+                    else relation_set
+                    for relation_name, relation_set in example.relations.items()
                 } | {
                     new_relation_name: set(
-                        CaRelation(
-                            new_relation_name,
-                            (object_id_to_new_object[an_object.object_id],),
-                            an_object.features[self.feature_name]
-                        )
+                        _get_cached_relation(
+                            new_relation_name, (object_id_to_new_object[an_object.object_id],),
+                            an_object.features[self.feature_name], new_relation_cache)
                         for an_object in example.all_objects_per_type[self.type_name]
                     )
                 },
-                example.is_valid_solution
-            ))
-        return RelationTarget(new_relation_name).transform_to_boolean_relations(transformed_dataset)
\ No newline at end of file
+                example.is_valid_solution,
+                validate=False
+            ), validate=False)
+        return RelationTarget(new_relation_name).transform_to_boolean_relations(transformed_dataset)
+
+    def __replace_objects_in_relations(
+            self, relation_set: set[CaRelation], object_id_to_new_object: dict[str, CaObject],
+            new_relation_cache: dict) -> set[CaRelation]:
+        return set(
+            _get_cached_relation(
+                relation.name,
+                tuple(
+                    object_id_to_new_object[o.object_id] if o.type_name == self.type_name else o
+                    for o in relation.objects
+                ),
+                relation.value, new_relation_cache
+            )
+            for relation in relation_set
+        )
+
+def _get_cached_relation(
+        relation_name: str, objects: tuple[CaObject], value, cache: dict) -> CaRelation:
+    """
+    returns a relation from the cache or creates and caches a new relation.
+    objects are compared by identity, because objects with equal ids can
+    differ in their features.
+    """
+    key = (relation_name, tuple(id(o) for o in objects), value)
+    relation = cache.get(key)
+    if relation is None:
+        relation = CaRelation(relation_name, objects, value)
+        cache[key] = relation
+    return relation
+
+def _get_one_hot_relations(
+        relation: CaRelation, value_to_relation_name: dict, cache: dict) -> tuple[CaRelation]:
+    key = (tuple(id(o) for o in relation.objects), relation.value)
+    one_hot_relations = cache.get(key)
+    if one_hot_relations is None:
+        one_hot_relations = tuple(
+            CaRelation(new_relation_name, relation.objects, relation.value == value)
+            for value, new_relation_name in value_to_relation_name.items()
+        )
+        cache[key] = one_hot_relations
+    return one_hot_relations
@@ -16,6 +16,16 @@
 '''
 
 cdef class CaVariableType:
+    """
+    variable types have no state, i.e. all instances of the same type are equal
+    """
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self).__name__)
+
     cpdef int get_value_arity(self):
         raise NotImplementedError()
     cpdef str get_sqlite_type_name(self):
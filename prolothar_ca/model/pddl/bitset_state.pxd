@@ -0,0 +1,58 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from prolothar_ca.model.pddl.state cimport State
+
+cdef class _GroundedSymbol:
+    cdef object symbol
+    cdef Py_ssize_t offset
+    cdef Py_ssize_t size
+    #list[dict[Object,int]], position of an object per parameter
+    cdef list object_positions
+    #list[list[Object]], objects per parameter
+    cdef list objects
+    cdef list strides
+
+    cdef Py_ssize_t get_index(self, tuple object_tuple)
+    cdef tuple get_object_tuple(self, Py_ssize_t index)
+
+cdef class GroundingTable:
+    cdef public object problem
+    cdef readonly Py_ssize_t nr_of_grounded_predicates
+    cdef readonly Py_ssize_t nr_of_grounded_numeric_fluents
+    #dict[Predicate, _GroundedSymbol]
+    cdef dict __predicates
+    #dict[NumericFluent, _GroundedSymbol]
+    cdef dict __numeric_fluents
+    #list[_GroundedSymbol] ordered by offset
+    cdef list __predicate_list
+    cdef list __numeric_fluent_list
+
+    cpdef Py_ssize_t get_predicate_index(self, object predicate, tuple object_tuple)
+    cpdef Py_ssize_t get_numeric_fluent_index(self, object numeric_fluent, tuple object_tuple)
+    cpdef tuple get_predicate_key(self, Py_ssize_t index)
+    cpdef tuple get_numeric_fluent_key(self, Py_ssize_t index)
+
+cdef class BitsetState(State):
+    cdef readonly GroundingTable grounding_table
+    cdef unsigned long long[::1] __predicate_bits
+    cdef long long[::1] __numeric_fluent_values
+    cdef unsigned char[::1] __is_numeric_value_assigned
+    #predicates and numeric fluents that are not covered by the grounding table
+    cdef set __other_true_predicates
+    cdef dict __other_numeric_values
+    cdef set __changed_keys
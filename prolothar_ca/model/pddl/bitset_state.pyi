@@ -0,0 +1,50 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from prolothar_ca.model.pddl.numeric_fluent import NumericFluent
+from prolothar_ca.model.pddl.pddl_object import Object
+from prolothar_ca.model.pddl.predicate import Predicate
+from prolothar_ca.model.pddl.state import State
+
+
+class GroundingTable:
+    problem: object
+    nr_of_grounded_predicates: int
+    nr_of_grounded_numeric_fluents: int
+
+    def __init__(self, problem): ...
+
+    def get_predicate_index(self, predicate: Predicate, object_tuple: tuple[Object]) -> int: ...
+
+    def get_numeric_fluent_index(self, numeric_fluent: NumericFluent, object_tuple: tuple[Object]) -> int: ...
+
+    def get_predicate_key(self, index: int) -> tuple[Predicate, tuple[Object]]: ...
+
+    def get_numeric_fluent_key(self, index: int) -> tuple[NumericFluent, tuple[Object]]: ...
+
+class BitsetState(State):
+    grounding_table: GroundingTable
+
+    def __init__(
+            self, problem, true_predicates: set[tuple[Predicate, tuple[Object]]],
+            numeric_fluents: dict[tuple[NumericFluent, tuple[Object]], int],
+            grounding_table: GroundingTable|None = None): ...
+
+    @staticmethod
+    def from_state(state: State, grounding_table: GroundingTable|None = None) -> 'BitsetState': ...
+
+    def to_state(self) -> State: ...
@@ -0,0 +1,279 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+import numpy as np
+
+from prolothar_ca.model.pddl.state cimport State
+
+cdef class _GroundedSymbol:
+    """
+    all groundings of a predicate or numeric fluent, i.e. all combinations of
+    objects of the parameter types, mapped to the indices offset, ..., offset + size - 1
+    """
+
+    def __init__(self, object symbol, Py_ssize_t offset, list objects):
+        self.symbol = symbol
+        self.offset = offset
+        self.objects = objects
+        self.object_positions = [
+            {o: i for i,o in enumerate(objects_of_parameter)}
+            for objects_of_parameter in objects
+        ]
+        self.strides = []
+        cdef Py_ssize_t stride = 1
+        for objects_of_parameter in reversed(objects):
+            self.strides.insert(0, stride)
+            stride *= len(objects_of_parameter)
+        self.size = stride
+
+    cdef Py_ssize_t get_index(self, tuple object_tuple):
+        """
+        returns -1 if the object tuple is not covered by this grounding
+        """
+        if len(object_tuple) != len(self.object_positions):
+            return -1
+        cdef Py_ssize_t index = self.offset
+        cdef Py_ssize_t i
+        cdef object position
+        for i in range(len(object_tuple)):
+            position = (<dict>self.object_positions[i]).get(object_tuple[i])
+            if position is None:
+                return -1
+            index += <Py_ssize_t>position * <Py_ssize_t>self.strides[i]
+        return index
+
+    cdef tuple get_object_tuple(self, Py_ssize_t index):
+        cdef list object_list = []
+        cdef Py_ssize_t i
+        index -= self.offset
+        for i in range(len(self.objects)):
+            object_list.append(self.objects[i][index // <Py_ssize_t>self.strides[i]])
+            index %= <Py_ssize_t>self.strides[i]
+        return tuple(object_list)
+
+cdef list _get_objects_of_parameter_type(list all_objects, object parameter_type):
+    if parameter_type.name == 'object':
+        return list(all_objects)
+    return [o for o in all_objects if o.object_type.is_of_type(parameter_type)]
+
+cdef class GroundingTable:
+    """
+    assigns an index to every grounded predicate and every grounded numeric
+    fluent of the domain of a problem, i.e. to every combination of a predicate
+    (resp. numeric fluent) and objects of the problem with matching types.
+    the memory of a BitsetState is linear in the number of groundings.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        cdef list all_objects = sorted(problem.get_objects(), key=lambda o: o.name)
+        self.__predicates = {}
+        self.__predicate_list = []
+        cdef Py_ssize_t offset = 0
+        cdef _GroundedSymbol grounded_symbol
+        for predicate in problem.get_domain().iter_predicates():
+            grounded_symbol = _GroundedSymbol(predicate, offset, [
+                _get_objects_of_parameter_type(all_objects, t) for t in predicate.parameter_types
+            ])
+            self.__predicates[predicate] = grounded_symbol
+            self.__predicate_list.append(grounded_symbol)
+            offset += grounded_symbol.size
+        self.nr_of_grounded_predicates = offset
+        self.__numeric_fluents = {}
+        self.__numeric_fluent_list = []
+        offset = 0
+        for numeric_fluent in problem.get_domain().iter_numeric_fluents():
+            grounded_symbol = _GroundedSymbol(numeric_fluent, offset, [
+                _get_objects_of_parameter_type(all_objects, t) for t in numeric_fluent.parameter_types
+            ])
+            self.__numeric_fluents[numeric_fluent] = grounded_symbol
+            self.__numeric_fluent_list.append(grounded_symbol)
+            offset += grounded_symbol.size
+        self.nr_of_grounded_numeric_fluents = offset
+
+    cpdef Py_ssize_t get_predicate_index(self, object predicate, tuple object_tuple):
+        """
+        returns the index of the grounded predicate or -1 if it is not part of the table
+        """
+        grounded_symbol = self.__predicates.get(predicate)
+        if grounded_symbol is None:
+            return -1
+        return (<_GroundedSymbol>grounded_symbol).get_index(object_tuple)
+
+    cpdef Py_ssize_t get_numeric_fluent_index(self, object numeric_fluent, tuple object_tuple):
+        """
+        returns the index of the grounded numeric fluent or -1 if it is not part of the table
+        """
+        grounded_symbol = self.__numeric_fluents.get(numeric_fluent)
+        if grounded_symbol is None:
+            return -1
+        return (<_GroundedSymbol>grounded_symbol).get_index(object_tuple)
+
+    cpdef tuple get_predicate_key(self, Py_ssize_t index):
+        """
+        returns the (predicate, object tuple) of the given index
+        """
+        return _get_key(self.__predicate_list, index)
+
+    cpdef tuple get_numeric_fluent_key(self, Py_ssize_t index):
+        """
+        returns the (numeric fluent, object tuple) of the given index
+        """
+        return _get_key(self.__numeric_fluent_list, index)
+
+cdef tuple _get_key(list grounded_symbol_list, Py_ssize_t index):
+    cdef _GroundedSymbol grounded_symbol
+    for grounded_symbol in grounded_symbol_list:
+        if index < grounded_symbol.offset + grounded_symbol.size:
+            return grounded_symbol.symbol, grounded_symbol.get_object_tuple(index)
+    raise IndexError(index)
+
+cdef class BitsetState(State):
+    """
+    alternative to State, which stores the truth values of the grounded
+    predicates in a bitset and the values of the grounded numeric fluents in
+    an array. the indices are defined by a GroundingTable, which is shared
+    between all states of the same problem. flat_copy therefore only copies
+    two arrays instead of a set and a dict.
+    """
+
+    def __init__(
+            self, problem, set true_predicates, dict numeric_fluents,
+            GroundingTable grounding_table = None):
+        super().__init__(problem, set(), {})
+        if grounding_table is None:
+            grounding_table = GroundingTable(problem)
+        self.grounding_table = grounding_table
+        self.__predicate_bits = np.zeros((grounding_table.nr_of_grounded_predicates + 63) // 64, dtype=np.uint64)
+        self.__numeric_fluent_values = np.zeros(grounding_table.nr_of_grounded_numeric_fluents, dtype=np.int64)
+        self.__is_numeric_value_assigned = np.zeros(grounding_table.nr_of_grounded_numeric_fluents, dtype=np.uint8)
+        self.__other_true_predicates = set()
+        self.__other_numeric_values = {}
+        self.__changed_keys = set()
+        for predicate, object_tuple in true_predicates:
+            self.set_predicate_true(predicate, object_tuple)
+        for (numeric_fluent, object_tuple), value in numeric_fluents.items():
+            self.set_numeric_fluent_value(numeric_fluent, object_tuple, value)
+        #the initial state does not count as modification
+        self.__changed_keys = set()
+
+    @staticmethod
+    def from_state(State state, GroundingTable grounding_table = None) -> 'BitsetState':
+        return BitsetState(
+            state.problem, set(state.iter_true_predicates()),
+            dict(state.iter_numeric_fluent_values()), grounding_table=grounding_table)
+
+    cpdef bint is_predicate_true(self, object predicate, tuple object_tuple):
+        cdef Py_ssize_t index = self.grounding_table.get_predicate_index(predicate, object_tuple)
+        if index < 0:
+            return (predicate, object_tuple) in self.__other_true_predicates
+        return (self.__predicate_bits[index >> 6] >> (index & 63)) & 1
+
+    cpdef set_predicate_true(self, object predicate, tuple object_tuple):
+        cdef Py_ssize_t index = self.grounding_table.get_predicate_index(predicate, object_tuple)
+        if index < 0:
+            self.__other_true_predicates.add((predicate, object_tuple))
+        else:
+            self.__predicate_bits[index >> 6] |= (<unsigned long long>1) << (index & 63)
+        self.__changed_keys.add((predicate, object_tuple))
+
+    cpdef set_predicate_false(self, object predicate, tuple object_tuple):
+        cdef Py_ssize_t index = self.grounding_table.get_predicate_index(predicate, object_tuple)
+        if index < 0:
+            self.__other_true_predicates.discard((predicate, object_tuple))
+        else:
+            self.__predicate_bits[index >> 6] &= ~((<unsigned long long>1) << (index & 63))
+        self.__changed_keys.add((predicate, object_tuple))
+
+    def iter_true_predicates(self):
+        cdef Py_ssize_t word_index
+        cdef unsigned long long word
+        cdef int bit
+        for word_index in range(self.__predicate_bits.shape[0]):
+            word = self.__predicate_bits[word_index]
+            bit = 0
+            while word:
+                if word & 1:
+                    yield self.grounding_table.get_predicate_key(word_index * 64 + bit)
+                word >>= 1
+                bit += 1
+        yield from self.__other_true_predicates
+
+    cpdef long get_numeric_fluent_value(self, object numeric_fluent, tuple object_tuple):
+        cdef Py_ssize_t index = self.grounding_table.get_numeric_fluent_index(numeric_fluent, object_tuple)
+        if index < 0:
+            return <long>(self.__other_numeric_values.get((numeric_fluent, object_tuple), 0))
+        return <long>self.__numeric_fluent_values[index]
+
+    cpdef set_numeric_fluent_value(self, object numeric_fluent, tuple object_tuple, long value):
+        for o in object_tuple:
+            if o is None:
+                raise ValueError(f'object tuple must not contain None: {object_tuple}')
+        cdef Py_ssize_t index = self.grounding_table.get_numeric_fluent_index(numeric_fluent, object_tuple)
+        if index < 0:
+            self.__other_numeric_values[(numeric_fluent, object_tuple)] = value
+        else:
+            self.__numeric_fluent_values[index] = value
+            self.__is_numeric_value_assigned[index] = 1
+        self.__changed_keys.add((numeric_fluent, object_tuple))
+
+    def iter_numeric_fluent_values(self):
+        cdef Py_ssize_t index
+        for index in range(self.__numeric_fluent_values.shape[0]):
+            if self.__is_numeric_value_assigned[index]:
+                yield self.grounding_table.get_numeric_fluent_key(index), self.__numeric_fluent_values[index]
+        yield from self.__other_numeric_values.items()
+
+    cpdef size_t get_nr_of_true_predicates(self):
+        cdef size_t nr_of_true_predicates = len(self.__other_true_predicates)
+        cdef Py_ssize_t word_index
+        cdef unsigned long long word
+        for word_index in range(self.__predicate_bits.shape[0]):
+            word = self.__predicate_bits[word_index]
+            while word:
+                word &= word - 1
+                nr_of_true_predicates += 1
+        return nr_of_true_predicates
+
+    cpdef State flat_copy(self):
+        cdef BitsetState copy = BitsetState.__new__(BitsetState)
+        State.__init__(copy, self.problem, set(), {})
+        copy.grounding_table = self.grounding_table
+        copy.__predicate_bits = self.__predicate_bits.copy()
+        copy.__numeric_fluent_values = self.__numeric_fluent_values.copy()
+        copy.__is_numeric_value_assigned = self.__is_numeric_value_assigned.copy()
+        copy.__other_true_predicates = set(self.__other_true_predicates)
+        copy.__other_numeric_values = dict(self.__other_numeric_values)
+        copy.__changed_keys = set()
+        return copy
+
+    cpdef set get_modified_keys(self):
+        return self.__changed_keys
+
+    def to_state(self) -> State:
+        """
+        converts this state into a State with sets and dicts
+        """
+        return State(
+            self.problem, set(self.iter_true_predicates()),
+            dict(self.iter_numeric_fluent_values()))
+
+    def to_pddl(self, ignore_zeros: bool = False) -> str:
+        return self.to_state().to_pddl(ignore_zeros=ignore_zeros)
+
+    def __str__(self):
+        return str(self.to_state())
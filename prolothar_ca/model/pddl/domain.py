@@ -18,10 +18,10 @@
 from itertools import chain
 from typing import Iterable
 
-from pyparsing import nested_expr
 from prolothar_common import validate
 
 from prolothar_ca.model.pddl.utils import NEWLINE
+from prolothar_ca.model.pddl.sexpression import parse_sexpression
 from prolothar_ca.model.pddl.action import Action
 from prolothar_ca.model.pddl.condition import And, Condition, Greater, Less, Not, Or, PredicateIsTrueCondition, LessOrEqual, GreaterOrEqual
 from prolothar_ca.model.pddl.durative_action import DurativeAction
@@ -191,7 +191,7 @@ class Domain:
 
     @staticmethod
     def from_pddl(pddl: str) -> 'Domain':
-        parsed_pddl = nested_expr().parse_string(pddl)[0]
+        parsed_pddl = parse_sexpression(pddl)
         validate.equals(parsed_pddl[0], 'define')
 
         validate.equals(parsed_pddl[1][0], 'domain')
@@ -19,6 +19,7 @@ from dataclasses import dataclass, field
 
 from prolothar_common import validate
 from prolothar_ca.model.pddl.state import State
+from prolothar_ca.model.pddl.bitset_state import BitsetState, GroundingTable
 
 from prolothar_ca.model.pddl.utils import NEWLINE
 from prolothar_ca.model.pddl.numeric_fluent import NumericFluent
@@ -64,3 +65,19 @@ class InitialState:
                 for numeric_fluent_tuple in self.numeric_fluents
             }
         )
+
+    def to_bitset_state(self, grounding_table: GroundingTable|None = None) -> BitsetState:
+        """
+        creates a BitsetState of this initial state. the grounding table should
+        be shared between all states of the same problem. if None, a new table
+        is created from the problem.
+        """
+        return BitsetState(
+            self.problem,
+            set(self.true_predicates),
+            {
+                numeric_fluent_tuple[:-1]: numeric_fluent_tuple[-1]
+                for numeric_fluent_tuple in self.numeric_fluents
+            },
+            grounding_table=grounding_table
+        )
@@ -18,6 +18,7 @@
 from dataclasses import dataclass
 
 from prolothar_ca.model.pddl.action import Action
+from prolothar_ca.model.pddl.bitset_state import GroundingTable
 from prolothar_ca.model.pddl.pddl_object import Object
 from prolothar_ca.model.pddl.problem import Problem
 
@@ -26,8 +27,16 @@ class Plan:
     action_list: list[tuple[Action, dict[str, Object]]]
     cost: float
 
-    def is_valid(self, problem: Problem) -> bool:
-        current_state = problem.get_intitial_state().to_state()
+    def is_valid(self, problem: Problem, grounding_table: GroundingTable|None = None) -> bool:
+        """
+        replays the plan and checks that all actions are applicable and that
+        the goal holds in the final state. if a grounding table of the problem
+        is given, the plan is replayed on BitsetStates.
+        """
+        if grounding_table is None:
+            current_state = problem.get_intitial_state().to_state()
+        else:
+            current_state = problem.get_intitial_state().to_bitset_state(grounding_table)
         for action, parameters in self.action_list:
             if not action.is_applicable(parameters, current_state, problem):
                 return False
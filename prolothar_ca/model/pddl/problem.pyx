@@ -15,11 +15,10 @@
     along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from pyparsing import nested_expr
-
 from prolothar_common import validate
 
 from prolothar_ca.model.pddl.utils import NEWLINE
+from prolothar_ca.model.pddl.sexpression import parse_sexpression
 from prolothar_ca.model.pddl.condition import Condition
 from prolothar_ca.model.pddl.domain import Domain
 from prolothar_ca.model.pddl.initial_state import InitialState
@@ -186,7 +185,7 @@ cdef class Problem:
 
     @staticmethod
     def from_pddl(pddl: str, domain: Domain) -> 'Problem':
-        parsed_pddl = nested_expr().parse_string(pddl)[0]
+        parsed_pddl = parse_sexpression(pddl)
         validate.equals(parsed_pddl[0], 'define')
 
         validate.equals(parsed_pddl[1][0], 'problem')
@@ -0,0 +1,26 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from typing import Generator, Iterable, TextIO
+
+DEFAULT_CHUNK_SIZE: int
+
+def parse_sexpression(text: str) -> list: ...
+
+def iterate_sexpression_elements(chunks: Iterable[str]) -> Generator[str|list,None,None]: ...
+
+def read_in_chunks(file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[str,None,None]: ...
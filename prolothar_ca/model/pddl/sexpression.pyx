@@ -0,0 +1,146 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from cpython.unicode cimport Py_UNICODE_ISSPACE
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+cdef class _SExpressionReader:
+    """
+    reads nested lists of whitespace separated tokens from chunks of text.
+    comments starting with ';' are skipped until the end of the line.
+    """
+    cdef list stack
+    cdef list elements
+    cdef int yield_depth
+    cdef str pending_token
+    cdef bint has_pending_token
+    cdef bint in_comment
+    cdef public bint done
+    cdef list result
+
+    def __init__(self, int yield_depth):
+        self.stack = []
+        self.elements = []
+        self.yield_depth = yield_depth
+        self.pending_token = ''
+        self.has_pending_token = False
+        self.in_comment = False
+        self.done = False
+        self.result = None
+
+    cdef feed(self, str chunk):
+        cdef Py_ssize_t i
+        cdef Py_ssize_t n = len(chunk)
+        cdef Py_ssize_t token_start = 0 if self.has_pending_token else -1
+        cdef Py_UCS4 c
+        for i in range(n):
+            if self.done:
+                return
+            c = chunk[i]
+            if self.in_comment:
+                if c == '\n':
+                    self.in_comment = False
+            elif c == '(' or c == ')' or c == ';' or Py_UNICODE_ISSPACE(c):
+                if token_start >= 0:
+                    self.add_element(self.pending_token + chunk[token_start:i])
+                    self.pending_token = ''
+                    token_start = -1
+                if c == '(':
+                    self.stack.append([])
+                elif c == ')':
+                    self.close_list()
+                elif c == ';':
+                    self.in_comment = True
+            elif token_start < 0:
+                token_start = i
+        #a token can continue in the next chunk
+        self.has_pending_token = token_start >= 0
+        if self.has_pending_token:
+            self.pending_token = self.pending_token + chunk[token_start:]
+
+    cdef add_element(self, object element):
+        if not self.stack:
+            raise ValueError(f'unexpected "{element}" outside of parentheses')
+        if len(self.stack) == self.yield_depth:
+            self.elements.append(element)
+        else:
+            self.stack[-1].append(element)
+
+    cdef close_list(self):
+        if not self.stack:
+            raise ValueError('unexpected ")" without matching "("')
+        cdef list closed_list = self.stack.pop()
+        if self.stack:
+            self.add_element(closed_list)
+        else:
+            self.result = closed_list
+            self.done = True
+
+    cdef list pop_elements(self):
+        cdef list elements = self.elements
+        self.elements = []
+        return elements
+
+    cdef list finish(self):
+        if not self.done:
+            raise ValueError('unexpected end of input, missing ")"')
+        return self.result
+
+def parse_sexpression(str text) -> list:
+    """
+    parses the first expression in parentheses of the given text into nested
+    lists of string tokens, e.g. "(define (domain d))" is parsed into
+    ['define', ['domain', 'd']]. text after the first expression is ignored.
+
+    Raises
+    ------
+    ValueError
+        if the parentheses are not balanced
+    """
+    cdef _SExpressionReader reader = _SExpressionReader(-1)
+    reader.feed(text)
+    return reader.finish()
+
+def iterate_sexpression_elements(chunks):
+    """
+    parses the first expression in parentheses of the given iterable of
+    text chunks and yields its elements one after the other as soon as they
+    are complete. this avoids holding the complete text and the complete
+    parsed expression in memory, e.g. for long trajectories.
+
+    Raises
+    ------
+    ValueError
+        if the parentheses are not balanced
+    """
+    cdef _SExpressionReader reader = _SExpressionReader(1)
+    for chunk in chunks:
+        reader.feed(chunk)
+        yield from reader.pop_elements()
+        if reader.done:
+            break
+    reader.finish()
+
+def read_in_chunks(file, int chunk_size = DEFAULT_CHUNK_SIZE):
+    """
+    yields the content of an opened text file in chunks of chunk_size characters
+    """
+    cdef str chunk = file.read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = file.read(chunk_size)
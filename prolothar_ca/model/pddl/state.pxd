@@ -19,6 +19,8 @@ cdef class State:
     cdef public object problem
     cdef set __true_predicates
     cdef dict __numeric_values
+    #set[tuple[Predicate|NumericFluent, tuple[Object]]]
+    cdef set __modified_keys
 
     cpdef bint is_predicate_true(self, object predicate, tuple object_tuple)
 
@@ -32,4 +34,6 @@ cdef class State:
 
     cpdef size_t get_nr_of_true_predicates(self)
 
-    cpdef State flat_copy(self)
\ No newline at end of file
+    cpdef State flat_copy(self)
+
+    cpdef set get_modified_keys(self)
\ No newline at end of file
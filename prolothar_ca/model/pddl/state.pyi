@@ -38,10 +38,14 @@ class State:
 
     def get_numeric_fluent_value(self, numeric_fluent: NumericFluent, object_tuple: tuple[Object]) -> int: ...
 
+    def iter_numeric_fluent_values(self) -> Iterator[tuple[tuple[NumericFluent, tuple[Object]], int]]: ...
+
     def set_numeric_fluent_value(self, numeric_fluent: NumericFluent, object_tuple: tuple[Object], value: int): ...
 
     def get_nr_of_true_predicates(self) -> int: ...
 
     def flat_copy(self) -> 'State': ...
 
+    def get_modified_keys(self) -> set[tuple[Predicate|NumericFluent, tuple[Object]]]: ...
+
     def to_pddl(self) -> str: ...
\ No newline at end of file
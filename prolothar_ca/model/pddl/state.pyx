@@ -20,27 +20,34 @@ cdef class State:
         self.problem = problem
         self.__true_predicates = true_predicates
         self.__numeric_values = numeric_fluents
+        self.__modified_keys = set()
 
     cpdef bint is_predicate_true(self, object predicate, tuple object_tuple):
         return (predicate, object_tuple) in self.__true_predicates
 
     cpdef set_predicate_true(self, object predicate, tuple object_tuple):
         self.__true_predicates.add((predicate, object_tuple))
+        self.__modified_keys.add((predicate, object_tuple))
 
     def iter_true_predicates(self):
         return iter(self.__true_predicates)
 
     cpdef set_predicate_false(self, object predicate, tuple object_tuple):
         self.__true_predicates.discard((predicate, object_tuple))
+        self.__modified_keys.add((predicate, object_tuple))
 
     cpdef long get_numeric_fluent_value(self, object numeric_fluent, tuple object_tuple):
         return <long>(self.__numeric_values.get((numeric_fluent, object_tuple), 0))
 
+    def iter_numeric_fluent_values(self):
+        return iter(self.__numeric_values.items())
+
     cpdef set_numeric_fluent_value(self, object numeric_fluent, tuple object_tuple, long value):
         for o in object_tuple:
             if o is None:
                 raise ValueError(f'object tuple must not contain None: {object_tuple}')
         self.__numeric_values[(numeric_fluent, object_tuple)] = value
+        self.__modified_keys.add((numeric_fluent, object_tuple))
 
     cpdef size_t get_nr_of_true_predicates(self):
         return len(self.__true_predicates)
@@ -52,6 +59,14 @@ cdef class State:
             dict(self.__numeric_values)
         )
 
+    cpdef set get_modified_keys(self):
+        """
+        returns the (predicate or numeric fluent, object tuple) keys that have
+        been set since this state has been created, e.g. by the effects of
+        Action.apply on the flat copy of the previous state
+        """
+        return self.__modified_keys
+
     def to_pddl(self, ignore_zeros: bool = False) -> str:
         def o_list_to_str(o_list):
             return ' '.join(o.name for o in o_list)
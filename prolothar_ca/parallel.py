@@ -0,0 +1,49 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from multiprocessing import get_context
+from multiprocessing.pool import Pool
+
+_worker_state = None
+
+def create_spawn_pool(nr_of_processes: int, worker_state=None) -> Pool:
+    """
+    creates a pool of worker processes. the workers are spawned, because forking
+    a process with running threads (e.g. the JVM started by optapy) can deadlock.
+
+    worker_state is transferred once to every worker, where tasks can access it
+    with get_worker_state. tasks therefore only need small arguments, e.g.
+    indices or seeds, instead of the dataset.
+    """
+    return get_context('spawn').Pool(
+        nr_of_processes, initializer=_initialize_worker, initargs=(worker_state,))
+
+def get_worker_state():
+    """
+    returns the worker_state given to create_spawn_pool in a worker process
+    """
+    return _worker_state
+
+def get_chunksize(nr_of_tasks: int, nr_of_processes: int) -> int:
+    """
+    chunksize for Pool.imap that gives each worker about four chunks
+    """
+    return max(1, nr_of_tasks // (4 * nr_of_processes))
+
+def _initialize_worker(worker_state):
+    global _worker_state
+    _worker_state = worker_state
@@ -0,0 +1,50 @@
+'''
+    This file is part of Prolothar-Constraint-Acquisition (More Info: https://github.com/shs-it/prolothar-constraint-acquisition).
+
+    Prolothar-Constraint-Acquisition is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Constraint-Acquisition is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Constraint-Acquisition. If not, see <https://www.gnu.org/licenses/>.
+'''
+
+from time import perf_counter
+from prolothar_ca.model.sat.cnf import CnfFormula
+from prolothar_ca.solver.sat.modelcount.model_counter import ModelCounter
+
+class InstrumentedModelCounter(ModelCounter):
+    """
+    wraps another ModelCounter and records the number of calls and the
+    cumulative wall time spent in the wrapped ModelCounter
+    """
+    def __init__(self, model_counter: ModelCounter):
+        self.model_counter = model_counter
+        self.nr_of_calls = 0
+        self.cumulative_time = 0.0
+
+    def reset(self):
+        self.nr_of_calls = 0
+        self.cumulative_time = 0.0
+
+    def count(self, cnf: CnfFormula) -> int:
+        start = perf_counter()
+        try:
+            return self.model_counter.count(cnf)
+        finally:
+            self.cumulative_time += perf_counter() - start
+            self.nr_of_calls += 1
+
+    def countlog2(self, cnf: CnfFormula) -> float:
+        start = perf_counter()
+        try:
+            return self.model_counter.countlog2(cnf)
+        finally:
+            self.cumulative_time += perf_counter() - start
+            self.nr_of_calls += 1
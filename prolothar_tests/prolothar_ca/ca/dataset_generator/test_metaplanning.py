@@ -1,4 +1,7 @@
 import unittest
+import os
+import shutil
+import tempfile
 
 from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
 
@@ -39,5 +42,38 @@ class TestMetaplanningCaDatasetGenerator(unittest.TestCase):
                     msg=f'{constraint} violates {i}-th example'
                 )
 
+    def test_parse_trajectories_with_multiple_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copytree(PATH_TO_HANOI_DATASET, directory, dirs_exist_ok=True)
+            dataset_generator = MetaplanningCaDatasetGenerator(PATH_TO_HANOI_DATASET)
+            parallel_dataset_generator = MetaplanningCaDatasetGenerator(
+                directory, nr_of_processes=2, cache_parsed_trajectories=True)
+            self.assertTrue(all(
+                os.path.exists(os.path.join(directory, f'trajectory-0{i}.cache'))
+                for i in range(10)
+            ))
+            self.assertFalse(any(f.endswith('.tmp') for f in os.listdir(directory)))
+            cached_dataset_generator = MetaplanningCaDatasetGenerator(
+                directory, nr_of_processes=2, cache_parsed_trajectories=True)
+            for generator in [parallel_dataset_generator, cached_dataset_generator]:
+                self.assertListEqual(
+                    list(map(str, dataset_generator.get_ground_truth_constraints())),
+                    list(map(str, generator.get_ground_truth_constraints())))
+                self.assertListEqual(
+                    sorted(plan.cost for plan in dataset_generator.pddl_ca_dataset_generator.plan_list),
+                    sorted(plan.cost for plan in generator.pddl_ca_dataset_generator.plan_list))
+                self.assertEqual(8, len(generator.generate(5, 3, random_seed=17082022)))
+
+    def test_ignore_leftover_temporary_cache_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copytree(PATH_TO_HANOI_DATASET, directory, dirs_exist_ok=True)
+            #e.g. left behind by a crashed run
+            for leftover_file in ['trajectory-00.cache1234.tmp', '.trajectory-00.cache5678.tmp']:
+                with open(os.path.join(directory, leftover_file), 'w') as f:
+                    f.write('partially written')
+            dataset_generator = MetaplanningCaDatasetGenerator(directory)
+            self.assertEqual(
+                10, len(dataset_generator.pddl_ca_dataset_generator.plan_list))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
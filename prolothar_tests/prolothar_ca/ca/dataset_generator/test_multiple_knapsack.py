@@ -21,5 +21,17 @@ class TestMultipleKnapsackCaDatasetGenerator(unittest.TestCase):
                     in dataset_generator.get_ground_truth_constraints()
                 ))
 
+    def test_generate_in_parallel(self):
+        dataset_generator = MultipleKnapsackCaDatasetGenerator(random_seed=14062023)
+        sequential_dataset = dataset_generator.generate(6, 5, random_seed=21092022, nr_of_processes=1)
+        parallel_dataset = dataset_generator.generate(6, 5, random_seed=21092022, nr_of_processes=2)
+        self.assertEqual(11, len(parallel_dataset))
+        for example, parallel_example in zip(sequential_dataset, parallel_dataset):
+            self.assertEqual(example.is_valid_solution, parallel_example.is_valid_solution)
+            self.assertDictEqual(
+                {o.object_id: o.features for o in example.iter_objects()},
+                {o.object_id: o.features for o in parallel_example.iter_objects()})
+            self.assertDictEqual(example.relations, parallel_example.relations)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.pddl import IS_VALID_ACTION, IncrementalCaExampleConverter
+
+PATH_TO_HANOI_DATASET = 'prolothar_tests/resources/meta_planning/hanoi'
+
+class TestIncrementalCaExampleConverter(unittest.TestCase):
+
+    def test_create_example_equals_conversion_from_scratch(self):
+        pddl_dataset_generator = MetaplanningCaDatasetGenerator(PATH_TO_HANOI_DATASET).pddl_ca_dataset_generator
+        empty_dataset = pddl_dataset_generator._create_empty_dataset()
+        relation_name_to_pddl_name = {
+            relation_type.name: relation_type.name
+            for relation_type in empty_dataset.get_relation_types()
+        }
+        relation_types = [
+            relation_type for relation_type in empty_dataset.get_relation_types()
+            if relation_type.name != IS_VALID_ACTION
+        ]
+        is_valid_action_relation_type = empty_dataset.get_relation_type(IS_VALID_ACTION)
+        problem = pddl_dataset_generator.problem_list[0]
+        plan = pddl_dataset_generator.plan_list[0]
+
+        current_state = problem.get_intitial_state().to_state()
+        converter = IncrementalCaExampleConverter(
+            empty_dataset, problem, current_state, relation_name_to_pddl_name,
+            relation_types, is_valid_action_relation_type)
+        for action, parameters in plan.action_list:
+            action_parameter_ids = tuple(
+                parameter_value.name for _, parameter_value in sorted(
+                    parameters.items(), key=lambda x: (x[1].object_type.name, x[0])))
+            example = converter.create_example(True, action_parameter_ids)
+            expected_example = IncrementalCaExampleConverter(
+                empty_dataset, problem, current_state, relation_name_to_pddl_name,
+                relation_types, is_valid_action_relation_type
+            ).create_example(True, action_parameter_ids)
+            self.assertDictEqual(
+                {o.object_id: o.features for o in expected_example.iter_objects()},
+                {o.object_id: o.features for o in example.iter_objects()})
+            self.assertDictEqual(expected_example.relations, example.relations)
+            self.assertEqual(1, sum(r.value for r in example.relations[IS_VALID_ACTION]))
+            for relation in example.iter_relations():
+                for o in relation.objects:
+                    self.assertIs(example.get_object_by_type_and_id(o.type_name, o.object_id), o)
+
+            current_state = action.apply(parameters, current_state)
+            converter.register_changes(current_state)
+
+if __name__ == '__main__':
+    unittest.main()
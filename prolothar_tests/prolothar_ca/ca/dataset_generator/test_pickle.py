@@ -6,6 +6,7 @@ from tempfile import TemporaryDirectory
 
 from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
 from prolothar_ca.ca.dataset_generator.pickle import PickleCaDatasetGenerator
+from prolothar_ca.model.ca.columnar import write_columnar_dataset
 
 class TestPickleCaDatasetGenerator(unittest.TestCase):
 
@@ -19,5 +20,15 @@ class TestPickleCaDatasetGenerator(unittest.TestCase):
                 temp_file, queens_dataset_generator.get_target().relation_name)
             self.assertEqual(15, len(dataset_generator.generate(10, 5)))
 
+    def test_generate_from_columnar_dataset(self):
+        with TemporaryDirectory() as temp_dir:
+            queens_dataset_generator = NQueensCaDatasetGenerator(5)
+            write_columnar_dataset(queens_dataset_generator.generate(10, 5, random_seed=17082022), temp_dir)
+            dataset_generator = PickleCaDatasetGenerator(
+                temp_dir, queens_dataset_generator.get_target().relation_name)
+            dataset = dataset_generator.generate(10, 5)
+            self.assertEqual(15, len(dataset))
+            self.assertEqual(10, sum(example.is_valid_solution for example in dataset))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
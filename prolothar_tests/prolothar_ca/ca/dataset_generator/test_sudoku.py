@@ -36,5 +36,28 @@ class TestSudokuCaDatasetGenerator(unittest.TestCase):
                 for constraint in dataset_generator.get_ground_truth_constraints()
             ))
 
+    def test_generate_in_parallel(self):
+        dataset_generator = SudokuCaDatasetGenerator(4, only_return_unique_examples=False)
+        sequential_dataset = dataset_generator.generate(3, 3, random_seed=17082022, nr_of_processes=1)
+        parallel_dataset = dataset_generator.generate(3, 3, random_seed=17082022, nr_of_processes=2)
+        self.assertEqual(6, len(parallel_dataset))
+        for example, parallel_example in zip(sequential_dataset, parallel_dataset):
+            self.assertEqual(example.is_valid_solution, parallel_example.is_valid_solution)
+            self.assertDictEqual(
+                {o.object_id: o.features for o in example.iter_objects()},
+                {o.object_id: o.features for o in parallel_example.iter_objects()})
+            self.assertDictEqual(example.relations, parallel_example.relations)
+
+    def test_generate_unique_examples_with_several_processes(self):
+        dataset_generator = SudokuCaDatasetGenerator(4)
+        ca_dataset = dataset_generator.generate(5, 5, random_seed=17082022, nr_of_processes=2)
+        self.assertEqual(10, len(ca_dataset))
+        examples = list(ca_dataset)
+        for i, example in enumerate(examples):
+            for other_example in examples[i+1:]:
+                self.assertNotEqual(
+                    {o.object_id: o.features for o in example.iter_objects()},
+                    {o.object_id: o.features for o in other_example.iter_objects()})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
+from prolothar_ca.ca.dataset_logger.archive_dataset_logger import ArchiveDatasetLogger
+from prolothar_ca.ca.dataset_logger.example_archive import ExampleArchiveReader
+
+class TestArchiveDatasetLogger(unittest.TestCase):
+
+    def test_log_and_read_dataset(self):
+        dataset = MultipleKnapsackCaDatasetGenerator().generate(7, 4, random_seed=17082022)
+        with TemporaryDirectory() as tempdir:
+            dataset_logger = ArchiveDatasetLogger(tempdir, examples_per_chunk=3)
+            dataset_logger.log_dataset(dataset, 'testdataset')
+            self.assertListEqual(['testdataset.caarchive'], os.listdir(tempdir))
+            read_dataset = dataset_logger.read_dataset('testdataset')
+            self.assertEqual(len(dataset), len(read_dataset))
+            for example, read_example in zip(dataset, read_dataset):
+                self.assertEqual(example.is_valid_solution, read_example.is_valid_solution)
+                self.assertDictEqual(example.relations, read_example.relations)
+            with ExampleArchiveReader(dataset_logger.get_archive_path('testdataset')) as reader:
+                example_list = list(dataset)
+                for i in [10, 0, 5, -1, 3]:
+                    self.assertDictEqual(example_list[i].relations, reader[i].relations)
+                    self.assertIsNone(reader.get_attachment(i))
+                self.assertRaises(IndexError, reader.__getitem__, 11)
+
+if __name__ == '__main__':
+    unittest.main()
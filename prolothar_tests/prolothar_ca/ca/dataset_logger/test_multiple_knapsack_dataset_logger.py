@@ -4,6 +4,7 @@ from tempfile import TemporaryDirectory
 
 from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
 from prolothar_ca.ca.dataset_logger.multiple_knacksack_dataset_logger import MultipleKnapsackDatasetLogger
+from prolothar_ca.ca.dataset_logger.example_archive import ExampleArchiveReader
 
 class TestMultipleKnapsackDatasetLogger(unittest.TestCase):
 
@@ -15,5 +16,16 @@ class TestMultipleKnapsackDatasetLogger(unittest.TestCase):
             self.assertEqual(3, len(os.listdir(dataset_logger.get_positive_examples_directory('testdataset'))))
             self.assertEqual(2, len(os.listdir(dataset_logger.get_negative_examples_directory('testdataset'))))
 
+    def test_log_dataset_to_archive(self):
+        dataset = MultipleKnapsackCaDatasetGenerator().generate(3, 2, random_seed=17082022)
+        with TemporaryDirectory() as tempdir:
+            dataset_logger = MultipleKnapsackDatasetLogger(tempdir, use_archive=True)
+            dataset_logger.log_dataset(dataset, 'testdataset')
+            self.assertListEqual(['testdataset.caarchive'], os.listdir(tempdir))
+            with ExampleArchiveReader(os.path.join(tempdir, 'testdataset.caarchive')) as reader:
+                self.assertEqual(5, len(reader))
+                for i in range(len(reader)):
+                    self.assertTrue(reader.get_attachment(i).startswith(b'Nr of items: '))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from prolothar_ca.ca.methods.countor.sparse import SparseTensor
+
+class TestSparseTensor(unittest.TestCase):
+
+    def setUp(self):
+        random_generator = np.random.default_rng(42)
+        self.dense_tensor = random_generator.integers(-2, 3, size=(4, 5, 3)) * (
+            random_generator.random((4, 5, 3)) < 0.3)
+        self.sparse_tensor = SparseTensor.from_dense(self.dense_tensor)
+
+    def test_to_dense(self):
+        np.testing.assert_array_equal(self.dense_tensor, self.sparse_tensor.to_dense())
+
+    def test_min_max(self):
+        self.assertEqual(np.max(self.dense_tensor), self.sparse_tensor.max())
+        self.assertEqual(np.min(self.dense_tensor), self.sparse_tensor.min())
+        full_tensor = SparseTensor.from_dense(np.full((2, 2), 3))
+        self.assertEqual(3, full_tensor.max())
+        self.assertEqual(3, full_tensor.min())
+
+    def test_sum(self):
+        for axis in [(0,), (1,), (2,), (0, 2), (1, 2)]:
+            np.testing.assert_array_equal(
+                np.sum(self.dense_tensor, axis=axis),
+                self.sparse_tensor.sum(axis=axis).to_dense())
+
+    def test_transpose(self):
+        np.testing.assert_array_equal(
+            self.dense_tensor.transpose((2, 0, 1)),
+            self.sparse_tensor.transpose((2, 0, 1)).to_dense())
+
+    def test_matmul(self):
+        matrix = np.array([[0, 2, 0, 1], [1, 0, 0, 0], [0, 0, 3, 0]])
+        sparse_matrix = SparseTensor.from_dense(matrix)
+        for tensor in [self.dense_tensor[:,0,0], self.dense_tensor[:,:,0], self.dense_tensor.transpose((1, 0, 2))]:
+            np.testing.assert_array_equal(
+                np.matmul(matrix, tensor),
+                sparse_matrix.matmul(SparseTensor.from_dense(tensor)).to_dense())
+        self.assertRaises(ValueError, sparse_matrix.matmul, self.sparse_tensor)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.methods.custom.candidate_generator.count_generator import generate_count_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.count_generator import _create_example_matrix
+from prolothar_ca.ca.methods.custom.candidate_generator.count_generator import _count_true_variables_in_groups
+from prolothar_ca.ca.methods.custom.model.custom_constraint import DataGraph
+from prolothar_ca.ca.methods.custom.model.custom_constraint import PartitionByTargetParameterFeaturesAreTrue
+from prolothar_ca.ca.methods.custom.sat_encoding import create_homgenous_sat_encoded_dataset
+from prolothar_ca.model.sat.variable import Value
+
+class TestCountGenerator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        cls.ca_dataset = dataset_generator.generate(10, 0, random_seed=191026)
+        cls.target_relation = cls.ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        cls.datagraph = DataGraph(next(iter(cls.ca_dataset)), cls.ca_dataset, cls.target_relation)
+        cls.sat_encoded_dataset = create_homgenous_sat_encoded_dataset(
+            cls.ca_dataset, cls.target_relation, cls.datagraph)
+
+    def test_count_true_variables_in_groups(self):
+        example_matrix, column_index_of_variable = _create_example_matrix(
+            TestCountGenerator.sat_encoded_dataset, TestCountGenerator.datagraph)
+        for i in range(len(TestCountGenerator.target_relation.parameter_types)):
+            variable_group_tuples = PartitionByTargetParameterFeaturesAreTrue(
+                i, len(TestCountGenerator.target_relation.parameter_types), [], 0
+            ).compute_variable_groups(TestCountGenerator.datagraph)
+            counts = _count_true_variables_in_groups(
+                variable_group_tuples, example_matrix, column_index_of_variable)
+            self.assertEqual((len(TestCountGenerator.sat_encoded_dataset), len(variable_group_tuples)), counts.shape)
+            for example_index, example in enumerate(TestCountGenerator.sat_encoded_dataset):
+                for group_index, variable_group in enumerate(variable_group_tuples):
+                    self.assertEqual(
+                        sum(example[variable].value == Value.TRUE for variable in variable_group),
+                        counts[example_index, group_index])
+
+    def test_generate_count_candidates(self):
+        candidates = list(generate_count_candidates(
+            TestCountGenerator.ca_dataset, TestCountGenerator.sat_encoded_dataset,
+            TestCountGenerator.datagraph, TestCountGenerator.target_relation))
+        self.assertGreater(len(candidates), 0)
+        #every row and every column contains exactly one queen
+        self.assertTrue(any(not candidate.is_trivial for candidate in candidates))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.double_round_robin import DoubleRoundRobinCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.methods.custom.candidate_generator.for_all_all_parameters_cross_product import generate_for_all_all_parameters_cross_product_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.for_all_cross_product import generate_for_all_cross_product_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.for_all_one_parameter_cross_product import generate_for_all_one_parameter_cross_product_candidates
+from prolothar_ca.ca.methods.custom.candidate_generator.gain_bound import GainBound
+from prolothar_ca.ca.methods.custom.candidate_generator.gain_bound import select_candidates_for_expansion
+from prolothar_ca.ca.methods.custom.homogenous_candidate import Candidate
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import BooleanRelation
+from prolothar_ca.ca.methods.custom.model.custom_constraint import DataGraph
+from prolothar_ca.ca.methods.custom.sat_encoding import create_homgenous_sat_encoded_dataset
+from prolothar_ca.model.sat.term_factory import TermFactory
+from prolothar_common.mdl_utils import L_N
+
+class TestGainBound(unittest.TestCase):
+
+    def test_bound_is_lowerbound_of_initial_gain(self):
+        dataset_generator = MetaplanningCaDatasetGenerator(
+            'prolothar_tests/resources/meta_planning/hanoi',
+            filter_actions_with_duplicate_parameter=True
+        )
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=17082022)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        sat_encoded_dataset = create_homgenous_sat_encoded_dataset(ca_dataset, target_relation, datagraph)
+        nr_of_target_relation_parameter_options = tuple(
+            len(first_example.all_objects_per_type[parameter_type])
+            for parameter_type in target_relation.parameter_types
+        )
+        constraint_list = list(generate_for_all_one_parameter_cross_product_candidates(
+            ca_dataset, target_relation, nr_of_target_relation_parameter_options))
+        constraint_list.extend(generate_for_all_cross_product_candidates(
+            ca_dataset, target_relation, nr_of_target_relation_parameter_options))
+        self.assertGreater(len(constraint_list), 0)
+
+        gain_bound = GainBound(datagraph, len(sat_encoded_dataset))
+        term_factory = TermFactory()
+        for constraint in constraint_list:
+            bound = gain_bound.compute(constraint)
+            candidate = Candidate(constraint, datagraph, sat_encoded_dataset, term_factory)
+            self.assertTrue(candidate.is_materialized)
+            self.assertLessEqual(bound, candidate.gain, msg=str(constraint))
+
+            lazy_candidate = Candidate(
+                constraint, datagraph, sat_encoded_dataset, term_factory, gain_bound=bound)
+            self.assertFalse(lazy_candidate.is_materialized)
+            self.assertEqual(bound, lazy_candidate.gain)
+            lazy_candidate.materialize()
+            self.assertTrue(lazy_candidate.is_materialized)
+            self.assertEqual(candidate.gain, lazy_candidate.gain)
+
+    def test_sampled_estimate_on_single_block_equals_initial_gain(self):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=191026)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        sat_encoded_dataset = create_homgenous_sat_encoded_dataset(ca_dataset, target_relation, datagraph)
+        nr_of_target_relation_parameter_options = tuple(
+            len(first_example.all_objects_per_type[parameter_type])
+            for parameter_type in target_relation.parameter_types
+        )
+        gain_bound = GainBound(datagraph, len(sat_encoded_dataset))
+        term_factory = TermFactory()
+        #the block contains the full cross product
+        max_nr_of_clauses = datagraph.get_nr_of_target_variables()**2
+        nr_of_promising_candidates = 0
+        for constraint in generate_for_all_all_parameters_cross_product_candidates(
+                ca_dataset, target_relation, nr_of_target_relation_parameter_options):
+            candidate = Candidate(constraint, datagraph, sat_encoded_dataset, term_factory)
+            if candidate.gain < 0:
+                self.assertAlmostEqual(
+                    candidate.gain,
+                    gain_bound.estimate_from_sampled_clauses(constraint, sat_encoded_dataset, max_nr_of_clauses),
+                    msg=str(constraint))
+                nr_of_promising_candidates += 1
+        self.assertGreater(nr_of_promising_candidates, 0)
+
+    def test_select_candidates_above_old_cutoff(self):
+        #the target relation has three parameters
+        dataset_generator = DoubleRoundRobinCaDatasetGenerator(4)
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=21092022)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        self.assertGreater(len(target_relation.parameter_types), 2)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        sat_encoded_dataset = create_homgenous_sat_encoded_dataset(ca_dataset, target_relation, datagraph)
+        nr_of_target_relation_parameter_options = tuple(
+            len(first_example.all_objects_per_type[parameter_type])
+            for parameter_type in target_relation.parameter_types
+        )
+        gain_bound = GainBound(datagraph, len(sat_encoded_dataset))
+        estimated_constraints = [
+            (gain_bound.estimate_from_sampled_clauses(constraint, sat_encoded_dataset, 500), constraint)
+            for constraint in generate_for_all_all_parameters_cross_product_candidates(
+                ca_dataset, target_relation, nr_of_target_relation_parameter_options)
+        ]
+        self.assertTrue(any(estimate < float('inf') for estimate, _ in estimated_constraints))
+
+        selected_constraints = select_candidates_for_expansion(estimated_constraints, 2)
+        promising_estimates = sorted(estimate for estimate, _ in estimated_constraints if estimate < 0)
+        self.assertListEqual(promising_estimates[:2], [estimate for estimate, _ in selected_constraints])
+        selected_constraint_ids = set(id(constraint) for _, constraint in selected_constraints)
+        for estimate, constraint in estimated_constraints:
+            if id(constraint) not in selected_constraint_ids:
+                #all skipped candidates have a non-negative or a worse estimate
+                self.assertTrue(estimate >= 0 or estimate >= selected_constraints[-1][0], msg=str(constraint))
+
+    def test_select_candidates_for_expansion(self):
+        estimated_constraints = [(-1, 'a'), (3, 'b'), (-5, 'c'), (-1, 'd'), (0, 'e'), (-2, 'f')]
+        self.assertListEqual(
+            [(-5, 'c'), (-2, 'f'), (-1, 'a')],
+            select_candidates_for_expansion(estimated_constraints, 3))
+        self.assertListEqual(
+            [(-5, 'c'), (-2, 'f'), (-1, 'a'), (-1, 'd')],
+            select_candidates_for_expansion(estimated_constraints, 10))
+        self.assertListEqual([], select_candidates_for_expansion(estimated_constraints, 0))
+
+    def test_relation_filter_bound(self):
+        dataset_generator = MetaplanningCaDatasetGenerator(
+            'prolothar_tests/resources/meta_planning/hanoi',
+            filter_actions_with_duplicate_parameter=True
+        )
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=17082022)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        sat_encoded_dataset = create_homgenous_sat_encoded_dataset(ca_dataset, target_relation, datagraph)
+        nr_of_target_relation_parameter_options = tuple(
+            len(first_example.all_objects_per_type[parameter_type])
+            for parameter_type in target_relation.parameter_types
+        )
+        gain_bound = GainBound(datagraph, len(sat_encoded_dataset))
+        term_factory = TermFactory()
+        nr_of_tightened_bounds = 0
+        for constraint in generate_for_all_cross_product_candidates(
+                ca_dataset, target_relation, nr_of_target_relation_parameter_options):
+            if not isinstance(constraint.cross_product_filter, BooleanRelation):
+                continue
+            bound = gain_bound.compute(constraint)
+            candidate = Candidate(constraint, datagraph, sat_encoded_dataset, term_factory)
+            self.assertLessEqual(bound, candidate.gain, msg=str(constraint))
+            bound_without_filter = (
+                constraint.encoded_model_length
+                - len(sat_encoded_dataset) * (datagraph.get_nr_of_target_variables() - 1)
+                + len(sat_encoded_dataset) * L_N(1)
+            )
+            if bound > bound_without_filter:
+                nr_of_tightened_bounds += 1
+        self.assertGreater(nr_of_tightened_bounds, 0)
+
+    def test_compute_against_model(self):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=191026)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        nr_of_target_relation_parameter_options = tuple(
+            len(first_example.all_objects_per_type[parameter_type])
+            for parameter_type in target_relation.parameter_types
+        )
+        gain_bound = GainBound(datagraph, 10)
+        constraint = next(
+            constraint for constraint in generate_for_all_cross_product_candidates(
+                ca_dataset, target_relation, nr_of_target_relation_parameter_options)
+            if gain_bound.compute(constraint) < 0)
+        bound = gain_bound.compute(constraint)
+        self.assertEqual(bound, gain_bound.compute_against_model(constraint, bound, [], float('inf')))
+        #without any data cost left, a new constraint only adds model cost
+        self.assertEqual(
+            constraint.encoded_model_length,
+            gain_bound.compute_against_model(constraint, bound, [], 0))
+        #the model cost does not need to grow if the constraint is merged into the model
+        self.assertEqual(0, gain_bound.compute_against_model(constraint, bound, [constraint], 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+sys.setrecursionlimit(15000)
+from prolothar_ca.ca.methods.custom.model.cross_product_filter import NumericFeature, NumericFilter
+
+from prolothar_ca.ca.methods.custom.model.custom_constraint import DataGraph
+from prolothar_ca.ca.methods.custom.model.for_all_join_all import ForAllJoinAll
+from prolothar_ca.ca.methods.custom.model.custom_constraint import JoinTargetConstraint
+from prolothar_ca.ca.methods.custom.sat_encoding import create_homgenous_sat_encoded_dataset
+
+from prolothar_ca.ca.methods.custom.mdl_score import compute_encoded_data_length_from_known_solution
+from prolothar_ca.ca.methods.custom.mdl_score import compute_encoded_data_length_from_known_solution_with_screening
+from prolothar_ca.ca.methods.custom.mdl_score import compute_lowerbound_of_summed_error_score
+from prolothar_ca.ca.methods.custom.mdl_score import compute_error_score
+from prolothar_ca.ca.methods.custom.facade import URPiLs
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.model.sat.cnf import CnfFormula
+from prolothar_ca.model.sat.term_factory import TermFactory
+from prolothar_ca.solver.sat.modelcount.mc2 import MC2
+
+class TestMdlScoreScreening(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset_generator = NQueensCaDatasetGenerator(6)
+        cls.ca_dataset = cls.dataset_generator.generate(20, 0, random_seed=191026)
+        cls.target_relation = cls.ca_dataset.get_relation_type(
+            cls.dataset_generator.get_target().relation_name)
+        cls.datagraph = DataGraph(next(iter(cls.ca_dataset)), cls.ca_dataset, cls.target_relation)
+        cls.sat_dataset = create_homgenous_sat_encoded_dataset(
+            cls.ca_dataset, cls.target_relation, cls.datagraph)
+        cls.sat_variables = cls.datagraph.get_target_variables()
+        cls.model_counter = MC2(use_graph_lower_bound=True, use_regular_graph_lower_bound=True)
+        cls.row_model = CnfFormula(ForAllJoinAll(
+            NumericFilter(NumericFeature('x', 1, 4, 2), NumericFilter.EQ, NumericFeature('x', 3, 4, 2)),
+            JoinTargetConstraint([(0,1)],(2,3), False, (6, 36)), 2
+        ).compute_cnf_clauses(cls.datagraph, TermFactory()))
+        #wrong constraint: if there is a queen in a row, all squares in this row have a queen
+        cls.wrong_row_model = CnfFormula(ForAllJoinAll(
+            NumericFilter(NumericFeature('x', 1, 4, 2), NumericFilter.EQ, NumericFeature('x', 3, 4, 2)),
+            JoinTargetConstraint([(0,1)],(2,3), True, (6, 36)), 2
+        ).compute_cnf_clauses(cls.datagraph, TermFactory()))
+
+    def test_lowerbound_of_summed_error_score(self):
+        exact_error_score = sum(
+            compute_error_score(TestMdlScoreScreening.wrong_row_model, example, i)
+            for i,example in enumerate(TestMdlScoreScreening.sat_dataset)
+        )
+        all_example_ids = list(range(len(TestMdlScoreScreening.sat_dataset)))
+        lowerbound = compute_lowerbound_of_summed_error_score(
+            TestMdlScoreScreening.wrong_row_model, TestMdlScoreScreening.sat_dataset,
+            all_example_ids, 0.5)
+        self.assertLess(lowerbound, exact_error_score)
+        self.assertLess(
+            compute_lowerbound_of_summed_error_score(
+                TestMdlScoreScreening.wrong_row_model, TestMdlScoreScreening.sat_dataset,
+                all_example_ids, 0.99),
+            lowerbound
+        )
+
+    def test_screening_is_exact_if_upperbound_is_not_exceeded(self):
+        exact_data_cost = compute_encoded_data_length_from_known_solution(
+            TestMdlScoreScreening.row_model, TestMdlScoreScreening.sat_dataset,
+            TestMdlScoreScreening.sat_variables, TestMdlScoreScreening.model_counter,
+            TestMdlScoreScreening.sat_dataset[0])
+        self.assertEqual(exact_data_cost, compute_encoded_data_length_from_known_solution_with_screening(
+            TestMdlScoreScreening.row_model, TestMdlScoreScreening.sat_dataset,
+            TestMdlScoreScreening.sat_variables, TestMdlScoreScreening.model_counter,
+            TestMdlScoreScreening.sat_dataset[0], float('inf'), [0, 5, 10], 0.95))
+        screened_data_cost = compute_encoded_data_length_from_known_solution_with_screening(
+            TestMdlScoreScreening.row_model, TestMdlScoreScreening.sat_dataset,
+            TestMdlScoreScreening.sat_variables, TestMdlScoreScreening.model_counter,
+            TestMdlScoreScreening.sat_dataset[0], 0, [0, 5, 10], 0.95)
+        self.assertGreater(screened_data_cost, 0)
+        self.assertLessEqual(screened_data_cost, exact_data_cost)
+
+    def test_urpils_with_screening(self):
+        constraints = URPiLs(
+            nr_of_screening_examples=10, random_seed=191026
+        ).acquire_constraints(
+            TestMdlScoreScreening.ca_dataset,
+            TestMdlScoreScreening.dataset_generator.get_target())
+        self.assertGreater(len(constraints), 0)
+        for constraint in constraints:
+            for example in TestMdlScoreScreening.ca_dataset:
+                self.assertTrue(constraint.holds(example, {}))
+
+if __name__ == '__main__':
+    unittest.main()
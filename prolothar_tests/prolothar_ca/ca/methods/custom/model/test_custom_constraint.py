@@ -13,6 +13,7 @@ from prolothar_ca.ca.methods.custom.sat_encoding import create_heterogenous_sat_
 from prolothar_ca.model.sat.cnf import CnfFormula
 from prolothar_ca.model.sat.term_factory import TermFactory
 from prolothar_ca.model.sat.variable import Value
+from prolothar_ca.model.ca.variable_type import CaBoolean
 
 class TestCustomConstraint(unittest.TestCase):
 
@@ -83,5 +84,40 @@ class TestCustomConstraint(unittest.TestCase):
             self.assertEqual(common_cnf.value(), Value.FALSE)
             i += 1
 
+    def test_target_variables_grouped_by_parameter(self):
+        dataset_generator = MetaplanningCaDatasetGenerator(
+            'prolothar_tests/resources/meta_planning/hanoi',
+            filter_actions_with_duplicate_parameter=True
+        )
+        ca_dataset = dataset_generator.generate(5, 0, random_seed=17082022)
+        target_relation = ca_dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_example = next(iter(ca_dataset))
+        datagraph = DataGraph(first_example, ca_dataset, target_relation)
+        self.assertEqual(
+            datagraph.get_fingerprint(),
+            DataGraph(first_example, ca_dataset, target_relation).get_fingerprint())
+        for parameter_index, parameter_type in enumerate(target_relation.parameter_types):
+            feature_name_lists = [[]] + [
+                [feature_name] for feature_name, feature_type
+                in ca_dataset.get_object_type(parameter_type).feature_definition.items()
+                if isinstance(feature_type, CaBoolean)
+            ]
+            for feature_name_list in feature_name_lists:
+                for expected_value in (True, False):
+                    expected_groups = {}
+                    for variable_nr, variable in sorted(datagraph.get_target_variables().items()):
+                        an_object = datagraph.get_target_relation(variable_nr).objects[parameter_index]
+                        if all(an_object.features[f] == expected_value for f in feature_name_list):
+                            expected_groups.setdefault(an_object.object_id, []).append(variable)
+                    expected_groups = tuple(
+                        tuple(variable_list) for _, variable_list in sorted(expected_groups.items()))
+                    if expected_value:
+                        groups = datagraph.get_target_variables_grouped_by_parameter_with_true_features(
+                            parameter_index, feature_name_list)
+                    else:
+                        groups = datagraph.get_target_variables_grouped_by_parameter_with_false_features(
+                            parameter_index, feature_name_list)
+                    self.assertEqual(expected_groups, groups)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
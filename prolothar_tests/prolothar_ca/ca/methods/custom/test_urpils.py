@@ -5,6 +5,8 @@ from socket import gethostname
 sys.setrecursionlimit(15000)
 
 from prolothar_ca.ca.methods.custom.facade import URPiLs
+from prolothar_ca.ca.methods.custom.homogenous_ca import HomogenousCustomCa
+from prolothar_ca.ca.methods.custom.itemset_miner.itemset_miner import ItemsetMiner
 from prolothar_ca.ca.dataset_generator.sudoku import SudokuCaDatasetGenerator
 from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
 from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
@@ -12,6 +14,18 @@ from prolothar_ca.ca.dataset_generator.double_round_robin import DoubleRoundRobi
 from prolothar_ca.ca.noise_generator.boolean_relation_flipper import BooleanRelationFlipper
 from prolothar_ca.ca.noise_generator.noisy_examples_adder import NoisyExamplesAdder
 
+class CallRecordingItemsetMiner(ItemsetMiner):
+    """
+    counts the calls independently of the counters of ItemsetMiner
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorded_calls = 0
+
+    def find_patterns(self, positive_list, negative_list):
+        self.recorded_calls += 1
+        return super().find_patterns(positive_list, negative_list)
+
 class TestCustomCa(unittest.TestCase):
 
     def test_acquire_constraints_sudoku_4x4(self):
@@ -104,6 +118,72 @@ class TestCustomCa(unittest.TestCase):
         constraints_as_str = [str(c) for c in constraints]
         self.assertIn('for all x0 in Cell: 1 <= count(x1 in CellValue | cell_has_value(x0,x1)) <= 1', constraints_as_str)
 
+    def test_acquire_constraints_with_report_nqueens_4(self):
+        dataset_generator = NQueensCaDatasetGenerator(4)
+        ca_dataset = dataset_generator.generate(40, 0, random_seed=22082022)
+
+        ca = URPiLs()
+        constraints, report = ca.acquire_constraints_with_report(
+            ca_dataset, dataset_generator.get_target())
+        self.assertEqual(
+            [str(c) for c in ca.acquire_constraints(ca_dataset, dataset_generator.get_target())],
+            [str(c) for c in constraints])
+        for phase in ['create_datagraph', 'sat_encoding', 'simple_quantified_expressions',
+                      'complex_quantified_expressions', 'count_expressions', 'to_ca_model']:
+            self.assertIn(phase, report.phase_times)
+            self.assertGreaterEqual(report.phase_times[phase], 0)
+        #accepted candidates can replace previously accepted candidates
+        self.assertLessEqual(
+            len(constraints),
+            sum(counts['accepted'] for counts in report.candidate_counts.values()))
+        for counts in report.candidate_counts.values():
+            self.assertGreaterEqual(counts['generated'], counts['accepted'])
+            #every candidate is either scored at least once or pruned by its gain bound
+            self.assertGreaterEqual(counts['scored'] + counts['pruned'], counts['generated'])
+        self.assertGreater(report.model_counter_calls, 0)
+        self.assertGreater(report.sql_queries, 0)
+        self.assertIn('phase_times', report.to_dict())
+
+    def test_report_counts_itemset_miner_calls_per_run(self):
+        dataset_generator = NQueensCaDatasetGenerator(4)
+        ca_dataset = dataset_generator.generate(40, 0, random_seed=22082022)
+        itemset_miner = CallRecordingItemsetMiner(verbose=False)
+        ca = HomogenousCustomCa(itemset_miner=itemset_miner, random_seed=22082022)
+
+        _, first_report = ca.acquire_constraints_with_report(ca_dataset, dataset_generator.get_target())
+        self.assertEqual(itemset_miner.recorded_calls, first_report.itemset_miner_calls)
+        self.assertEqual(itemset_miner.cumulative_time, first_report.itemset_miner_time)
+        self.assertGreater(first_report.model_counter_calls, 0)
+
+        #a second run on the same miner only reports the calls of this run
+        calls_before_second_run = itemset_miner.recorded_calls
+        time_before_second_run = itemset_miner.cumulative_time
+        _, second_report = ca.acquire_constraints_with_report(ca_dataset, dataset_generator.get_target())
+        self.assertEqual(
+            itemset_miner.recorded_calls - calls_before_second_run,
+            second_report.itemset_miner_calls)
+        self.assertAlmostEqual(
+            itemset_miner.cumulative_time - time_before_second_run,
+            second_report.itemset_miner_time)
+
+    def test_acquire_constraints_with_report_hanoi(self):
+        if not gethostname().startswith('PC'):
+            self.skipTest('not sure why this fails in ci pipeline, but we temporarily skip this test')
+        dataset_generator = MetaplanningCaDatasetGenerator(
+            'prolothar_tests/resources/meta_planning/hanoi',
+            filter_actions_with_duplicate_parameter=True)
+        ca_dataset = dataset_generator.generate(10, 0, random_seed=20022023)
+
+        ca = URPiLs(planning_dataset=True)
+        constraints, report = ca.acquire_constraints_with_report(
+            ca_dataset, dataset_generator.get_target())
+        #accepted candidates can replace previously accepted candidates
+        self.assertLessEqual(
+            len(constraints),
+            sum(counts['accepted'] for counts in report.candidate_counts.values()))
+        self.assertIn('simple_quantified_expressions', report.phase_times)
+        self.assertGreater(report.sql_queries, 0)
+
     def test_acquire_constraints_hanoi(self):
         if not gethostname().startswith('PC'):
             self.skipTest('not sure why this fails in ci pipeline, but we temporarily skip this test')
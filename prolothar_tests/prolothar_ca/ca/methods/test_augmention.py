@@ -0,0 +1,61 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.methods.augmention import NegativeExamplesAugmentationAdaptor
+from prolothar_ca.ca.methods.method import CaMethod
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.targets import CaTarget
+
+class DatasetRecordingMethod(CaMethod):
+
+    def __init__(self):
+        self.dataset = None
+        self.target = None
+
+    def acquire_constraints(self, dataset: CaDataset, target: CaTarget):
+        self.dataset = dataset
+        self.target = target
+        return []
+
+    def __repr__(self):
+        return 'DatasetRecordingMethod'
+
+class TestNegativeExamplesAugmentationAdaptor(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset_generator = NQueensCaDatasetGenerator(5)
+        self.dataset = self.dataset_generator.generate(5, 0, random_seed=191026)
+
+    def test_acquire_constraints(self):
+        method = DatasetRecordingMethod()
+        NegativeExamplesAugmentationAdaptor(method, random_seed=42).acquire_constraints(
+            self.dataset, self.dataset_generator.get_target())
+        self.assertEqual(5, len(self.dataset))
+        self.assertEqual(10, len(method.dataset))
+        positive_examples = [e for e in method.dataset if e.is_valid_solution]
+        negative_examples = [e for e in method.dataset if not e.is_valid_solution]
+        self.assertEqual(5, len(negative_examples))
+        target_relation_names = method.target.relation_name_list
+        for example in negative_examples:
+            self.assertIs(positive_examples[0].all_objects_per_type, example.all_objects_per_type)
+            for relation_name, relation_set in example.relations.items():
+                if relation_name not in target_relation_names:
+                    self.assertIs(positive_examples[0].relations[relation_name], relation_set)
+            for relation in example.iter_relations():
+                self.assertEqual(relation.value, example.get_relation_value(relation.name, relation.objects))
+        self.assertGreater(len(set(
+            frozenset(r for r in e.iter_relations() if r.value) for e in negative_examples)), 1)
+
+    def test_acquire_constraints_with_rejection_model(self):
+        method = DatasetRecordingMethod()
+        rejection_model = self.dataset_generator.get_ground_truth_constraints()
+        NegativeExamplesAugmentationAdaptor(
+            method, random_seed=42, rejection_model=rejection_model
+        ).acquire_constraints(self.dataset, self.dataset_generator.get_target())
+        for example in method.dataset:
+            self.assertEqual(
+                example.is_valid_solution,
+                all(constraint.holds(example, {}) for constraint in rejection_model))
+
+if __name__ == '__main__':
+    unittest.main()
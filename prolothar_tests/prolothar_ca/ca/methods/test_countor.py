@@ -1,12 +1,17 @@
 import unittest
+from functools import reduce
+from itertools import combinations
+import numpy as np
 from prolothar_ca.model.ca.targets import RelationTarget
 
 from prolothar_ca.model.rostering import SchedulingPeriod, Solution, ca_names
 from prolothar_ca.model.sudoku import Sudoku
 
 from prolothar_ca.ca.methods.countor.countor import CountOr
+from prolothar_ca.ca.methods.countor.sparse import SparseTensor
 from prolothar_ca.ca.dataset_generator.sudoku import CELL_VALUE_RELATION, SudokuCaDatasetGenerator
 from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.random import RandomCaDatasetGenerator
 
 class TestCountOr(unittest.TestCase):
 
@@ -47,5 +52,51 @@ class TestCountOr(unittest.TestCase):
             for example in ca_dataset:
                 self.assertTrue(constraint.holds(example, {}))
 
+    def test_acquire_constraints_with_multiple_processes(self):
+        dataset_generator = RandomCaDatasetGenerator(3, 6, numeric_features=2)
+        ca_dataset = dataset_generator.generate(6, 0, random_seed=5)
+
+        constraints = CountOr().acquire_constraints(ca_dataset, dataset_generator.get_target())
+        parallel_constraints = CountOr(nr_of_processes=2).acquire_constraints(
+            ca_dataset, dataset_generator.get_target())
+        self.assertGreater(len(constraints), 0)
+        self.assertListEqual(list(map(str, constraints)), list(map(str, parallel_constraints)))
+
+    def test_acquire_constraints_four_dimensions(self):
+        dataset_generator = RandomCaDatasetGenerator(4, 4, boolean_features=1, numeric_features=1)
+        ca_dataset = dataset_generator.generate(3, 0, random_seed=33)
+
+        constraints = CountOr().acquire_constraints(ca_dataset, dataset_generator.get_target())
+        self.assertGreater(len(constraints), 0)
+        for constraint in constraints:
+            for example in ca_dataset:
+                self.assertTrue(constraint.holds(example, {}))
+
+    def test_pruned_bounds_equal_bounds_of_all_splits(self):
+        random_generator = np.random.default_rng(8)
+        #the first tensor has a block of maximal values and a block of zeros,
+        #i.e. the bounds of many splits are implied by coarser splits
+        blocked_tensor = random_generator.integers(0, 2, size=(3, 4, 2, 3)).astype(float)
+        blocked_tensor[0] = 1
+        blocked_tensor[1] = 0
+        for dense_tensor in [blocked_tensor, random_generator.integers(0, 3, size=(2, 3, 4)).astype(float)]:
+            nr_of_dimensions = dense_tensor.ndim
+            splits = [
+                ([d for d in range(nr_of_dimensions) if d not in s], list(s))
+                for nr_of_summed_dimensions in range(1, nr_of_dimensions)
+                for s in combinations(range(nr_of_dimensions), nr_of_summed_dimensions)
+            ]
+            upper_bound_per_s, lower_bound_per_s = CountOr()._CountOr__compute_non_trivial_bounds(
+                SparseTensor.from_dense(dense_tensor), splits, dense_tensor.max(), dense_tensor.min())
+            for _,s in splits:
+                sums = dense_tensor.sum(axis=tuple(s))
+                trivial_upper_bound = dense_tensor.max() * reduce(lambda a,b: a*b, (dense_tensor.shape[i] for i in s))
+                self.assertEqual(
+                    sums.max() if sums.max() != trivial_upper_bound else None,
+                    upper_bound_per_s[tuple(s)], msg=str(s))
+                self.assertEqual(
+                    sums.min() if sums.min() != dense_tensor.min() else None,
+                    lower_bound_per_s[tuple(s)], msg=str(s))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -14,5 +14,19 @@ class TestMineAcq(unittest.TestCase):
         self.assertIsNotNone(constraints)
         self.assertGreater(len(constraints), 0)
 
+    def test_acquire_constraints_accept_all_candidates(self):
+        dataset_generator = NQueensCaDatasetGenerator(4, include_queen_permutations=False)
+        ca_dataset = dataset_generator.generate(2, 0, random_seed=22082022)
+        target_relation_name = dataset_generator.get_target().relation_name
+        example = next(iter(ca_dataset))
+        nr_of_relations = sum(len(relation_set) for relation_set in example.relations.values())
+        nr_of_target_relations = len(example.relations[target_relation_name])
+
+        constraints = MineAcq(rho=1).acquire_constraints(ca_dataset, dataset_generator.get_target())
+        self.assertEqual(
+            nr_of_relations + 2 * (nr_of_relations - 1) * nr_of_target_relations,
+            len(constraints))
+        self.assertEqual(len(constraints), len(set(map(str, constraints))))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.double_round_robin import DoubleRoundRobinCaDatasetGenerator
+from prolothar_ca.model.ca.constraints.batch import evaluate_constraint_on_examples
+from prolothar_ca.model.ca.constraints.boolean import BooleanFeatureIsTrue
+from prolothar_ca.model.ca.constraints.numeric import Between, Constant, Count, NotEqual
+from prolothar_ca.model.ca.constraints.numeric import NumericFeature, NumericVariable
+from prolothar_ca.model.ca.constraints.numeric import CountConsecutive, MinimumOfNumericQuery
+from prolothar_ca.model.ca.constraints.query import AllOfType, AllOfTypeOrderBy, Filter
+from prolothar_ca.model.ca.constraints.query import DistinctValuesOfFeatureQuery
+from prolothar_ca.model.ca.constraints.quantifier import ForAll
+from prolothar_ca.model.ca.constraints.objects import ObjectsNotEqual
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject, CaObjectType
+from prolothar_ca.model.ca.variable_type import CaBoolean, CaNumber
+
+class TestBatch(unittest.TestCase):
+
+    def assert_equal_to_holds(self, constraint, dataset):
+        holds, nr_of_violations = evaluate_constraint_on_examples(constraint, dataset)
+        expected = np.array([constraint.holds(example, {}) for example in dataset])
+        np.testing.assert_array_equal(expected, holds)
+        np.testing.assert_array_equal(~expected, nr_of_violations > 0)
+
+    def test_ground_truth_n_queens(self):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        dataset = dataset_generator.generate(10, 10, random_seed=1)
+        for constraint in dataset_generator.get_ground_truth_constraints():
+            self.assert_equal_to_holds(constraint, dataset)
+
+    def test_ground_truth_multiple_knapsack(self):
+        dataset_generator = MultipleKnapsackCaDatasetGenerator(random_seed=2)
+        dataset = dataset_generator.generate(20, 20, random_seed=2)
+        for constraint in dataset_generator.get_ground_truth_constraints():
+            self.assert_equal_to_holds(constraint, dataset)
+
+    def test_ground_truth_double_round_robin(self):
+        dataset_generator = DoubleRoundRobinCaDatasetGenerator(4)
+        dataset = dataset_generator.generate(10, 10, random_seed=3)
+        for constraint in dataset_generator.get_ground_truth_constraints():
+            self.assert_equal_to_holds(constraint, dataset)
+
+    def create_dataset(self) -> CaDataset:
+        dataset = CaDataset({'Item': CaObjectType('Item', {'size': CaNumber(), 'big': CaBoolean()})}, {})
+        for sizes in [(1, 2, 3), (2, 2, 5), (1, 1, 1), (4, 4, 4), (5, 1, 5, 2)]:
+            dataset.add_example(CaExample(
+                {'Item': set(
+                    CaObject(f'i{i}', 'Item', {'size': size, 'big': size > 3})
+                    for i, size in enumerate(sizes)
+                )},
+                {}, True
+            ))
+        return dataset
+
+    def test_count_distinct_values(self):
+        dataset = self.create_dataset()
+        constraint = ForAll(
+            DistinctValuesOfFeatureQuery('Item', 'size', 'size'),
+            Between(
+                Constant(1),
+                Count(Filter(
+                    AllOfType('Item', 'item'),
+                    NotEqual(NumericFeature('Item', 'item', 'size'), NumericVariable('size'))
+                )),
+                Constant(2)
+            )
+        )
+        self.assert_equal_to_holds(constraint, dataset)
+        holds, nr_of_violations = evaluate_constraint_on_examples(constraint, dataset)
+        np.testing.assert_array_equal([True, True, False, False, False], holds)
+        np.testing.assert_array_equal([0, 0, 1, 1, 2], nr_of_violations)
+
+    def test_objects_not_equal_and_boolean_feature(self):
+        dataset = self.create_dataset()
+        constraint = ForAll(
+            Filter(
+                AllOfTypeOrderBy('Item', 'item', 'size'),
+                ObjectsNotEqual('item', 'i0')
+            ),
+            BooleanFeatureIsTrue('Item', 'item', 'big')
+        )
+        self.assert_equal_to_holds(constraint, dataset)
+
+    def test_fallback_to_holds(self):
+        dataset = self.create_dataset()
+        constraint = Between(
+            Constant(2),
+            MinimumOfNumericQuery(CountConsecutive(
+                AllOfTypeOrderBy('Item', 'item', 'size'), 'a', 'b',
+                ObjectsNotEqual('a', 'b'))),
+            Constant(3)
+        )
+        self.assert_equal_to_holds(constraint, dataset)
+
+if __name__ == '__main__':
+    unittest.main()
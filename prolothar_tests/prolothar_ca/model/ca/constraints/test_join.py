@@ -0,0 +1,89 @@
+import unittest
+
+from prolothar_ca.model.ca.constraints.join import create_join_plan, FeatureJoin, RelationJoin
+from prolothar_ca.model.ca.constraints.boolean import RelationIsTrue, BooleanFeatureIsTrue
+from prolothar_ca.model.ca.constraints.conjunction import And
+from prolothar_ca.model.ca.constraints.numeric import Equal, LessOrEqual, NumericFeature, Count, Constant
+from prolothar_ca.model.ca.constraints.objects import ObjectsEqual, ObjectsNotEqual
+from prolothar_ca.model.ca.constraints.query import AllOfType, Filter, Product
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.relation import CaRelation, CaRelationType
+from prolothar_ca.model.ca.variable_type import CaBoolean
+
+RELATION_TYPE = CaRelationType('likes', ('Person', 'Person'), CaBoolean())
+
+class TestJoin(unittest.TestCase):
+
+    def create_example(self) -> CaExample:
+        persons = [
+            CaObject(f'p{i}', 'Person', {'age': i % 3, 'adult': i > 1})
+            for i in range(6)
+        ]
+        return CaExample(
+            {'Person': set(persons)},
+            {'likes': set(
+                CaRelation('likes', (a, b), (int(a.object_id[1:]) + int(b.object_id[1:])) % 4 == 1)
+                for a in persons for b in persons
+            )},
+            True
+        )
+
+    def assert_same_as_product(self, query: Filter, example: CaExample):
+        expected = []
+        for result in query.query.evaluate(example, {}):
+            if query.constraint.holds(example, dict(result)):
+                expected.append(result)
+        self.assertEqual(expected, query.evaluate(example, {}))
+
+    def create_product(self) -> Product:
+        return Product([AllOfType('Person', 'a'), AllOfType('Person', 'b'), AllOfType('Person', 'c')])
+
+    def test_create_join_plan(self):
+        plan = create_join_plan(self.create_product().subquery_list, And([
+            BooleanFeatureIsTrue('Person', 'a', 'adult'),
+            RelationIsTrue(RELATION_TYPE, ('a', 'b')),
+            Equal(NumericFeature('Person', 'c', 'age'), NumericFeature('Person', 'a', 'age')),
+            ObjectsNotEqual('b', 'c')
+        ]))
+        self.assertEqual(1, len(plan.local_terms_per_subquery[0]))
+        self.assertIsNone(plan.join_per_subquery[0])
+        self.assertIsInstance(plan.join_per_subquery[1], RelationJoin)
+        self.assertIsInstance(plan.join_per_subquery[2], FeatureJoin)
+        self.assertEqual(1, len(plan.residual_terms))
+
+    def test_no_join_plan_without_pushable_terms(self):
+        self.assertIsNone(create_join_plan(
+            self.create_product().subquery_list, ObjectsNotEqual('a', 'b')))
+
+    def test_evaluate(self):
+        example = self.create_example()
+        for constraint in [
+            And([
+                BooleanFeatureIsTrue('Person', 'a', 'adult'),
+                RelationIsTrue(RELATION_TYPE, ('a', 'b')),
+                Equal(NumericFeature('Person', 'c', 'age'), NumericFeature('Person', 'a', 'age')),
+                ObjectsNotEqual('b', 'c')
+            ]),
+            And([ObjectsEqual('c', 'a'), RelationIsTrue(RELATION_TYPE, ('c', 'b'))]),
+            And([
+                RelationIsTrue(RELATION_TYPE, ('b', 'a')),
+                LessOrEqual(Count(Filter(AllOfType('Person', 'd'), RelationIsTrue(RELATION_TYPE, ('c', 'd')))), Constant(2))
+            ]),
+        ]:
+            query = Filter(self.create_product(), constraint)
+            self.assert_same_as_product(query, example)
+            self.assertIsNotNone(create_join_plan(query.query.subquery_list, constraint))
+
+    def test_evaluate_with_shadowing_variable(self):
+        example = self.create_example()
+        query = Filter(self.create_product(), RelationIsTrue(RELATION_TYPE, ('a', 'b')))
+        variables = {'a': example.get_object_by_type_and_id('Person', 'p1')}
+        expected = []
+        for result in query.query.evaluate(example, variables):
+            if query.constraint.holds(example, dict(result) | variables):
+                expected.append(result)
+        self.assertEqual(expected, query.evaluate(example, variables))
+
+if __name__ == '__main__':
+    unittest.main()
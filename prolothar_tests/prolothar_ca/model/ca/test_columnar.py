@@ -0,0 +1,61 @@
+import unittest
+
+from tempfile import TemporaryDirectory
+
+from prolothar_ca.ca.dataset_generator.graph_color import GraphColorCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.multiple_knapsack import MultipleKnapsackCaDatasetGenerator
+from prolothar_ca.model.ca.columnar import write_columnar_dataset, read_columnar_dataset
+from prolothar_ca.model.ca.columnar import _variable_type_from_str, _variable_type_to_str
+from prolothar_ca.model.ca.variable_type import CaBoolean, CaNumber
+
+class TestColumnarCaDataset(unittest.TestCase):
+
+    def assert_datasets_equal(self, dataset, columnar_dataset):
+        self.assertEqual(len(dataset), len(columnar_dataset))
+        self.assertListEqual(
+            [(t.name, t.feature_definition) for t in dataset.get_object_types()],
+            [(t.name, t.feature_definition) for t in columnar_dataset.get_object_types()])
+        self.assertListEqual(dataset.get_relation_types(), columnar_dataset.get_relation_types())
+        for example, columnar_example in zip(dataset, columnar_dataset):
+            self.assertEqual(example.is_valid_solution, columnar_example.is_valid_solution)
+            self.assertDictEqual(
+                {o.object_id: o.features for o in example.iter_objects()},
+                {o.object_id: o.features for o in columnar_example.iter_objects()})
+            self.assertDictEqual(example.relations, columnar_example.relations)
+
+    def test_variable_type_round_trip(self):
+        for variable_type in (CaBoolean(), CaNumber()):
+            self.assertEqual(variable_type, _variable_type_from_str(_variable_type_to_str(variable_type)))
+        self.assertNotEqual(CaBoolean(), CaNumber())
+
+    def test_write_and_read_graph_color_dataset(self):
+        dataset = GraphColorCaDatasetGenerator(nr_of_nodes=10, nr_of_edges=20).generate(
+            5, 4, random_seed=21092022)
+        with TemporaryDirectory() as temp_dir:
+            write_columnar_dataset(dataset, temp_dir)
+            columnar_dataset = read_columnar_dataset(temp_dir)
+            self.assert_datasets_equal(dataset, columnar_dataset)
+            self.assertEqual(dataset.get_max_size_of_object_set(), columnar_dataset.get_max_size_of_object_set())
+            self.assertRaises(NotImplementedError, columnar_dataset.add_example, next(iter(dataset)))
+            self.assert_datasets_equal(dataset, columnar_dataset.to_ca_dataset())
+            self.assertEqual(list(dataset)[-1].relations, columnar_dataset[-1].relations)
+
+    def test_numeric_feature_columns(self):
+        dataset = MultipleKnapsackCaDatasetGenerator().generate(5, 5, random_seed=42)
+        with TemporaryDirectory() as temp_dir:
+            write_columnar_dataset(dataset, temp_dir)
+            columnar_dataset = read_columnar_dataset(temp_dir)
+            self.assert_datasets_equal(dataset, columnar_dataset)
+            for object_type in dataset.get_object_types():
+                for feature_name in object_type.feature_definition:
+                    if dataset.get_nr_of_numeric_features(object_type.name) > 0 and \
+                    len(columnar_dataset.get_feature_column(object_type.name, feature_name)) > 0:
+                        self.assertEqual(
+                            dataset.compute_minimum_feature_value(object_type, feature_name),
+                            columnar_dataset.compute_minimum_feature_value(object_type, feature_name))
+                        self.assertEqual(
+                            dataset.compute_maximum_feature_value(object_type, feature_name),
+                            columnar_dataset.compute_maximum_feature_value(object_type, feature_name))
+
+if __name__ == '__main__':
+    unittest.main()
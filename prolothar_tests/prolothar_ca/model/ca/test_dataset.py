@@ -0,0 +1,51 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.relation import CaRelation
+
+class TestCaDataset(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = NQueensCaDatasetGenerator(5).generate(3, 2, random_seed=191026)
+
+    def test_add_examples(self):
+        dataset = TestCaDataset.dataset.empty_copy()
+        dataset.add_examples(TestCaDataset.dataset)
+        self.assertEqual(len(TestCaDataset.dataset), len(dataset))
+        self.assertEqual(
+            TestCaDataset.dataset.get_max_size_of_object_set(),
+            dataset.get_max_size_of_object_set())
+
+    def test_add_example_with_missing_relation(self):
+        example = next(iter(TestCaDataset.dataset))
+        relation_name, relation_set = next(iter(example.relations.items()))
+        incomplete_example = CaExample(
+            example.all_objects_per_type,
+            example.relations | {relation_name: set(list(relation_set)[1:])},
+            example.is_valid_solution, validate=False)
+        dataset = TestCaDataset.dataset.empty_copy()
+        with self.assertRaises(ValueError):
+            dataset.add_example(incomplete_example)
+        dataset.add_example(incomplete_example, validate=False)
+        self.assertEqual(1, len(dataset))
+
+    def test_add_example_with_unknown_object(self):
+        example = next(iter(TestCaDataset.dataset))
+        relation_name, relation_set = next(iter(example.relations.items()))
+        relation_list = list(relation_set)
+        known_object = relation_list[0].objects[0]
+        unknown_object = CaObject('unknown', known_object.type_name, dict(known_object.features))
+        relation_list[0] = CaRelation(
+            relation_name, (unknown_object,) + relation_list[0].objects[1:], relation_list[0].value)
+        dataset = TestCaDataset.dataset.empty_copy()
+        with self.assertRaises(ValueError):
+            dataset.add_example(CaExample(
+                example.all_objects_per_type,
+                example.relations | {relation_name: set(relation_list)},
+                example.is_valid_solution, validate=False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import pickle
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.model.ca.dataset import CaDataset
+
+class TestObjectTable(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = NQueensCaDatasetGenerator(5).generate(3, 2, random_seed=191026)
+        self.shared_dataset = CaDataset(
+            {object_type.name: object_type for object_type in self.dataset.get_object_types()},
+            {relation_type.name: relation_type for relation_type in self.dataset.get_relation_types()},
+            share_objects=True)
+        self.shared_dataset.add_examples(self.dataset)
+
+    def test_examples_are_preserved(self):
+        self.assertEqual(len(self.dataset), len(self.shared_dataset))
+        for example, shared_example in zip(self.dataset, self.shared_dataset):
+            self.assertEqual(example.is_valid_solution, shared_example.is_valid_solution)
+            self.assertDictEqual(example.all_objects_per_type, shared_example.all_objects_per_type)
+            self.assertDictEqual(example.relations, shared_example.relations)
+            for relation in shared_example.iter_relations():
+                for o in relation.objects:
+                    self.assertIs(shared_example.get_object_by_type_and_id(o.type_name, o.object_id), o)
+
+    def test_objects_and_relations_are_shared(self):
+        first_example, *other_examples = list(self.shared_dataset)
+        for other_example in other_examples:
+            for an_object in other_example.iter_objects():
+                self.assertIs(
+                    first_example.get_object_by_type_and_id(an_object.type_name, an_object.object_id),
+                    an_object)
+        object_table = self.shared_dataset.get_object_table()
+        self.assertEqual(
+            len(list(first_example.iter_objects())), object_table.get_nr_of_objects())
+        self.assertLessEqual(
+            object_table.get_nr_of_relations(),
+            sum(len(list(example.iter_relations())) for example in self.dataset))
+
+    def test_pickle_is_smaller(self):
+        self.assertLess(
+            len(pickle.dumps(self.shared_dataset)),
+            len(pickle.dumps(self.dataset)))
+        copy = self.shared_dataset.fast_deepcopy()
+        self.assertIsNotNone(copy.get_object_table())
+        for example, copied_example in zip(self.shared_dataset, copy):
+            self.assertDictEqual(example.relations, copied_example.relations)
+
+if __name__ == '__main__':
+    unittest.main()
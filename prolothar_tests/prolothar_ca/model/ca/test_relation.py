@@ -0,0 +1,35 @@
+import unittest
+
+import os
+import pickle
+import subprocess
+import sys
+
+from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.relation import CaRelation
+
+PICKLE_RELATION_SCRIPT = '''
+import pickle, sys
+from prolothar_ca.model.ca.obj import CaObject
+from prolothar_ca.model.ca.relation import CaRelation
+a = CaObject('a', 'type', {'x': 1})
+b = CaObject('b', 'type', {'x': 2})
+sys.stdout.buffer.write(pickle.dumps({CaRelation('r', (a, b), True)}))
+'''
+
+class TestCaRelation(unittest.TestCase):
+
+    def test_unpickle_relation_from_other_process(self):
+        #string hashes differ between processes with different hash seeds
+        pickled_relations = subprocess.run(
+            [sys.executable, '-c', PICKLE_RELATION_SCRIPT], check=True, capture_output=True,
+            env=os.environ | {'PYTHONHASHSEED': '12345'}).stdout
+        relations = pickle.loads(pickled_relations)
+        a = CaObject('a', 'type', {'x': 1})
+        b = CaObject('b', 'type', {'x': 2})
+        self.assertIn(CaRelation('r', (a, b), True), relations)
+        self.assertSetEqual({CaRelation('r', (a, b), True)}, relations)
+        self.assertIn(a, {o for relation in relations for o in relation.objects})
+
+if __name__ == '__main__':
+    unittest.main()
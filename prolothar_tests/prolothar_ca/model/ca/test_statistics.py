@@ -0,0 +1,84 @@
+import unittest
+
+import pickle
+
+from prolothar_ca.ca.dataset_generator.n_queens import NQueensCaDatasetGenerator
+from prolothar_ca.ca.dataset_generator.random import RandomCaDatasetGenerator
+from prolothar_ca.ca.noise_generator.boolean_relation_flipper import BooleanRelationFlipper
+from prolothar_ca.ca.noise_generator.noisy_examples_adder import NoisyExamplesAdder
+from prolothar_ca.model.ca.statistics import DatasetStatistics
+from prolothar_ca.model.ca.variable_type import CaNumber
+
+class TestDatasetStatistics(unittest.TestCase):
+
+    def test_statistics_equal_full_scan(self):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        dataset = dataset_generator.generate(6, 4, random_seed=191026)
+        target_relation_name = dataset_generator.get_target().relation_name
+        statistics = dataset.get_statistics()
+        self.assertEqual(
+            max(len(object_set) for example in dataset for object_set in example.all_objects_per_type.values()),
+            statistics.get_max_size_of_object_set())
+        for object_type in dataset.get_object_types():
+            for feature_name in object_type.feature_definition:
+                values = [
+                    o.features[feature_name] for example in dataset
+                    for o in example.all_objects_per_type[object_type.name]
+                ]
+                self.assertEqual(min(values), dataset.compute_minimum_feature_value(object_type, feature_name))
+                self.assertEqual(max(values), dataset.compute_maximum_feature_value(object_type, feature_name))
+                self.assertEqual(
+                    len(set(values)),
+                    statistics.get_nr_of_distinct_feature_values(object_type.name, feature_name))
+        for relation in next(iter(dataset)).relations[target_relation_name]:
+            self.assertEqual(
+                any(example.get_relation_value(target_relation_name, relation.objects) for example in dataset),
+                dataset.is_relation_true_for_any_example(target_relation_name, relation.objects))
+
+    def test_incremental_update(self):
+        #both parameters of the target relation need the numeric feature
+        dataset_generator = RandomCaDatasetGenerator(dimensions=2, nr_of_objects=5)
+        dataset = dataset_generator.generate(10, 0, random_seed=191026)
+        target_relation = dataset.get_relation_type(dataset_generator.get_target().relation_name)
+        first_type, second_type = (dataset.get_object_type(t) for t in target_relation.parameter_types)
+        feature_name = next(
+            feature_name for feature_name, feature_type in first_type.feature_definition.items()
+            if isinstance(feature_type, CaNumber) and feature_name in second_type.feature_definition)
+
+        incremental_dataset = dataset.empty_copy()
+        statistics = incremental_dataset.get_statistics()
+        self.assertEqual(0, statistics.get_max_absolute_difference(target_relation.name, feature_name, 0, 1))
+        for example in dataset:
+            incremental_dataset.add_example(example, validate=False)
+        expected_statistics = DatasetStatistics(list(dataset))
+        self.assertEqual(
+            expected_statistics.get_max_absolute_difference(target_relation.name, feature_name, 0, 1),
+            statistics.get_max_absolute_difference(target_relation.name, feature_name, 0, 1))
+        self.assertEqual(
+            expected_statistics.get_max_size_of_object_set(),
+            statistics.get_max_size_of_object_set())
+
+        unpickled_dataset = pickle.loads(pickle.dumps(incremental_dataset))
+        unpickled_dataset.add_example(next(iter(dataset)), validate=False)
+        self.assertEqual(
+            expected_statistics.get_max_absolute_difference(target_relation.name, feature_name, 0, 1),
+            unpickled_dataset.get_statistics().get_max_absolute_difference(target_relation.name, feature_name, 0, 1))
+
+    def test_statistics_after_noise(self):
+        dataset_generator = NQueensCaDatasetGenerator(5)
+        dataset = dataset_generator.generate(6, 0, random_seed=191026)
+        target_relation_name = dataset_generator.get_target().relation_name
+        all_parameters = [relation.objects for relation in next(iter(dataset)).relations[target_relation_name]]
+        #the statistics are computed before the noise is added
+        for parameters in all_parameters:
+            dataset.is_relation_true_for_any_example(target_relation_name, parameters)
+
+        NoisyExamplesAdder(1, BooleanRelationFlipper(0.5, target_relation_name, random_seed=1), random_seed=2).apply(dataset)
+
+        for parameters in all_parameters:
+            self.assertEqual(
+                any(example.get_relation_value(target_relation_name, parameters) for example in dataset),
+                dataset.is_relation_true_for_any_example(target_relation_name, parameters))
+
+if __name__ == '__main__':
+    unittest.main()
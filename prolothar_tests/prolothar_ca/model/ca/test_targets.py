@@ -0,0 +1,74 @@
+import unittest
+
+from prolothar_ca.model.ca.dataset import CaDataset
+from prolothar_ca.model.ca.example import CaExample
+from prolothar_ca.model.ca.obj import CaObject, CaObjectType
+from prolothar_ca.model.ca.relation import CaRelation, CaRelationType
+from prolothar_ca.model.ca.targets import FeatureValueTarget, RelationTarget
+from prolothar_ca.model.ca.variable_type import CaBoolean, CaNumber
+
+def create_dataset() -> CaDataset:
+    dataset = CaDataset(
+        {
+            'cell': CaObjectType('cell', {'value': CaNumber()}),
+            'row': CaObjectType('row', {})
+        },
+        {
+            'digit': CaRelationType('digit', ('cell',), CaNumber()),
+            'in_row': CaRelationType('in_row', ('cell', 'row'), CaBoolean())
+        }
+    )
+    for values in [(1, 2), (2, 1), (1, 1)]:
+        cells = [CaObject(f'cell{i}', 'cell', {'value': v}) for i,v in enumerate(values)]
+        row = CaObject('row', 'row', {})
+        dataset.add_example(CaExample(
+            {'cell': set(cells), 'row': {row}},
+            {
+                'digit': set(CaRelation('digit', (c,), c.features['value']) for c in cells),
+                'in_row': set(CaRelation('in_row', (c, row), True) for c in cells)
+            },
+            values[0] != values[1]
+        ))
+    return dataset
+
+class TestRelationTarget(unittest.TestCase):
+
+    def test_transform_numeric_relation(self):
+        dataset = create_dataset()
+        transformed_dataset, target_relations = RelationTarget(
+            'digit').transform_to_boolean_relations(dataset)
+        self.assertCountEqual(['digit_1', 'digit_2'], target_relations)
+        self.assertEqual(len(dataset), len(transformed_dataset))
+        for example, transformed_example in zip(dataset, transformed_dataset):
+            self.assertEqual(example.is_valid_solution, transformed_example.is_valid_solution)
+            self.assertNotIn('digit', transformed_example.relations)
+            for relation in example.relations['digit']:
+                for value in (1, 2):
+                    self.assertEqual(
+                        relation.value == value,
+                        transformed_example.get_relation_value(f'digit_{value}', relation.objects))
+
+class TestFeatureValueTarget(unittest.TestCase):
+
+    def test_transform(self):
+        dataset = create_dataset()
+        transformed_dataset, target_relations = FeatureValueTarget(
+            'cell', 'value').transform_to_boolean_relations(dataset)
+        self.assertCountEqual(['cell_value_1', 'cell_value_2'], target_relations)
+        self.assertDictEqual({}, transformed_dataset.get_object_type('cell').feature_definition)
+        first_example, *other_examples = list(transformed_dataset)
+        for example, transformed_example in zip(dataset, transformed_dataset):
+            for cell in example.all_objects_per_type['cell']:
+                transformed_cell = transformed_example.get_object_by_type_and_id('cell', cell.object_id)
+                self.assertDictEqual({}, transformed_cell.features)
+                #cells without the feature are equal in all examples and therefore shared
+                self.assertIs(first_example.get_object_by_type_and_id('cell', cell.object_id), transformed_cell)
+                self.assertTrue(transformed_example.get_relation_value('in_row', (
+                    transformed_cell, transformed_example.get_object_by_type_and_id('row', 'row'))))
+                for value in (1, 2):
+                    self.assertEqual(
+                        cell.features['value'] == value,
+                        transformed_example.get_relation_value(f'cell_value_{value}', (transformed_cell,)))
+
+if __name__ == '__main__':
+    unittest.main()
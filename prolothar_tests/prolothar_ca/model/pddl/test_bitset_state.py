@@ -0,0 +1,53 @@
+import unittest
+
+from prolothar_ca.ca.dataset_generator.metaplanning import MetaplanningCaDatasetGenerator
+from prolothar_ca.model.pddl.bitset_state import BitsetState, GroundingTable
+
+PATH_TO_HANOI_DATASET = 'prolothar_tests/resources/meta_planning/hanoi'
+
+class TestBitsetState(unittest.TestCase):
+
+    def test_replay_plan_equals_replay_on_state(self):
+        pddl_dataset_generator = MetaplanningCaDatasetGenerator(PATH_TO_HANOI_DATASET).pddl_ca_dataset_generator
+        problem = pddl_dataset_generator.problem_list[0]
+        plan = pddl_dataset_generator.plan_list[0]
+        grounding_table = GroundingTable(problem)
+        self.assertTrue(plan.is_valid(problem, grounding_table=grounding_table))
+
+        state = problem.get_intitial_state().to_state()
+        bitset_state = problem.get_intitial_state().to_bitset_state(grounding_table)
+        self.assertSetEqual(set(state.iter_true_predicates()), set(bitset_state.iter_true_predicates()))
+        for action, parameters in plan.action_list:
+            self.assertTrue(action.is_applicable(parameters, bitset_state, problem))
+            state = action.apply(parameters, state)
+            bitset_state = action.apply(parameters, bitset_state)
+            self.assertIsInstance(bitset_state, BitsetState)
+            self.assertSetEqual(set(state.iter_true_predicates()), set(bitset_state.iter_true_predicates()))
+            self.assertEqual(state.get_nr_of_true_predicates(), bitset_state.get_nr_of_true_predicates())
+            self.assertSetEqual(state.get_modified_keys(), bitset_state.get_modified_keys())
+            self.assertDictEqual(
+                dict(state.iter_numeric_fluent_values()),
+                dict(bitset_state.iter_numeric_fluent_values()))
+        self.assertEqual(str(state), str(bitset_state))
+
+    def test_grounding_table(self):
+        pddl_dataset_generator = MetaplanningCaDatasetGenerator(PATH_TO_HANOI_DATASET).pddl_ca_dataset_generator
+        problem = pddl_dataset_generator.problem_list[0]
+        grounding_table = GroundingTable(problem)
+        self.assertGreater(grounding_table.nr_of_grounded_predicates, 0)
+        for index in range(grounding_table.nr_of_grounded_predicates):
+            predicate, object_tuple = grounding_table.get_predicate_key(index)
+            self.assertEqual(index, grounding_table.get_predicate_index(predicate, object_tuple))
+        self.assertRaises(IndexError, grounding_table.get_predicate_key, grounding_table.nr_of_grounded_predicates)
+
+    def test_use_bitset_states_in_dataset_generator(self):
+        dataset = MetaplanningCaDatasetGenerator(PATH_TO_HANOI_DATASET).generate(5, 5, random_seed=42)
+        bitset_dataset = MetaplanningCaDatasetGenerator(
+            PATH_TO_HANOI_DATASET, use_bitset_states=True).generate(5, 5, random_seed=42)
+        self.assertEqual(len(dataset), len(bitset_dataset))
+        for example, bitset_example in zip(dataset, bitset_dataset):
+            self.assertEqual(example.is_valid_solution, bitset_example.is_valid_solution)
+            self.assertDictEqual(example.relations, bitset_example.relations)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+
+from prolothar_ca.model.pddl import Domain, Problem
+from prolothar_ca.model.pddl.sexpression import parse_sexpression, iterate_sexpression_elements, read_in_chunks
+from prolothar_ca.ca.dataset_generator.metaplanning import parse_plan_with_nested_expression
+
+GRIPPER_DIRECTORY = 'prolothar_tests/resources/pddl/gripper'
+HANOI_DIRECTORY = 'prolothar_tests/resources/meta_planning/hanoi'
+
+class TestSExpression(unittest.TestCase):
+
+    def test_parse_sexpression(self):
+        self.assertListEqual(
+            ['define', ['domain', 'd'], [':predicates', ['at', '?x', '-', 'object'], ['empty']]],
+            parse_sexpression('(define (domain d)\n\t(:predicates (at ?x - object)(empty)))'))
+        self.assertListEqual(
+            ['a', ['b']],
+            parse_sexpression('; comment (with parentheses\n(a ;another comment\n (b))) ignored'))
+        self.assertRaises(ValueError, parse_sexpression, '(a (b)')
+        self.assertRaises(ValueError, parse_sexpression, 'a (b)')
+        self.assertRaises(ValueError, parse_sexpression, '')
+
+    def test_iterate_sexpression_elements(self):
+        text = '(trajectory (:objects a b) (:init (at a) (at b)) (:action (move a b)))'
+        for chunk_size in [1, 3, 100]:
+            chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
+            self.assertListEqual(
+                ['trajectory', [':objects', 'a', 'b'], [':init', ['at', 'a'], ['at', 'b']], [':action', ['move', 'a', 'b']]],
+                list(iterate_sexpression_elements(chunks)))
+        self.assertRaises(ValueError, list, iterate_sexpression_elements(['(trajectory (a)']))
+
+    def test_round_trip_domains_and_problems(self):
+        with open(os.path.join(GRIPPER_DIRECTORY, 'domain.pddl')) as f:
+            gripper_domain = Domain.from_pddl(f.read())
+        self.assertEqual(gripper_domain, Domain.from_pddl(gripper_domain.to_pddl()))
+        with open(os.path.join(GRIPPER_DIRECTORY, 'prob01.pddl')) as f:
+            gripper_problem = Problem.from_pddl(f.read(), gripper_domain)
+        self.assertEqual(gripper_problem, Problem.from_pddl(gripper_problem.to_pddl(), gripper_domain))
+
+        with open(os.path.join(HANOI_DIRECTORY, 'reference')) as f:
+            hanoi_domain = Domain.from_pddl(f.read())
+        self.assertEqual(hanoi_domain, Domain.from_pddl(hanoi_domain.to_pddl()))
+
+    def test_parse_trajectory_in_chunks(self):
+        with open(os.path.join(HANOI_DIRECTORY, 'reference')) as f:
+            domain = Domain.from_pddl(f.read())
+            domain.add_type('object')
+        trajectory_file = os.path.join(HANOI_DIRECTORY, 'trajectory-00')
+        with open(trajectory_file) as f:
+            problem = Problem(trajectory_file, domain)
+            plan = parse_plan_with_nested_expression(f.read(), domain, problem)
+        with open(trajectory_file) as f:
+            chunked_problem = Problem(trajectory_file, domain)
+            chunked_plan = parse_plan_with_nested_expression(
+                read_in_chunks(f, chunk_size=17), domain, chunked_problem)
+        self.assertEqual(problem, chunked_problem)
+        self.assertGreater(plan.cost, 0)
+        self.assertEqual(plan.cost, chunked_plan.cost)
+        self.assertListEqual(
+            [(action.action_name, parameters) for action, parameters in plan.action_list],
+            [(action.action_name, parameters) for action, parameters in chunked_plan.action_list])
+
+if __name__ == '__main__':
+    unittest.main()
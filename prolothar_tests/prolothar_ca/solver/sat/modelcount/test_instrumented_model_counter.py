@@ -0,0 +1,25 @@
+import unittest
+
+from prolothar_ca.model.sat.cnf import CnfFormula, CnfDisjunction
+from prolothar_ca.model.sat.term import Term
+from prolothar_ca.model.sat.variable import Variable
+from prolothar_ca.solver.sat.modelcount.mc2 import MC2
+from prolothar_ca.solver.sat.modelcount.instrumented_model_counter import InstrumentedModelCounter
+
+class TestInstrumentedModelCounter(unittest.TestCase):
+
+    def test_count(self):
+        cnf = CnfFormula(disjunctions=set([
+            CnfDisjunction((Term(Variable(1)), Term(Variable(2)))),
+        ]))
+        model_counter = InstrumentedModelCounter(MC2())
+        self.assertEqual(MC2().count(cnf), model_counter.count(cnf))
+        self.assertAlmostEqual(MC2().countlog2(cnf), model_counter.countlog2(cnf))
+        self.assertEqual(2, model_counter.nr_of_calls)
+        self.assertGreaterEqual(model_counter.cumulative_time, 0)
+        model_counter.reset()
+        self.assertEqual(0, model_counter.nr_of_calls)
+        self.assertEqual(0, model_counter.cumulative_time)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+import unittest
+
+from prolothar_ca.parallel import create_spawn_pool, get_chunksize, get_worker_state
+
+def _add_worker_state(x: int) -> int:
+    return x + get_worker_state()
+
+class TestParallel(unittest.TestCase):
+
+    def test_create_spawn_pool(self):
+        with create_spawn_pool(2, worker_state=10) as pool:
+            self.assertListEqual(
+                [10, 11, 12, 13], list(pool.imap(_add_worker_state, range(4), chunksize=get_chunksize(4, 2))))
+
+    def test_get_chunksize(self):
+        self.assertEqual(1, get_chunksize(3, 2))
+        self.assertEqual(5, get_chunksize(40, 2))
+
+if __name__ == '__main__':
+    unittest.main()
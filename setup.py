@@ -69,8 +69,10 @@ if os.path.exists('prolothar_ca/model/sat/cnf.pyx'):
         make_extension_from_pyx("prolothar_ca/model/pddl/numeric_expression.pyx"),
         make_extension_from_pyx("prolothar_ca/model/pddl/object_type.pyx"),
         make_extension_from_pyx("prolothar_ca/model/pddl/state.pyx"),
+        make_extension_from_pyx("prolothar_ca/model/pddl/bitset_state.pyx"),
         make_extension_from_pyx("prolothar_ca/model/pddl/problem.pyx"),
         make_extension_from_pyx("prolothar_ca/model/pddl/pddl_object.pyx"),
+        make_extension_from_pyx("prolothar_ca/model/pddl/sexpression.pyx"),
         make_extension_from_pyx("prolothar_ca/model/ca/obj.pyx"),
         make_extension_from_pyx("prolothar_ca/model/ca/relation.pyx"),
         make_extension_from_pyx("prolothar_ca/model/ca/example.pyx"),